@@ -0,0 +1,244 @@
+"""Offline benchmark of agent framework overhead.
+
+Runs SGRAgent, ToolCallingAgent and SGRToolCallingAgent through N
+concurrent sessions against the replay LLM and search stand-ins from
+benchmark.replay, so no network is needed and results are reproducible.
+Reports per session latency (p50/p99), framework overhead per iteration
+(session time minus time spent streaming from the LLM and running
+tools), stream chunks per second and memory retained per agent.
+
+Usage:
+    python -m benchmark.bench_agents --sessions 50
+    python -m benchmark.bench_agents --agents sgr --sessions 200 --ttft 0.3 --chunk-delay 0.01
+
+    # Record a trace from a real LLM and Tavily, then replay it
+    python -m benchmark.bench_agents --sessions 1 --record trace.jsonl \\
+        --base-url https://api.openai.com/v1 --api-key sk-... --model gpt-4o-mini --tavily-api-key tvly-...
+    python -m benchmark.bench_agents --sessions 100 --trace trace.jsonl
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Type
+
+import httpx
+from openai import AsyncOpenAI
+
+from benchmark.replay import (
+    FakeTavilySearchService,
+    RecordingTavilyClient,
+    RecordingTransport,
+    ReplayLLM,
+    ReplayTavilyClient,
+    ScriptedResponder,
+    TraceWriter,
+    load_trace,
+)
+from sgr_agent_core.agent_config import GlobalConfig
+from sgr_agent_core.agent_definition import AgentConfig, ExecutionConfig, LLMConfig, SearchConfig
+from sgr_agent_core.agents import SGRAgent, SGRToolCallingAgent, ToolCallingAgent
+from sgr_agent_core.base_agent import BaseAgent
+from sgr_agent_core.tools import FinalAnswerTool, WebSearchTool
+
+AGENTS: dict[str, Type[BaseAgent]] = {
+    "sgr": SGRAgent,
+    "tool_calling": ToolCallingAgent,
+    "sgr_tool_calling": SGRToolCallingAgent,
+}
+
+TASK = [{"role": "user", "content": "Find when the benchmark framework was first released and by whom."}]
+
+
+@dataclass
+class SessionResult:
+    seconds: float
+    iterations: int
+    llm_seconds: float
+    tool_seconds: float
+    chunks: int
+    completed: bool
+
+
+@dataclass
+class Report:
+    agent: str
+    sessions: int
+    completed: int
+    p50_seconds: float
+    p99_seconds: float
+    iterations: float
+    overhead_ms_per_iteration: float
+    chunks_per_second: float
+    kb_per_agent: float | None = None
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+async def run_session(agent: BaseAgent) -> SessionResult:
+    chunks = 0
+
+    async def read_stream():
+        nonlocal chunks
+        async for _ in agent.streaming_generator.stream():
+            chunks += 1
+
+    reader = asyncio.create_task(read_stream())
+    started = time.perf_counter()
+    await agent.execute()
+    seconds = time.perf_counter() - started
+    await reader
+    timings = agent._context.timings
+    llm = timings.get("llm_stream")
+    return SessionResult(
+        seconds=seconds,
+        iterations=agent._context.iteration,
+        llm_seconds=llm.total_seconds if llm else 0.0,
+        tool_seconds=sum(span.total_seconds for name, span in timings.items() if name.startswith("tool:")),
+        chunks=chunks,
+        completed=agent._context.state.value == "completed",
+    )
+
+
+def create_agents(agent_class: Type[BaseAgent], client: AsyncOpenAI, config: AgentConfig, n: int) -> list[BaseAgent]:
+    return [
+        agent_class(
+            task_messages=TASK, openai_client=client, agent_config=config, toolkit=[WebSearchTool, FinalAnswerTool]
+        )
+        for _ in range(n)
+    ]
+
+
+async def bench_agent(name: str, client: AsyncOpenAI, config: AgentConfig, sessions: int) -> Report:
+    agents = create_agents(AGENTS[name], client, config, sessions)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run_session(agent) for agent in agents))
+    wall = time.perf_counter() - started
+    iterations = sum(result.iterations for result in results)
+    overhead = sum(result.seconds - result.llm_seconds - result.tool_seconds for result in results)
+    return Report(
+        agent=name,
+        sessions=sessions,
+        completed=sum(result.completed for result in results),
+        p50_seconds=percentile([result.seconds for result in results], 0.5),
+        p99_seconds=percentile([result.seconds for result in results], 0.99),
+        iterations=iterations / sessions,
+        overhead_ms_per_iteration=overhead / max(iterations, 1) * 1000,
+        chunks_per_second=sum(result.chunks for result in results) / wall,
+    )
+
+
+async def measure_memory(name: str, client: AsyncOpenAI, config: AgentConfig, sessions: int) -> float:
+    """Memory retained per finished agent in KB, measured in a separate
+    pass because tracing allocations slows everything down."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    agents = create_agents(AGENTS[name], client, config, sessions)
+    await asyncio.gather(*(run_session(agent) for agent in agents))
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del agents
+    return retained / sessions / 1024
+
+
+def print_reports(reports: list[Report]) -> None:
+    header = f"{'agent':<18}{'done':>9}{'p50, s':>9}{'p99, s':>9}{'iters':>7}{'overhead, ms/it':>17}{'chunks/s':>11}"
+    print(header + f"{'KB/agent':>10}")
+    for report in reports:
+        memory = f"{report.kb_per_agent:>10.1f}" if report.kb_per_agent is not None else f"{'-':>10}"
+        print(
+            f"{report.agent:<18}{f'{report.completed}/{report.sessions}':>9}{report.p50_seconds:>9.3f}"
+            f"{report.p99_seconds:>9.3f}{report.iterations:>7.1f}{report.overhead_ms_per_iteration:>17.2f}"
+            f"{report.chunks_per_second:>11.0f}{memory}"
+        )
+
+
+async def main(args: argparse.Namespace) -> list[Report]:
+    trace = load_trace(args.trace) if args.trace else None
+    writer = TraceWriter(args.record) if args.record else None
+    search_config = SearchConfig(tavily_api_key=args.tavily_api_key or "replay")
+    if writer:
+        from tavily import AsyncTavilyClient
+
+        transport = RecordingTransport(writer)
+        tavily = RecordingTavilyClient(AsyncTavilyClient(api_key=args.tavily_api_key), writer)
+    else:
+        llm = ReplayLLM(
+            trace=trace,
+            responder=ScriptedResponder(searches=args.searches, chunk_chars=args.chunk_chars),
+            ttft=args.ttft,
+            chunk_delay=args.chunk_delay,
+        )
+        transport = llm.transport() if not args.base_url else httpx.AsyncHTTPTransport()
+        tavily = ReplayTavilyClient(trace, latency=args.search_latency)
+    FakeTavilySearchService.install(search_config, tavily)
+
+    base_url = args.base_url or "http://replay.local/v1"
+    client = AsyncOpenAI(
+        base_url=base_url,
+        api_key=args.api_key,
+        http_client=httpx.AsyncClient(transport=transport, timeout=60),
+    )
+    config = AgentConfig(
+        llm=LLMConfig(api_key=args.api_key, base_url=base_url, model=args.model),
+        search=search_config,
+        execution=ExecutionConfig(max_iterations=args.max_iterations, max_searches=args.searches),
+    )
+
+    reports = []
+    for name in args.agents:
+        report = await bench_agent(name, client, config, args.sessions)
+        if args.memory and not writer:
+            report.kb_per_agent = await measure_memory(name, client, config, args.sessions)
+        reports.append(report)
+    await client.close()
+    return reports
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline agent framework benchmark")
+    parser.add_argument("--agents", nargs="+", choices=list(AGENTS), default=list(AGENTS), help="Agent types to run")
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent sessions per agent type")
+    parser.add_argument("--searches", type=int, default=2, help="Web searches of the scripted research")
+    parser.add_argument("--max-iterations", type=int, default=10, help="Agent iteration limit")
+    parser.add_argument("--ttft", type=float, default=0.0, help="Replayed LLM time to first token in seconds")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="Seconds between replayed LLM chunks")
+    parser.add_argument("--chunk-chars", type=int, default=8, help="Characters per scripted LLM chunk")
+    parser.add_argument("--search-latency", type=float, default=0.0, help="Replayed search latency in seconds")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the memory pass")
+    parser.add_argument("--trace", help="JSON Lines trace to replay")
+    parser.add_argument("--record", help="Record a trace from the real LLM at --base-url and Tavily")
+    parser.add_argument("--base-url", help="LLM base URL, e.g. the replay stub server; in-process replay if omitted")
+    parser.add_argument("--api-key", default="replay", help="LLM API key")
+    parser.add_argument("--model", default="replay", help="LLM model")
+    parser.add_argument("--tavily-api-key", help="Tavily API key for recording")
+    parser.add_argument("--json", dest="json_path", help="Also write the reports to this JSON file")
+    parser.add_argument("--log-level", default="WARNING", help="Logging level of the agents")
+    args = parser.parse_args()
+    if args.record and not (args.base_url and args.tavily_api_key):
+        parser.error("--record needs --base-url, --api-key and --tavily-api-key of the real services")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    logging.basicConfig(level=args.log_level)
+    # Some modules pin their loggers to INFO, so lower levels are disabled globally
+    logging.disable(logging.getLevelName(args.log_level.upper()) - 1)
+    # Agent logs are not part of the measured work
+    GlobalConfig().execution.logs_dir = None
+    reports = asyncio.run(main(args))
+    print_reports(reports)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump([asdict(report) for report in reports], f, indent=2)
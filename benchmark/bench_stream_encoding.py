@@ -0,0 +1,140 @@
+"""Microbenchmark of SSE chunk encoding in OpenAIStreamingGenerator.
+
+Compares the per-chunk cost (encoding plus buffering) of the
+template-based encoder with the previous implementation that rebuilt
+and serialized the whole chunk on every token.
+
+Usage:
+    python -m benchmark.bench_stream_encoding --chunks 20000
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import time
+import timeit
+
+from openai.types.chat import ChatCompletionChunk
+
+from sgr_agent_core.stream import OpenAIStreamingGenerator
+
+
+class LegacyEncoder:
+    """Previous encoding path with its unbounded queue, kept here as the
+    baseline."""
+
+    def __init__(self, model: str):
+        self.queue = asyncio.Queue()
+        self.model = model
+        self.fingerprint = f"fp_{hex(hash(model))[-8:]}"
+        self.id = f"chatcmpl-{int(time.time())}{hash(str(time.time()))}"[:29]
+        self.created = int(time.time())
+        self.choice_index = 0
+
+    def add_chunk(self, chunk: ChatCompletionChunk):
+        chunk.model = self.model
+        self.queue.put_nowait(f"data: {chunk.model_dump_json()}\n\n")
+
+    def add_chunk_from_str(self, content: str):
+        response = {
+            "id": self.id,
+            "object": "chat.completion.chunk",
+            "created": self.created,
+            "model": self.model,
+            "system_fingerprint": self.fingerprint,
+            "choices": [
+                {
+                    "delta": {"content": content, "role": "assistant", "tool_calls": None},
+                    "index": self.choice_index,
+                    "finish_reason": None,
+                    "logprobs": None,
+                }
+            ],
+            "usage": None,
+        }
+        self.queue.put_nowait(f"data: {json.dumps(response)}\n\n")
+
+    def add_tool_call(self, tool_call_id: str, function_name: str, arguments: str):
+        response = {
+            "id": self.id,
+            "object": "chat.completion.chunk",
+            "created": self.created,
+            "model": self.model,
+            "system_fingerprint": f"fp_{hex(hash(self.model))[-8:]}",
+            "choices": [
+                {
+                    "delta": {
+                        "tool_calls": [
+                            {
+                                "index": 0,
+                                "id": tool_call_id,
+                                "type": "function",
+                                "function": {"name": function_name, "arguments": arguments},
+                            }
+                        ]
+                    },
+                    "index": self.choice_index,
+                    "logprobs": None,
+                    "finish_reason": None,
+                }
+            ],
+            "usage": None,
+        }
+        self.queue.put_nowait(f"data: {json.dumps(response)}\n\n")
+
+
+def make_upstream_chunk(content: str) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chatcmpl-upstream",
+            "object": "chat.completion.chunk",
+            "created": 1700000000,
+            "model": "upstream-model",
+            "choices": [{"index": 0, "delta": {"content": content, "role": "assistant"}, "finish_reason": None}],
+        }
+    )
+
+
+def measure(function, chunks: int, repeat: int) -> float:
+    """Best per-call time in microseconds."""
+    return min(timeit.repeat(function, number=chunks, repeat=repeat)) / chunks * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SSE chunk encoding microbenchmark")
+    parser.add_argument("--chunks", type=int, default=20000, help="Chunks encoded per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements per case, best one is reported")
+    args = parser.parse_args()
+
+    token = "token "
+    upstream_chunk = make_upstream_chunk(token)
+    legacy = LegacyEncoder(model="bench-agent")
+    # Buffer large enough to keep every chunk of a measurement
+    generator = OpenAIStreamingGenerator(model="bench-agent", max_chunks=args.chunks + 1)
+
+    cases = {
+        "add_chunk (upstream delta)": (
+            lambda: legacy.add_chunk(upstream_chunk),
+            lambda: generator.add_chunk(upstream_chunk),
+        ),
+        "add_chunk_from_str": (
+            lambda: legacy.add_chunk_from_str(token),
+            lambda: generator.add_chunk_from_str(token),
+        ),
+        "add_tool_call": (
+            lambda: legacy.add_tool_call("1-reasoning", "reasoningtool", '{"reasoning_steps": ["a", "b"]}'),
+            lambda: generator.add_tool_call("1-reasoning", "reasoningtool", '{"reasoning_steps": ["a", "b"]}'),
+        ),
+    }
+
+    print(f"JSON encoder: {'orjson' if importlib.util.find_spec('orjson') else 'json'}")
+    print(f"{'case':<30}{'legacy, us':>12}{'current, us':>14}{'speedup':>10}")
+    for name, (legacy_call, current_call) in cases.items():
+        legacy_time = measure(legacy_call, args.chunks, args.repeat)
+        current_time = measure(current_call, args.chunks, args.repeat)
+        print(f"{name:<30}{legacy_time:>12.2f}{current_time:>14.2f}{legacy_time / current_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-from openai import pydantic_function_tool
 from openai.types.chat import ChatCompletionFunctionToolParam
 
 from examples.sgr_deep_research.agents import ResearchSGRToolCallingAgent
@@ -26,17 +25,17 @@ class BenchmarkAgent(ResearchSGRToolCallingAgent):
     async def _prepare_tools(self) -> list[ChatCompletionFunctionToolParam]:
         """Prepare available tools for current agent state and progress."""
         tools = set(self.toolkit)
-        if self._context.iteration >= self.max_iterations:
+        if self._context.iteration >= self.config.execution.max_iterations:
             tools = {
                 ReasoningTool,
                 FinalAnswerTool,
             }
-        if self._context.searches_used >= self.max_searches:
+        if self._context.searches_used >= self.config.search.max_searches:
             tools -= {
                 WebSearchTool,
             }
 
-        return [pydantic_function_tool(tool, name=tool.tool_name, description="") for tool in tools]
+        return [tool.to_openai_tool(description="") for tool in tools]
 
     async def execute(
         self,
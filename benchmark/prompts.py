@@ -1,6 +1,7 @@
-def GRADER_TEMPLATE(question, target, predicted_answer):
-    """Generate grading template for evaluating predicted answers."""
-    return f"""
+# Bump when the wording of GRADER_TEMPLATE or BATCH_GRADER_TEMPLATE changes, so cached grades are redone
+GRADER_PROMPT_VERSION = 1
+
+GRADER_INSTRUCTIONS = """
 Your job is to look at a question, a gold target, and a predicted answer, and then assign a grade of either \
 ["CORRECT", "INCORRECT", "NOT_ATTEMPTED"].
 First, I will give examples of each grade, and then you will grade a new example.
@@ -89,6 +90,13 @@ The predicted answer "Michelle" would be considered CORRECT, because the last na
 - Do not punish for typos in people's name if it's clearly the same name.
     - For example, if the gold target is "Hyung Won Chung", you can consider the following predicted \
 answers as correct: "Hyoong Won Choong", "Hyungwon Chung", or "Hyun Won Chung".
+""".strip()
+
+
+def GRADER_TEMPLATE(question, target, predicted_answer):
+    """Generate grading template for evaluating predicted answers."""
+    return f"""
+{GRADER_INSTRUCTIONS}
 
 
 Here is a new example. Simply reply with either CORRECT, INCORRECT, NOT ATTEMPTED.
@@ -104,3 +112,35 @@ CORRECT
 INCORRECT
 NOT_ATTEMPTED
 """.strip()
+
+
+def BATCH_GRADER_TEMPLATE(examples):
+    """Generate grading template for evaluating several predicted answers in
+    one request.
+
+    Args:
+        examples: List of (question, target, predicted_answer) tuples.
+    """
+    blocks = "\n".join(
+        f"""Example {i}:
+```
+Question: {question}
+Gold target: {target}
+Predicted answer: {predicted_answer}
+```"""
+        for i, (question, target, predicted_answer) in enumerate(examples, 1)
+    )
+    return f"""
+{GRADER_INSTRUCTIONS}
+
+
+Here are {len(examples)} new examples. Grade each of them independently, in the given order, and return exactly \
+{len(examples)} grades.
+Don't apologize or correct yourself if there was a mistake; we are just trying to grade the answers.
+{blocks}
+
+Grade the predicted answer of each new question as one of:
+CORRECT
+INCORRECT
+NOT_ATTEMPTED
+""".strip()
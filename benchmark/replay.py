@@ -0,0 +1,377 @@
+"""Offline stand-ins for the LLM and Tavily APIs used by the agent
+benchmarks.
+
+The LLM stand-in speaks the streamed OpenAI chat completions protocol,
+either in-process through an httpx transport (so the OpenAI SDK, SSE
+parsing and agent code run exactly as in production) or as an HTTP stub
+server. Responses come from a JSON Lines trace recorded from a real run,
+or are scripted from the request: search the web a few times, then give
+the final answer. Search goes through the real TavilySearchService with a
+replaying client. Latency of both is configurable.
+
+Usage:
+    # Serve the stub on http://127.0.0.1:8090/v1
+    python -m benchmark.replay --trace trace.jsonl --port 8090
+
+Trace lines:
+    {"type": "llm", "key": "...", "events": ["{chunk json}", ...]}
+    {"type": "search", "query": "...", "response": {...}}
+    {"type": "extract", "url": "...", "result": {...}}
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import httpx
+
+from sgr_agent_core.agent_definition import SearchConfig
+from sgr_agent_core.services.tavily_search import TavilySearchService
+
+
+def request_key(body: dict) -> str:
+    """Key a chat completion request by its kind and conversation length.
+
+    Replaying agents send the same sequence of request kinds and message
+    counts as the recorded run, so the key finds the recorded response
+    without keeping per-session state.
+    """
+    response_format = body.get("response_format")
+    if response_format:
+        kind = "schema:" + response_format.get("json_schema", {}).get("name", "")
+    else:
+        kind = "tools:" + ",".join(sorted(tool["function"]["name"] for tool in body.get("tools", [])))
+    return f"{kind}#{len(body.get('messages', []))}"
+
+
+def _chunk(content: str | None = None, tool_call: dict | None = None, finish_reason: str | None = None) -> dict:
+    delta: dict[str, Any] = {"role": "assistant"}
+    if content is not None:
+        delta["content"] = content
+    if tool_call is not None:
+        delta["tool_calls"] = [tool_call]
+    return {
+        "id": "chatcmpl-replay",
+        "object": "chat.completion.chunk",
+        "created": 1700000000,
+        "model": "replay",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+class ScriptedResponder:
+    """Builds valid responses for the agents from the request alone.
+
+    The scripted research makes ``searches`` web searches and then calls
+    the final answer tool. Works with structured output requests of
+    SGRAgent and tool calls of the tool calling agents.
+    """
+
+    def __init__(self, searches: int = 2, chunk_chars: int = 8):
+        self.searches = searches
+        self.chunk_chars = chunk_chars
+
+    @staticmethod
+    def _reasoning(step: int) -> dict:
+        return {
+            "reasoning_steps": [f"Step {step}: review collected data", "Decide on the next action"],
+            "current_situation": f"Research step {step} of the benchmark task",
+            "plan_status": "On track",
+            "enough_data": False,
+            "remaining_steps": ["Search for more data", "Answer the question"],
+            "task_completed": False,
+        }
+
+    def _action(self, searches_done: int, search_available: bool) -> tuple[str, dict]:
+        if search_available and searches_done < self.searches:
+            return "websearchtool", {
+                "reasoning": "Need facts from the web",
+                "query": f"benchmark question facts part {searches_done + 1}",
+                "max_results": 5,
+            }
+        return "finalanswertool", {
+            "reasoning": "Collected enough data",
+            "completed_steps": [f"Made {searches_done} searches"],
+            "answer": "Benchmark answer based on the collected sources.",
+            "status": "completed",
+        }
+
+    def _tool_calls(self, calls: list[tuple[str, dict]]) -> list[dict]:
+        chunks = []
+        for index, (name, arguments) in enumerate(calls):
+            chunks.append(
+                _chunk(
+                    tool_call={
+                        "index": index,
+                        "id": f"call_{index}",
+                        "type": "function",
+                        "function": {"name": name, "arguments": ""},
+                    }
+                )
+            )
+            text = json.dumps(arguments)
+            for start in range(0, len(text), self.chunk_chars):
+                piece = text[start : start + self.chunk_chars]
+                chunks.append(_chunk(tool_call={"index": index, "function": {"arguments": piece}}))
+        chunks.append(_chunk(finish_reason="tool_calls"))
+        return chunks
+
+    def _content(self, text: str) -> list[dict]:
+        chunks = [
+            _chunk(content=text[start : start + self.chunk_chars]) for start in range(0, len(text), self.chunk_chars)
+        ]
+        chunks.append(_chunk(finish_reason="stop"))
+        return chunks
+
+    def events(self, body: dict) -> list[str]:
+        messages = body.get("messages", [])
+        called = [
+            tool_call["function"]["name"]
+            for message in messages
+            if message.get("role") == "assistant"
+            for tool_call in message.get("tool_calls") or []
+        ]
+        searches_done = called.count("websearchtool")
+        step = called.count("reasoningtool") + searches_done + 1
+        response_format = body.get("response_format")
+        if response_format:
+            name, arguments = self._action(searches_done, "websearchtool" in json.dumps(response_format))
+            chunks = self._content(
+                json.dumps({**self._reasoning(step), "function": {"tool_name_discriminator": name, **arguments}})
+            )
+        else:
+            tools = [tool["function"]["name"] for tool in body.get("tools", [])]
+            calls = []
+            if "reasoningtool" in tools:
+                calls.append(("reasoningtool", self._reasoning(step)))
+            if tools != ["reasoningtool"]:
+                calls.append(self._action(searches_done, "websearchtool" in tools))
+            chunks = self._tool_calls(calls)
+        if body.get("stream_options", {}).get("include_usage"):
+            completion_tokens = sum(len(json.dumps(chunk["choices"][0]["delta"])) for chunk in chunks) // 4
+            prompt_tokens = len(json.dumps(messages)) // 4
+            chunks.append(
+                {
+                    **_chunk(),
+                    "choices": [],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    },
+                }
+            )
+        return [json.dumps(chunk) for chunk in chunks]
+
+
+def load_trace(path: str | Path) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class TraceWriter:
+    """Appends trace entries to a JSON Lines file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, entry: dict) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class ReplayLLM:
+    """Streams chat completions from a trace or a ScriptedResponder with
+    simulated latency.
+
+    Args:
+        trace: Trace entries; requests without a recorded response fall back to the scripted responder
+        responder: Scripted responder, defaults to ScriptedResponder()
+        ttft: Seconds before the first chunk
+        chunk_delay: Seconds between chunks
+    """
+
+    def __init__(
+        self,
+        trace: list[dict] | None = None,
+        responder: ScriptedResponder | None = None,
+        ttft: float = 0.0,
+        chunk_delay: float = 0.0,
+    ):
+        self.recorded = {entry["key"]: entry["events"] for entry in trace or [] if entry.get("type") == "llm"}
+        self.responder = responder or ScriptedResponder()
+        self.ttft = ttft
+        self.chunk_delay = chunk_delay
+        self.requests = 0
+        self.replayed = 0
+
+    async def stream(self, body: dict) -> AsyncIterator[bytes]:
+        self.requests += 1
+        events = self.recorded.get(request_key(body))
+        if events is None:
+            events = self.responder.events(body)
+        else:
+            self.replayed += 1
+        if self.ttft:
+            await asyncio.sleep(self.ttft)
+        for event in events:
+            yield f"data: {event}\n\n".encode()
+            if self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+        yield b"data: [DONE]\n\n"
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        """httpx transport handler for AsyncOpenAI clients."""
+        if not request.url.path.endswith("/chat/completions"):
+            return httpx.Response(404, json={"error": {"message": f"Not supported: {request.url.path}"}})
+        body = json.loads(request.content)
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=self.stream(body))
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        return httpx.MockTransport(self.handle)
+
+    def app(self):
+        """FastAPI app serving the stub over HTTP."""
+        from fastapi import FastAPI, Request
+        from fastapi.responses import StreamingResponse
+
+        app = FastAPI(title="Replay LLM")
+
+        @app.post("/v1/chat/completions")
+        async def chat_completions(request: Request):
+            return StreamingResponse(self.stream(await request.json()), media_type="text/event-stream")
+
+        return app
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Forwards chat completion requests upstream and records the streamed
+    responses as trace entries."""
+
+    def __init__(self, writer: TraceWriter, upstream: httpx.AsyncBaseTransport | None = None):
+        self.writer = writer
+        self.upstream = upstream or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.upstream.handle_async_request(request)
+        if not request.url.path.endswith("/chat/completions") or response.status_code != 200:
+            return response
+        content = b"".join([part async for part in response.stream])
+        await response.aclose()
+        events = [
+            line[len("data: ") :]
+            for line in content.decode().splitlines()
+            if line.startswith("data: ") and line != "data: [DONE]"
+        ]
+        self.writer.write({"type": "llm", "key": request_key(json.loads(request.content)), "events": events})
+        return httpx.Response(response.status_code, headers=response.headers, content=content)
+
+    async def aclose(self) -> None:
+        await self.upstream.aclose()
+
+
+class ReplayTavilyClient:
+    """AsyncTavilyClient stand-in replaying recorded responses with latency.
+
+    Queries and URLs missing from the trace get synthetic results of
+    ``content_chars`` characters.
+    """
+
+    def __init__(self, trace: list[dict] | None = None, latency: float = 0.0, content_chars: int = 2000):
+        trace = trace or []
+        self.searches = {entry["query"]: entry["response"] for entry in trace if entry.get("type") == "search"}
+        self.extracts = {entry["url"]: entry["result"] for entry in trace if entry.get("type") == "extract"}
+        self.latency = latency
+        self.content_chars = content_chars
+        self.calls = 0
+
+    async def _wait(self) -> None:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _page(self, url: str) -> str:
+        seed = hashlib.sha1(url.encode()).hexdigest()
+        return (f"Content of {url} {seed} " * (self.content_chars // 60 + 1))[: self.content_chars]
+
+    async def search(self, query: str, max_results: int = 5, include_raw_content: bool = False, **_) -> dict:
+        await self._wait()
+        if query in self.searches:
+            return self.searches[query]
+        slug = hashlib.sha1(query.encode()).hexdigest()[:8]
+        results = []
+        for i in range(max_results):
+            url = f"https://example.com/{slug}/{i}"
+            result = {"title": f"Result {i} for {query}", "url": url, "content": self._page(url)[:200], "score": 0.9}
+            if include_raw_content:
+                result["raw_content"] = self._page(url)
+            results.append(result)
+        return {"query": query, "results": results, "response_time": self.latency}
+
+    async def extract(self, urls: list[str], **_) -> dict:
+        await self._wait()
+        results = [self.extracts.get(url) or {"url": url, "raw_content": self._page(url)} for url in urls]
+        return {"results": results, "failed_results": []}
+
+
+class RecordingTavilyClient:
+    """Wraps an AsyncTavilyClient and records its responses."""
+
+    def __init__(self, client: Any, writer: TraceWriter):
+        self.client = client
+        self.writer = writer
+
+    async def search(self, query: str, **kwargs) -> dict:
+        response = await self.client.search(query=query, **kwargs)
+        self.writer.write({"type": "search", "query": query, "response": response})
+        return response
+
+    async def extract(self, urls: list[str], **kwargs) -> dict:
+        response = await self.client.extract(urls=urls, **kwargs)
+        for result in response.get("results", []):
+            self.writer.write({"type": "extract", "url": result.get("url"), "result": result})
+        return response
+
+
+class FakeTavilySearchService(TavilySearchService):
+    """TavilySearchService running on a replaying or recording client."""
+
+    @classmethod
+    def install(cls, search_config: SearchConfig, client: Any) -> "FakeTavilySearchService":
+        """Make the service the shared one for the search configuration,
+        so tools of benchmarked agents use it through get_shared()."""
+        service = cls(search_config, client=client)
+        cls._instances[search_config.model_dump_json()] = service
+        return service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI-compatible replay stub server")
+    parser.add_argument("--trace", help="JSON Lines trace to replay, scripted responses if omitted")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--ttft", type=float, default=0.2, help="Seconds before the first chunk")
+    parser.add_argument("--chunk-delay", type=float, default=0.005, help="Seconds between chunks")
+    parser.add_argument("--searches", type=int, default=2, help="Searches of scripted research")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    llm = ReplayLLM(
+        trace=load_trace(args.trace) if args.trace else None,
+        responder=ScriptedResponder(searches=args.searches),
+        ttft=args.ttft,
+        chunk_delay=args.chunk_delay,
+    )
+    started = time.monotonic()
+    uvicorn.run(llm.app(), host=args.host, port=args.port, log_level="warning")
+    print(f"Served {llm.requests} requests ({llm.replayed} replayed) in {time.monotonic() - started:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
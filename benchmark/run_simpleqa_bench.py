@@ -2,6 +2,7 @@ import argparse
 import asyncio
 import logging
 import os
+import time
 from typing import Any, Dict, List
 
 import pandas as pd
@@ -10,11 +11,16 @@ from dotenv import load_dotenv
 
 from benchmark.utils import (
     GradeAnswerModel,
+    GradeCache,
+    JsonlCheckpoint,
+    JudgeGrader,
+    create_judge_client,
     get_f1_score,
-    grading_answer,
     save_result,
 )
 from sgr_agent_core.agent_config import GlobalConfig
+from sgr_agent_core.agent_definition import AgentConfig
+from sgr_agent_core.services.openai_client_pool import OpenAIClientPool
 
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 config_path = os.path.join(project_root, "config.yaml")
@@ -28,25 +34,40 @@ logger = logging.getLogger(__name__)
 logger.info(f"Using config file: {config_path}")
 
 
-async def benchmark_agent(question, answer, model_config) -> Dict[str, Any]:
+def create_agent(question: str) -> BenchmarkAgent:
     system_conf = GlobalConfig()
-    agent = BenchmarkAgent(task=question, max_iterations=system_conf.execution.max_iterations)
+    agent_config = AgentConfig(
+        llm=system_conf.llm,
+        search=system_conf.search,
+        execution=system_conf.execution,
+        prompts=system_conf.prompts,
+    )
+    return BenchmarkAgent(
+        task_messages=[{"role": "user", "content": question}],
+        openai_client=OpenAIClientPool.get_client(agent_config.llm),
+        agent_config=agent_config,
+        toolkit=[],
+    )
 
+
+async def benchmark_agent(
+    question_id, question, answer, grader: JudgeGrader, agent_timeout: float | None = None
+) -> Dict[str, Any]:
+    agent = None
+    started = time.monotonic()
     try:
-        await agent.execute()
+        agent = create_agent(question)
+        await asyncio.wait_for(agent.execute(), agent_timeout)
 
         predicted_answer = agent._context.execution_result
 
-        grade_answer_report: GradeAnswerModel = grading_answer(predicted_answer, question, answer, model_config)
+        grade_answer_report: GradeAnswerModel = await grader.grade(predicted_answer, question, answer)
         grade_answer = grade_answer_report.grade_answer
 
-        is_correct_val = grade_answer == "CORRECT"
-        is_incorrect_val = grade_answer == "INCORRECT"
-        is_not_attempted_val = grade_answer == "NOT_ATTEMPTED"
-
     except Exception as ex:
         return {
-            "problem": question,
+            "question_id": question_id,
+            "question": question,
             "answer": answer,
             "predicted_answer": "None",
             "grade_str": "None",
@@ -55,63 +76,106 @@ async def benchmark_agent(question, answer, model_config) -> Dict[str, Any]:
             "is_not_attempted": False,
             "fail_search": True,
             "grade_answer_report": "None",
-            "Error text": str(ex),
+            "Error text": str(ex) or type(ex).__name__,
             "agent_id": getattr(agent, "id", "N/A"),
+            "seconds": time.monotonic() - started,
         }
 
     return {
+        "question_id": question_id,
         "question": question,
         "answer": answer,
         "predicted_answer": predicted_answer,
         "grade_str": grade_answer,
-        "is_correct": is_correct_val,
-        "is_incorrect": is_incorrect_val,
-        "is_not_attempted": is_not_attempted_val,
+        "is_correct": grade_answer == "CORRECT",
+        "is_incorrect": grade_answer == "INCORRECT",
+        "is_not_attempted": grade_answer == "NOT_ATTEMPTED",
         "fail_search": False,
-        "grade_answer_report": grade_answer_report,
+        "grade_answer_report": grade_answer_report.model_dump_json(),
         "Error text": "None",
         "agent_id": agent.id,
+        "seconds": time.monotonic() - started,
     }
 
 
 async def main(
+    question_ids: List[Any],
     problems: List[str],
     answers: List[str],
     output_path: str,
     judge_model_config: Dict[str, str],
-    results_task: List[Dict[str, Any]] = None,
-    batch_size: int = 3,
-    start_idx: int = 0,
+    checkpoint_path: str | None = None,
+    concurrency: int = 10,
+    retry_failed: bool = False,
+    agent_timeout: float | None = None,
+    grade_cache_path: str | None = None,
+    judge_concurrency: int = 8,
+    judge_batch_size: int = 1,
 ):
-    results = results_task if results_task else []
-
-    if len(problems) != len(answers):
-        raise "Problems list and Answer list don't compare"
-
-    total_batches = (len(problems) + batch_size - 1) // batch_size
-
-    for batch_idx, i in enumerate(range(0, len(problems), batch_size), start=1):
-        batch_tasks = problems[i : i + batch_size], answers[i : i + batch_size]
-
-        logger.info(
-            f"Started batch {batch_idx}/{total_batches} (questions {i + 1}-{min(i + batch_size, len(problems))})"
-        )
-        logger.debug(f"Batch tasks: {batch_tasks}")
-
-        batch_results = await asyncio.gather(
-            *[benchmark_agent(question, answer, judge_model_config) for question, answer in zip(*batch_tasks)]
-        )
-
-        results.extend(batch_results)
-
-        save_result(results, output_path)
+    """Run the benchmark with a pool of workers.
+
+    Each worker takes the next question as soon as its previous one is
+    graded, so a slow question only occupies one slot. Finished questions
+    are appended to the JSON Lines checkpoint; questions already in it are
+    skipped, which makes interrupted runs resumable. The Excel file and
+    metrics are written once at the end. Judge grades are cached in
+    ``grade_cache_path``, so only new predictions are sent to the judge.
+    """
+    if not len(question_ids) == len(problems) == len(answers):
+        raise ValueError("Question IDs, problems and answers lists have different lengths")
+
+    checkpoint = JsonlCheckpoint(checkpoint_path or os.path.splitext(output_path)[0] + ".jsonl")
+    done = checkpoint.load()
+    if retry_failed:
+        done = {question_id: record for question_id, record in done.items() if not record["fail_search"]}
+    pending: asyncio.Queue = asyncio.Queue()
+    for task in zip(question_ids, problems, answers):
+        if task[0] not in done:
+            pending.put_nowait(task)
+    total = pending.qsize()
+    logger.info(f"{len(done)} questions restored from {checkpoint.path}, {total} to run with concurrency {concurrency}")
+
+    judge_client = create_judge_client(judge_model_config)
+    grade_cache = GradeCache(grade_cache_path) if grade_cache_path else None
+    grader = JudgeGrader(
+        judge_model_config,
+        judge_client,
+        cache=grade_cache,
+        concurrency=judge_concurrency,
+        batch_size=judge_batch_size,
+    )
+    finished = 0
+    started = time.monotonic()
+
+    async def worker():
+        nonlocal finished
+        while True:
+            try:
+                question_id, question, answer = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            result = await benchmark_agent(question_id, question, answer, grader, agent_timeout)
+            checkpoint.append(result)
+            done[question_id] = result
+            finished += 1
+            if finished % concurrency == 0 or finished == total:
+                rate = finished / (time.monotonic() - started)
+                logger.info(f"Processed {finished}/{total} questions ({rate * 60:.1f}/min)")
 
-        logger.info(
-            f"Completed batch {batch_idx}/{total_batches}."
-            f"Processed questions: {len(results)}/{len(problems) + len(results_task if results_task else [])}"
-        )
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, total)))))
+    finally:
+        checkpoint.close()
+        if grade_cache is not None:
+            grade_cache.close()
+        await judge_client.close()
+        await OpenAIClientPool.aclose()
 
     logger.info("Benchmark completed!")
+    logger.info(f"Judge grades: {grader.hits} from cache, {grader.misses} graded by {judge_model_config['model']}")
+
+    results = [done[question_id] for question_id in question_ids if question_id in done]
+    save_result(results, output_path)
 
     results_df = pd.DataFrame(results)
     num_correct = results_df["is_correct"].sum()
@@ -158,6 +222,14 @@ if __name__ == "__main__":
         help="Path to output Excel file",
     )
 
+    parser.add_argument(
+        "--checkpoint_path",
+        type=str,
+        required=False,
+        default=None,
+        help="JSON Lines checkpoint of graded questions, defaults to the output path with .jsonl extension",
+    )
+
     parser.add_argument(
         "--n_samples",
         type=int,
@@ -167,11 +239,58 @@ if __name__ == "__main__":
     )
 
     parser.add_argument(
+        "--concurrency",
         "--batch_size",
         type=int,
         required=False,
         default=10,
-        help="Number of samples to process from simpleqa",
+        help="Number of questions processed at the same time",
+    )
+
+    parser.add_argument(
+        "--grade_cache_path",
+        type=str,
+        required=False,
+        default="grade_cache.jsonl",
+        help="JSON Lines cache of judge grades shared between runs, empty string disables it",
+    )
+
+    parser.add_argument(
+        "--judge_concurrency",
+        type=int,
+        required=False,
+        default=8,
+        help="Maximum number of judge requests at the same time",
+    )
+
+    parser.add_argument(
+        "--judge_batch_size",
+        type=int,
+        required=False,
+        default=1,
+        help="Number of answers graded in one judge request",
+    )
+
+    parser.add_argument(
+        "--id_column",
+        type=str,
+        required=False,
+        default=None,
+        help="Column with question IDs for resuming, the CSV row number if not set",
+    )
+
+    parser.add_argument(
+        "--retry_failed",
+        action="store_true",
+        help="Run questions that failed in the previous run again",
+    )
+
+    parser.add_argument(
+        "--agent_timeout",
+        type=float,
+        required=False,
+        default=None,
+        help="Seconds before an agent run is abandoned and recorded as failed",
     )
 
     args = parser.parse_args()
@@ -182,41 +301,30 @@ if __name__ == "__main__":
         "model": os.getenv("JUDGE_MODEL_NAME"),
     }
 
-    simpleqa_path = args.path_to_simpleqa
-    output_path = args.output_path
-
-    batch_size = args.batch_size
+    if os.path.exists(config_path):
+        GlobalConfig.from_yaml(config_path)
 
-    n_samples = args.n_samples
-
-    df = pd.read_csv(simpleqa_path)
+    df = pd.read_csv(args.path_to_simpleqa)
 
     # Select only a subset of questions if needed
-    if n_samples:
-        df = df.head(n_samples)
-
-    problems = df["problem"].to_list()
-    answers = df["answer"].to_list()
-
-    results_tasks = []
-    start_idx = 0
+    if args.n_samples:
+        df = df.head(args.n_samples)
 
-    if os.path.exists(output_path):
-        results_df = pd.read_excel(output_path)
-        number_ready_task = len(results_df)
-        start_idx = number_ready_task
-        problems = problems[number_ready_task:]
-        answers = answers[number_ready_task:]
-        results_tasks = results_df.to_dict(orient="records")
+    question_ids = df[args.id_column].to_list() if args.id_column else df.index.to_list()
 
     asyncio.run(
         main(
-            problems=problems,
-            answers=answers,
-            output_path=output_path,
+            question_ids=question_ids,
+            problems=df["problem"].to_list(),
+            answers=df["answer"].to_list(),
+            output_path=args.output_path,
             judge_model_config=judge_model_config,
-            results_task=results_tasks,
-            batch_size=batch_size,
-            start_idx=start_idx,
+            checkpoint_path=args.checkpoint_path,
+            concurrency=args.concurrency,
+            retry_failed=args.retry_failed,
+            agent_timeout=args.agent_timeout,
+            grade_cache_path=args.grade_cache_path,
+            judge_concurrency=args.judge_concurrency,
+            judge_batch_size=args.judge_batch_size,
         )
     )
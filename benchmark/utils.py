@@ -1,8 +1,12 @@
+import asyncio
+import hashlib
+import json
+import os
 from typing import Literal
 
 import pandas as pd
-from openai import OpenAI
-from prompts import GRADER_TEMPLATE
+from openai import AsyncOpenAI
+from prompts import BATCH_GRADER_TEMPLATE, GRADER_INSTRUCTIONS, GRADER_PROMPT_VERSION, GRADER_TEMPLATE
 from pydantic import BaseModel, Field
 
 
@@ -19,10 +23,20 @@ class GradeAnswerModel(BaseModel):
     grade_answer: Literal["CORRECT", "INCORRECT", "NOT_ATTEMPTED"] = Field(..., description="Grade of the answer")
 
 
-def grading_answer(predicted_answer, problem, answer, model_config):
-    client = OpenAI(base_url=model_config["base_url"], api_key=model_config["api_key"])
+class GradeBatchModel(BaseModel):
+    """Grades of several predicted answers in the given order."""
 
-    completion = client.beta.chat.completions.parse(
+    grades: list[GradeAnswerModel] = Field(..., description="One grade per example, in the order of the examples")
+
+
+def create_judge_client(model_config) -> AsyncOpenAI:
+    return AsyncOpenAI(base_url=model_config["base_url"], api_key=model_config["api_key"])
+
+
+async def grading_answer(predicted_answer, problem, answer, model_config, client: AsyncOpenAI) -> GradeAnswerModel:
+    """Grade a predicted answer with the judge model without blocking the
+    event loop."""
+    completion = await client.chat.completions.parse(
         model=model_config["model"],
         messages=[
             {
@@ -35,11 +49,196 @@ def grading_answer(predicted_answer, problem, answer, model_config):
     return completion.choices[0].message.parsed
 
 
+def grade_cache_key(predicted_answer, problem, answer, model) -> str:
+    """Hash of everything the grade depends on.
+
+    The grader instructions and GRADER_PROMPT_VERSION are part of the key,
+    so editing the grader prompts invalidates cached grades. The key does
+    not depend on whether the example is graded alone or in a batch.
+    """
+    payload = json.dumps(
+        [problem, answer, predicted_answer, model, GRADER_INSTRUCTIONS, GRADER_PROMPT_VERSION], ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GradeCache:
+    """Persistent judge grades in an append-only JSON Lines file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._grades: dict[str, GradeAnswerModel] = {}
+        self._file = None
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._grades[record["key"]] = GradeAnswerModel.model_validate(record["grade"])
+
+    def __len__(self) -> int:
+        return len(self._grades)
+
+    def get(self, key: str) -> GradeAnswerModel | None:
+        return self._grades.get(key)
+
+    def put(self, key: str, grade: GradeAnswerModel) -> None:
+        self._grades[key] = grade
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps({"key": key, "grade": grade.model_dump()}, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class JudgeGrader:
+    """Grades answers through the cache and sends only misses to the judge.
+
+    Misses arriving within ``batch_wait`` seconds of each other are graded
+    in one judge request of up to ``batch_size`` examples, and at most
+    ``concurrency`` judge requests run at once. Identical pairs graded at
+    the same time share one request.
+    """
+
+    def __init__(
+        self,
+        model_config,
+        client: AsyncOpenAI,
+        cache: GradeCache | None = None,
+        concurrency: int = 8,
+        batch_size: int = 1,
+        batch_wait: float = 0.05,
+    ):
+        self.model_config = model_config
+        self.client = client
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait
+        self.hits = 0
+        self.misses = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._pending: list[tuple[str, tuple, asyncio.Future]] = []
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def grade(self, predicted_answer, problem, answer) -> GradeAnswerModel:
+        key = grade_cache_key(predicted_answer, problem, answer, self.model_config["model"])
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            self.hits += 1
+            return cached
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self._pending.append((key, (predicted_answer, problem, answer), future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_wait, self._flush)
+        # A cancelled caller must not lose the grade for the rest of the batch
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._grade_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _grade_batch(self, batch: list[tuple[str, tuple, asyncio.Future]]) -> None:
+        try:
+            async with self._semaphore:
+                grades = await self._request([args for _, args, _ in batch])
+            for (key, _, future), grade in zip(batch, grades):
+                if self.cache is not None:
+                    self.cache.put(key, grade)
+                future.set_result(grade)
+        except Exception as ex:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(ex)
+        finally:
+            for key, _, _ in batch:
+                self._inflight.pop(key, None)
+
+    async def _request(self, examples: list[tuple]) -> list[GradeAnswerModel]:
+        if len(examples) > 1:
+            completion = await self.client.chat.completions.parse(
+                model=self.model_config["model"],
+                messages=[
+                    {
+                        "role": "user",
+                        "content": BATCH_GRADER_TEMPLATE(
+                            [(problem, answer, predicted_answer) for predicted_answer, problem, answer in examples]
+                        ),
+                    },
+                ],
+                response_format=GradeBatchModel,
+            )
+            parsed = completion.choices[0].message.parsed
+            if parsed is not None and len(parsed.grades) == len(examples):
+                return parsed.grades
+        # Single example, or the judge lost count of a batch
+        return [await grading_answer(*example, self.model_config, self.client) for example in examples]
+
+
 def save_result(results, output_path):
     results_df = pd.DataFrame(results)
     results_df.to_excel(output_path, index=False)
 
 
+class JsonlCheckpoint:
+    """Append-only JSON Lines file of graded questions.
+
+    Every finished question is appended as one line, so a crash loses at
+    most the questions in flight and resuming costs one read of the file.
+    A question recorded several times (e.g. retried failures) keeps its
+    last record.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        records = {}
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Line cut short by a crash mid-write, the question is rerun
+                    continue
+                records[record["question_id"]] = record
+        return records
+
+    def append(self, record: dict) -> None:
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
 def get_accuracy_given_attempted(df) -> float:
     attempted_count = df["is_correct"].sum() + df["is_incorrect"].sum()
     if attempted_count == 0:
@@ -7,7 +7,7 @@ reporting capabilities.
 
 from typing import Type
 
-from openai import AsyncOpenAI, pydantic_function_tool
+from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionFunctionToolParam, ChatCompletionMessageParam
 
 from sgr_agent_core.agent_definition import AgentConfig
@@ -106,7 +106,7 @@ class ResearchToolCallingAgent(ToolCallingAgent):
             tools -= {
                 WebSearchTool,
             }
-        return [pydantic_function_tool(tool, name=tool.tool_name, description="") for tool in tools]
+        return [tool.to_openai_tool(description="") for tool in tools]
 
 
 class ResearchSGRToolCallingAgent(SGRToolCallingAgent):
@@ -148,4 +148,4 @@ class ResearchSGRToolCallingAgent(SGRToolCallingAgent):
             tools -= {
                 WebSearchTool,
             }
-        return [pydantic_function_tool(tool, name=tool.tool_name, description="") for tool in tools]
+        return [tool.to_openai_tool(description="") for tool in tools]
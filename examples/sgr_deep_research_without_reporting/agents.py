@@ -7,7 +7,7 @@ generating report files.
 
 from typing import Type
 
-from openai import AsyncOpenAI, pydantic_function_tool
+from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionFunctionToolParam
 
 from sgr_agent_core.agent_config import AgentConfig
@@ -107,7 +107,7 @@ class ResearchToolCallingAgentNoReporting(ToolCallingAgent):
             tools -= {
                 WebSearchTool,
             }
-        return [pydantic_function_tool(tool, name=tool.tool_name, description="") for tool in tools]
+        return [tool.to_openai_tool(description="") for tool in tools]
 
 
 class ResearchSGRToolCallingAgentNoReporting(SGRToolCallingAgent):
@@ -150,4 +150,4 @@ class ResearchSGRToolCallingAgentNoReporting(SGRToolCallingAgent):
             tools -= {
                 WebSearchTool,
             }
-        return [pydantic_function_tool(tool, name=tool.tool_name, description="") for tool in tools]
+        return [tool.to_openai_tool(description="") for tool in tools]
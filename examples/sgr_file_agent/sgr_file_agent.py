@@ -19,6 +19,7 @@ from .tools import (
     ReadFileTool,
     SearchInFilesTool,
 )
+from .tools.workspace_index import WorkspaceIndexService
 
 
 class SGRFileAgent(SGRAgent):
@@ -37,6 +38,8 @@ class SGRFileAgent(SGRAgent):
 
     All tools use native OS commands for optimal performance.
     Automatic filtering excludes cache dirs, node_modules, .git, etc.
+    Searches, finds and listings inside working_directory are answered from
+    a persistent workspace index (disable with workspace_index: false).
 
     Usage:
         # Via config file (recommended):
@@ -91,6 +94,7 @@ class SGRFileAgent(SGRAgent):
         if working_directory is None:
             working_directory = getattr(agent_config, "working_directory", ".")
         self.working_directory = working_directory
+        WorkspaceIndexService.prefetch(agent_config)
 
     async def _prepare_tools(self) -> Type[NextStepToolStub]:
         """Prepare available tools for current agent state and progress.
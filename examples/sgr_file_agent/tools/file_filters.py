@@ -1,6 +1,9 @@
 """File and directory filters for file system tools."""
 
+import os
+from fnmatch import fnmatch
 from pathlib import Path
+from typing import Iterator
 
 # Directories to ignore during file search
 IGNORED_DIRECTORIES = {
@@ -82,11 +85,25 @@ MAX_RECURSION_DEPTH = 5
 # Timeout for file operations in seconds
 FILE_OPERATION_TIMEOUT = 30
 
+# Files larger than this are not searched for content
+MAX_SEARCH_FILE_SIZE = 10 * 1024 * 1024
+
+# Bytes read at once when searching file content
+SEARCH_CHUNK_SIZE = 1024 * 1024
+
 
 def should_ignore_directory(path: Path) -> bool:
     """Check if directory should be ignored."""
-    name = path.name
+    return is_ignored_directory_name(path.name)
+
 
+def should_ignore_file(path: Path) -> bool:
+    """Check if file should be ignored."""
+    return is_ignored_file_name(path.name)
+
+
+def is_ignored_directory_name(name: str) -> bool:
+    """Check if directory with this name should be ignored."""
     # Check exact matches
     if name in IGNORED_DIRECTORIES:
         return True
@@ -95,13 +112,16 @@ def should_ignore_directory(path: Path) -> bool:
     if name.startswith(".") and name not in {".", ".."}:
         return True
 
-    return False
+    # Check patterns
+    for pattern in IGNORED_DIRECTORIES:
+        if pattern.startswith("*") and name.endswith(pattern[1:]):
+            return True
 
+    return False
 
-def should_ignore_file(path: Path) -> bool:
-    """Check if file should be ignored."""
-    name = path.name
 
+def is_ignored_file_name(name: str) -> bool:
+    """Check if file with this name should be ignored."""
     # Check exact matches
     if name in IGNORED_FILE_PATTERNS:
         return True
@@ -142,3 +162,32 @@ def filter_paths(paths: list[Path], include_hidden: bool = False) -> list[Path]:
         filtered.append(path)
 
     return filtered
+
+
+def walk_files(root: Path, file_pattern: str = "*") -> Iterator[os.DirEntry]:
+    """Lazily yield files under root whose name matches file_pattern.
+
+    Ignored and hidden directories are pruned before they are entered
+    and directory symlinks are not followed, so the walk only touches
+    directories it may yield files from. Entries are yielded in a stable
+    depth-first order.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        subdirectories = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not is_ignored_directory_name(entry.name):
+                        subdirectories.append(entry.path)
+                elif entry.is_file() and fnmatch(entry.name, file_pattern) and not is_ignored_file_name(entry.name):
+                    yield entry
+            except OSError:
+                continue
+        stack.extend(reversed(subdirectories))
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -10,7 +11,8 @@ from pydantic import Field
 from sgr_agent_core.agent_definition import AgentConfig
 from sgr_agent_core.base_tool import BaseTool
 
-from .file_filters import MAX_SEARCH_RESULTS
+from .file_filters import IGNORED_DIRECTORIES, MAX_SEARCH_RESULTS, is_ignored_file_name
+from .workspace_index import WorkspaceIndexService
 
 if TYPE_CHECKING:
     from sgr_agent_core.models import AgentContext
@@ -51,56 +53,23 @@ class FindFilesFastTool(BaseTool):
             if not search_path.is_dir():
                 return f"Error: Path is not a directory: {self.directory}"
 
-            # Build find command
-            cmd = ["find", str(search_path), "-maxdepth", str(self.max_depth), "-type", "f"]
-
-            # Add name pattern
-            if self.name_pattern:
-                cmd.extend(["-name", self.name_pattern])
-
-            # Add modification time
-            if self.modified_days is not None:
-                cmd.extend(["-mtime", f"-{self.modified_days}"])
-
-            # Add size filter
-            if self.min_size:
-                cmd.extend(["-size", f"+{self.min_size}"])
-
-            # Exclude common patterns
-            exclude_patterns = [
-                "node_modules",
-                "__pycache__",
-                ".git",
-                ".venv",
-                "venv",
-                ".cache",
-                "dist",
-                "build",
-                ".idea",
-                ".vscode",
-            ]
-
-            for pattern in exclude_patterns:
-                cmd.extend(["-not", "-path", f"*/{pattern}/*"])
-
-            # Execute find command with timeout
-            process = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-            )
-
-            try:
-                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=30)
-            except asyncio.TimeoutError:
-                process.kill()
-                return "Error: Search timed out after 30 seconds. Try searching in a more specific directory."
-
-            if process.returncode != 0:
-                stderr_text = stderr.decode("utf-8", errors="replace")
-                return f"Error executing find command: {stderr_text}"
-
-            # Parse results
-            stdout_text = stdout.decode("utf-8", errors="replace")
-            files = [line.strip() for line in stdout_text.split("\n") if line.strip()]
+            files = None
+            index = await WorkspaceIndexService.for_path(config, search_path)
+            if index is not None:
+                files = await asyncio.to_thread(
+                    index.find,
+                    search_path,
+                    name_pattern=self.name_pattern,
+                    modified_after_ns=(
+                        time.time_ns() - self.modified_days * 86400 * 10**9 if self.modified_days is not None else None
+                    ),
+                    min_size=self._parse_size(self.min_size) if self.min_size else None,
+                    max_depth=self.max_depth,
+                )
+            if files is None:
+                files = await self._run_find(search_path)
+                if isinstance(files, str):
+                    return files
 
             # Limit results
             total_files = len(files)
@@ -116,7 +85,7 @@ class FindFilesFastTool(BaseTool):
             if self.min_size:
                 result += f"Min size: {self.min_size}\n"
             result += f"Max depth: {self.max_depth}\n"
-            result += f"Excluded: {', '.join(exclude_patterns[:5])}...\n\n"
+            result += "Excluded: hidden directories, node_modules, __pycache__, venv, dist...\n\n"
 
             if not files:
                 result += "No files found matching the criteria."
@@ -143,6 +112,62 @@ class FindFilesFastTool(BaseTool):
             logger.error(f"Error in fast find: {e}")
             return f"Error: {str(e)}"
 
+    async def _run_find(self, search_path: Path) -> list[str] | str:
+        """Run native find, returns found paths or an error message.
+
+        Skips the same directories and files as the workspace index, so
+        results do not depend on whether the index is ready.
+        """
+        # Prune ignored and hidden directories below the search path
+        prune = ["-name", ".*"]
+        for name in sorted(IGNORED_DIRECTORIES):
+            prune.extend(["-o", "-name", name])
+        cmd = ["find", str(search_path), "-mindepth", "1", "-maxdepth", str(self.max_depth)]
+        cmd.extend(["(", "-type", "d", "(", *prune, ")", "-prune", ")", "-o", "-type", "f"])
+
+        # Add name pattern
+        if self.name_pattern:
+            cmd.extend(["-name", self.name_pattern])
+
+        # Add modification time
+        if self.modified_days is not None:
+            cmd.extend(["-mtime", f"-{self.modified_days}"])
+
+        # Add size filter
+        if self.min_size:
+            cmd.extend(["-size", f"+{self.min_size}"])
+
+        cmd.append("-print")
+
+        # Execute find command with timeout
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=30)
+        except asyncio.TimeoutError:
+            process.kill()
+            return "Error: Search timed out after 30 seconds. Try searching in a more specific directory."
+
+        if process.returncode != 0:
+            stderr_text = stderr.decode("utf-8", errors="replace")
+            return f"Error executing find command: {stderr_text}"
+
+        # Parse results
+        stdout_text = stdout.decode("utf-8", errors="replace")
+        paths = [line.strip() for line in stdout_text.split("\n") if line.strip()]
+        return sorted(path for path in paths if not is_ignored_file_name(Path(path).name))
+
+    @staticmethod
+    def _parse_size(size: str) -> int:
+        """Convert a find -size value to bytes (plain numbers are 512-byte
+        blocks)."""
+        units = {"c": 1, "k": 1024, "M": 1024**2, "G": 1024**3}
+        if size[-1:] in units:
+            return int(size[:-1]) * units[size[-1]]
+        return int(size) * 512
+
     @staticmethod
     def _format_size(size_bytes: int) -> str:
         """Format size in human-readable format."""
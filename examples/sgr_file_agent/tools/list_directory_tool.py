@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from pathlib import Path
@@ -14,6 +15,7 @@ from .file_filters import (
     MAX_DIRECTORY_ITEMS,
     filter_paths,
 )
+from .workspace_index import WorkspaceIndexService
 
 if TYPE_CHECKING:
     from sgr_agent_core.models import AgentContext
@@ -64,16 +66,16 @@ class ListDirectoryTool(BaseTool):
             result += f"Directory name: {directory_path.name}\n"
             result += "\n"
 
-        # Get directory items
-        if self.recursive:
-            items = sorted(directory_path.rglob("*"))
-            result += "Contents (recursive, filtered):\n"
-        else:
-            items = sorted(directory_path.iterdir())
-            result += "Contents (filtered):\n"
-
-        # Filter out ignored directories and files
-        items = filter_paths(items)
+        # Get directory items as (path, is directory, size), from the workspace index when it covers the directory
+        items = None
+        index = await WorkspaceIndexService.for_path(config, directory_path)
+        if index is not None:
+            items = await asyncio.to_thread(index.list_directory, directory_path, self.recursive)
+        if items is None:
+            paths = sorted(directory_path.rglob("*")) if self.recursive else sorted(directory_path.iterdir())
+            # Filter out ignored directories and files
+            items = [(item, None, None) for item in filter_paths(paths)]
+        result += "Contents (recursive, filtered):\n" if self.recursive else "Contents (filtered):\n"
 
         # Limit results
         if len(items) > MAX_DIRECTORY_ITEMS:
@@ -83,18 +85,19 @@ class ListDirectoryTool(BaseTool):
         dirs = []
         files = []
 
-        for item in items:
+        for item, is_dir, size in items:
             try:
                 if self.recursive:
                     relative_path = item.relative_to(directory_path)
                 else:
                     relative_path = item.name
 
-                if item.is_dir():
+                if is_dir if is_dir is not None else item.is_dir():
                     dirs.append(f"📁 {relative_path}/")
                 else:
                     try:
-                        size = item.stat().st_size
+                        if size is None:
+                            size = item.stat().st_size
                         files.append(f"📄 {relative_path} ({size} bytes)")
                     except (OSError, PermissionError):
                         # Skip files that cannot be accessed
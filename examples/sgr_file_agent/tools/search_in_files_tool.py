@@ -1,20 +1,157 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 import re
+import shutil
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, AsyncIterator, ClassVar, Iterator, Literal
 
 from pydantic import Field
 
 from sgr_agent_core.agent_definition import AgentConfig
 from sgr_agent_core.base_tool import BaseTool
 
+from .file_filters import IGNORED_DIRECTORIES, MAX_SEARCH_FILE_SIZE, SEARCH_CHUNK_SIZE, walk_files
+from .workspace_index import WorkspaceIndex, WorkspaceIndexService
+
 if TYPE_CHECKING:
     from sgr_agent_core.models import AgentContext
 
 logger = logging.getLogger(__name__)
 
+# Files searched in parallel by the Python backend
+SEARCH_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+# Files walked after an early stop to estimate the total number of matches
+ESTIMATE_MAX_FILES = 10000
+
+# Matching lines counted from rg/grep output before the process is stopped
+MAX_COUNTED_MATCHES = 1000
+
+# Characters of a matching line kept in results, e.g. of minified files
+MAX_LINE_LENGTH = 2000
+
+# Bytes of an rg/grep output line kept, room for the path and a full UTF-8 line
+MAX_OUTPUT_LINE_BYTES = MAX_LINE_LENGTH * 4 + 4096
+
+# Appended by rg --max-columns-preview to truncated lines
+RG_TRUNCATION_SUFFIX = " [... omitted end of long line]"
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="search_in_files")
+        return _executor
+
+
+@dataclass
+class SearchOutcome:
+    """Matches found by a search backend."""
+
+    matches: list[tuple[str, int, str]] = field(default_factory=list)
+    total: int = 0
+    exact: bool = True
+    files_searched: int = 0
+    skipped_binary: int = 0
+    skipped_large: int = 0
+
+
+def search_file(path: str, pattern: re.Pattern, limit: int) -> tuple[list[tuple[int, str]], int, str | None]:
+    """Search one file chunk by chunk without splitting it into lines.
+
+    Chunks end at a line boundary, so the regex runs over a whole chunk
+    at once and only matching lines are decoded. Files with a NUL byte
+    in the first chunk are treated as binary and skipped. A str pattern
+    is used for non-ASCII search text and searches chunks decoded as
+    UTF-8.
+
+    Returns:
+        Up to limit (line number, line) pairs with lines cut to
+        MAX_LINE_LENGTH characters, the number of matching lines seen
+        and "binary" if the file was skipped
+    """
+    matches = []
+    count = 0
+    text_mode = isinstance(pattern.pattern, str)
+    newline = "\n" if text_mode else b"\n"
+    line_number = 1
+
+    with open(path, "rb") as f:
+        data = f.read(SEARCH_CHUNK_SIZE)
+        if b"\0" in data[:8192]:
+            return [], 0, "binary"
+        tail = b""
+        while data and count < limit:
+            data = tail + data
+            next_data = f.read(SEARCH_CHUNK_SIZE)
+            tail = b""
+            if next_data:
+                cut = data.rfind(b"\n") + 1
+                if cut == 0:
+                    # Line longer than a chunk, keep reading until it ends
+                    tail, data = data, next_data
+                    continue
+                data, tail = data[:cut], data[cut:]
+            chunk = data.decode("utf-8", errors="replace") if text_mode else data
+
+            position = 0
+            counted_to = 0
+            while count < limit:
+                match = pattern.search(chunk, position)
+                if match is None:
+                    break
+                line_start = chunk.rfind(newline, 0, match.start()) + 1
+                line_end = chunk.find(newline, match.start())
+                if line_end == -1:
+                    line_end = len(chunk)
+                line_number += chunk.count(newline, counted_to, line_start)
+                counted_to = line_start
+                line = chunk[line_start : min(line_end, line_start + MAX_LINE_LENGTH * 4)]
+                if not text_mode:
+                    line = line.decode("utf-8", errors="replace")
+                matches.append((line_number, line[:MAX_LINE_LENGTH].rstrip()))
+                count += 1
+                position = line_end + 1
+                if position > len(chunk):
+                    break
+            line_number += chunk.count(newline, counted_to)
+            data = next_data
+
+    return matches, count, None
+
+
+async def read_lines(stream: asyncio.StreamReader, max_bytes: int) -> AsyncIterator[bytes]:
+    """Lines of stream without the newline, cut to max_bytes.
+
+    Unlike iterating the stream, lines longer than the stream buffer do
+    not raise, the rest of such a line is read and dropped.
+    """
+    line = b""
+    while data := await stream.read(SEARCH_CHUNK_SIZE):
+        start = 0
+        while True:
+            end = data.find(b"\n", start)
+            if len(line) < max_bytes:
+                line += data[start : end if end != -1 else len(data)][: max_bytes - len(line)]
+            if end == -1:
+                break
+            yield line
+            line = b""
+            start = end + 1
+    if line:
+        yield line
+
 
 class SearchInFilesTool(BaseTool):
     """Search for text content within files (like grep). Use this tool to find
@@ -26,6 +163,9 @@ class SearchInFilesTool(BaseTool):
         - Returns matching lines with file paths and line numbers
     """
 
+    # Search implementation: "auto" uses ripgrep when installed and Python otherwise
+    backend: ClassVar[Literal["auto", "python", "rg", "grep"]] = "auto"
+
     reasoning: str = Field(description="Why you need to search for this text and what you expect to find")
     search_text: str = Field(description="Text or regex pattern to search for")
     directory: str = Field(default=".", description="Directory to search in")
@@ -48,56 +188,207 @@ class SearchInFilesTool(BaseTool):
             if not search_path.is_dir():
                 return f"Error: Path is not a directory: {self.directory}"
 
-            files = list(search_path.rglob(self.file_pattern))
-            files = [f for f in files if f.is_file()]
+            try:
+                pattern = self._compile_pattern()
+            except re.error as e:
+                return f"Error: Invalid regex pattern: {e}"
 
-            flags = 0 if self.case_sensitive else re.IGNORECASE
-            if self.regex:
-                try:
-                    pattern = re.compile(self.search_text, flags)
-                except re.error as e:
-                    return f"Error: Invalid regex pattern: {e}"
-            else:
-                pattern = re.compile(re.escape(self.search_text), flags)
-
-            results = []
-            total_matches = 0
-
-            for file_path in files:
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        for line_num, line in enumerate(f, 1):
-                            if pattern.search(line):
-                                if len(results) < self.max_results:
-                                    relative_path = file_path.relative_to(search_path)
-                                    results.append(
-                                        {"file": str(relative_path), "line": line_num, "content": line.rstrip()}
-                                    )
-                                total_matches += 1
-                except (UnicodeDecodeError, PermissionError):
-                    continue
+            index = await WorkspaceIndexService.for_path(config, search_path)
+            backend = "index" if index is not None else self._resolve_backend()
+            outcome = None
+            if backend in ("rg", "grep"):
+                outcome = await self._search_command(backend, search_path)
+            if outcome is None:
+                outcome = await asyncio.to_thread(self._search_python, search_path, pattern, index)
 
             result = f"Search text: {self.search_text}\n"
             result += f"Directory: {self.directory}\n"
             result += f"File pattern: {self.file_pattern}\n"
             result += f"Case sensitive: {self.case_sensitive}\n"
-            result += f"Regex: {self.regex}\n\n"
+            result += f"Regex: {self.regex}\n"
+            if outcome.skipped_binary or outcome.skipped_large:
+                result += f"Skipped: {outcome.skipped_binary} binary, {outcome.skipped_large} large file(s)\n"
+            result += "\n"
 
-            if not results:
+            if not outcome.matches:
                 result += "No matches found."
                 return result
 
-            result += f"Found {total_matches} match(es)"
-            if total_matches > self.max_results:
-                result += f" (showing first {self.max_results})"
+            if outcome.exact:
+                result += f"Found {outcome.total} match(es)"
+            else:
+                result += f"Found about {outcome.total} match(es), search stopped early"
+            if outcome.total > len(outcome.matches):
+                result += f" (showing first {len(outcome.matches)})"
             result += ":\n\n"
 
-            for match in results:
-                result += f"{match['file']}:{match['line']}: {match['content']}\n"
+            for file, line, content in outcome.matches:
+                result += f"{file}:{line}: {content}\n"
 
-            logger.debug(f"Found {total_matches} matches for '{self.search_text}'")
+            logger.debug(f"Found {outcome.total} matches for '{self.search_text}' with {backend} backend")
             return result
 
         except Exception as e:
             logger.error(f"Error searching in files: {e}")
             return f"Error searching in files: {str(e)}"
+
+    def _compile_pattern(self) -> re.Pattern:
+        # ^ and $ anchor at line ends like grep, since whole chunks are searched
+        flags = re.MULTILINE | (0 if self.case_sensitive else re.IGNORECASE)
+        source = self.search_text if self.regex else re.escape(self.search_text)
+        if source.isascii():
+            return re.compile(source.encode("ascii"), flags)
+        return re.compile(source, flags)
+
+    def _resolve_backend(self) -> str:
+        if self.backend == "auto":
+            return "rg" if shutil.which("rg") else "python"
+        if self.backend != "python" and not shutil.which(self.backend):
+            logger.warning(f"{self.backend} is not installed, searching with Python")
+            return "python"
+        return self.backend
+
+    def _index_needle(self) -> bytes | None:
+        """Literal for the trigram index, None if the index cannot narrow
+        the search down."""
+        if self.regex or not (self.case_sensitive or self.search_text.isascii()):
+            # The index ignores case of ASCII letters only
+            return None
+        return self.search_text.encode("utf-8")
+
+    def _walk(self, search_path: Path) -> Iterator[tuple[str, int]]:
+        for entry in walk_files(search_path, self.file_pattern):
+            try:
+                yield entry.path, entry.stat().st_size
+            except OSError:
+                continue
+
+    def _search_python(
+        self, search_path: Path, pattern: re.Pattern, index: WorkspaceIndex | None = None
+    ) -> SearchOutcome:
+        """Search files in the thread pool and stop as soon as max_results
+        matching lines are found.
+
+        Files come from the workspace index when it covers search_path,
+        otherwise from a streaming walk.
+        """
+        outcome = SearchOutcome()
+        executor = _get_executor()
+        found = index.search_candidates(search_path, self.file_pattern, self._index_needle()) if index else None
+        if found is not None:
+            candidates, outcome.skipped_binary = found
+            files = iter(candidates)
+        else:
+            files = self._walk(search_path)
+        running: dict[Future, str] = {}
+        results: list[tuple[str, list[tuple[int, str]]]] = []
+
+        def submit(entries) -> None:
+            for path, size in entries:
+                if size > MAX_SEARCH_FILE_SIZE:
+                    outcome.skipped_large += 1
+                    continue
+                remaining = self.max_results - outcome.total
+                running[executor.submit(search_file, path, pattern, remaining)] = path
+
+        submit(islice(files, SEARCH_WORKERS * 2))
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = running.pop(future)
+                try:
+                    lines, count, skipped = future.result()
+                except (OSError, ValueError):
+                    continue
+                if skipped == "binary":
+                    outcome.skipped_binary += 1
+                    continue
+                outcome.files_searched += 1
+                outcome.total += count
+                if lines:
+                    results.append((path, lines))
+            if outcome.total < self.max_results:
+                submit(islice(files, len(done)))
+
+        outcome.exact = outcome.total < self.max_results
+        for path, lines in sorted(results):
+            relative_path = Path(path).relative_to(search_path)
+            for line_number, content in lines:
+                if len(outcome.matches) < self.max_results:
+                    outcome.matches.append((str(relative_path), line_number, content))
+
+        if not outcome.exact:
+            # Extrapolate the match rate of searched files to files left unread
+            remaining_files = sum(1 for _ in islice(files, ESTIMATE_MAX_FILES))
+            outcome.total += round(outcome.total / max(outcome.files_searched, 1) * remaining_files)
+        return outcome
+
+    def _command(self, backend: str, search_path: Path) -> list[str]:
+        if backend == "rg":
+            cmd = ["rg", "--line-number", "--no-heading", "--with-filename", "--null", "--color", "never"]
+            cmd += ["--max-filesize", str(MAX_SEARCH_FILE_SIZE), "--glob", self.file_pattern]
+            cmd += ["--max-columns", str(MAX_LINE_LENGTH), "--max-columns-preview"]
+            # Search hidden and gitignored files and skip hidden directories like the other backends
+            cmd += ["--hidden", "--no-ignore", "--glob", "!.*/"]
+            for name in IGNORED_DIRECTORIES:
+                cmd += ["--glob", f"!{name}/"]
+        else:
+            # grep -I skips binary files, large files are not filtered
+            cmd = ["grep", "-r", "-n", "-I", "-H", "-Z", "--color=never", f"--include={self.file_pattern}"]
+            for name in IGNORED_DIRECTORIES:
+                cmd.append(f"--exclude-dir={name}")
+            # Hidden directories are skipped like in the other backends. The pattern also
+            # matches a hidden search root, which is why the root is passed resolved
+            if not search_path.name.startswith("."):
+                cmd.append("--exclude-dir=.*")
+            cmd.append("-P" if self.regex else "-F")
+        if not self.case_sensitive:
+            cmd.append("-i")
+        if backend == "rg" and not self.regex:
+            cmd.append("--fixed-strings")
+        cmd += ["-e", self.search_text, "--", str(search_path)]
+        return cmd
+
+    async def _search_command(self, backend: str, search_path: Path) -> SearchOutcome | None:
+        """Stream rg/grep output and stop the process after
+        MAX_COUNTED_MATCHES matching lines.
+
+        Returns None if the command failed without output, e.g. on a
+        regex it does not support.
+        """
+        outcome = SearchOutcome()
+        search_path = search_path.resolve()
+        process = await asyncio.create_subprocess_exec(
+            *self._command(backend, search_path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        prefix = str(search_path).rstrip(os.sep) + os.sep
+        finished = False
+        try:
+            async for raw in read_lines(process.stdout, MAX_OUTPUT_LINE_BYTES):
+                line = raw.decode("utf-8", errors="replace")
+                file, _, rest = line.partition("\0")
+                line_number, _, content = rest.partition(":")
+                if not line_number.isdigit():
+                    continue
+                outcome.total += 1
+                if len(outcome.matches) < self.max_results:
+                    content = content.removesuffix(RG_TRUNCATION_SUFFIX)[:MAX_LINE_LENGTH].rstrip()
+                    outcome.matches.append((file.removeprefix(prefix), int(line_number), content))
+                if outcome.total >= MAX_COUNTED_MATCHES:
+                    outcome.exact = False
+                    break
+            else:
+                finished = True
+        finally:
+            if not finished and process.returncode is None:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+            await process.wait()
+        if process.returncode not in (0, 1) and not outcome.matches and outcome.exact:
+            logger.warning(f"{backend} failed with exit code {process.returncode}, searching with Python")
+            return None
+        return outcome
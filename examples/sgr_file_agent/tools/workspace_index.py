@@ -0,0 +1,476 @@
+"""Persistent index of the file agent's working directory.
+
+The index keeps the metadata of every file under the working directory
+and a trigram inverted index over small text files, so file tools can
+answer from memory instead of walking and reading the tree on every
+call. It is brought up to date by comparing size and mtime of files and
+saved to disk, so later sessions over the same tree start warm.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import hashlib
+import logging
+import marshal
+import os
+import threading
+import time
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import ClassVar
+
+from .file_filters import is_ignored_directory_name, is_ignored_file_name
+
+logger = logging.getLogger(__name__)
+
+# Files larger than this are kept in the metadata table only and are
+# always searched, since extracting their trigrams costs more than it saves
+TRIGRAM_MAX_FILE_SIZE = 256 * 1024
+
+# Bumped whenever the on-disk layout changes
+INDEX_VERSION = 1
+
+
+def trigrams(data: bytes) -> set[bytes]:
+    """Distinct trigrams of data with ASCII letters lowercased."""
+    data = data.lower()
+    return {data[i : i + 3] for i in range(len(data) - 2)}
+
+
+@dataclass(slots=True)
+class IndexedFile:
+    """Metadata of an indexed file."""
+
+    id: int
+    size: int
+    mtime_ns: int
+    binary: bool
+    # Whether the trigrams of the file are in the postings
+    indexed: bool
+
+
+class WorkspaceIndex:
+    """Metadata table and trigram index of a directory tree.
+
+    Ignored and hidden directories and ignored files are left out, like
+    in the file tools. Paths are stored relative to the root with "/"
+    separators. All methods may be called from worker threads.
+    """
+
+    def __init__(self, root: Path, index_path: Path | None = None):
+        self.root = root
+        self.index_path = index_path
+        self.files: dict[str, IndexedFile] = {}
+        # Directory relative path -> names of files and subdirectories in it
+        self.directories: dict[str, set[str]] = {"": set()}
+        self.postings: dict[bytes, set[int]] = {}
+        self.refreshed_at = 0.0
+        self._paths: dict[int, str] = {}
+        self._next_id = 0
+        self._dead = 0
+        self._lock = threading.RLock()
+
+    def refresh(self) -> bool:
+        """Walk the tree and reindex files whose size or mtime changed.
+
+        Unchanged files are only stat'ed, never read.
+
+        Returns:
+            True if anything was added, changed or removed
+        """
+        with self._lock:
+            # Taken before the walk, changes made during it are seen by the next refresh
+            started = time.monotonic()
+            files: dict[str, IndexedFile] = {}
+            directories: dict[str, set[str]] = {"": set()}
+            changed = False
+            stack = [""]
+            while stack:
+                directory = stack.pop()
+                children = directories[directory]
+                try:
+                    with os.scandir(self.root / directory) as it:
+                        entries = list(it)
+                except OSError:
+                    continue
+                for entry in entries:
+                    path = f"{directory}/{entry.name}" if directory else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not is_ignored_directory_name(entry.name):
+                                children.add(entry.name)
+                                directories[path] = set()
+                                stack.append(path)
+                        elif entry.is_file() and not is_ignored_file_name(entry.name):
+                            stat = entry.stat()
+                            known = self.files.get(path)
+                            if known and known.size == stat.st_size and known.mtime_ns == stat.st_mtime_ns:
+                                files[path] = known
+                            else:
+                                if known:
+                                    self._drop(known)
+                                files[path] = self._index_file(path, entry.path, stat)
+                                changed = True
+                            children.add(entry.name)
+                    except OSError:
+                        continue
+
+            for path in self.files.keys() - files.keys():
+                self._drop(self.files[path])
+                changed = True
+            changed = changed or directories != self.directories
+            self.files = files
+            self.directories = directories
+            if self._dead > len(self.files):
+                self._compact()
+            self.refreshed_at = started
+            return changed
+
+    def _index_file(self, path: str, full_path: str, stat: os.stat_result) -> IndexedFile:
+        file = IndexedFile(id=self._next_id, size=stat.st_size, mtime_ns=stat.st_mtime_ns, binary=False, indexed=False)
+        self._next_id += 1
+        self._paths[file.id] = path
+        try:
+            with open(full_path, "rb") as f:
+                # Large files are only checked for being binary
+                data = f.read(TRIGRAM_MAX_FILE_SIZE if stat.st_size <= TRIGRAM_MAX_FILE_SIZE else 8192)
+        except OSError:
+            return file
+        file.binary = b"\0" in data[:8192]
+        if not file.binary and stat.st_size <= TRIGRAM_MAX_FILE_SIZE:
+            for trigram in trigrams(data):
+                self.postings.setdefault(trigram, set()).add(file.id)
+            file.indexed = True
+        return file
+
+    def _drop(self, file: IndexedFile) -> None:
+        # Postings keep the id until the next compaction, lookups skip ids without a path
+        self._paths.pop(file.id, None)
+        if file.indexed:
+            self._dead += 1
+
+    def _compact(self) -> None:
+        live = self._paths.keys()
+        postings = {}
+        for trigram, ids in self.postings.items():
+            ids = ids & live
+            if ids:
+                postings[trigram] = ids
+        self.postings = postings
+        self._dead = 0
+
+    def _relative(self, directory: Path) -> str | None:
+        """Path of directory relative to the root, None if it is not an
+        indexed directory."""
+        try:
+            relative = directory.resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+        relative = "" if relative == "." else relative
+        return relative if relative in self.directories else None
+
+    def _files_under(self, directory: str):
+        prefix = f"{directory}/" if directory else ""
+        for path, file in self.files.items():
+            if path.startswith(prefix):
+                yield path[len(prefix) :], file
+
+    def search_candidates(
+        self, directory: Path, file_pattern: str, needle: bytes | None
+    ) -> tuple[list[tuple[str, int]], int] | None:
+        """Files under directory that may contain needle.
+
+        Args:
+            directory: Directory to search in
+            file_pattern: Pattern the file name must match
+            needle: Literal the files must contain (ASCII case ignored),
+                None to return every text file
+
+        Returns:
+            (full path, size) of candidate files sorted by path and the
+            number of binary files left out, or None if directory is not
+            indexed
+        """
+        with self._lock:
+            relative = self._relative(directory)
+            if relative is None:
+                return None
+            ids = None
+            if needle is not None and len(needle) >= 3:
+                for trigram in sorted(trigrams(needle), key=lambda t: len(self.postings.get(t, ()))):
+                    ids = self.postings.get(trigram, set()) if ids is None else ids & self.postings.get(trigram, set())
+                    if not ids:
+                        break
+            candidates = []
+            binary = 0
+            for path, file in self._files_under(relative):
+                if not fnmatch(path.rpartition("/")[2], file_pattern):
+                    continue
+                if file.binary:
+                    binary += 1
+                elif ids is None or not file.indexed or file.id in ids:
+                    candidates.append((str(directory / path), file.size))
+            candidates.sort()
+            return candidates, binary
+
+    def find(
+        self,
+        directory: Path,
+        name_pattern: str | None = None,
+        modified_after_ns: int | None = None,
+        min_size: int | None = None,
+        max_depth: int | None = None,
+    ) -> list[str] | None:
+        """Files under directory matching find-like filters.
+
+        Returns:
+            Paths under directory sorted, or None if directory is not
+            indexed
+        """
+        with self._lock:
+            relative = self._relative(directory)
+            if relative is None:
+                return None
+            found = []
+            for path, file in self._files_under(relative):
+                if max_depth is not None and path.count("/") + 1 > max_depth:
+                    continue
+                if name_pattern and not fnmatch(path.rpartition("/")[2], name_pattern):
+                    continue
+                if modified_after_ns is not None and file.mtime_ns <= modified_after_ns:
+                    continue
+                if min_size is not None and file.size <= min_size:
+                    continue
+                found.append(str(directory / path))
+            found.sort()
+            return found
+
+    def list_directory(self, directory: Path, recursive: bool = False) -> list[tuple[Path, bool, int | None]] | None:
+        """Contents of directory sorted like Path objects.
+
+        Returns:
+            (path, is directory, file size) of every item, or None if
+            directory is not indexed
+        """
+        with self._lock:
+            relative = self._relative(directory)
+            if relative is None:
+                return None
+            prefix = f"{relative}/" if relative else ""
+            if recursive:
+                names = [path[len(prefix) :] for path in self.directories if path.startswith(prefix) and path]
+                names += [path for path, _ in self._files_under(relative)]
+            else:
+                names = list(self.directories[relative])
+            items = []
+            for name in names:
+                file = self.files.get(prefix + name)
+                items.append((directory / name, file is None, file.size if file else None))
+            items.sort()
+            return items
+
+    def save(self) -> None:
+        """Write the index to index_path atomically."""
+        if self.index_path is None:
+            return
+        with self._lock:
+            if self._dead:
+                self._compact()
+            data = {
+                "version": INDEX_VERSION,
+                "root": str(self.root),
+                "files": {
+                    path: (file.id, file.size, file.mtime_ns, file.binary, file.indexed)
+                    for path, file in self.files.items()
+                },
+                "directories": self.directories,
+                "postings": self.postings,
+                "next_id": self._next_id,
+            }
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.index_path.with_suffix(".tmp")
+            with open(temporary, "wb") as f:
+                marshal.dump(data, f)
+            os.replace(temporary, self.index_path)
+
+    def load(self) -> bool:
+        """Read the index saved by save, it still needs a refresh.
+
+        Returns:
+            True if a compatible index was loaded
+        """
+        if self.index_path is None or not self.index_path.exists():
+            return False
+        try:
+            with open(self.index_path, "rb") as f:
+                data = marshal.load(f)
+            if data["version"] != INDEX_VERSION or data["root"] != str(self.root):
+                return False
+            files = {path: IndexedFile(*fields) for path, fields in data["files"].items()}
+        except (OSError, EOFError, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Discarding unreadable workspace index {self.index_path}: {e}")
+            return False
+        with self._lock:
+            self.files = files
+            self.directories = data["directories"]
+            self.postings = data["postings"]
+            self._paths = {file.id: path for path, file in files.items()}
+            self._next_id = data["next_id"]
+            self._dead = 0
+        return True
+
+
+class WorkspaceIndexService:
+    """Shared workspace indexes, one per working directory.
+
+    The first request for a directory starts building its index in the
+    background and gets None, so tools fall back to scanning until the
+    index is ready. Later requests refresh the index before it is used,
+    so answers never miss files changed since the last call. A refresh
+    only stats unchanged files; refresh_interval lets very large trees
+    trade freshness for fewer walks. Changed indexes are saved in the
+    background save_delay seconds after a refresh, and at exit.
+    """
+
+    cache_dir: ClassVar[Path] = Path.home() / ".cache" / "sgr_file_agent"
+    # Seconds an index is used without a refresh, 0 refreshes on every request
+    refresh_interval: ClassVar[float] = 0.0
+    # Seconds a changed index waits before it is saved, so a burst of requests saves it once
+    save_delay: ClassVar[float] = 5.0
+
+    _indexes: ClassVar[dict[Path, WorkspaceIndex]] = {}
+    _building: ClassVar[dict[Path, asyncio.Task]] = {}
+    _locks: ClassVar[dict[Path, asyncio.Lock]] = {}
+    _dirty: ClassVar[set[Path]] = set()
+    _saving: ClassVar[dict[Path, asyncio.Task]] = {}
+
+    def __init__(self):
+        raise TypeError(f"{self.__class__.__name__} is a static class and cannot be instantiated")
+
+    @classmethod
+    def _index_path(cls, root: Path) -> Path:
+        digest = hashlib.sha256(str(root).encode("utf-8")).hexdigest()[:16]
+        return cls.cache_dir / f"{digest}.idx"
+
+    @classmethod
+    async def get(cls, root: str | Path) -> WorkspaceIndex | None:
+        """Index of root refreshed for this request, None while it is being
+        built."""
+        root = Path(root).expanduser().resolve()
+        index = cls._indexes.get(root)
+        if index is None:
+            cls._start_build(root)
+            return None
+        requested = time.monotonic()
+        if requested - index.refreshed_at >= cls.refresh_interval:
+            async with cls._locks.setdefault(root, asyncio.Lock()):
+                # Concurrent requests share a refresh that started after they arrived
+                if requested - index.refreshed_at >= cls.refresh_interval:
+                    if await asyncio.to_thread(index.refresh):
+                        cls._mark_dirty(root)
+        return index
+
+    @classmethod
+    def _mark_dirty(cls, root: Path) -> None:
+        cls._dirty.add(root)
+        saving = cls._saving.get(root)
+        if saving is None or saving.done():
+            cls._saving[root] = asyncio.create_task(cls._save_later(root))
+
+    @classmethod
+    async def _save_later(cls, root: Path) -> None:
+        # Refreshes made while saving mark the index dirty again and are saved in the next round
+        while root in cls._dirty:
+            await asyncio.sleep(cls.save_delay)
+            cls._dirty.discard(root)
+            index = cls._indexes.get(root)
+            if index is None:
+                return
+            try:
+                await asyncio.to_thread(index.save)
+            except Exception as e:
+                logger.error(f"Failed to save workspace index of {root}: {e}")
+
+    @classmethod
+    def save_dirty(cls) -> None:
+        """Save indexes changed since their last save, called at exit."""
+        for root in list(cls._dirty):
+            cls._dirty.discard(root)
+            index = cls._indexes.get(root)
+            if index is None:
+                continue
+            try:
+                index.save()
+            except Exception as e:
+                logger.error(f"Failed to save workspace index of {root}: {e}")
+
+    @classmethod
+    async def for_path(cls, config, path: Path) -> WorkspaceIndex | None:
+        """Index of the agent working directory if path is inside it.
+
+        Indexing is enabled by the working_directory agent parameter and
+        can be turned off with workspace_index: false.
+        """
+        working_directory = getattr(config, "working_directory", None)
+        if not working_directory or not getattr(config, "workspace_index", True):
+            return None
+        root = Path(working_directory).expanduser().resolve()
+        if not path.resolve().is_relative_to(root):
+            return None
+        return await cls.get(root)
+
+    @classmethod
+    def prefetch(cls, config) -> None:
+        """Start indexing the agent working directory in the background,
+        so the index is ready by the first tool call."""
+        working_directory = getattr(config, "working_directory", None)
+        if not working_directory or not getattr(config, "workspace_index", True):
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        root = Path(working_directory).expanduser().resolve()
+        if root not in cls._indexes:
+            cls._start_build(root)
+
+    @classmethod
+    def _start_build(cls, root: Path) -> None:
+        if root not in cls._building:
+            task = asyncio.create_task(cls._build(root))
+            cls._building[root] = task
+            task.add_done_callback(lambda _: cls._building.pop(root, None))
+
+    @classmethod
+    async def _build(cls, root: Path) -> None:
+        started = time.monotonic()
+        index = WorkspaceIndex(root, cls._index_path(root))
+        try:
+            loaded = await asyncio.to_thread(index.load)
+            if await asyncio.to_thread(index.refresh) or not loaded:
+                await asyncio.to_thread(index.save)
+        except Exception as e:
+            logger.error(f"Failed to index {root}: {e}")
+            return
+        cls._indexes[root] = index
+        logger.info(
+            f"🗂️ Indexed {len(index.files)} files in {root} in {time.monotonic() - started:.2f}s"
+            f" ({'updated' if loaded else 'built'})"
+        )
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget loaded indexes, saved ones stay on disk."""
+        for task in [*cls._building.values(), *cls._saving.values()]:
+            task.cancel()
+        cls._indexes.clear()
+        cls._building.clear()
+        cls._locks.clear()
+        cls._dirty.clear()
+        cls._saving.clear()
+
+
+atexit.register(WorkspaceIndexService.save_dirty)
@@ -4,7 +4,7 @@ import logging
 import os
 from functools import cached_property
 from pathlib import Path
-from typing import Any, Self, Union
+from typing import Any, Literal, Self, Union
 
 import yaml
 from fastmcp.mcp_config import MCPConfig
@@ -57,9 +57,41 @@ class LLMConfig(BaseModel, extra="allow"):
     proxy: str | None = Field(
         default=None, description="Proxy URL (e.g., socks5://127.0.0.1:1081 or http://127.0.0.1:8080)"
     )
+    http2: bool = Field(default=False, description="Enable HTTP/2 for LLM connections (requires 'h2' package)")
+    max_connections: int = Field(default=100, gt=0, description="Maximum number of concurrent LLM connections")
+    max_keepalive_connections: int = Field(
+        default=20, ge=0, description="Maximum number of idle keep-alive LLM connections"
+    )
+    keepalive_expiry: float = Field(default=30.0, ge=0, description="Idle keep-alive connection expiry in seconds")
+    stream_usage: bool = Field(
+        default=True,
+        description="Request token usage in streamed responses (stream_options.include_usage). "
+        "Disable for upstreams that reject stream_options",
+    )
+    rate_limit: float | None = Field(
+        default=None, gt=0, description="Maximum LLM requests per second to the base URL across all agents"
+    )
+    rate_limit_burst: int = Field(default=1, gt=0, description="Requests allowed at once before rate_limit applies")
 
     def to_openai_client_kwargs(self) -> dict[str, Any]:
-        return self.model_dump(exclude={"api_key", "base_url", "proxy"})
+        # Client transport settings are not passed to chat completion requests
+        kwargs = self.model_dump(
+            exclude={
+                "api_key",
+                "base_url",
+                "proxy",
+                "http2",
+                "max_connections",
+                "max_keepalive_connections",
+                "keepalive_expiry",
+                "stream_usage",
+                "rate_limit",
+                "rate_limit_burst",
+            }
+        )
+        if self.stream_usage:
+            kwargs.setdefault("stream_options", {"include_usage": True})
+        return kwargs
 
 
 class SearchConfig(BaseModel, extra="allow"):
@@ -70,6 +102,29 @@ class SearchConfig(BaseModel, extra="allow"):
     max_results: int = Field(default=10, ge=1, description="Maximum number of search results")
     content_limit: int = Field(default=3500, gt=0, description="Content character limit per source")
 
+    cache_backend: Literal["memory", "sqlite"] | None = Field(
+        default=None, description="Search result cache backend. Set to None to disable caching."
+    )
+    cache_ttl: float = Field(default=600.0, gt=0, description="Search result cache TTL in seconds")
+    cache_max_entries: int = Field(default=1024, gt=0, description="Maximum number of cached search results")
+    cache_max_bytes: int = Field(default=64 * 1024 * 1024, gt=0, description="Maximum total size of cached results")
+    cache_path: str = Field(default="cache/search_cache.sqlite3", description="Database path for sqlite cache")
+
+    extract_mode: Literal["batch", "per_url"] = Field(
+        default="batch",
+        description="'batch' sends all URLs in one extract call, 'per_url' extracts URLs concurrently "
+        "and keeps partial results when some pages are slow or fail",
+    )
+    extract_concurrency: int = Field(default=5, gt=0, description="Maximum concurrent per-URL extract requests")
+    extract_timeout: float = Field(default=20.0, gt=0, description="Per-URL extract timeout in seconds")
+    extract_fallback: Literal["local"] | None = Field(
+        default=None, description="Fallback extract backend for URLs Tavily failed to extract"
+    )
+    rate_limit: float | None = Field(
+        default=None, gt=0, description="Maximum Tavily requests per second to the base URL across all agents"
+    )
+    rate_limit_burst: int = Field(default=1, gt=0, description="Requests allowed at once before rate_limit applies")
+
 
 class PromptsConfig(BaseModel, extra="allow"):
     system_prompt_file: FilePath | None = Field(
@@ -145,8 +200,62 @@ class ExecutionConfig(BaseModel, extra="allow"):
     logs_dir: str | None = Field(
         default="logs", description="Directory for saving bot logs. Set to None or empty string to disable logging."
     )
+    log_format: Literal["json", "jsonl"] = Field(
+        default="json",
+        description="Agent log format: 'json' writes one document when the agent finishes, "
+        "'jsonl' appends every step as a JSON line while the agent runs",
+    )
+    log_compression: Literal["gzip", "zstd"] | None = Field(
+        default=None, description="Compress agent logs, zstd requires the zstandard package"
+    )
+    log_max_bytes: int | None = Field(
+        default=None, gt=0, description="Rotate a JSON Lines agent log once it reaches this size. None disables"
+    )
+    log_backup_count: int = Field(default=5, ge=0, description="Number of rotated agent log files kept")
     reports_dir: str = Field(default="reports", description="Directory for saving reports")
 
+    stream_max_chunks: int = Field(default=10000, gt=0, description="Maximum chunks kept in the agent stream buffer")
+    stream_max_bytes: int = Field(
+        default=8 * 1024 * 1024, gt=0, description="Maximum total size of chunks kept in the agent stream buffer"
+    )
+    stream_overflow_policy: Literal["drop", "coalesce"] = Field(
+        default="drop",
+        description="How lagging stream readers catch up: 'drop' skips chunks evicted from the buffer, "
+        "'coalesce' also sends all available chunks in one write",
+    )
+
+    parallel_tool_calls: bool = Field(
+        default=False,
+        description="Execute all tool calls of an LLM response concurrently instead of only the first one",
+    )
+    max_parallel_tool_calls: int = Field(
+        default=4, gt=0, description="Maximum tool calls of one agent executed at the same time"
+    )
+
+    fused_reasoning: bool = Field(
+        default=False,
+        description="SGRToolCallingAgent: request reasoning and the next action in one LLM call, "
+        "falling back to a separate action call when only reasoning is returned",
+    )
+
+    context_token_budget: int | None = Field(
+        default=None,
+        gt=0,
+        description="Maximum tokens of the LLM context, older content is evicted when exceeded. None disables",
+    )
+    context_token_counter: Literal["heuristic", "tiktoken"] = Field(
+        default="heuristic", description="Token counter used for the context budget"
+    )
+    context_keep_tool_outputs: int = Field(
+        default=2, ge=0, description="Number of most recent tool outputs never dropped from the context"
+    )
+    context_keep_recent_messages: int = Field(
+        default=6, ge=0, description="Number of most recent conversation messages never summarized"
+    )
+    context_summarizer: Literal["extractive", "llm"] = Field(
+        default="extractive", description="How older turns are summarized: without LLM calls or with the agent LLM"
+    )
+
 
 class AgentConfig(BaseModel, extra="allow"):
     """Agent configuration with all settings.
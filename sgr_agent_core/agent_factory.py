@@ -3,7 +3,6 @@
 import logging
 from typing import Type, TypeVar
 
-import httpx
 from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionMessageParam
 
@@ -11,7 +10,7 @@ from sgr_agent_core.agent_config import GlobalConfig
 from sgr_agent_core.agent_definition import AgentDefinition, LLMConfig
 from sgr_agent_core.base_agent import BaseAgent
 from sgr_agent_core.base_tool import BaseTool
-from sgr_agent_core.services import AgentRegistry, MCP2ToolConverter, ToolRegistry
+from sgr_agent_core.services import AgentRegistry, MCP2ToolConverter, OpenAIClientPool, ToolRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +26,9 @@ class AgentFactory:
 
     @classmethod
     def _create_client(cls, llm_config: LLMConfig) -> AsyncOpenAI:
-        """Create OpenAI client from configuration.
+        """Get a shared OpenAI client for the configuration.
+
+        Clients are pooled per upstream, see OpenAIClientPool.
 
         Args:
             llm_config: LLM configuration
@@ -35,11 +36,7 @@ class AgentFactory:
         Returns:
             Configured AsyncOpenAI client
         """
-        client_kwargs = {"base_url": llm_config.base_url, "api_key": llm_config.api_key}
-        if llm_config.proxy:
-            client_kwargs["http_client"] = httpx.AsyncClient(proxy=llm_config.proxy)
-
-        return AsyncOpenAI(**client_kwargs)
+        return OpenAIClientPool.get_client(llm_config)
 
     @classmethod
     def _resolve_tool(cls, tool_name: str | type, config: GlobalConfig) -> type[BaseTool]:
@@ -40,15 +40,12 @@ class SGRAgent(BaseAgent):
         return NextStepToolsBuilder.build_NextStepTools(list(tools))
 
     async def _reasoning_phase(self) -> NextStepToolStub:
-        async with self.openai_client.chat.completions.stream(
-            response_format=await self._prepare_tools(),
+        next_step_tools = await self._prepare_tools()
+        completion = await self._stream_completion(
+            response_format=NextStepToolsBuilder.get_response_format(next_step_tools),
             messages=await self._prepare_context(),
-            **self.config.llm.to_openai_client_kwargs(),
-        ) as stream:
-            async for event in stream:
-                if event.type == "chunk":
-                    self.streaming_generator.add_chunk(event.chunk)
-        reasoning: NextStepToolStub = (await stream.get_final_completion()).choices[0].message.parsed  # type: ignore
+        )
+        reasoning = next_step_tools.model_validate_json(completion.choices[0].message.content)
         # we are not fully sure if it should be in conversation or not. Looks like not necessary data
         # self.conversation.append({"role": "assistant", "content": reasoning.model_dump_json(exclude={"function"})})
         self.streaming_generator.add_tool_call(
@@ -83,7 +80,7 @@ class SGRAgent(BaseAgent):
         return tool
 
     async def _action_phase(self, tool: BaseTool) -> str:
-        result = await tool(self._context, self.config)
+        (result,) = await self._execute_tools([tool])
         self.conversation.append(
             {"role": "tool", "content": result, "tool_call_id": f"{self._context.iteration}-action"}
         )
@@ -1,6 +1,6 @@
 from typing import Literal, Type
 
-from openai import AsyncOpenAI, pydantic_function_tool
+from openai import AsyncOpenAI
 
 from sgr_agent_core.agent_config import AgentConfig
 from sgr_agent_core.base_agent import BaseAgent
@@ -36,20 +36,19 @@ class SGRToolCallingAgent(BaseAgent):
             **kwargs,
         )
         self.tool_choice: Literal["required"] = "required"
+        self._fused_actions: list[BaseTool] = []
 
     async def _reasoning_phase(self) -> ReasoningTool:
-        async with self.openai_client.chat.completions.stream(
-            messages=await self._prepare_context(),
-            tools=[pydantic_function_tool(ReasoningTool, name=ReasoningTool.tool_name)],
-            tool_choice=self.tool_choice,
-            **self.config.llm.to_openai_client_kwargs(),
-        ) as stream:
-            async for event in stream:
-                if event.type == "chunk":
-                    self.streaming_generator.add_chunk(event.chunk)
-            reasoning: ReasoningTool = (
-                (await stream.get_final_completion()).choices[0].message.tool_calls[0].function.parsed_arguments
+        reasoning = None
+        if self.config.execution.fused_reasoning:
+            reasoning, self._fused_actions = await self._fused_reasoning_call()
+        if reasoning is None:
+            completion = await self._stream_completion(
+                messages=await self._prepare_context(),
+                tools=[ReasoningTool.to_openai_tool()],
+                tool_choice=self.tool_choice,
             )
+            reasoning: ReasoningTool = completion.choices[0].message.tool_calls[0].function.parsed_arguments
         self.conversation.append(
             {
                 "role": "assistant",
@@ -76,58 +75,72 @@ class SGRToolCallingAgent(BaseAgent):
         self._log_reasoning(reasoning)
         return reasoning
 
+    async def _fused_reasoning_call(self) -> tuple[ReasoningTool | None, list[BaseTool]]:
+        """Request reasoning and the next action as parallel tool calls of
+        one completion.
+
+        Returns:
+            Reasoning (None if the model skipped it) and the action tools
+            called together with it
+        """
+        tools = await self._prepare_tools()
+        if not any(tool["function"]["name"] == ReasoningTool.tool_name for tool in tools):
+            tools = [ReasoningTool.to_openai_tool(), *tools]
+        instruction = {
+            "role": "user",
+            "content": f"Call {ReasoningTool.tool_name} first and then the tool for the next action, "
+            "both in this response.",
+        }
+        completion = await self._stream_completion(
+            messages=[*await self._prepare_context(), instruction],
+            tools=tools,
+            tool_choice=self.tool_choice,
+            parallel_tool_calls=True,
+        )
+
+        called = [tool_call.function.parsed_arguments for tool_call in completion.choices[0].message.tool_calls or []]
+        reasoning = next((tool for tool in called if isinstance(tool, ReasoningTool)), None)
+        actions = [tool for tool in called if isinstance(tool, BaseTool) and not isinstance(tool, ReasoningTool)]
+        if reasoning is None:
+            self.logger.info("🔀 Fused call returned no reasoning, using separate reasoning call")
+            return None, []
+        if not actions:
+            self.logger.info("🔀 Fused call returned only reasoning, using separate action call")
+        return reasoning, actions
+
     async def _select_action_phase(self, reasoning: ReasoningTool) -> BaseTool:
-        async with self.openai_client.chat.completions.stream(
+        tools, self._fused_actions = self._fused_actions, []
+        if not tools:
+            tools = await self._action_call()
+        return self._record_tool_batch(
+            tools, reasoning.remaining_steps[0] if reasoning.remaining_steps else "Completing"
+        )
+
+    async def _action_call(self) -> list[BaseTool]:
+        """Request the next action tools from the LLM."""
+        completion = await self._stream_completion(
             messages=await self._prepare_context(),
             tools=await self._prepare_tools(),
             tool_choice=self.tool_choice,
-            **self.config.llm.to_openai_client_kwargs(),
-        ) as stream:
-            async for event in stream:
-                if event.type == "chunk":
-                    self.streaming_generator.add_chunk(event.chunk)
-
-        completion = await stream.get_final_completion()
+        )
 
-        try:
-            tool = completion.choices[0].message.tool_calls[0].function.parsed_arguments
-        except (IndexError, AttributeError, TypeError):
+        tool_calls = completion.choices[0].message.tool_calls
+        if tool_calls:
+            tools = [tool_call.function.parsed_arguments for tool_call in tool_calls]
+        else:
             # LLM returned a text response instead of a tool call - treat as completion
             final_content = completion.choices[0].message.content or "Task completed successfully"
-            tool = FinalAnswerTool(
-                reasoning="Agent decided to complete the task",
-                completed_steps=[],
-                answer=final_content,
-                status=AgentStatesEnum.COMPLETED,
-            )
-        if not isinstance(tool, BaseTool):
+            tools = [
+                FinalAnswerTool(
+                    reasoning="Agent decided to complete the task",
+                    completed_steps=[],
+                    answer=final_content,
+                    status=AgentStatesEnum.COMPLETED,
+                )
+            ]
+        if not all(isinstance(tool, BaseTool) for tool in tools):
             raise ValueError("Selected tool is not a valid BaseTool instance")
-        self.conversation.append(
-            {
-                "role": "assistant",
-                "content": reasoning.remaining_steps[0] if reasoning.remaining_steps else "Completing",
-                "tool_calls": [
-                    {
-                        "type": "function",
-                        "id": f"{self._context.iteration}-action",
-                        "function": {
-                            "name": tool.tool_name,
-                            "arguments": tool.model_dump_json(),
-                        },
-                    }
-                ],
-            }
-        )
-        self.streaming_generator.add_tool_call(
-            f"{self._context.iteration}-action", tool.tool_name, tool.model_dump_json()
-        )
-        return tool
+        return tools
 
     async def _action_phase(self, tool: BaseTool) -> str:
-        result = await tool(self._context, self.config)
-        self.conversation.append(
-            {"role": "tool", "content": result, "tool_call_id": f"{self._context.iteration}-action"}
-        )
-        self.streaming_generator.add_chunk_from_str(f"{result}\n")
-        self._log_tool_execution(tool, result)
-        return result
+        return await self._run_tool_batch(tool)
@@ -39,45 +39,17 @@ class ToolCallingAgent(BaseAgent):
         return None
 
     async def _select_action_phase(self, reasoning=None) -> BaseTool:
-        async with self.openai_client.chat.completions.stream(
+        completion = await self._stream_completion(
             messages=await self._prepare_context(),
             tools=await self._prepare_tools(),
             tool_choice=self.tool_choice,
-            **self.config.llm.to_openai_client_kwargs(),
-        ) as stream:
-            async for event in stream:
-                if event.type == "chunk":
-                    self.streaming_generator.add_chunk(event.chunk)
-        tool = (await stream.get_final_completion()).choices[0].message.tool_calls[0].function.parsed_arguments
+        )
+        tool_calls = completion.choices[0].message.tool_calls
+        tools = [tool_call.function.parsed_arguments for tool_call in tool_calls]
 
-        if not isinstance(tool, BaseTool):
+        if not all(isinstance(tool, BaseTool) for tool in tools):
             raise ValueError("Selected tool is not a valid BaseTool instance")
-        self.conversation.append(
-            {
-                "role": "assistant",
-                "content": None,
-                "tool_calls": [
-                    {
-                        "type": "function",
-                        "id": f"{self._context.iteration}-action",
-                        "function": {
-                            "name": tool.tool_name,
-                            "arguments": tool.model_dump_json(),
-                        },
-                    }
-                ],
-            }
-        )
-        self.streaming_generator.add_tool_call(
-            f"{self._context.iteration}-action", tool.tool_name, tool.model_dump_json()
-        )
-        return tool
+        return self._record_tool_batch(tools)
 
     async def _action_phase(self, tool: BaseTool) -> str:
-        result = await tool(self._context, self.config)
-        self.conversation.append(
-            {"role": "tool", "content": result, "tool_call_id": f"{self._context.iteration}-action"}
-        )
-        self.streaming_generator.add_chunk_from_str(f"{result}\n")
-        self._log_tool_execution(tool, result)
-        return result
+        return await self._run_tool_batch(tool)
@@ -1,23 +1,30 @@
 import asyncio
-import json
 import logging
 import os
+import time
 import traceback
 import uuid
 from datetime import datetime
-from typing import Type
+from typing import Awaitable, Callable, Type
 
-from openai import AsyncOpenAI, pydantic_function_tool
-from openai.types.chat import ChatCompletionFunctionToolParam, ChatCompletionMessageParam
+from openai import AsyncOpenAI
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletionChunk, ChatCompletionFunctionToolParam, ChatCompletionMessageParam
 
 from sgr_agent_core.agent_definition import AgentConfig
 from sgr_agent_core.models import AgentContext, AgentStatesEnum
+from sgr_agent_core.services.context_builder import ContextBuilder
+from sgr_agent_core.services.context_manager import ContextManager
+from sgr_agent_core.services.log_writer import AgentLogWriter
+from sgr_agent_core.services.metrics import AgentMetrics
 from sgr_agent_core.services.prompt_loader import PromptLoader
+from sgr_agent_core.services.rate_limiter import RateLimiter
 from sgr_agent_core.services.registry import AgentRegistry
 from sgr_agent_core.stream import OpenAIStreamingGenerator
 from sgr_agent_core.tools import (
     BaseTool,
     ClarificationTool,
+    FinalAnswerTool,
     ReasoningTool,
 )
 
@@ -51,13 +58,32 @@ class BaseAgent(AgentRegistryMixin):
         self.toolkit = toolkit
 
         self._context = AgentContext()
+        self.metrics = AgentMetrics(self._context, agent_name=def_name or self.name)
         self.conversation = []
+        self._context_builder = ContextBuilder()
+        self.context_manager = ContextManager.from_config(
+            agent_config.execution,
+            model=agent_config.llm.model,
+            summarizer=self._summarize_messages if agent_config.execution.context_summarizer == "llm" else None,
+        )
 
-        self.streaming_generator = OpenAIStreamingGenerator(model=self.id)
+        self.streaming_generator = OpenAIStreamingGenerator(
+            model=self.id,
+            max_chunks=agent_config.execution.stream_max_chunks,
+            max_bytes=agent_config.execution.stream_max_bytes,
+            overflow_policy=agent_config.execution.stream_overflow_policy,
+        )
         self.logger = logging.getLogger(f"sgr_agent_core.agents.{self.id}")
         self.log = []
+        self._log_compression = AgentLogWriter.resolve_compression(agent_config.execution.log_compression)
+        self._log_path: str | None = None
 
         self._execute_task: asyncio.Task | None = None
+        self._tool_semaphore = asyncio.Semaphore(agent_config.execution.max_parallel_tool_calls)
+        self._action_batch: list[tuple[str, BaseTool]] = []
+        # Called around the wait for clarification, e.g. to free a scheduler slot
+        self.on_clarification_wait: Callable[[], Awaitable[None]] | None = None
+        self.on_clarification_resume: Callable[[], Awaitable[None]] | None = None
 
     async def provide_clarification(self, messages: list[ChatCompletionMessageParam]):
         """Receive clarification from an external source (e.g. user input) in
@@ -73,9 +99,10 @@ class BaseAgent(AgentRegistryMixin):
         self.logger.info(f"✅ Clarification received: {len(messages)} messages")
 
     def _log_reasoning(self, result: ReasoningTool) -> None:
-        next_step = result.remaining_steps[0] if result.remaining_steps else "Completing"
-        self.logger.info(
-            f"""
+        if self.logger.isEnabledFor(logging.INFO):
+            next_step = result.remaining_steps[0] if result.remaining_steps else "Completing"
+            self.logger.info(
+                f"""
     ###############################################
     🤖 LLM RESPONSE DEBUG:
        🧠 Reasoning Steps: {result.reasoning_steps}
@@ -88,8 +115,8 @@ class BaseAgent(AgentRegistryMixin):
        🏁 Task Completed: {result.task_completed}
        ➡️ Next Step: {next_step}
     ###############################################"""
-        )
-        self.log.append(
+            )
+        self._add_log_entry(
             {
                 "step_number": self._context.iteration,
                 "timestamp": datetime.now().isoformat(),
@@ -99,16 +126,17 @@ class BaseAgent(AgentRegistryMixin):
         )
 
     def _log_tool_execution(self, tool: BaseTool, result: str):
-        self.logger.info(
-            f"""
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                f"""
 ###############################################
 🛠️ TOOL EXECUTION DEBUG:
     🔧 Tool Name: {tool.tool_name}
     📋 Tool Model: {tool.model_dump_json(indent=2)}
     🔍 Result: '{result[:400]}...'
 ###############################################"""
-        )
-        self.log.append(
+            )
+        self._add_log_entry(
             {
                 "step_number": self._context.iteration,
                 "timestamp": datetime.now().isoformat(),
@@ -119,28 +147,95 @@ class BaseAgent(AgentRegistryMixin):
             }
         )
 
-    def _save_agent_log(self):
-        from sgr_agent_core.agent_config import GlobalConfig
-
-        logs_dir = GlobalConfig().execution.logs_dir
-        # Skip saving if logs_dir is None or empty string
-        if not logs_dir:
-            self.logger.debug("Skipping agent log save: logs_dir is not configured")
-            return
-
-        os.makedirs(logs_dir, exist_ok=True)
-        filepath = os.path.join(logs_dir, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{self.id}-log.json")
-        agent_log = {
+    def _log_header(self) -> dict:
+        return {
             "id": self.id,
             "model_config": self.config.llm.model_dump(
                 exclude={"api_key", "proxy"}, mode="json"
             ),  # Sensitive data excluded by default
             "task_messages": self.task_messages,
             "toolkit": [tool.tool_name for tool in self.toolkit],
-            "log": self.log,
         }
 
-        json.dump(agent_log, open(filepath, "w", encoding="utf-8"), indent=2, ensure_ascii=False)
+    def _get_log_path(self, extension: str) -> str | None:
+        """Get the agent log file path, None if logs_dir is not
+        configured."""
+        from sgr_agent_core.agent_config import GlobalConfig
+
+        logs_dir = GlobalConfig().execution.logs_dir
+        # Skip saving if logs_dir is None or empty string
+        if not logs_dir:
+            self.logger.debug("Skipping agent log save: logs_dir is not configured")
+            return None
+        filename = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{self.id}-log.{extension}"
+        return os.path.join(logs_dir, filename + AgentLogWriter.suffix(self._log_compression))
+
+    def _append_log_record(self, record: dict) -> None:
+        if self._log_path is None:
+            # The first record creates the file with the agent description
+            self._log_path = self._get_log_path("jsonl") or ""
+            if self._log_path:
+                self._append_log_record(self._log_header())
+        if self._log_path:
+            execution = self.config.execution
+            AgentLogWriter.append(
+                self._log_path,
+                record,
+                compression=self._log_compression,
+                max_bytes=execution.log_max_bytes,
+                backup_count=execution.log_backup_count,
+            )
+
+    def _add_log_entry(self, entry: dict) -> None:
+        """Add a step entry to the agent log.
+
+        With execution.log_format 'jsonl' the entry is also appended to
+        the log file right away by the background log writer.
+        """
+        self.log.append(entry)
+        if self.config.execution.log_format == "jsonl":
+            self._append_log_record(entry)
+
+    def _metrics_summary(self) -> dict:
+        return self._context.model_dump(include={"usage", "timings"}, mode="json")
+
+    def _stream_usage(self) -> dict[str, int]:
+        return self._context.usage.model_dump(include={"prompt_tokens", "completion_tokens", "total_tokens"})
+
+    def _log_step_metrics(self) -> None:
+        self._add_log_entry(
+            {
+                "step_number": self._context.iteration,
+                "timestamp": datetime.now().isoformat(),
+                "step_type": "step_metrics",
+                **self.metrics.pop_step(),
+            }
+        )
+
+    def _save_agent_log(self):
+        """Save the agent log when the agent finishes.
+
+        Writing is done by the background log writer, so the event loop
+        is not blocked by serializing large logs.
+        """
+        if self.config.execution.log_format == "jsonl":
+            self._append_log_record(
+                {
+                    "step_number": self._context.iteration,
+                    "timestamp": datetime.now().isoformat(),
+                    "step_type": "finish",
+                    "state": self._context.state.value,
+                    "execution_result": self._context.execution_result,
+                    "metrics": self._metrics_summary(),
+                }
+            )
+            return
+
+        filepath = self._get_log_path("json")
+        if filepath is None:
+            return
+        agent_log = {**self._log_header(), "metrics": self._metrics_summary(), "log": list(self.log)}
+        AgentLogWriter.write(filepath, agent_log, compression=self._log_compression)
 
     async def _prepare_context(self) -> list[dict]:
         """Prepare a conversation context with system prompt, task data and any
@@ -149,15 +244,111 @@ class BaseAgent(AgentRegistryMixin):
         Note: Override this method to change the context setup for the agent.
 
         Returns a list of dictionaries OpenAI like format, each
-        containing a role and content key by default.
+        containing a role and content key by default. The system prompt,
+        task messages and initial user request form a stable prefix of
+        ``self._context_builder.prefix_length`` messages; only new
+        conversation turns are appended between calls, so the returned
+        list must not be modified.
         """
 
-        return [
-            {"role": "system", "content": PromptLoader.get_system_prompt(self.toolkit, self.config.prompts)},
-            *self.task_messages,
-            {"role": "user", "content": PromptLoader.get_initial_user_request(self.task_messages, self.config.prompts)},
-            *self.conversation,
-        ]
+        return self._context_builder.build(self.toolkit, self.config.prompts, self.task_messages, self.conversation)
+
+    async def _stream_completion(self, forward_chunks: bool = True, **kwargs):
+        """Request a streamed chat completion and forward its chunks to the
+        agent stream.
+
+        Records time to first token, duration and token usage of the call.
+        Keyword arguments are passed to the completion request together
+        with the LLM settings. Internal calls whose output is not meant
+        for the client pass forward_chunks=False.
+
+        Returns:
+            Final completion of the stream
+        """
+        await RateLimiter.acquire(
+            f"llm:{self.config.llm.base_url}", self.config.llm.rate_limit, self.config.llm.rate_limit_burst
+        )
+        started = time.perf_counter()
+        first_token = None
+        async with self.openai_client.chat.completions.stream(
+            **kwargs, **self.config.llm.to_openai_client_kwargs()
+        ) as stream:
+            async for event in stream:
+                if event.type == "chunk":
+                    if first_token is None and self._has_token(event.chunk):
+                        first_token = time.perf_counter() - started
+                    if forward_chunks:
+                        self.streaming_generator.add_chunk(event.chunk)
+            completion = await stream.get_final_completion()
+        usage = getattr(completion, "usage", None)
+        self.metrics.record_llm_call(
+            time.perf_counter() - started, first_token, usage if isinstance(usage, CompletionUsage) else None
+        )
+        return completion
+
+    @staticmethod
+    def _has_token(chunk: ChatCompletionChunk) -> bool:
+        return any(choice.delta.content or choice.delta.tool_calls or choice.delta.refusal for choice in chunk.choices)
+
+    async def _summarize_messages(self, messages: list[dict]) -> str:
+        """Summarize older conversation turns with the agent LLM.
+
+        The request shares the rate limit, metrics and LLM settings of
+        agent steps, its output is not streamed to the client.
+        """
+        completion = await self._stream_completion(
+            forward_chunks=False,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "Summarize the research steps below: what was searched and done and the key "
+                    "findings. Keep every source citation line like '[1] Title - URL' unchanged.",
+                },
+                {
+                    "role": "user",
+                    "content": "\n\n".join(
+                        f"{message.get('role')}: {str(message.get('content') or message.get('tool_calls'))[:4000]}"
+                        for message in messages
+                    ),
+                },
+            ],
+        )
+        return completion.choices[0].message.content or ""
+
+    async def _fit_context(self) -> None:
+        """Evict conversation content that does not fit the context token
+        budget.
+
+        Note: Called before every step when
+        execution.context_token_budget is set. Tokens saved by each
+        eviction policy are accumulated in the agent context and logged.
+        """
+        if self.context_manager is None:
+            return
+        context = await self._prepare_context()
+        tokens_before = self.context_manager.count(context)
+        tokens, saved = await self.context_manager.fit(
+            context[: self._context_builder.prefix_length], self.conversation
+        )
+        self._context.context_tokens = tokens
+        if not saved:
+            return
+        self._context_builder.invalidate()
+        for policy, policy_saved in saved.items():
+            self._context.context_tokens_saved[policy] = (
+                self._context.context_tokens_saved.get(policy, 0) + policy_saved
+            )
+        self.logger.info(f"🗜️ Context reduced from {tokens_before} to {tokens} tokens: {saved}")
+        self._add_log_entry(
+            {
+                "step_number": self._context.iteration,
+                "timestamp": datetime.now().isoformat(),
+                "step_type": "context_eviction",
+                "tokens_before": tokens_before,
+                "tokens_after": tokens,
+                "tokens_saved": saved,
+            }
+        )
 
     async def _prepare_tools(self) -> list[ChatCompletionFunctionToolParam]:
         """Prepare available tools for the current agent state and progress.
@@ -171,7 +362,96 @@ class BaseAgent(AgentRegistryMixin):
         tools = set(self.toolkit)
         if self._context.iteration >= self.config.execution.max_iterations:
             raise RuntimeError("Max iterations reached")
-        return [pydantic_function_tool(tool, name=tool.tool_name) for tool in tools]
+        return [tool.to_openai_tool() for tool in tools]
+
+    def _select_tool_batch(self, tools: list[BaseTool]) -> list[BaseTool]:
+        """Select the tools to execute from the tool calls of one LLM
+        response.
+
+        Without execution.parallel_tool_calls only the first call is
+        executed. Reasoning, clarification and final answer tools drive
+        the agent workflow, so they are never executed together with other
+        tools: a leading one runs alone and others are skipped.
+        """
+        workflow_tools = (ReasoningTool, ClarificationTool, FinalAnswerTool)
+        if not self.config.execution.parallel_tool_calls or isinstance(tools[0], workflow_tools):
+            return tools[:1]
+        batch = [tool for tool in tools if not isinstance(tool, workflow_tools)]
+        if len(batch) < len(tools):
+            self.logger.info(f"⏭️ Skipped {len(tools) - len(batch)} workflow tool calls issued with other tools")
+        return batch
+
+    async def _execute_tools(self, tools: list[BaseTool]) -> list[str]:
+        """Execute tools concurrently, at most
+        execution.max_parallel_tool_calls at a time.
+
+        Returns results in the order of tools. If any tool fails, its
+        exception is raised after all tools have finished.
+        """
+
+        async def run(tool: BaseTool) -> str:
+            async with self._tool_semaphore:
+                with self.metrics.span(f"tool:{tool.tool_name}"):
+                    return await tool(self._context, self.config)
+
+        if len(tools) == 1:
+            return [await run(tools[0])]
+        results = await asyncio.gather(*(run(tool) for tool in tools), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    def _record_tool_batch(self, tools: list[BaseTool], content: str | None = None) -> BaseTool:
+        """Select the batch to execute from the tool calls of one LLM
+        response, add it to the conversation as an assistant message and
+        stream the tool calls.
+
+        Returns the first tool of the batch; _run_tool_batch executes the
+        whole batch when it gets that tool.
+        """
+        tools = self._select_tool_batch(tools)
+        self._action_batch = [
+            (f"{self._context.iteration}-action" + (f"-{i}" if i else ""), tool) for i, tool in enumerate(tools)
+        ]
+        self.conversation.append(
+            {
+                "role": "assistant",
+                "content": content,
+                "tool_calls": [
+                    {
+                        "type": "function",
+                        "id": tool_call_id,
+                        "function": {
+                            "name": tool.tool_name,
+                            "arguments": tool.model_dump_json(),
+                        },
+                    }
+                    for tool_call_id, tool in self._action_batch
+                ],
+            }
+        )
+        for tool_call_id, tool in self._action_batch:
+            self.streaming_generator.add_tool_call(tool_call_id, tool.tool_name, tool.model_dump_json())
+        return tools[0]
+
+    async def _run_tool_batch(self, tool: BaseTool) -> str:
+        """Execute the batch recorded by _record_tool_batch and add the
+        results to the conversation as tool messages.
+
+        A tool that does not start the recorded batch runs alone.
+        Returns the result of the first tool.
+        """
+        batch = self._action_batch
+        self._action_batch = []
+        if not batch or batch[0][1] is not tool:
+            batch = [(f"{self._context.iteration}-action", tool)]
+        results = await self._execute_tools([batch_tool for _, batch_tool in batch])
+        for (tool_call_id, batch_tool), result in zip(batch, results):
+            self.conversation.append({"role": "tool", "content": result, "tool_call_id": tool_call_id})
+            self.streaming_generator.add_chunk_from_str(f"{result}\n")
+            self._log_tool_execution(batch_tool, result)
+        return results[0]
 
     async def _reasoning_phase(self) -> ReasoningTool:
         """Call LLM to decide next action based on current context."""
@@ -197,17 +477,25 @@ class BaseAgent(AgentRegistryMixin):
 
         Note: Override this method to change the agent workflow for each step.
         """
-        reasoning = await self._reasoning_phase()
+        with self.metrics.span("reasoning_phase"):
+            reasoning = await self._reasoning_phase()
         self._context.current_step_reasoning = reasoning
-        action_tool = await self._select_action_phase(reasoning)
-        await self._action_phase(action_tool)
+        with self.metrics.span("select_action_phase"):
+            action_tool = await self._select_action_phase(reasoning)
+        with self.metrics.span("action_phase"):
+            await self._action_phase(action_tool)
 
         if isinstance(action_tool, ClarificationTool):
             self.logger.info("\n⏸️  Research paused - please answer questions")
             self._context.state = AgentStatesEnum.WAITING_FOR_CLARIFICATION
-            self.streaming_generator.finish()
+            self.streaming_generator.finish(usage=self._stream_usage())
             self._context.clarification_received.clear()
-            await self._context.clarification_received.wait()
+            if self.on_clarification_wait is not None:
+                await self.on_clarification_wait()
+            with self.metrics.span("clarification_wait"):
+                await self._context.clarification_received.wait()
+                if self.on_clarification_resume is not None:
+                    await self.on_clarification_resume()
 
     async def cancel(self) -> None:
         """Cancel the agent execution.
@@ -245,7 +533,11 @@ class BaseAgent(AgentRegistryMixin):
             while self._context.state not in AgentStatesEnum.FINISH_STATES.value:
                 self._context.iteration += 1
                 self.logger.info(f"Step {self._context.iteration} started")
-                await self._execution_step()
+                await self._fit_context()
+                try:
+                    await self._execution_step()
+                finally:
+                    self._log_step_metrics()
             return self._context.execution_result
 
         except asyncio.CancelledError:
@@ -259,5 +551,5 @@ class BaseAgent(AgentRegistryMixin):
             traceback.print_exc()
         finally:
             if self.streaming_generator is not None:
-                self.streaming_generator.finish(self._context.execution_result)
+                self.streaming_generator.finish(self._context.execution_result, usage=self._stream_usage())
             self._save_agent_log()
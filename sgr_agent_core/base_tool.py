@@ -1,27 +1,45 @@
 from __future__ import annotations
 
-import json
 import logging
-from typing import TYPE_CHECKING, ClassVar
+from typing import TYPE_CHECKING, ClassVar, NamedTuple
 
-from fastmcp import Client
+from openai import pydantic_function_tool
+from openai.types.chat import ChatCompletionFunctionToolParam
 from pydantic import BaseModel
 
 from sgr_agent_core.agent_config import GlobalConfig
+from sgr_agent_core.services.mcp_session import format_tool_result
+from sgr_agent_core.services.metrics import MetricsRegistry
 from sgr_agent_core.services.registry import ToolRegistry
 
 if TYPE_CHECKING:
     from sgr_agent_core.agent_definition import AgentConfig
     from sgr_agent_core.models import AgentContext
+    from sgr_agent_core.services.mcp_session import MCPSession
 
 
 logger = logging.getLogger(__name__)
 
 
+def _iter_subclasses(cls: type) -> set[type]:
+    subclasses = set()
+    for subclass in cls.__subclasses__():
+        subclasses.add(subclass)
+        subclasses |= _iter_subclasses(subclass)
+    return subclasses
+
+
+class ToolSchemaCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    currsize: int
+
+
 class ToolRegistryMixin:
-    def __init_subclass__(cls, **kwargs) -> None:
+    def __init_subclass__(cls, register: bool = True, **kwargs) -> None:
         super().__init_subclass__(**kwargs)
-        if cls.__name__ not in ("BaseTool", "MCPBaseTool"):
+        # Internal dynamic models (e.g. NextStepTools unions) opt out via register=False
+        if register and cls.__name__ not in ("BaseTool", "MCPBaseTool"):
             ToolRegistry.register(cls, name=cls.tool_name)
 
 
@@ -31,6 +49,11 @@ class BaseTool(BaseModel, ToolRegistryMixin):
     tool_name: ClassVar[str] = None
     description: ClassVar[str] = None
 
+    # Per-class cache of OpenAI function tool params keyed by (name, description) overrides
+    _openai_tool_cache: ClassVar[dict[tuple[str | None, str | None], ChatCompletionFunctionToolParam]] = {}
+    _openai_tool_cache_hits: ClassVar[int] = 0
+    _openai_tool_cache_misses: ClassVar[int] = 0
+
     async def __call__(self, context: AgentContext, config: AgentConfig, **kwargs) -> str:
         """The result should be a string or dumped JSON."""
         raise NotImplementedError("Execute method must be implemented by subclass")
@@ -38,23 +61,67 @@ class BaseTool(BaseModel, ToolRegistryMixin):
     def __init_subclass__(cls, **kwargs) -> None:
         cls.tool_name = cls.tool_name or cls.__name__.lower()
         cls.description = cls.description or cls.__doc__ or ""
+        cls._openai_tool_cache = {}
         super().__init_subclass__(**kwargs)
 
+    @classmethod
+    def to_openai_tool(cls, name: str | None = None, description: str | None = None) -> ChatCompletionFunctionToolParam:
+        """Get the OpenAI function tool param for this tool class.
+
+        The schema is generated once per class and overrides pair, later
+        calls return the cached param. Returned value is shared and must
+        not be mutated.
+
+        Args:
+            name: Function name override (defaults to tool_name)
+            description: Function description override (defaults to class docstring)
+
+        Returns:
+            ChatCompletionFunctionToolParam with strict JSON schema of the tool
+        """
+        key = (name, description)
+        tool_param = cls._openai_tool_cache.get(key)
+        if tool_param is not None:
+            BaseTool._openai_tool_cache_hits += 1
+            return tool_param
+        BaseTool._openai_tool_cache_misses += 1
+        tool_param = pydantic_function_tool(cls, name=name or cls.tool_name, description=description)
+        cls._openai_tool_cache[key] = tool_param
+        return tool_param
+
+    @classmethod
+    def openai_tool_cache_info(cls) -> ToolSchemaCacheInfo:
+        """Get OpenAI tool schema cache statistics across all tool
+        classes."""
+        currsize = sum(len(tool._openai_tool_cache) for tool in _iter_subclasses(BaseTool))
+        return ToolSchemaCacheInfo(BaseTool._openai_tool_cache_hits, BaseTool._openai_tool_cache_misses, currsize)
+
+    @classmethod
+    def openai_tool_cache_clear(cls) -> None:
+        """Drop cached OpenAI tool schemas of all tool classes and reset
+        statistics."""
+        for tool in _iter_subclasses(BaseTool):
+            tool._openai_tool_cache.clear()
+        BaseTool._openai_tool_cache_hits = 0
+        BaseTool._openai_tool_cache_misses = 0
+
 
 class MCPBaseTool(BaseTool):
     """Base model for MCP Tool schema."""
 
-    _client: ClassVar[Client | None] = None
+    # Shared connection to the MCP server providing the tool
+    _session: ClassVar[MCPSession | None] = None
 
     async def __call__(self, context: AgentContext, config: AgentConfig, **kwargs) -> str:
         config = GlobalConfig()
         payload = self.model_dump(mode="json")
         try:
-            async with self._client:
-                result = await self._client.call_tool(self.tool_name, payload)
-                return json.dumps([m.model_dump_json() for m in result.content], ensure_ascii=False)[
-                    : config.execution.mcp_context_limit
-                ]
+            result = await self._session.call_tool(self.tool_name, payload)
+            text, dropped = format_tool_result(result.content, config.execution.mcp_context_limit)
+            if dropped:
+                logger.info(f"✂️ MCP tool {self.tool_name} result truncated, {dropped} bytes dropped")
+                MetricsRegistry.inc("sgr_mcp_result_dropped_bytes_total", dropped, tool=self.tool_name)
+            return text
         except Exception as e:
             logger.error(f"Error processing MCP tool {self.tool_name}: {e}")
             return f"Error: {e}"
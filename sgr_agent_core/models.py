@@ -3,7 +3,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 
 
 class SourceData(BaseModel):
@@ -32,6 +32,54 @@ class SearchResult(BaseModel):
         return f"Search: '{self.query}' ({len(self.citations)} sources)"
 
 
+class SearchCacheStats(BaseModel):
+    """Search result cache usage of a single agent."""
+
+    hits: int = Field(default=0, description="Number of lookups served from cache")
+    misses: int = Field(default=0, description="Number of lookups sent upstream")
+
+    @computed_field(description="Share of lookups served from cache")
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SpanStats(BaseModel):
+    """Aggregated durations of a measured span."""
+
+    count: int = Field(default=0, description="Number of measurements")
+    total_seconds: float = Field(default=0.0, description="Total duration in seconds")
+    max_seconds: float = Field(default=0.0, description="Longest duration in seconds")
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+
+class LLMUsageStats(BaseModel):
+    """Token usage and streaming speed of the LLM calls of a single
+    agent."""
+
+    calls: int = Field(default=0, description="Number of LLM calls")
+    prompt_tokens: int = Field(default=0, description="Prompt tokens reported by the LLM")
+    completion_tokens: int = Field(default=0, description="Completion tokens reported by the LLM")
+    total_tokens: int = Field(default=0, description="Total tokens reported by the LLM")
+    time_to_first_token: SpanStats = Field(
+        default_factory=SpanStats, description="Time from sending a request to the first streamed token"
+    )
+    generation_seconds: float = Field(
+        default=0.0, description="Time from the first to the last token of calls with reported usage"
+    )
+    generated_tokens: int = Field(default=0, description="Completion tokens of calls included in generation_seconds")
+
+    @computed_field
+    @property
+    def tokens_per_second(self) -> float:
+        return self.generated_tokens / self.generation_seconds if self.generation_seconds else 0.0
+
+
 class AgentStatesEnum(str, Enum):
     INITED = "inited"
     RESEARCHING = "researching"
@@ -57,8 +105,21 @@ class AgentContext(BaseModel):
     sources: dict[str, SourceData] = Field(default_factory=dict, description="Dictionary of found sources")
 
     searches_used: int = Field(default=0, description="Number of searches performed")
+    search_cache: SearchCacheStats = Field(
+        default_factory=SearchCacheStats, description="Search result cache usage statistics"
+    )
+
+    context_tokens: int = Field(default=0, description="Tokens in the LLM context after the last eviction check")
+    context_tokens_saved: dict[str, int] = Field(
+        default_factory=dict, description="Total context tokens saved by each eviction policy"
+    )
 
     clarifications_used: int = Field(default=0, description="Number of clarifications requested")
+
+    usage: LLMUsageStats = Field(default_factory=LLMUsageStats, description="LLM token usage and streaming speed")
+    timings: dict[str, SpanStats] = Field(
+        default_factory=dict, description="Durations of agent phases, tool calls and LLM streams by span name"
+    )
     clarification_received: asyncio.Event = Field(
         default_factory=asyncio.Event, description="Event for clarification synchronization"
     )
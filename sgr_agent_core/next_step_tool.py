@@ -2,13 +2,19 @@ from __future__ import annotations
 
 import logging
 import operator
+import threading
+import weakref
 from abc import ABC
+from collections import OrderedDict
 from functools import reduce
-from typing import Annotated, Literal, Type, TypeVar
+from typing import Annotated, ClassVar, Literal, NamedTuple, Type, TypeVar
 
+from openai import pydantic_function_tool
+from openai.types.shared_params import ResponseFormatJSONSchema
 from pydantic import BaseModel, Field, create_model
 
 from sgr_agent_core.base_tool import BaseTool
+from sgr_agent_core.services.registry import ToolRegistry
 from sgr_agent_core.tools.reasoning_tool import ReasoningTool
 
 logger = logging.getLogger(__name__)
@@ -33,9 +39,32 @@ class DiscriminantToolMixin(BaseModel):
         return super().model_dump(*args, exclude=exclude, **kwargs)
 
 
+class NextStepToolsCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
 class NextStepToolsBuilder:
     """SGR Core - Builder for NextStepTool with a dynamic union tool function type on
-    pydantic models level."""
+    pydantic models level.
+
+    Built models are kept in a process-wide LRU cache keyed by the set of
+    tool classes, so agents re-selecting the same toolkit subset on every
+    iteration do not rebuild pydantic models. The cache is dropped whenever
+    ToolRegistry changes. The strict JSON schema response format of each
+    model is generated once and kept for as long as the model lives.
+    """
+
+    cache_maxsize: ClassVar[int] = 128
+
+    _cache: ClassVar[OrderedDict[frozenset[type], Type[NextStepToolStub]]] = OrderedDict()
+    _cache_lock: ClassVar[threading.Lock] = threading.Lock()
+    _cache_hits: ClassVar[int] = 0
+    _cache_misses: ClassVar[int] = 0
+    _cache_registry_version: ClassVar[int] = -1
+    _response_formats: ClassVar[weakref.WeakKeyDictionary[type, ResponseFormatJSONSchema]] = weakref.WeakKeyDictionary()
 
     @classmethod
     def _create_discriminant_tool(cls, tool_class: Type[T]) -> Type[BaseModel]:
@@ -45,6 +74,7 @@ class NextStepToolsBuilder:
         return create_model(  # noqa
             f"D_{tool_class.__name__}",
             __base__=(tool_class, DiscriminantToolMixin),  # the order matters here
+            __cls_kwargs__={"register": False},
             tool_name_discriminator=(Literal[tool_class.tool_name], Field(..., description="Tool name discriminator")),
         )
 
@@ -60,8 +90,62 @@ class NextStepToolsBuilder:
 
     @classmethod
     def build_NextStepTools(cls, tools_list: list[Type[T]]) -> Type[NextStepToolStub]:  # noqa
-        return create_model(
-            "NextStepTools",
-            __base__=NextStepToolStub,
-            function=(cls._create_tool_types_union(tools_list), Field()),
-        )
+        """Get the NextStepTools model for the toolkit subset, building it on
+        cache miss."""
+        key = frozenset(tools_list)
+        with cls._cache_lock:
+            if cls._cache_registry_version != ToolRegistry.version():
+                cls._cache.clear()
+                cls._cache_registry_version = ToolRegistry.version()
+            model = cls._cache.get(key)
+            if model is not None:
+                cls._cache.move_to_end(key)
+                cls._cache_hits += 1
+                return model
+            cls._cache_misses += 1
+            model = create_model(
+                "NextStepTools",
+                __base__=NextStepToolStub,
+                __cls_kwargs__={"register": False},
+                function=(cls._create_tool_types_union(tools_list), Field()),
+            )
+            cls._cache[key] = model
+            while len(cls._cache) > cls.cache_maxsize:
+                cls._cache.popitem(last=False)
+            logger.debug(f"Built NextStepTools for {sorted(tool.tool_name for tool in key)}")
+            return model
+
+    @classmethod
+    def get_response_format(cls, model: Type[BaseModel]) -> ResponseFormatJSONSchema:
+        """Get the strict JSON schema response format for the model.
+
+        The schema is generated on the first call for a model and reused
+        after, so the SDK does not regenerate it on every LLM call.
+        """
+        with cls._cache_lock:
+            response_format = cls._response_formats.get(model)
+            if response_format is None:
+                response_format = cls._response_formats[model] = {
+                    "type": "json_schema",
+                    "json_schema": {
+                        "name": model.__name__,
+                        "schema": pydantic_function_tool(model)["function"]["parameters"],
+                        "strict": True,
+                    },
+                }
+            return response_format
+
+    @classmethod
+    def cache_info(cls) -> NextStepToolsCacheInfo:
+        """Get NextStepTools cache statistics."""
+        with cls._cache_lock:
+            return NextStepToolsCacheInfo(cls._cache_hits, cls._cache_misses, cls.cache_maxsize, len(cls._cache))
+
+    @classmethod
+    def cache_clear(cls) -> None:
+        """Drop all cached models and reset statistics."""
+        with cls._cache_lock:
+            cls._cache.clear()
+            cls._response_formats.clear()
+            cls._cache_hits = 0
+            cls._cache_misses = 0
@@ -1,17 +1,23 @@
 """Main entry point for SGR Agent Core API server."""
 
 import logging
+import os
 from pathlib import Path
 
 import uvicorn
 import yaml
+from fastapi import FastAPI
 
 from sgr_agent_core.agent_config import GlobalConfig
 from sgr_agent_core.server.app import app
+from sgr_agent_core.server.endpoints import agent_cluster, agent_scheduler, agents_storage
 from sgr_agent_core.server.settings import ServerConfig, setup_logging
+from sgr_agent_core.services.shared_state import SQLiteSharedStateBackend
 
 logger = logging.getLogger(__name__)
 
+WORKER_ARGS_ENV = "SGR_SERVER_WORKER_ARGS"
+
 
 def load_config(config_file: str, agents_file: str | None = None) -> GlobalConfig:
     """Load configuration and agents from YAML files.
@@ -46,15 +52,62 @@ def load_config(config_file: str, agents_file: str | None = None) -> GlobalConfi
     return config
 
 
-def main():
-    """Start FastAPI server."""
-    args = ServerConfig()
+def configure_server(args: ServerConfig) -> FastAPI:
+    """Load configuration and set up agent storage for a server process.
 
+    Args:
+        args: Server settings
+
+    Returns:
+        Configured FastAPI application
+    """
     setup_logging(args.logging_file)
 
     load_config(args.config_file, args.agents_file)
+    agents_storage.configure(
+        ttl=args.agents_ttl,
+        max_agents=args.agents_max_count,
+        max_memory_bytes=args.agents_memory_budget_mb * 1024 * 1024,
+        sweep_interval=args.agents_sweep_interval,
+    )
+    agent_scheduler.configure(
+        max_running=args.max_running_agents,
+        max_running_per_definition=args.max_running_per_agent,
+        max_queue=args.max_queued_agents,
+        queue_timeout=args.queue_timeout,
+        max_priority=args.max_request_priority,
+    )
+    if args.shared_state_path:
+        agent_cluster.configure(SQLiteSharedStateBackend(args.shared_state_path))
+    return app
+
+
+def create_worker_app() -> FastAPI:
+    """Application factory for worker processes started by uvicorn in
+    multi-worker mode."""
+    return configure_server(ServerConfig.model_validate_json(os.environ[WORKER_ARGS_ENV]))
+
+
+def main():
+    """Start FastAPI server."""
+    args = ServerConfig()
 
-    uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+    if args.workers > 1:
+        if not args.shared_state_path:
+            raise ValueError("--shared-state-path is required when running more than one worker")
+        # Each worker process loads its own configuration through the factory
+        os.environ[WORKER_ARGS_ENV] = args.model_dump_json()
+        uvicorn.run(
+            "sgr_agent_core.server.__main__:create_worker_app",
+            factory=True,
+            workers=args.workers,
+            host=args.host,
+            port=args.port,
+            log_level="info",
+        )
+        return
+
+    uvicorn.run(configure_server(args), host=args.host, port=args.port, log_level="info")
 
 
 if __name__ == "__main__":
@@ -1,13 +1,15 @@
 """FastAPI application instance creation and configuration."""
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from sgr_agent_core import AgentFactory, AgentRegistry, ToolRegistry, __version__
-from sgr_agent_core.server.endpoints import router
+from sgr_agent_core import AgentFactory, AgentRegistry, MCP2ToolConverter, ToolRegistry, __version__
+from sgr_agent_core.server.endpoints import agent_cluster, agents_storage, router
+from sgr_agent_core.services import AgentLogWriter, MCPSession, OpenAIClientPool, TavilySearchService
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +22,20 @@ async def lifespan(_: FastAPI):
         logger.info(f"Agent registered: {agent.__name__}")
     for defn in AgentFactory.get_definitions_list():
         logger.info(f"Agent definition loaded: {defn}")
+    agents_storage.start_sweeper()
+    agent_cluster.start(agents_storage)
+    # Discover MCP tools before the first request needs them
+    mcp_prefetch = asyncio.create_task(
+        MCP2ToolConverter.prefetch([defn.mcp for defn in AgentFactory.get_definitions_list()])
+    )
     yield
+    mcp_prefetch.cancel()
+    await agent_cluster.stop()
+    await agents_storage.stop_sweeper()
+    await OpenAIClientPool.aclose()
+    await TavilySearchService.aclose_shared()
+    await MCPSession.aclose_shared()
+    await AgentLogWriter.aflush()
 
 
 app = FastAPI(title="SGR Agent Core API", version=__version__, lifespan=lifespan)
@@ -0,0 +1,187 @@
+"""Coordination of agents across several server workers."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import TYPE_CHECKING, AsyncIterator
+
+from sgr_agent_core.models import AgentStatesEnum
+from sgr_agent_core.services.shared_state import AgentSnapshot, SharedStateBackend
+
+if TYPE_CHECKING:
+    from sgr_agent_core.base_agent import BaseAgent
+    from sgr_agent_core.services.agent_store import AgentStore
+
+logger = logging.getLogger(__name__)
+
+
+class AgentCluster:
+    """Runs agents of this worker in multi-worker mode.
+
+    Disabled until a SharedStateBackend is configured. When enabled,
+    every agent registered on this worker gets a pump task that publishes
+    its stream chunks to the shared backend and persists snapshots of its
+    context and conversation, so any worker can serve the stream and the
+    agent state. Commands for agents owned by this worker (clarifications,
+    cancellation) are received by a background listener. When the owning
+    worker evicts an agent, its snapshot is marked as evicted.
+    """
+
+    def __init__(
+        self,
+        backend: SharedStateBackend | None = None,
+        worker_id: str | None = None,
+        snapshot_interval: float = 1.0,
+        event_retention: float = 3600.0,
+    ):
+        self.backend = backend
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.snapshot_interval = snapshot_interval
+        self.event_retention = event_retention
+        self.agents_storage: AgentStore | None = None
+        self._pumps: dict[str, asyncio.Task] = {}
+        self._eviction_saves: set[asyncio.Task] = set()
+        self._listener_task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def configure(self, backend: SharedStateBackend | None, worker_id: str | None = None) -> None:
+        """Enable multi-worker mode with a shared backend, or disable it with
+        None."""
+        self.backend = backend
+        if worker_id:
+            self.worker_id = worker_id
+
+    async def save_snapshot(self, agent: BaseAgent) -> None:
+        await self.backend.save_snapshot(AgentSnapshot.from_agent(agent, worker_id=self.worker_id))
+
+    def _mark_evicted(self, agent: BaseAgent) -> None:
+        snapshot = AgentSnapshot.from_agent(agent, worker_id=self.worker_id, evicted=True)
+        task = asyncio.create_task(self.backend.save_snapshot(snapshot))
+        self._eviction_saves.add(task)
+        task.add_done_callback(self._eviction_saves.discard)
+
+    async def load_snapshot(self, agent_id: str) -> AgentSnapshot | None:
+        return await self.backend.load_snapshot(agent_id)
+
+    async def register(self, agent: BaseAgent) -> int:
+        """Start publishing stream and snapshots of a local agent.
+
+        Returns:
+            Event ID to subscribe after to receive the agent stream
+        """
+        after, _ = await self.backend.last_event(agent.id)
+        await self.save_snapshot(agent)
+        self._pumps[agent.id] = asyncio.create_task(self._pump(agent))
+        return after
+
+    async def _pump(self, agent: BaseAgent) -> None:
+        last_snapshot = time.monotonic()
+        try:
+            while True:
+                async for chunk in agent.streaming_generator.stream():
+                    await self.backend.publish(agent.id, chunk)
+                    if time.monotonic() - last_snapshot >= self.snapshot_interval:
+                        await self.save_snapshot(agent)
+                        last_snapshot = time.monotonic()
+                # The snapshot is saved before the end marker so that state is
+                # up to date for anyone reacting to the end of the segment
+                await self.save_snapshot(agent)
+                await self.backend.publish(agent.id, None)
+                if agent._context.state in AgentStatesEnum.FINISH_STATES.value:
+                    break
+        except Exception as e:
+            logger.error(f"Stream publishing failed for agent {agent.id}: {e}", exc_info=True)
+        finally:
+            self._pumps.pop(agent.id, None)
+
+    async def resume_offset(self, agent_id: str, timeout: float = 5.0, poll_interval: float = 0.05) -> int:
+        """Get the event ID to subscribe after for the stream continuing a
+        paused agent.
+
+        The agent state switches to waiting for clarification slightly
+        before its pump publishes the end of the stream segment, so this
+        waits for the end marker to avoid replaying the previous segment.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            event_id, segment_ended = await self.backend.last_event(agent_id)
+            if segment_ended or time.monotonic() >= deadline:
+                return event_id
+            await asyncio.sleep(poll_interval)
+
+    def subscribe(self, agent_id: str, after: int = 0) -> AsyncIterator[str]:
+        """Stream chunks of an agent running on any worker."""
+        return self.backend.subscribe(agent_id, after=after)
+
+    async def subscribe_latest(self, agent_id: str) -> AsyncIterator[str]:
+        """Stream the latest segment of an agent from its start."""
+        async for chunk in self.backend.subscribe(agent_id, after=await self.backend.segment_start(agent_id)):
+            yield chunk
+
+    async def send_command(self, snapshot: AgentSnapshot, command: str, payload: dict | None = None) -> None:
+        """Route a command to the worker owning an agent."""
+        await self.backend.send_command(snapshot.worker_id, snapshot.agent_id, command, payload)
+        logger.info(f"Routed '{command}' for agent {snapshot.agent_id} to worker {snapshot.worker_id}")
+
+    async def delete_agent(self, agent_id: str) -> None:
+        await self.backend.delete_agent(agent_id)
+
+    async def _handle_command(self, agent_id: str, command: str, payload: dict) -> None:
+        agent = self.agents_storage.get(agent_id) if self.agents_storage is not None else None
+        if agent is None:
+            logger.warning(f"Received '{command}' for unknown agent {agent_id}")
+            return
+        if command == "clarification":
+            await agent.provide_clarification(payload["messages"])
+        elif command == "cancel":
+            await agent.cancel()
+        elif command == "delete":
+            await agent.cancel()
+            del self.agents_storage[agent_id]
+            await self.delete_agent(agent_id)
+        else:
+            logger.warning(f"Unknown command '{command}' for agent {agent_id}")
+
+    async def _listen(self, poll_interval: float) -> None:
+        last_prune = time.monotonic()
+        while True:
+            try:
+                for agent_id, command, payload in await self.backend.receive_commands(self.worker_id):
+                    await self._handle_command(agent_id, command, payload)
+                if time.monotonic() - last_prune >= self.event_retention:
+                    await self.backend.prune(self.event_retention)
+                    last_prune = time.monotonic()
+            except Exception as e:
+                logger.error(f"Command handling failed on worker {self.worker_id}: {e}", exc_info=True)
+            await asyncio.sleep(poll_interval)
+
+    def start(self, agents_storage: AgentStore, poll_interval: float = 0.05) -> None:
+        """Start receiving commands for agents stored in agents_storage."""
+        self.agents_storage = agents_storage
+        if not self.enabled:
+            return
+        agents_storage.on_evict = self._mark_evicted
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen(poll_interval))
+            logger.info(f"Multi-worker mode enabled, worker {self.worker_id}")
+
+    async def stop(self) -> None:
+        """Stop the command listener and stream publishing tasks and close
+        the shared backend."""
+        tasks = [*self._pumps.values(), *([self._listener_task] if self._listener_task else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._listener_task = None
+        self._pumps.clear()
+        # Evicted snapshots are written before the backend is closed
+        await asyncio.gather(*self._eviction_saves, return_exceptions=True)
+        if self.backend is not None:
+            await self.backend.aclose()
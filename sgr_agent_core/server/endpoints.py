@@ -1,10 +1,11 @@
 import asyncio
 import logging
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
-from sgr_agent_core import AgentFactory, AgentStatesEnum, BaseAgent
+from sgr_agent_core import AgentFactory, AgentStatesEnum
+from sgr_agent_core.server.cluster import AgentCluster
 from sgr_agent_core.server.models import (
     AgentCancelResponse,
     AgentDeleteResponse,
@@ -15,13 +16,33 @@ from sgr_agent_core.server.models import (
     ClarificationRequest,
     HealthResponse,
 )
+from sgr_agent_core.server.scheduler import AgentScheduler, SchedulerBusyError
+from sgr_agent_core.services.agent_store import AgentStore
+from sgr_agent_core.services.metrics import MetricsRegistry, format_metric
+from sgr_agent_core.services.openai_client_pool import OpenAIClientPool
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# ToDo: better to move to a separate service
-agents_storage: dict[str, BaseAgent] = {}
+agents_storage = AgentStore()
+# Multi-worker mode, enabled when a shared state backend is configured
+agent_cluster = AgentCluster()
+# Caps running agents and queues requests above the caps
+agent_scheduler = AgentScheduler()
+
+
+def _streaming_response(stream, agent_id: str, **headers: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Agent-ID": str(agent_id),
+            **headers,
+        },
+    )
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -29,10 +50,46 @@ async def health_check():
     return HealthResponse()
 
 
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus metrics: agents by state, agent phase and LLM timings,
+    token usage, scheduler queue and pooled LLM connections."""
+    states: dict[tuple, float] = {}
+    for agent in agents_storage.values():
+        key = (("state", agent._context.state.value),)
+        states[key] = states.get(key, 0) + 1
+    connections = {
+        metric: {
+            (("base_url", base_url),): stats[metric] for base_url, stats in OpenAIClientPool.connection_stats().items()
+        }
+        for metric in ("clients", "connections", "idle_connections")
+    }
+    text = "".join(
+        [
+            format_metric("sgr_agents", "gauge", "Agents kept in storage by state", states),
+            MetricsRegistry.render(),
+            agent_scheduler.render_metrics(),
+            format_metric("sgr_llm_clients", "gauge", "Pooled LLM clients", connections["clients"]),
+            format_metric("sgr_llm_connections", "gauge", "Open LLM connections", connections["connections"]),
+            format_metric(
+                "sgr_llm_idle_connections", "gauge", "Idle keep-alive LLM connections", connections["idle_connections"]
+            ),
+        ]
+    )
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
+
 @router.get("/agents/{agent_id}/state", response_model=AgentStateResponse)
 async def get_agent_state(agent_id: str):
     if agent_id not in agents_storage:
-        raise HTTPException(status_code=404, detail="Agent not found")
+        # Evicted agents keep a summary of their final state
+        summary = agents_storage.get_summary(agent_id)
+        if summary is None and agent_cluster.enabled:
+            # The agent may run on another worker
+            summary = await agent_cluster.load_snapshot(agent_id)
+        if summary is None:
+            raise HTTPException(status_code=404, detail="Agent not found")
+        return AgentStateResponse(**summary.model_dump(exclude={"creation_time", "worker_id", "conversation"}))
 
     agent = agents_storage[agent_id]
 
@@ -61,7 +118,17 @@ async def cancel_agent(agent_id: str):
         HTTPException: 404 if agent not found
     """
     if agent_id not in agents_storage:
-        raise HTTPException(status_code=404, detail="Agent not found")
+        # Evicted agents are already finished and cannot be cancelled
+        summary = agents_storage.get_summary(agent_id)
+        if summary is None and agent_cluster.enabled:
+            snapshot = await agent_cluster.load_snapshot(agent_id)
+            if snapshot is not None and snapshot.state not in AgentStatesEnum.FINISH_STATES.value:
+                await agent_cluster.send_command(snapshot, "cancel")
+                return AgentCancelResponse(agent_id=agent_id, cancelled=True, state=snapshot.state)
+            summary = snapshot
+        if summary is None:
+            raise HTTPException(status_code=404, detail="Agent not found")
+        return AgentCancelResponse(agent_id=agent_id, cancelled=False, state=summary.state)
 
     agent = agents_storage[agent_id]
 
@@ -97,7 +164,16 @@ async def delete_agent(agent_id: str):
         HTTPException: 404 if agent not found
     """
     if agent_id not in agents_storage:
-        raise HTTPException(status_code=404, detail="Agent not found")
+        # Deleting an evicted agent drops its summary
+        summary = agents_storage.remove_summary(agent_id)
+        if summary is None and agent_cluster.enabled:
+            summary = await agent_cluster.load_snapshot(agent_id)
+            if summary is not None:
+                # The owning worker cancels the agent and drops its shared state
+                await agent_cluster.send_command(summary, "delete")
+        if summary is None:
+            raise HTTPException(status_code=404, detail="Agent not found")
+        return AgentDeleteResponse(agent_id=agent_id, deleted=True, final_state=summary.state)
 
     agent = agents_storage[agent_id]
 
@@ -109,6 +185,8 @@ async def delete_agent(agent_id: str):
 
     # Remove from storage
     del agents_storage[agent_id]
+    if agent_cluster.enabled:
+        await agent_cluster.delete_agent(agent_id)
     logger.info(f"Agent {agent_id} deleted with final state: {final_state}")
 
     return AgentDeleteResponse(
@@ -153,27 +231,63 @@ async def get_available_models():
 async def provide_clarification(agent_id: str, request: ClarificationRequest):
     try:
         agent = agents_storage.get(agent_id)
+        if not agent and agent_cluster.enabled:
+            # Route the clarification to the worker owning the agent
+            snapshot = await agent_cluster.load_snapshot(agent_id)
+            if snapshot is None:
+                raise HTTPException(status_code=404, detail="Agent not found")
+            after = await agent_cluster.resume_offset(agent_id)
+            await agent_cluster.send_command(snapshot, "clarification", {"messages": request.messages})
+            return _streaming_response(agent_cluster.subscribe(agent_id, after=after), agent_id)
         if not agent:
             raise HTTPException(status_code=404, detail="Agent not found")
 
         logger.info(f"Providing clarification to agent {agent.id}: {len(request.messages)} messages")
 
+        if agent_cluster.enabled:
+            after = await agent_cluster.resume_offset(agent.id)
+            await agent.provide_clarification(request.messages)
+            return _streaming_response(agent_cluster.subscribe(agent.id, after=after), agent.id)
+
         await agent.provide_clarification(request.messages)
-        return StreamingResponse(
-            agent.streaming_generator.stream(),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Agent-ID": str(agent.id),
-            },
-        )
+        return _streaming_response(agent.streaming_generator.stream(), agent.id)
 
     except Exception as e:
         logger.error(f"Error completion: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _get_agent_state_value(agent_id: str) -> str | None:
+    """Get the current state of a local agent or, in multi-worker mode, of
+    an agent running on another worker."""
+    if agent_id in agents_storage:
+        return agents_storage[agent_id]._context.state.value
+    if agent_cluster.enabled:
+        snapshot = await agent_cluster.load_snapshot(agent_id)
+        return snapshot.state if snapshot is not None else None
+    return None
+
+
+@router.get("/agents/{agent_id}/stream")
+async def stream_agent(agent_id: str, last_event_id: str | None = Header(default=None)):
+    """Subscribe to the stream of an agent.
+
+    Any number of clients can subscribe at once. Without Last-Event-ID
+    the latest stream segment (since the start or the last
+    clarification) is replayed from its beginning; with it, the stream
+    resumes after that event. Chunks carry SSE ids for reconnects. In
+    multi-worker mode agents running on other workers are streamed from
+    the shared channel.
+    """
+    agent = agents_storage.get(agent_id)
+    if agent is not None:
+        after = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+        return _streaming_response(agent.streaming_generator.subscribe(after=after, with_ids=True), agent_id)
+    if agent_cluster.enabled and await agent_cluster.load_snapshot(agent_id) is not None:
+        return _streaming_response(agent_cluster.subscribe_latest(agent_id), agent_id)
+    raise HTTPException(status_code=404, detail="Agent not found")
+
+
 def _is_agent_id(model_str: str) -> bool:
     """Check if the model string is an agent ID (contains underscore and UUID-
     like format)."""
@@ -190,8 +304,7 @@ async def create_chat_completion(request: ChatCompletionRequest):
         request.model
         and isinstance(request.model, str)
         and _is_agent_id(request.model)
-        and request.model in agents_storage
-        and agents_storage[request.model]._context.state == AgentStatesEnum.WAITING_FOR_CLARIFICATION
+        and await _get_agent_state_value(request.model) == AgentStatesEnum.WAITING_FOR_CLARIFICATION.value
     ):
         return await provide_clarification(
             agent_id=request.model,
@@ -206,21 +319,31 @@ async def create_chat_completion(request: ChatCompletionRequest):
                 detail=f"Invalid model '{request.model}'. "
                 f"Available models: {[ad.name for ad in AgentFactory.get_definitions_list()]}",
             )
-        agent = await AgentFactory.create(agent_def, request.messages.root)
-        logger.info(f"Created agent '{request.model}' with {len(request.messages)} messages")
-
-        agents_storage[agent.id] = agent
-        asyncio.create_task(agent.execute())  # Starts execution, task stored in agent._execute_task
-        return StreamingResponse(
-            agent.streaming_generator.stream(),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Agent-ID": str(agent.id),
-                "X-Agent-Model": request.model,
-            },
-        )
+        priority = agent_scheduler.clamp_priority(request.priority)
+        try:
+            await agent_scheduler.acquire(agent_def.name, priority)
+        except SchedulerBusyError as e:
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=f"Server is busy: {e}",
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        try:
+            agent = await AgentFactory.create(agent_def, request.messages.root)
+            logger.info(f"Created agent '{request.model}' with {len(request.messages)} messages")
+
+            agents_storage[agent.id] = agent
+            stream = agent.streaming_generator.stream()
+            if agent_cluster.enabled:
+                # Chunks go through the shared channel so any worker can serve them
+                stream = agent_cluster.subscribe(agent.id, after=await agent_cluster.register(agent))
+        except BaseException:
+            agent_scheduler.release(agent_def.name)
+            raise
+        # Starts execution, task stored in agent._execute_task; the slot is released when it finishes
+        # and while the agent waits for clarification
+        asyncio.create_task(agent_scheduler.run(agent_def.name, agent.execute(), agent=agent, priority=priority))
+        return _streaming_response(stream, agent.id, **{"X-Agent-Model": request.model})
 
     except ValueError as e:
         logger.error(f"Error completion: {e}", exc_info=True)
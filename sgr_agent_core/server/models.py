@@ -7,6 +7,8 @@ from typing import Any, ClassVar, Literal
 from openai.types.chat import ChatCompletionMessageParam
 from pydantic import BaseModel, Field, RootModel, field_serializer, field_validator
 
+from sgr_agent_core.models import LLMUsageStats, SearchCacheStats, SpanStats
+
 
 class MessagesList(RootModel[list[ChatCompletionMessageParam]]):
     """Root model for list of chat completion messages."""
@@ -69,6 +71,7 @@ class ChatCompletionRequest(BaseModel):
     stream: bool = Field(default=True, description="Enable streaming mode")
     max_tokens: int | None = Field(default=1500, description="Maximum number of tokens")
     temperature: float | None = Field(default=0, description="Generation temperature")
+    priority: int = Field(default=0, description="Scheduling priority, higher is admitted first when agents queue")
 
 
 class ChatCompletionChoice(BaseModel):
@@ -101,10 +104,18 @@ class AgentStateResponse(BaseModel):
     state: str = Field(description="Current agent state")
     iteration: int = Field(description="Current iteration number")
     searches_used: int = Field(description="Number of searches performed")
+    search_cache: SearchCacheStats = Field(
+        default_factory=SearchCacheStats, description="Search result cache usage statistics"
+    )
     clarifications_used: int = Field(description="Number of clarifications requested")
     sources_count: int = Field(description="Number of sources found")
     current_step_reasoning: dict[str, Any] | None = Field(default=None, description="Current agent step")
     execution_result: str | None = Field(default=None, description="Execution result")
+    usage: LLMUsageStats = Field(default_factory=LLMUsageStats, description="LLM token usage and streaming speed")
+    timings: dict[str, SpanStats] = Field(
+        default_factory=dict, description="Durations of agent phases, tool calls and LLM streams by span name"
+    )
+    evicted: bool = Field(default=False, description="Agent was evicted from storage, only its summary is kept")
 
 
 class AgentListItem(BaseModel):
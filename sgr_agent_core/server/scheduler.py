@@ -0,0 +1,231 @@
+"""Admission control for agents started by the API server."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import itertools
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Awaitable, TypeVar
+
+if TYPE_CHECKING:
+    from sgr_agent_core.base_agent import BaseAgent
+
+from sgr_agent_core.services.metrics import MetricsRegistry, format_metric
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SchedulerBusyError(Exception):
+    """Raised when an agent cannot be admitted.
+
+    Attributes:
+        status_code: 429 when the wait queue is full, 503 when waiting timed out
+        retry_after: Suggested seconds before retrying
+    """
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+@dataclass(order=True)
+class _Waiter:
+    sort_key: tuple[int, int, int]
+    definition: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued: float = field(compare=False, default_factory=time.monotonic)
+
+
+class AgentScheduler:
+    """Caps the number of running agents and queues the rest by priority.
+
+    An agent is admitted while fewer than ``max_running`` agents run in
+    total and fewer than ``max_running_per_definition`` run for its agent
+    definition. Otherwise the request waits in a queue of at most
+    ``max_queue`` entries, ordered by priority and then arrival, for up to
+    ``queue_timeout`` seconds. Requests that cannot be queued or waited
+    too long are rejected with SchedulerBusyError carrying a Retry-After
+    estimate based on recent agent run times.
+
+    Agents waiting for clarification give their slot back and queue for
+    it again, ahead of new requests, once the clarification arrives.
+    Request priorities are capped at ``max_priority``, so clients cannot
+    jump the queue unless the server allows it.
+    """
+
+    def __init__(
+        self,
+        max_running: int = 64,
+        max_running_per_definition: int | None = None,
+        max_queue: int = 256,
+        queue_timeout: float = 60.0,
+        max_priority: int = 0,
+    ):
+        self.max_running = max_running
+        self.max_running_per_definition = max_running_per_definition
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_priority = max_priority
+        self.running: dict[str, int] = {}
+        self._queue: list[_Waiter] = []
+        self._counter = itertools.count()
+        # Moving average of agent run durations for Retry-After estimates
+        self._avg_run_seconds = 10.0
+
+    def configure(
+        self,
+        max_running: int,
+        max_running_per_definition: int | None = None,
+        max_queue: int = 256,
+        queue_timeout: float = 60.0,
+        max_priority: int = 0,
+    ) -> None:
+        self.max_running = max_running
+        self.max_running_per_definition = max_running_per_definition
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_priority = max_priority
+
+    @property
+    def running_total(self) -> int:
+        return sum(self.running.values())
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def _has_capacity(self, definition: str) -> bool:
+        if self.running_total >= self.max_running:
+            return False
+        limit = self.max_running_per_definition
+        return limit is None or self.running.get(definition, 0) < limit
+
+    def clamp_priority(self, priority: int) -> int:
+        """Cap a client supplied priority at ``max_priority``."""
+        return min(priority, self.max_priority)
+
+    def _start(self, definition: str) -> None:
+        self.running[definition] = self.running.get(definition, 0) + 1
+
+    def retry_after(self) -> int:
+        """Estimate seconds until a new request could be admitted."""
+        waves = (len(self._queue) + 1) / self.max_running
+        return max(1, math.ceil(self._avg_run_seconds * waves))
+
+    def _reject(self, message: str, status_code: int, reason: str) -> SchedulerBusyError:
+        MetricsRegistry.inc("sgr_scheduler_rejected_total", reason=reason)
+        logger.warning(f"⚠️ Agent rejected: {message}")
+        return SchedulerBusyError(message, status_code=status_code, retry_after=self.retry_after())
+
+    async def acquire(self, definition: str, priority: int = 0, resume: bool = False) -> None:
+        """Wait for a slot to run an agent of the definition.
+
+        Args:
+            definition: Agent definition name
+            priority: Higher priorities are admitted first
+            resume: The agent was already running and resumes after a
+                clarification; it is queued ahead of new requests and is
+                never rejected
+
+        Raises:
+            SchedulerBusyError: The queue is full or the wait timed out
+        """
+        if self._has_capacity(definition):
+            # Queued waiters are blocked by their own definition caps only
+            self._start(definition)
+            MetricsRegistry.observe("sgr_scheduler_wait_seconds", 0.0, agent=definition)
+            return
+        if not resume and len(self._queue) >= self.max_queue:
+            raise self._reject(f"queue is full ({self.max_queue} waiting)", status_code=429, reason="queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = _Waiter((0 if resume else 1, -priority, next(self._counter)), definition, future)
+        bisect.insort(self._queue, waiter)
+        try:
+            await asyncio.wait_for(waiter.future, None if resume else self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was granted while the waiter gave up
+                self.release(definition)
+            elif waiter in self._queue:
+                self._queue.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._reject(
+                    f"waited longer than {self.queue_timeout:g}s", status_code=503, reason="timeout"
+                ) from None
+            raise
+        MetricsRegistry.observe("sgr_scheduler_wait_seconds", time.monotonic() - waiter.enqueued, agent=definition)
+
+    def release(self, definition: str) -> None:
+        """Free the slot of a finished agent and admit queued ones."""
+        count = self.running.get(definition, 0) - 1
+        if count > 0:
+            self.running[definition] = count
+        else:
+            self.running.pop(definition, None)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        for waiter in list(self._queue):
+            if self.running_total >= self.max_running:
+                break
+            if waiter.future.done() or not self._has_capacity(waiter.definition):
+                continue
+            self._queue.remove(waiter)
+            self._start(waiter.definition)
+            waiter.future.set_result(None)
+
+    async def run(
+        self, definition: str, agent_run: Awaitable[T], agent: BaseAgent | None = None, priority: int = 0
+    ) -> T:
+        """Run an admitted agent and release its slot when it finishes.
+
+        When the agent is given, its slot is released while it waits for
+        clarification and acquired again before it resumes. Time spent
+        waiting is left out of the run time average.
+        """
+        started = time.monotonic()
+        holding = True
+        paused_at = 0.0
+        paused_seconds = 0.0
+
+        async def on_wait() -> None:
+            nonlocal holding, paused_at
+            paused_at = time.monotonic()
+            holding = False
+            self.release(definition)
+
+        async def on_resume() -> None:
+            nonlocal holding, paused_seconds
+            await self.acquire(definition, priority, resume=True)
+            holding = True
+            paused_seconds += time.monotonic() - paused_at
+
+        if agent is not None:
+            agent.on_clarification_wait = on_wait
+            agent.on_clarification_resume = on_resume
+        try:
+            return await agent_run
+        finally:
+            if holding:
+                run_seconds = time.monotonic() - started - paused_seconds
+                self._avg_run_seconds = 0.9 * self._avg_run_seconds + 0.1 * run_seconds
+                self.release(definition)
+
+    def render_metrics(self) -> str:
+        """Prometheus gauges of running and queued agents."""
+        queued: dict[tuple, float] = {}
+        for waiter in self._queue:
+            key = (("agent", waiter.definition),)
+            queued[key] = queued.get(key, 0) + 1
+        running = {(("agent", definition),): count for definition, count in self.running.items()}
+        return format_metric(
+            "sgr_scheduler_running_agents", "gauge", "Agents holding a scheduler slot", running
+        ) + format_metric("sgr_scheduler_queue_depth", "gauge", "Agents waiting for a scheduler slot", queued)
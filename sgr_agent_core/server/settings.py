@@ -17,6 +17,29 @@ class ServerConfig(BaseSettings):
     agents_file: str | None = Field(default=None, description="Optional agents definitions file path")
     host: str = Field(default="0.0.0.0", description="Host to listen on")
     port: int = Field(default=8010, gt=0, le=65535, description="Port to listen on")
+    agents_ttl: float = Field(default=3600.0, gt=0, description="Seconds before an idle finished agent is evicted")
+    agents_max_count: int = Field(default=1000, gt=0, description="Maximum number of agents kept in memory")
+    agents_memory_budget_mb: int = Field(default=512, gt=0, description="Estimated memory budget for stored agents")
+    agents_sweep_interval: float = Field(default=30.0, gt=0, description="Seconds between agent eviction sweeps")
+    max_running_agents: int = Field(default=64, gt=0, description="Maximum agents running at once")
+    max_running_per_agent: int | None = Field(
+        default=None, gt=0, description="Maximum running agents of one agent definition, None for no separate cap"
+    )
+    max_queued_agents: int = Field(
+        default=256, ge=0, description="Maximum requests waiting for a free slot, more are rejected with 429"
+    )
+    queue_timeout: float = Field(
+        default=60.0, gt=0, description="Seconds a request waits for a free slot before it is rejected with 503"
+    )
+    max_request_priority: int = Field(
+        default=0, ge=0, description="Highest scheduling priority a request may ask for, higher values are capped"
+    )
+    workers: int = Field(default=1, gt=0, description="Number of server worker processes")
+    shared_state_path: str | None = Field(
+        default=None,
+        description="Shared sqlite database for multi-worker mode: agent snapshots, stream fan-out "
+        "and clarification routing. Required when workers > 1",
+    )
 
 
 def setup_logging(logging_file: str) -> None:
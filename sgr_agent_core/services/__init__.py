@@ -1,14 +1,58 @@
 """Services module for external integrations and business logic."""
 
+from sgr_agent_core.services.agent_store import AgentStore, AgentSummary
+from sgr_agent_core.services.context_builder import ContextBuilder
+from sgr_agent_core.services.context_manager import (
+    ContextManager,
+    ContextPolicy,
+    DropStaleToolOutputsPolicy,
+    HeuristicTokenCounter,
+    SummarizeOlderTurnsPolicy,
+    TiktokenTokenCounter,
+    TokenCounter,
+)
+from sgr_agent_core.services.log_writer import AgentLogWriter
 from sgr_agent_core.services.mcp_service import MCP2ToolConverter
+from sgr_agent_core.services.mcp_session import MCPSession
+from sgr_agent_core.services.metrics import AgentMetrics, MetricsRegistry
+from sgr_agent_core.services.openai_client_pool import OpenAIClientPool
+from sgr_agent_core.services.page_extractor import LocalPageExtractor, PageExtractor
 from sgr_agent_core.services.prompt_loader import PromptLoader
+from sgr_agent_core.services.rate_limiter import RateLimiter, TokenBucket
 from sgr_agent_core.services.registry import AgentRegistry, ToolRegistry
+from sgr_agent_core.services.search_cache import InMemorySearchCache, SearchCacheBackend, SQLiteSearchCache
+from sgr_agent_core.services.shared_state import AgentSnapshot, SharedStateBackend, SQLiteSharedStateBackend
 from sgr_agent_core.services.tavily_search import TavilySearchService
 
 __all__ = [
+    "AgentStore",
+    "AgentSummary",
+    "AgentSnapshot",
+    "SharedStateBackend",
+    "SQLiteSharedStateBackend",
     "TavilySearchService",
+    "SearchCacheBackend",
+    "InMemorySearchCache",
+    "SQLiteSearchCache",
+    "PageExtractor",
+    "LocalPageExtractor",
     "MCP2ToolConverter",
+    "MCPSession",
+    "OpenAIClientPool",
     "ToolRegistry",
     "AgentRegistry",
     "PromptLoader",
+    "ContextBuilder",
+    "ContextManager",
+    "ContextPolicy",
+    "DropStaleToolOutputsPolicy",
+    "SummarizeOlderTurnsPolicy",
+    "TokenCounter",
+    "HeuristicTokenCounter",
+    "TiktokenTokenCounter",
+    "AgentLogWriter",
+    "AgentMetrics",
+    "MetricsRegistry",
+    "RateLimiter",
+    "TokenBucket",
 ]
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, MutableMapping
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel, Field
+
+from sgr_agent_core.models import AgentStatesEnum, LLMUsageStats, SearchCacheStats, SpanStats
+
+if TYPE_CHECKING:
+    from sgr_agent_core.base_agent import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+
+class AgentSummary(BaseModel):
+    """Lightweight record kept for an agent after it was evicted from
+    the store."""
+
+    agent_id: str = Field(description="Agent ID")
+    task_messages: list[dict] = Field(default_factory=list, description="Agent task messages in OpenAI format")
+    state: str = Field(description="Final agent state")
+    iteration: int = Field(default=0, description="Last iteration number")
+    searches_used: int = Field(default=0, description="Number of searches performed")
+    search_cache: SearchCacheStats = Field(
+        default_factory=SearchCacheStats, description="Search result cache usage statistics"
+    )
+    clarifications_used: int = Field(default=0, description="Number of clarifications requested")
+    sources_count: int = Field(default=0, description="Number of sources found")
+    current_step_reasoning: dict[str, Any] | None = Field(default=None, description="Last agent step")
+    execution_result: str | None = Field(default=None, description="Execution result")
+    usage: LLMUsageStats = Field(default_factory=LLMUsageStats, description="LLM token usage and streaming speed")
+    timings: dict[str, SpanStats] = Field(
+        default_factory=dict, description="Durations of agent phases, tool calls and LLM streams by span name"
+    )
+    creation_time: datetime = Field(description="Agent creation time")
+    evicted: bool = Field(default=True, description="Whether the agent was evicted from the store")
+
+    @classmethod
+    def from_agent(cls, agent: BaseAgent) -> AgentSummary:
+        context = agent._context.model_dump(
+            include={
+                "state",
+                "iteration",
+                "searches_used",
+                "search_cache",
+                "clarifications_used",
+                "current_step_reasoning",
+                "execution_result",
+                "usage",
+                "timings",
+            }
+        )
+        return cls(
+            agent_id=agent.id,
+            task_messages=agent.task_messages,
+            sources_count=len(agent._context.sources),
+            creation_time=agent.creation_time,
+            **context,
+        )
+
+
+def estimate_agent_size(agent: BaseAgent) -> int:
+    """Roughly estimate memory held by an agent in bytes.
+
+    Counts the dominant payloads: source contents, conversation messages,
+    the execution log and the stream buffer. The estimate is meant for
+    budget-based eviction, not exact accounting.
+    """
+    size = 0
+    for source in agent._context.sources.values():
+        size += len(source.full_content or "") + len(source.snippet or "") + len(source.title or "")
+    for message in agent.conversation:
+        size += len(str(message.get("content") or "")) + len(str(message.get("tool_calls") or ""))
+    for entry in agent.log:
+        size += len(str(entry))
+    size += agent.streaming_generator.buffered_bytes
+    return size
+
+
+class AgentStore(MutableMapping):
+    """In-process agent storage with eviction of finished agents.
+
+    Behaves like a dict of agent ID to agent. Agents in a finished state
+    are evicted when they were not accessed for ``ttl`` seconds, and in
+    least recently used order when the store holds more than
+    ``max_agents`` agents or their estimated size exceeds
+    ``max_memory_bytes``. Running agents are never evicted.
+
+    Evicted agents leave an AgentSummary tombstone, so their final state
+    can still be queried. Tombstones are bounded by ``max_tombstones``.
+    ``on_evict`` is called with every evicted agent.
+
+    Only looking up a single agent (``store[agent_id]``, ``store.get``)
+    counts as access; iterating the store does not.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600.0,
+        max_agents: int = 1000,
+        max_memory_bytes: int = 512 * 1024 * 1024,
+        max_tombstones: int = 10000,
+        sweep_interval: float = 30.0,
+    ):
+        self._agents: OrderedDict[str, BaseAgent] = OrderedDict()
+        self._last_access: dict[str, float] = {}
+        self._sizes: dict[str, int] = {}
+        self._tombstones: OrderedDict[str, AgentSummary] = OrderedDict()
+        self._sweeper_task: asyncio.Task | None = None
+        self.evictions = 0
+        self.on_evict: Callable[[BaseAgent], None] | None = None
+        self.configure(
+            ttl=ttl,
+            max_agents=max_agents,
+            max_memory_bytes=max_memory_bytes,
+            max_tombstones=max_tombstones,
+            sweep_interval=sweep_interval,
+        )
+
+    def configure(
+        self,
+        ttl: float | None = None,
+        max_agents: int | None = None,
+        max_memory_bytes: int | None = None,
+        max_tombstones: int | None = None,
+        sweep_interval: float | None = None,
+    ) -> None:
+        """Update eviction limits, keeping current values for omitted
+        ones."""
+        self.ttl = ttl if ttl is not None else self.ttl
+        self.max_agents = max_agents if max_agents is not None else self.max_agents
+        self.max_memory_bytes = max_memory_bytes if max_memory_bytes is not None else self.max_memory_bytes
+        self.max_tombstones = max_tombstones if max_tombstones is not None else self.max_tombstones
+        self.sweep_interval = sweep_interval if sweep_interval is not None else self.sweep_interval
+
+    def __getitem__(self, agent_id: str) -> BaseAgent:
+        agent = self._agents[agent_id]
+        self._touch(agent_id)
+        return agent
+
+    def __setitem__(self, agent_id: str, agent: BaseAgent) -> None:
+        self._agents[agent_id] = agent
+        self._sizes.pop(agent_id, None)
+        self._tombstones.pop(agent_id, None)
+        self._touch(agent_id)
+        if len(self._agents) > self.max_agents:
+            self.sweep()
+
+    def __delitem__(self, agent_id: str) -> None:
+        del self._agents[agent_id]
+        self._last_access.pop(agent_id, None)
+        self._sizes.pop(agent_id, None)
+
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self._agents
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._agents))
+
+    # Bulk reads (listings, metrics scrapes) must not count as access, otherwise
+    # polling them would keep every finished agent from expiring
+    def values(self) -> list[BaseAgent]:
+        return list(self._agents.values())
+
+    def items(self) -> list[tuple[str, BaseAgent]]:
+        return list(self._agents.items())
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def clear(self) -> None:
+        self._agents.clear()
+        self._last_access.clear()
+        self._sizes.clear()
+        self._tombstones.clear()
+
+    def _touch(self, agent_id: str) -> None:
+        self._agents.move_to_end(agent_id)
+        self._last_access[agent_id] = time.monotonic()
+
+    @staticmethod
+    def is_finished(agent: BaseAgent) -> bool:
+        return agent._context.state in AgentStatesEnum.FINISH_STATES.value
+
+    def get_summary(self, agent_id: str) -> AgentSummary | None:
+        """Get the tombstone of an evicted agent."""
+        return self._tombstones.get(agent_id)
+
+    def remove_summary(self, agent_id: str) -> AgentSummary | None:
+        """Drop the tombstone of an evicted agent."""
+        return self._tombstones.pop(agent_id, None)
+
+    def _agent_size(self, agent_id: str, agent: BaseAgent) -> int:
+        size = self._sizes.get(agent_id)
+        if size is None:
+            size = estimate_agent_size(agent)
+            # Finished agents no longer change, so their size is computed once
+            if self.is_finished(agent):
+                self._sizes[agent_id] = size
+        return size
+
+    def memory_usage(self) -> int:
+        """Get the estimated total size of stored agents in bytes."""
+        return sum(self._agent_size(agent_id, agent) for agent_id, agent in self._agents.items())
+
+    def _evict(self, agent_id: str) -> None:
+        agent = self._agents[agent_id]
+        del self[agent_id]
+        self._tombstones[agent_id] = AgentSummary.from_agent(agent)
+        while len(self._tombstones) > self.max_tombstones:
+            self._tombstones.popitem(last=False)
+        self.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(agent)
+
+    def sweep(self) -> int:
+        """Evict expired finished agents and enforce count and memory
+        limits.
+
+        Returns:
+            Number of evicted agents
+        """
+        now = time.monotonic()
+        finished = [agent_id for agent_id, agent in self._agents.items() if self.is_finished(agent)]
+        evicted = 0
+
+        for agent_id in finished:
+            if now - self._last_access.get(agent_id, now) >= self.ttl:
+                self._evict(agent_id)
+                evicted += 1
+
+        # Finished agents are already in least recently used order
+        candidates = iter([agent_id for agent_id in finished if agent_id in self._agents])
+        memory = self.memory_usage()
+        while len(self._agents) > self.max_agents or memory > self.max_memory_bytes:
+            agent_id = next(candidates, None)
+            if agent_id is None:
+                break
+            memory -= self._agent_size(agent_id, self._agents[agent_id])
+            self._evict(agent_id)
+            evicted += 1
+
+        if evicted:
+            logger.info(f"🧹 Evicted {evicted} finished agents, {len(self._agents)} agents in store")
+        return evicted
+
+    async def _run_sweeper(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Agent store sweep failed: {e}", exc_info=True)
+
+    def start_sweeper(self) -> None:
+        """Start periodic background eviction."""
+        if self._sweeper_task is None or self._sweeper_task.done():
+            self._sweeper_task = asyncio.create_task(self._run_sweeper())
+
+    async def stop_sweeper(self) -> None:
+        """Stop periodic background eviction."""
+        if self._sweeper_task is None:
+            return
+        self._sweeper_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._sweeper_task
+        self._sweeper_task = None
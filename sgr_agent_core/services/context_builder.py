@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import TYPE_CHECKING, ClassVar
+
+from sgr_agent_core.services.prompt_loader import PromptLoader
+
+if TYPE_CHECKING:
+    from sgr_agent_core import BaseTool, PromptsConfig
+
+
+class ContextBuilder:
+    """Incrementally builds the LLM context of an agent.
+
+    The context is a stable prefix (system prompt, task messages and the
+    initial user request) followed by the conversation. The prefix is
+    rendered once and kept byte-identical between calls, and only the
+    conversation turns added since the previous build are appended, so
+    repeated builds within and across iterations cost O(new turns).
+
+    Rendered system prompts are shared between agents with the same
+    toolkit and prompt template.
+
+    The returned list is owned by the builder. Callers must not modify
+    it; if they do, the next build detects the change and starts over.
+    """
+
+    cache_maxsize: ClassVar[int] = 128
+    _system_prompts: ClassVar[OrderedDict[tuple, str]] = OrderedDict()
+
+    def __init__(self):
+        self._messages: list[dict] = []
+        self._prefix_key: tuple | None = None
+        self._prefix_length = 0
+        self._prompt_cache_key: str | None = None
+        self._conversation: list[dict] | None = None
+        self._synced = 0
+
+    @classmethod
+    def get_system_prompt(cls, toolkit: list[type[BaseTool]], prompts_config: PromptsConfig) -> str:
+        """Render the system prompt, reusing the result for the same toolkit
+        and template."""
+        template = prompts_config.system_prompt
+        key = (tuple(toolkit), template)
+        prompt = cls._system_prompts.get(key)
+        if prompt is None:
+            prompt = PromptLoader.get_system_prompt(toolkit, prompts_config)
+            cls._system_prompts[key] = prompt
+            while len(cls._system_prompts) > cls.cache_maxsize:
+                cls._system_prompts.popitem(last=False)
+        else:
+            cls._system_prompts.move_to_end(key)
+        return prompt
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        cls._system_prompts.clear()
+
+    @property
+    def prefix_length(self) -> int:
+        """Number of leading context messages that stay identical between
+        builds.
+
+        Providers with prompt caching can place their cache breakpoint
+        on the last message of the prefix.
+        """
+        return self._prefix_length
+
+    @property
+    def prompt_cache_key(self) -> str | None:
+        """Hash of the stable prefix, usable as a provider prompt cache
+        key."""
+        if self._prompt_cache_key is None and self._prefix_length:
+            prefix = json.dumps(self._messages[: self._prefix_length], sort_keys=True, ensure_ascii=False, default=str)
+            self._prompt_cache_key = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        return self._prompt_cache_key
+
+    def invalidate(self) -> None:
+        """Force the conversation part to be rebuilt on the next build, e.g.
+        after conversation messages were edited in place."""
+        self._conversation = None
+
+    def _build_prefix(
+        self,
+        key: tuple,
+        toolkit: list[type[BaseTool]],
+        prompts_config: PromptsConfig,
+        task_messages: list[dict],
+    ) -> None:
+        self._messages = [
+            {"role": "system", "content": self.get_system_prompt(toolkit, prompts_config)},
+            *task_messages,
+            {"role": "user", "content": PromptLoader.get_initial_user_request(task_messages, prompts_config)},
+        ]
+        self._prefix_key = key
+        self._prefix_length = len(self._messages)
+        self._prompt_cache_key = None
+        self._conversation = None
+
+    def build(
+        self,
+        toolkit: list[type[BaseTool]],
+        prompts_config: PromptsConfig,
+        task_messages: list[dict],
+        conversation: list[dict],
+    ) -> list[dict]:
+        """Get the context for the current conversation.
+
+        Args:
+            toolkit: Agent tools listed in the system prompt
+            prompts_config: Prompt templates
+            task_messages: Initial task messages
+            conversation: Conversation messages after the initial request
+
+        Returns:
+            Messages in OpenAI format: prefix followed by the conversation
+        """
+        key = (
+            tuple(toolkit),
+            prompts_config.system_prompt,
+            prompts_config.initial_user_request,
+            id(task_messages),
+            len(task_messages),
+        )
+        if key != self._prefix_key:
+            self._build_prefix(key, toolkit, prompts_config, task_messages)
+
+        synced = self._synced
+        in_sync = (
+            conversation is self._conversation
+            and synced <= len(conversation)
+            and len(self._messages) == self._prefix_length + synced
+            and (not synced or self._messages[-1] is conversation[synced - 1])
+        )
+        if not in_sync:
+            # Conversation was replaced, truncated or the context was modified by a caller
+            del self._messages[self._prefix_length :]
+            synced = 0
+
+        self._messages.extend(conversation[synced:])
+        self._conversation = conversation
+        self._synced = len(conversation)
+        return self._messages
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Awaitable, Callable, ClassVar
+
+if TYPE_CHECKING:
+    from sgr_agent_core.agent_definition import ExecutionConfig
+
+logger = logging.getLogger(__name__)
+
+Summarizer = Callable[[list[dict]], Awaitable[str]]
+
+CITATION_PATTERN = re.compile(r"^\[\d+\] .* - https?://\S+$", re.MULTILINE)
+
+
+def extract_citations(text: str) -> list[str]:
+    """Find source citation lines like ``[1] Title - https://...`` produced
+    by search tools."""
+    return CITATION_PATTERN.findall(text)
+
+
+def _content_text(message: dict) -> str:
+    content = message.get("content")
+    if content is None:
+        return ""
+    return content if isinstance(content, str) else json.dumps(content, ensure_ascii=False, default=str)
+
+
+class TokenCounter(ABC):
+    """Counts tokens of OpenAI format messages."""
+
+    #: Tokens added per message for role and separators
+    message_overhead: int = 4
+
+    @abstractmethod
+    def count_text(self, text: str) -> int:
+        """Count tokens of a text."""
+
+    def count_message(self, message: dict) -> int:
+        tokens = self.message_overhead + self.count_text(_content_text(message))
+        if message.get("tool_calls"):
+            tokens += self.count_text(json.dumps(message["tool_calls"], ensure_ascii=False, default=str))
+        return tokens
+
+    def count(self, messages: list[dict]) -> int:
+        return sum(self.count_message(message) for message in messages)
+
+
+class HeuristicTokenCounter(TokenCounter):
+    """Approximate token count from text length, no tokenizer needed."""
+
+    def __init__(self, chars_per_token: float = 4.0):
+        self.chars_per_token = chars_per_token
+
+    def count_text(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+
+class TiktokenTokenCounter(TokenCounter):
+    """Exact token count with tiktoken, requires the tiktoken package."""
+
+    def __init__(self, model: str | None = None):
+        import tiktoken
+
+        try:
+            self.encoding = tiktoken.encoding_for_model(model or "")
+        except KeyError:
+            self.encoding = tiktoken.get_encoding("o200k_base")
+
+    def count_text(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+def create_token_counter(name: str, model: str | None = None) -> TokenCounter:
+    """Create a token counter by name, falling back to the heuristic one
+    when the tokenizer is not installed or its encoding cannot be
+    loaded."""
+    if name == "tiktoken":
+        try:
+            return TiktokenTokenCounter(model)
+        except ImportError:
+            logger.warning("⚠️ tiktoken is not installed, using heuristic token counter")
+        except Exception as e:
+            logger.warning(f"⚠️ tiktoken encoding unavailable, using heuristic token counter: {e}")
+    return HeuristicTokenCounter()
+
+
+async def extractive_summary(messages: list[dict]) -> str:
+    """Summarize messages without an LLM call by keeping the called tools,
+    the beginning of every result and all source citations."""
+    lines = []
+    citations: dict[str, None] = {}
+    for message in messages:
+        text = _content_text(message)
+        for tool_call in message.get("tool_calls") or []:
+            function = tool_call.get("function", {})
+            lines.append(f"- Called {function.get('name')}: {function.get('arguments', '')[:200]}")
+        if text:
+            first_line = text.strip().split("\n", 1)[0][:200]
+            lines.append(f"- {'Result' if message.get('role') == 'tool' else message.get('role')}: {first_line}")
+        citations.update(dict.fromkeys(extract_citations(text)))
+    if citations:
+        lines.append("Sources found:")
+        lines.extend(citations)
+    return "\n".join(lines)
+
+
+class ContextPolicy(ABC):
+    """Eviction policy shrinking the conversation part of an agent
+    context."""
+
+    name: ClassVar[str]
+
+    @abstractmethod
+    async def apply(self, conversation: list[dict], excess: int, manager: ContextManager) -> list[dict]:
+        """Shrink the conversation.
+
+        Args:
+            conversation: Conversation messages, must not be modified
+            excess: Tokens over the budget the policy should try to free
+            manager: Context manager with the token counter
+
+        Returns:
+            New conversation messages
+        """
+
+
+class DropStaleToolOutputsPolicy(ContextPolicy):
+    """Replace old tool results with a placeholder, oldest first.
+
+    The most recent ``keep_last`` results stay intact. Source citations
+    found in a dropped result are kept in its placeholder, so the agent
+    can still reference them in the final answer.
+    """
+
+    name = "drop_stale_tool_outputs"
+
+    def __init__(self, keep_last: int = 2, min_tokens: int = 50):
+        self.keep_last = keep_last
+        self.min_tokens = min_tokens
+
+    async def apply(self, conversation: list[dict], excess: int, manager: ContextManager) -> list[dict]:
+        tool_indexes = [i for i, message in enumerate(conversation) if message.get("role") == "tool"]
+        stale = tool_indexes[: max(len(tool_indexes) - self.keep_last, 0)]
+        result = list(conversation)
+        saved = 0
+        for i in stale:
+            if saved >= excess:
+                break
+            message = conversation[i]
+            tokens = manager.count_message(message)
+            if tokens < self.min_tokens:
+                continue
+            content = "[Tool output removed to save context]"
+            if citations := extract_citations(_content_text(message)):
+                content += "\nSources:\n" + "\n".join(citations)
+            replacement = {**message, "content": content}
+            saved += tokens - manager.count_message(replacement)
+            result[i] = replacement
+        return result
+
+
+class SummarizeOlderTurnsPolicy(ContextPolicy):
+    """Replace older conversation turns with a single summary message.
+
+    Keeps at least the last ``keep_recent`` messages and never separates
+    tool results from the assistant message that called them.
+    """
+
+    name = "summarize_older_turns"
+
+    def __init__(self, keep_recent: int = 6, summarizer: Summarizer | None = None):
+        self.keep_recent = keep_recent
+        self.summarizer = summarizer or extractive_summary
+
+    async def apply(self, conversation: list[dict], excess: int, manager: ContextManager) -> list[dict]:
+        cut = len(conversation) - self.keep_recent
+        while cut > 0 and conversation[cut].get("role") == "tool":
+            cut -= 1
+        if cut < 2:
+            return conversation
+        try:
+            summary = await self.summarizer(conversation[:cut])
+        except Exception as e:
+            logger.warning(f"⚠️ Context summarization failed, using extractive summary: {e}")
+            summary = await extractive_summary(conversation[:cut])
+        return [{"role": "user", "content": f"Summary of earlier research steps:\n{summary}"}, *conversation[cut:]]
+
+
+class ContextManager:
+    """Keeps an agent context within a token budget.
+
+    Policies are applied in order, each one only while the context is
+    still over the budget. The conversation is changed in place; the
+    prefix (system prompt, task and initial request) is never evicted.
+    """
+
+    def __init__(
+        self,
+        token_budget: int,
+        counter: TokenCounter | None = None,
+        policies: list[ContextPolicy] | None = None,
+    ):
+        self.token_budget = token_budget
+        self.counter = counter or HeuristicTokenCounter()
+        if policies is None:
+            policies = [DropStaleToolOutputsPolicy(), SummarizeOlderTurnsPolicy()]
+        self.policies = policies
+        self._counts: dict[int, tuple[dict, int]] = {}
+
+    @classmethod
+    def from_config(
+        cls, execution_config: ExecutionConfig, model: str | None = None, summarizer: Summarizer | None = None
+    ) -> ContextManager | None:
+        """Create a manager from execution settings, None if no budget is
+        set."""
+        if execution_config.context_token_budget is None:
+            return None
+        return cls(
+            token_budget=execution_config.context_token_budget,
+            counter=create_token_counter(execution_config.context_token_counter, model),
+            policies=[
+                DropStaleToolOutputsPolicy(keep_last=execution_config.context_keep_tool_outputs),
+                SummarizeOlderTurnsPolicy(
+                    keep_recent=execution_config.context_keep_recent_messages, summarizer=summarizer
+                ),
+            ],
+        )
+
+    def count_message(self, message: dict) -> int:
+        # Policies replace messages instead of editing them, so counts are cached by message identity
+        cached = self._counts.get(id(message))
+        if cached is not None and cached[0] is message:
+            return cached[1]
+        tokens = self.counter.count_message(message)
+        self._counts[id(message)] = (message, tokens)
+        return tokens
+
+    def count(self, messages: list[dict]) -> int:
+        return sum(self.count_message(message) for message in messages)
+
+    async def fit(self, prefix: list[dict], conversation: list[dict]) -> tuple[int, dict[str, int]]:
+        """Evict conversation content until the context fits the budget.
+
+        Args:
+            prefix: Messages preceding the conversation in the context
+            conversation: Conversation messages, changed in place
+
+        Returns:
+            Context tokens after eviction and tokens saved by each applied policy
+        """
+        prefix_tokens = self.count(prefix)
+        tokens = prefix_tokens + self.count(conversation)
+        saved: dict[str, int] = {}
+        for policy in self.policies:
+            if tokens <= self.token_budget:
+                break
+            compacted = await policy.apply(conversation, tokens - self.token_budget, self)
+            if compacted is conversation:
+                continue
+            new_tokens = prefix_tokens + self.count(compacted)
+            saved[policy.name] = tokens - new_tokens
+            tokens = new_tokens
+            conversation[:] = compacted
+
+        if saved:
+            live = {id(message) for message in (*prefix, *conversation)}
+            self._counts = {key: value for key, value in self._counts.items() if key in live}
+        if tokens > self.token_budget:
+            logger.warning(f"⚠️ Context has {tokens} tokens after eviction, budget is {self.token_budget}")
+        return tokens, saved
@@ -0,0 +1,223 @@
+import asyncio
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, ClassVar, Literal
+
+logger = logging.getLogger(__name__)
+
+Compression = Literal["gzip", "zstd"]
+
+_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+
+@dataclass
+class _LogItem:
+    path: str
+    data: Any
+    append: bool
+    compression: Compression | None = None
+    max_bytes: int | None = None
+    backup_count: int = 0
+
+
+class AgentLogWriter:
+    """Process-wide background writer for agent execution logs.
+
+    Serialization, compression and file I/O run in a single daemon
+    thread, so saving large logs never blocks the event loop. Records
+    appended to JSON Lines files are batched: all queued records of a
+    file are written with one open and one compressed frame. Compressed
+    files are sequences of gzip members or zstd frames, readable with
+    ``read_records``.
+
+    Outside a running event loop, writes are done in the calling thread
+    after the queue is drained.
+    """
+
+    batch_size: ClassVar[int] = 512
+
+    _queue: ClassVar["queue.Queue[_LogItem | None] | None"] = None
+    _thread: ClassVar[threading.Thread | None] = None
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+    _zstd_warned: ClassVar[bool] = False
+
+    def __init__(self):
+        raise TypeError(f"{self.__class__.__name__} is a static class and cannot be instantiated")
+
+    @classmethod
+    def resolve_compression(cls, compression: Compression | None) -> Compression | None:
+        """Get the usable compression, falling back from zstd to gzip when
+        the zstandard package is not installed."""
+        if compression == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                if not cls._zstd_warned:
+                    logger.warning("⚠️ zstandard is not installed, compressing agent logs with gzip")
+                    cls._zstd_warned = True
+                return "gzip"
+        return compression
+
+    @staticmethod
+    def suffix(compression: Compression | None) -> str:
+        """File name suffix of the compression."""
+        return _SUFFIXES[compression]
+
+    @classmethod
+    def append(
+        cls,
+        path: str,
+        record: dict,
+        compression: Compression | None = None,
+        max_bytes: int | None = None,
+        backup_count: int = 0,
+    ) -> None:
+        """Append a record as a JSON line.
+
+        Args:
+            path: Log file path
+            record: JSON serializable record, must not be modified afterwards
+            compression: Compression of the file, already resolved
+            max_bytes: Rotate the file once it reaches this size, None disables
+            backup_count: Number of rotated files kept as path.1 ... path.N
+        """
+        cls._submit(_LogItem(path, record, True, compression, max_bytes, backup_count))
+
+    @classmethod
+    def write(cls, path: str, data: Any, compression: Compression | None = None) -> None:
+        """Write data as an indented JSON document, replacing the file.
+
+        Args:
+            path: Log file path
+            data: JSON serializable data, must not be modified afterwards
+            compression: Compression of the file, already resolved
+        """
+        cls._submit(_LogItem(path, data, False, compression))
+
+    @classmethod
+    def flush(cls) -> None:
+        """Block until all queued writes are done."""
+        if cls._queue is not None:
+            cls._queue.join()
+
+    @classmethod
+    async def aflush(cls) -> None:
+        """Wait for all queued writes without blocking the event loop."""
+        await asyncio.to_thread(cls.flush)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Write all queued records and stop the writer thread."""
+        with cls._lock:
+            log_queue, thread = cls._queue, cls._thread
+            cls._queue = cls._thread = None
+        if log_queue is None:
+            return
+        log_queue.put(None)
+        thread.join()
+
+    @staticmethod
+    def read_records(path: str) -> list[dict]:
+        """Read all records of a JSON Lines log file, compressed or not."""
+        with open(path, "rb") as f:
+            data = f.read()
+        if path.endswith(".gz"):
+            data = gzip.decompress(data)
+        elif path.endswith(".zst"):
+            import io
+
+            import zstandard
+
+            data = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data), read_across_frames=True).read()
+        return [json.loads(line) for line in data.decode("utf-8").splitlines() if line]
+
+    @classmethod
+    def _submit(cls, item: _LogItem) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            cls.flush()
+            cls._process([item])
+            return
+        with cls._lock:
+            if cls._queue is None:
+                cls._queue = queue.Queue()
+                cls._thread = threading.Thread(
+                    target=cls._run, args=(cls._queue,), name="agent-log-writer", daemon=True
+                )
+                cls._thread.start()
+            cls._queue.put(item)
+
+    @classmethod
+    def _run(cls, log_queue: "queue.Queue[_LogItem | None]") -> None:
+        stop = False
+        while not stop:
+            items = [log_queue.get()]
+            while len(items) < cls.batch_size:
+                try:
+                    items.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in items
+            batch = [item for item in items if item is not None]
+            try:
+                cls._process(batch)
+            finally:
+                for _ in items:
+                    log_queue.task_done()
+
+    @classmethod
+    def _process(cls, items: list[_LogItem]) -> None:
+        # A file is either appended to or written as a whole, so grouping appends by path keeps the order
+        appends: dict[str, list[_LogItem]] = {}
+        for item in items:
+            if item.append:
+                appends.setdefault(item.path, []).append(item)
+                continue
+            try:
+                text = json.dumps(item.data, indent=2, ensure_ascii=False, default=str)
+                cls._write_bytes(item.path, text, item.compression, "wb")
+            except Exception as e:
+                logger.error(f"❌ Failed to write agent log {item.path}: {e}")
+
+        for path, group in appends.items():
+            last = group[-1]
+            try:
+                text = "".join(json.dumps(item.data, ensure_ascii=False, default=str) + "\n" for item in group)
+                if last.max_bytes and os.path.exists(path) and os.path.getsize(path) >= last.max_bytes:
+                    cls._rotate(path, last.backup_count)
+                cls._write_bytes(path, text, last.compression, "ab")
+            except Exception as e:
+                logger.error(f"❌ Failed to append {len(group)} records to agent log {path}: {e}")
+
+    @staticmethod
+    def _write_bytes(path: str, text: str, compression: Compression | None, mode: str) -> None:
+        data = text.encode("utf-8")
+        if compression == "gzip":
+            data = gzip.compress(data)
+        elif compression == "zstd":
+            import zstandard
+
+            data = zstandard.ZstdCompressor().compress(data)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, mode) as f:
+            f.write(data)
+
+    @staticmethod
+    def _rotate(path: str, backup_count: int) -> None:
+        if backup_count <= 0:
+            os.remove(path)
+            return
+        for i in range(backup_count - 1, 0, -1):
+            if os.path.exists(f"{path}.{i}"):
+                os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+        os.replace(path, f"{path}.1")
+
+
+atexit.register(AgentLogWriter.shutdown)
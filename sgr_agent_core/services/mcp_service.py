@@ -1,51 +1,123 @@
+import asyncio
 import logging
-from typing import Type
+import time
+from typing import ClassVar, Type
 
-from fastmcp import Client
 from fastmcp.mcp_config import MCPConfig
 from jambo import SchemaConverter
 from pydantic import create_model
 
+from sgr_agent_core.services.mcp_session import MCPSession
+
 logger = logging.getLogger(__name__)
 
 
 class MCP2ToolConverter:
+    """Builds tool classes from tools discovered on MCP servers.
+
+    Discovered tool classes are cached per MCP configuration and shared
+    by all agents. Entries older than ``cache_ttl`` seconds are still
+    served while they are refreshed in the background, so MCP round
+    trips only block the first agent of a configuration; prefetch() at
+    startup removes even that.
+    """
+
+    cache_ttl: ClassVar[float] = 300.0
+
+    # Config key -> (tool classes, monotonic load time)
+    _cache: ClassVar[dict[str, tuple[list[type], float]]] = {}
+    _loading: ClassVar[dict[str, asyncio.Task]] = {}
+
     @staticmethod
     def _to_CamelCase(name: str) -> str:
         return name.replace("_", " ").title().replace(" ", "")
 
     @classmethod
-    async def build_tools_from_mcp(cls, config: MCPConfig):
+    async def build_tools_from_mcp(cls, config: MCPConfig) -> list[type]:
+        """Get tool classes of the MCP servers in the config, discovering
+        them only when they are not cached yet."""
+        if not config.mcpServers:
+            return []
+        key = MCPSession._make_key(config)
+        cached = cls._cache.get(key)
+        if cached is None:
+            return list(await asyncio.shield(cls._load(key, config)))
+        tools, loaded_at = cached
+        if time.monotonic() - loaded_at > cls.cache_ttl:
+            # Serve stale tools, the refresh result is used by the next agents
+            task = cls._load(key, config)
+            task.add_done_callback(cls._log_refresh_error)
+        return list(tools)
+
+    @classmethod
+    def _load(cls, key: str, config: MCPConfig) -> asyncio.Task:
+        """Start discovery for the config or join the one in progress."""
+        task = cls._loading.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = cls._loading[key] = asyncio.create_task(cls._discover(key, config))
+        return task
+
+    @classmethod
+    async def _discover(cls, key: str, config: MCPConfig) -> list[type]:
+        try:
+            tools = await cls._build_tools(config)
+            cls._cache[key] = (tools, time.monotonic())
+            return tools
+        finally:
+            cls._loading.pop(key, None)
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"⚠️ MCP tools refresh failed, keeping cached tools: {task.exception()}")
+
+    @classmethod
+    async def prefetch(cls, configs: list[MCPConfig]) -> None:
+        """Discover tools of several configs, e.g. at startup; failures are
+        logged and retried on first use."""
+        results = await asyncio.gather(
+            *(cls.build_tools_from_mcp(config) for config in configs), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"⚠️ MCP tools prefetch failed: {result}")
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        cls._cache.clear()
+        cls._loading.clear()
+
+    @classmethod
+    async def _build_tools(cls, config: MCPConfig) -> list[type]:
         from sgr_agent_core import BaseTool, MCPBaseTool
 
         tools = []
         if not config.mcpServers:
             return tools
 
-        client: Client = Client(config)
-        async with client:
-            mcp_tools = await client.list_tools()
-
-            for t in mcp_tools:
-                if not t.name or not t.inputSchema:
-                    logger.error(f"Skipping tool due to missing name or input schema: {t}")
-                    continue
-
-                try:
-                    t.inputSchema["title"] = cls._to_CamelCase(t.name)
-                    PdModel = SchemaConverter.build(t.inputSchema)
-                except Exception as e:
-                    logger.error(f"Error creating model {t.name} from schema: {t.inputSchema}: {e}")
-                    continue
-
-                ToolCls: Type[BaseTool] = create_model(
-                    f"MCP{cls._to_CamelCase(t.name)}", __base__=(PdModel, MCPBaseTool), __doc__=t.description or ""
-                )
-                ToolCls.tool_name = t.name
-                ToolCls.description = t.description or ""
-                ToolCls._client = client
-                tools.append(ToolCls)
-                logger.info(f"Built MCP Tool: {ToolCls.tool_name}")
-
-            logger.info(f"Built {len(tools)} MCP tools.")
-            return tools
+        session = MCPSession.get_shared(config)
+        mcp_tools = await session.list_tools()
+
+        for t in mcp_tools:
+            if not t.name or not t.inputSchema:
+                logger.error(f"Skipping tool due to missing name or input schema: {t}")
+                continue
+
+            try:
+                t.inputSchema["title"] = cls._to_CamelCase(t.name)
+                PdModel = SchemaConverter.build(t.inputSchema)
+            except Exception as e:
+                logger.error(f"Error creating model {t.name} from schema: {t.inputSchema}: {e}")
+                continue
+
+            ToolCls: Type[BaseTool] = create_model(
+                f"MCP{cls._to_CamelCase(t.name)}", __base__=(PdModel, MCPBaseTool), __doc__=t.description or ""
+            )
+            ToolCls.tool_name = t.name
+            ToolCls.description = t.description or ""
+            ToolCls._session = session
+            tools.append(ToolCls)
+            logger.info(f"Built MCP Tool: {ToolCls.tool_name}")
+
+        logger.info(f"Built {len(tools)} MCP tools.")
+        return tools
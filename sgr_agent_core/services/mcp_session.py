@@ -0,0 +1,234 @@
+import asyncio
+import json
+import logging
+from typing import Any, ClassVar
+
+import anyio
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+from mcp.types import BlobResourceContents, EmbeddedResource, TextContent, TextResourceContents, Tool
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Errors meaning the session itself is broken, not that the call failed
+CONNECTION_ERRORS = (
+    ConnectionError,
+    OSError,
+    EOFError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+)
+
+
+def _omit_binary(data: str, mime_type: str | None) -> str:
+    return f"<{mime_type or 'binary'} data omitted, {len(data)} bytes base64>"
+
+
+def _payload_size(item: Any) -> int:
+    if isinstance(item, TextContent):
+        return len(item.text.encode())
+    if isinstance(item, EmbeddedResource):
+        resource = item.resource
+        return len(resource.blob) if isinstance(resource, BlobResourceContents) else len(resource.text.encode())
+    data = getattr(item, "data", None)
+    return len(data) if isinstance(data, str) else 0
+
+
+def format_tool_result(content: list[Any], limit: int) -> tuple[str, int]:
+    """Render MCP result content as a JSON list of serialized items, cut to
+    the limit.
+
+    Items are serialized one by one and serialization stops once the
+    limit is reached; long texts are cut before serializing. Base64
+    payloads of images, audio and blob resources are useless for the
+    LLM and replaced with a short placeholder.
+
+    Args:
+        content: Content items of a CallToolResult
+        limit: Maximum length of the result in characters
+
+    Returns:
+        Result string and the number of payload bytes left out
+    """
+    parts: list[str] = []
+    length = 1  # Opening bracket
+    dropped = 0
+    for item in content:
+        remaining = limit - length
+        if remaining <= 0:
+            dropped += _payload_size(item)
+            continue
+        if isinstance(item, TextContent):
+            if len(item.text) > remaining:
+                dropped += len(item.text[remaining:].encode())
+                item = item.model_copy(update={"text": item.text[:remaining]})
+        elif isinstance(item, EmbeddedResource):
+            resource = item.resource
+            if isinstance(resource, BlobResourceContents):
+                dropped += len(resource.blob)
+                resource = resource.model_copy(update={"blob": _omit_binary(resource.blob, resource.mimeType)})
+            elif isinstance(resource, TextResourceContents) and len(resource.text) > remaining:
+                dropped += len(resource.text[remaining:].encode())
+                resource = resource.model_copy(update={"text": resource.text[:remaining]})
+            item = item.model_copy(update={"resource": resource})
+        elif isinstance(getattr(item, "data", None), str):
+            # Image and audio content
+            dropped += len(item.data)
+            item = item.model_copy(update={"data": _omit_binary(item.data, getattr(item, "mimeType", None))})
+        part = json.dumps(item.model_dump_json(), ensure_ascii=False)
+        parts.append(part)
+        length += len(part) + (2 if len(parts) > 1 else 0)
+    return ("[" + ", ".join(parts) + "]")[:limit], dropped
+
+
+class MCPSession:
+    """Long-lived connection to MCP servers of one configuration.
+
+    Keeps a single connected ``fastmcp.Client`` and runs all calls over
+    it concurrently, instead of paying the transport connect and
+    initialize handshake per call. The client is connected lazily and
+    reconnected with exponential backoff when connecting fails. When
+    the connection breaks during a call, the next call gets a new
+    connection. Only list_tools is retried on it right away: a tool call
+    may have run on the server before the connection broke, so its error
+    is returned instead of running a non-idempotent tool twice.
+
+    Use get_shared() to obtain the session shared by all agents and
+    tools with the same configuration.
+    """
+
+    connect_attempts: ClassVar[int] = 3
+    backoff: ClassVar[float] = 0.5
+    max_backoff: ClassVar[float] = 10.0
+
+    _instances: ClassVar[dict[str, "MCPSession"]] = {}
+
+    def __init__(self, transport: Any):
+        """
+        Args:
+            transport: Anything fastmcp.Client accepts: MCPConfig, config dict,
+                server URL or an in-process FastMCP server
+        """
+        self.transport = transport
+        self.reconnects = 0
+        self._client: Client | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+
+    @staticmethod
+    def _make_key(transport: Any) -> str:
+        if isinstance(transport, BaseModel):
+            return json.dumps(transport.model_dump(mode="json"), sort_keys=True)
+        if isinstance(transport, dict):
+            return json.dumps(transport, sort_keys=True, default=str)
+        if isinstance(transport, str):
+            return transport
+        # Server objects are shared by identity, the session keeps them alive
+        return f"{type(transport).__name__}:{id(transport)}"
+
+    @classmethod
+    def get_shared(cls, transport: Any) -> "MCPSession":
+        """Get the session shared by all users of the configuration."""
+        key = cls._make_key(transport)
+        session = cls._instances.get(key)
+        if session is None:
+            session = cls._instances[key] = cls(transport)
+        return session
+
+    @classmethod
+    async def aclose_shared(cls) -> None:
+        """Close all shared sessions."""
+        sessions = list(cls._instances.values())
+        cls._instances.clear()
+        for session in sessions:
+            await session.close()
+        if sessions:
+            logger.info(f"Closed {len(sessions)} MCP sessions")
+
+    @property
+    def connected(self) -> bool:
+        return self._client is not None and self._client.is_connected()
+
+    async def _connect(self) -> Client:
+        delay = self.backoff
+        for attempt in range(1, self.connect_attempts + 1):
+            client = Client(self.transport)
+            try:
+                await client.__aenter__()
+                return client
+            except Exception as e:
+                if attempt == self.connect_attempts:
+                    raise
+                logger.warning(f"⚠️ MCP connection failed (attempt {attempt}), retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+
+    async def get_client(self) -> Client:
+        """Get the connected client, connecting if needed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Clients and locks are bound to the event loop that created them
+            self._client = None
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        if self.connected:
+            return self._client
+        async with self._lock:
+            if not self.connected:
+                if self._client is not None:
+                    self.reconnects += 1
+                    await self._close_client()
+                self._client = await self._connect()
+                logger.info("🔌 MCP session connected")
+            return self._client
+
+    async def _close_client(self) -> None:
+        client, self._client = self._client, None
+        if client is None:
+            return
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Error closing MCP client: {e}")
+
+    async def _run(self, method: str, *args: Any, retry: bool = False) -> Any:
+        client = await self.get_client()
+        try:
+            return await getattr(client, method)(*args)
+        except ToolError:
+            raise
+        except Exception as e:
+            if client.is_connected() and not isinstance(e, CONNECTION_ERRORS):
+                raise
+            async with self._lock:
+                if self._client is client:
+                    self.reconnects += 1
+                    await self._close_client()
+            if not retry:
+                logger.warning(f"⚠️ MCP session lost during {method}, reconnecting on the next call: {e}")
+                raise
+            logger.warning(f"⚠️ MCP session lost during {method}, reconnecting: {e}")
+            client = await self.get_client()
+            return await getattr(client, method)(*args)
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]) -> Any:
+        """Call a tool over the shared connection.
+
+        Not retried when the connection breaks, since the tool may have
+        already run; the next call reconnects.
+
+        Returns:
+            fastmcp CallToolResult
+        """
+        return await self._run("call_tool", name, arguments)
+
+    async def list_tools(self) -> list[Tool]:
+        return await self._run("list_tools", retry=True)
+
+    async def close(self) -> None:
+        """Disconnect; the next call connects again."""
+        if self._loop is asyncio.get_running_loop():
+            await self._close_client()
+        self._client = None
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, ClassVar, Iterator
+
+from sgr_agent_core.models import SpanStats
+
+if TYPE_CHECKING:
+    from openai.types import CompletionUsage
+
+    from sgr_agent_core.models import AgentContext
+
+logger = logging.getLogger(__name__)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_metric(name: str, metric_type: str, description: str, samples: dict[Labels, float]) -> str:
+    """Render a metric in the Prometheus text exposition format.
+
+    Args:
+        name: Metric name
+        metric_type: Prometheus type: counter, gauge or summary
+        description: HELP text
+        samples: Sample values by label pairs, summaries use a ``__suffix`` label for _count and _sum
+
+    Returns:
+        Metric lines ending with a newline
+    """
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} {metric_type}"]
+    for labels, value in sorted(samples.items()):
+        suffix = ""
+        pairs = []
+        for key, label_value in labels:
+            if key == "__suffix":
+                suffix = label_value
+            else:
+                pairs.append(f'{key}="{_escape(label_value)}"')
+        label_str = "{" + ",".join(pairs) + "}" if pairs else ""
+        lines.append(f"{name}{suffix}{label_str} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsRegistry:
+    """Process-wide counters and summaries of all agents.
+
+    Values survive agent eviction, so they can be scraped as monotonic
+    Prometheus counters. Summaries keep only ``_count`` and ``_sum``.
+    """
+
+    _metrics: ClassVar[dict[str, tuple[str, str]]] = {
+        "sgr_agent_span_seconds": ("summary", "Duration of agent phases, tool calls and LLM streams"),
+        "sgr_agent_llm_time_to_first_token_seconds": ("summary", "Time from LLM request to the first streamed token"),
+        "sgr_agent_llm_calls_total": ("counter", "Number of LLM calls"),
+        "sgr_agent_llm_tokens_total": ("counter", "LLM tokens reported by the upstream"),
+        "sgr_agent_llm_generation_seconds_total": ("counter", "Time spent streaming tokens of calls with usage"),
+        "sgr_agent_llm_generated_tokens_total": ("counter", "Completion tokens of calls with measured generation time"),
+        "sgr_scheduler_wait_seconds": ("summary", "Time agents waited for a scheduler slot"),
+        "sgr_scheduler_rejected_total": ("counter", "Agent requests rejected by the scheduler"),
+        "sgr_rate_limit_wait_seconds": ("summary", "Time upstream requests waited for the rate limit"),
+        "sgr_mcp_result_dropped_bytes_total": ("counter", "Bytes of MCP tool results left out by mcp_context_limit"),
+        "sgr_search_cache_lookups_total": ("counter", "Search and extract cache lookups by result"),
+    }
+    _values: ClassVar[dict[str, dict[Labels, float]]] = {}
+
+    def __init__(self):
+        raise TypeError(f"{self.__class__.__name__} is a static class and cannot be instantiated")
+
+    @classmethod
+    def inc(cls, name: str, value: float = 1.0, **labels: str) -> None:
+        samples = cls._values.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        samples[key] = samples.get(key, 0.0) + value
+
+    @classmethod
+    def observe(cls, name: str, value: float, **labels: str) -> None:
+        cls.inc(name, 1, __suffix="_count", **labels)
+        cls.inc(name, value, __suffix="_sum", **labels)
+
+    @classmethod
+    def render(cls) -> str:
+        """Render all recorded metrics in the Prometheus text format."""
+        return "".join(
+            format_metric(name, metric_type, description, cls._values[name])
+            for name, (metric_type, description) in cls._metrics.items()
+            if name in cls._values
+        )
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._values.clear()
+
+
+class AgentMetrics:
+    """Records timings and LLM token usage of a single agent.
+
+    Totals are aggregated into ``AgentContext.usage`` and
+    ``AgentContext.timings`` and into the process-wide
+    ``MetricsRegistry``; values of the current step are kept until
+    ``pop_step()`` for the agent log.
+    """
+
+    def __init__(self, context: AgentContext, agent_name: str):
+        self.context = context
+        self.agent_name = agent_name
+        self._step_spans: dict[str, float] = {}
+        self._step_usage = {"llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+        self._step_ttft: list[float] = []
+
+    def add_span(self, name: str, seconds: float) -> None:
+        self.context.timings.setdefault(name, SpanStats()).add(seconds)
+        self._step_spans[name] = self._step_spans.get(name, 0.0) + seconds
+        MetricsRegistry.observe("sgr_agent_span_seconds", seconds, agent=self.agent_name, span=name)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Measure the duration of the block, also when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, time.perf_counter() - started)
+
+    def record_llm_call(
+        self,
+        duration: float,
+        time_to_first_token: float | None,
+        usage: CompletionUsage | None,
+    ) -> None:
+        """Record a streamed LLM call.
+
+        Args:
+            duration: Time from sending the request to the end of the stream
+            time_to_first_token: Time to the first content or tool call delta, None if nothing was streamed
+            usage: Token usage reported by the upstream, None if not reported
+        """
+        stats = self.context.usage
+        stats.calls += 1
+        self._step_usage["llm_calls"] += 1
+        self.add_span("llm_stream", duration)
+        MetricsRegistry.inc("sgr_agent_llm_calls_total", agent=self.agent_name)
+        if time_to_first_token is not None:
+            stats.time_to_first_token.add(time_to_first_token)
+            self._step_ttft.append(round(time_to_first_token, 6))
+            MetricsRegistry.observe(
+                "sgr_agent_llm_time_to_first_token_seconds", time_to_first_token, agent=self.agent_name
+            )
+        if usage is None:
+            return
+        stats.prompt_tokens += usage.prompt_tokens
+        stats.completion_tokens += usage.completion_tokens
+        stats.total_tokens += usage.total_tokens
+        self._step_usage["prompt_tokens"] += usage.prompt_tokens
+        self._step_usage["completion_tokens"] += usage.completion_tokens
+        MetricsRegistry.inc("sgr_agent_llm_tokens_total", usage.prompt_tokens, agent=self.agent_name, type="prompt")
+        MetricsRegistry.inc(
+            "sgr_agent_llm_tokens_total", usage.completion_tokens, agent=self.agent_name, type="completion"
+        )
+        if time_to_first_token is not None and duration > time_to_first_token:
+            generation_seconds = duration - time_to_first_token
+            stats.generation_seconds += generation_seconds
+            stats.generated_tokens += usage.completion_tokens
+            MetricsRegistry.inc("sgr_agent_llm_generation_seconds_total", generation_seconds, agent=self.agent_name)
+            MetricsRegistry.inc("sgr_agent_llm_generated_tokens_total", usage.completion_tokens, agent=self.agent_name)
+
+    def pop_step(self) -> dict:
+        """Get the timings and usage recorded since the previous call and
+        start a new step."""
+        step = {
+            "spans": {name: round(seconds, 6) for name, seconds in self._step_spans.items()},
+            "time_to_first_token": self._step_ttft,
+            **self._step_usage,
+        }
+        self._step_spans = {}
+        self._step_usage = dict.fromkeys(self._step_usage, 0)
+        self._step_ttft = []
+        return step
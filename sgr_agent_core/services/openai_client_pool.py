@@ -0,0 +1,104 @@
+import hashlib
+import importlib.util
+import logging
+from typing import ClassVar
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from sgr_agent_core.agent_definition import LLMConfig
+
+logger = logging.getLogger(__name__)
+
+ClientKey = tuple[str, str, str | None]
+
+
+class OpenAIClientPool:
+    """Process-wide pool of AsyncOpenAI clients shared across agents.
+
+    Clients are keyed by (base_url, api_key hash, proxy), so every agent
+    talking to the same upstream reuses one httpx connection pool instead
+    of paying a fresh TLS handshake per request. Connection limits,
+    keep-alive and HTTP/2 are taken from the LLMConfig that first
+    requested the client.
+    """
+
+    _clients: ClassVar[dict[ClientKey, AsyncOpenAI]] = {}
+
+    def __init__(self):
+        raise TypeError(f"{self.__class__.__name__} is a static class and cannot be instantiated")
+
+    @staticmethod
+    def _make_key(llm_config: LLMConfig) -> ClientKey:
+        api_key_hash = hashlib.sha256((llm_config.api_key or "").encode("utf-8")).hexdigest()
+        return llm_config.base_url, api_key_hash, llm_config.proxy
+
+    @staticmethod
+    def _create_http_client(llm_config: LLMConfig) -> httpx.AsyncClient:
+        http2 = llm_config.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but 'h2' package is not installed, falling back to HTTP/1.1")
+            http2 = False
+        return DefaultAsyncHttpxClient(
+            proxy=llm_config.proxy,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=llm_config.max_connections,
+                max_keepalive_connections=llm_config.max_keepalive_connections,
+                keepalive_expiry=llm_config.keepalive_expiry,
+            ),
+        )
+
+    @classmethod
+    def get_client(cls, llm_config: LLMConfig) -> AsyncOpenAI:
+        """Get a shared OpenAI client for the LLM configuration.
+
+        Args:
+            llm_config: LLM configuration
+
+        Returns:
+            Pooled AsyncOpenAI client
+        """
+        key = cls._make_key(llm_config)
+        client = cls._clients.get(key)
+        if client is None or client.is_closed():
+            client = AsyncOpenAI(
+                base_url=llm_config.base_url,
+                api_key=llm_config.api_key,
+                http_client=cls._create_http_client(llm_config),
+            )
+            cls._clients[key] = client
+            logger.info(f"Created pooled OpenAI client for {llm_config.base_url}")
+        return client
+
+    @classmethod
+    def connection_stats(cls) -> dict[str, dict[str, int]]:
+        """Get live connection counts per upstream base URL.
+
+        Returns:
+            Mapping of base URL to clients, total and idle connection counts
+        """
+        stats: dict[str, dict[str, int]] = {}
+        for (base_url, _, _), client in cls._clients.items():
+            upstream = stats.setdefault(base_url, {"clients": 0, "connections": 0, "idle_connections": 0})
+            upstream["clients"] += 1
+            http_client = client._client
+            transports = [http_client._transport, *getattr(http_client, "_mounts", {}).values()]
+            for transport in transports:
+                for connection in getattr(getattr(transport, "_pool", None), "connections", []):
+                    upstream["connections"] += 1
+                    upstream["idle_connections"] += int(connection.is_idle())
+        return stats
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close all pooled clients and release their connections."""
+        clients = list(cls._clients.values())
+        cls._clients.clear()
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Error closing OpenAI client: {e}")
+        if clients:
+            logger.info(f"Closed {len(clients)} pooled OpenAI clients")
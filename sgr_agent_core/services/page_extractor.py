@@ -0,0 +1,175 @@
+import asyncio
+import ipaddress
+import logging
+import re
+import socket
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class _HTMLTextParser(HTMLParser):
+    """Collect readable text from HTML, skipping scripts and styles."""
+
+    SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "head"}
+    BLOCK_TAGS = {"p", "div", "br", "li", "ul", "ol", "tr", "section", "article", "h1", "h2", "h3", "h4", "h5", "h6"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self.title = ""
+        self._skip_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "title":
+            self._in_title = False
+        elif tag in self.BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+        elif not self._skip_depth:
+            self.parts.append(data)
+
+    def text(self) -> str:
+        text = re.sub(r"[ \t\r\f\v]+", " ", "".join(self.parts))
+        return re.sub(r"\s*\n\s*", "\n", text).strip()
+
+
+def html_to_text(html: str) -> tuple[str, str]:
+    """Convert HTML to plain text.
+
+    Args:
+        html: HTML document
+
+    Returns:
+        Tuple with page title and readable text
+    """
+    parser = _HTMLTextParser()
+    parser.feed(html)
+    parser.close()
+    return parser.title.strip(), parser.text()
+
+
+class PageExtractor(ABC):
+    """Base class for page content extractors used as extract
+    backends."""
+
+    @abstractmethod
+    async def extract(self, url: str) -> dict | None:
+        """Extract page content.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Tavily-like result dict with url and raw_content, or None on failure
+        """
+
+    async def aclose(self) -> None:
+        """Release extractor resources."""
+
+
+class LocalPageExtractor(PageExtractor):
+    """Extract page content directly with httpx and a plain HTML-to-text
+    conversion.
+
+    URLs whose host resolves to a non-public address (loopback, private,
+    link-local) are refused, on the first request and after every
+    redirect, unless allow_private_addresses is set.
+    """
+
+    CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+    MAX_REDIRECTS = 5
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        max_bytes: int = 5 * 1024 * 1024,
+        allow_private_addresses: bool = False,
+    ):
+        self._client = client or httpx.AsyncClient(
+            headers={"User-Agent": "Mozilla/5.0 (compatible; sgr-agent-core)"},
+        )
+        self._max_bytes = max_bytes
+        self._allow_private_addresses = allow_private_addresses
+
+    @staticmethod
+    async def _check_public_host(url: httpx.URL) -> None:
+        """Raise ValueError unless every address of the URL host is
+        public."""
+        if url.scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL scheme '{url.scheme}'")
+        port = url.port or (443 if url.scheme == "https" else 80)
+        addresses = await asyncio.get_running_loop().getaddrinfo(url.host, port, type=socket.SOCK_STREAM)
+        for *_, sockaddr in addresses:
+            address = ipaddress.ip_address(sockaddr[0])
+            if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+                address = address.ipv4_mapped
+            if not address.is_global:
+                raise ValueError(f"{url.host} resolves to non-public address {address}")
+
+    async def _fetch(self, url: httpx.URL) -> tuple[str, str] | None:
+        """Fetch a page following redirects manually, so every hop is
+        checked.
+
+        Returns:
+            Tuple with content type and decoded body, or None if the
+            content type is not supported
+        """
+        for _ in range(self.MAX_REDIRECTS + 1):
+            if not self._allow_private_addresses:
+                await self._check_public_host(url)
+            async with self._client.stream("GET", url, follow_redirects=False) as response:
+                if response.next_request is not None:
+                    url = response.next_request.url
+                    continue
+                response.raise_for_status()
+                content_type = response.headers.get("content-type", "text/html").split(";")[0].strip().lower()
+                if content_type not in self.CONTENT_TYPES:
+                    logger.warning(f"⚠️ Local extract skipped {url}: unsupported content type {content_type}")
+                    return None
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body.extend(chunk)
+                    if len(body) >= self._max_bytes:
+                        break
+                return content_type, bytes(body[: self._max_bytes]).decode(
+                    response.encoding or "utf-8", errors="replace"
+                )
+        raise httpx.TooManyRedirects(f"Exceeded {self.MAX_REDIRECTS} redirects", request=response.request)
+
+    async def extract(self, url: str) -> dict | None:
+        try:
+            fetched = await self._fetch(httpx.URL(url))
+        except (httpx.HTTPError, httpx.InvalidURL, OSError, ValueError) as e:
+            logger.warning(f"⚠️ Local extract failed for {url}: {e}")
+            return None
+        if fetched is None:
+            return None
+
+        content_type, text = fetched
+        title = ""
+        if content_type != "text/plain":
+            title, text = await asyncio.to_thread(html_to_text, text)
+        if not text:
+            return None
+        return {"url": url, "title": title, "raw_content": text}
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+from typing import ClassVar
+
+from sgr_agent_core.services.metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket limiting the request rate to an upstream.
+
+    Tokens are refilled continuously at ``rate`` per second up to
+    ``burst``. Waiters take tokens in arrival order, so a burst of agents
+    is spread over time instead of hitting the upstream quota at once.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock: asyncio.Lock | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Wait for a token.
+
+        Returns:
+            Seconds spent waiting
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Locks are bound to the event loop that created them
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        started = time.monotonic()
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+        return time.monotonic() - started
+
+
+class RateLimiter:
+    """Process-wide token buckets per upstream shared by all agents."""
+
+    _buckets: ClassVar[dict[str, TokenBucket]] = {}
+
+    def __init__(self):
+        raise TypeError(f"{self.__class__.__name__} is a static class and cannot be instantiated")
+
+    @classmethod
+    def get_bucket(cls, upstream: str, rate: float, burst: int = 1) -> TokenBucket:
+        """Get the bucket of an upstream, updating its limits when they
+        changed."""
+        bucket = cls._buckets.get(upstream)
+        if bucket is None:
+            bucket = cls._buckets[upstream] = TokenBucket(rate, burst)
+        else:
+            bucket.rate, bucket.burst = rate, burst
+        return bucket
+
+    @classmethod
+    async def acquire(cls, upstream: str, rate: float | None, burst: int = 1) -> None:
+        """Wait until a request to the upstream is allowed; no-op without a
+        rate limit."""
+        if rate is None:
+            return
+        waited = await cls.get_bucket(upstream, rate, burst).acquire()
+        MetricsRegistry.observe("sgr_rate_limit_wait_seconds", waited, upstream=upstream)
+        if waited > 1:
+            logger.debug(f"Rate limit of {upstream} delayed request by {waited:.1f}s")
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._buckets.clear()
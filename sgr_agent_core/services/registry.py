@@ -21,10 +21,12 @@ class Registry(Generic[T]):
     """
 
     _items: dict[str, type[T]] = {}
+    _version: int = 0
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
         cls._items = {}
+        cls._version = 0
 
     def __init__(self):
         raise TypeError(f"{self.__class__.__name__} is a static class and cannot be instantiated")
@@ -59,10 +61,15 @@ class Registry(Generic[T]):
 
         def _register(cls_to_register: type[T]) -> type[T]:
             """Internal registration function."""
-            if cls_to_register.__name__ not in cls._items:
-                cls._items[cls_to_register.__name__.lower()] = cls_to_register
-                if name is not None:
-                    cls._items[name.lower()] = cls_to_register
+            keys = {cls_to_register.__name__.lower()}
+            if name is not None:
+                keys.add(name.lower())
+            changed = [key for key in keys if cls._items.get(key) is not cls_to_register]
+            for key in changed:
+                cls._items[key] = cls_to_register
+            if changed:
+                # Registering the same class again leaves dependent caches valid
+                cls._version += 1
             return cls_to_register
 
         # Used as decorator without arguments: @Registry.register
@@ -112,10 +119,24 @@ class Registry(Generic[T]):
                 continue
         return items, missing
 
+    @classmethod
+    def version(cls) -> int:
+        """Get the registry version.
+
+        The version is incremented whenever a registration changes the
+        stored classes and on clear, so dependent caches can detect
+        registry changes.
+
+        Returns:
+            Current registry version
+        """
+        return cls._version
+
     @classmethod
     def clear(cls) -> None:
         """Clear all registered items."""
         cls._items.clear()
+        cls._version += 1
 
 
 class AgentRegistry(Registry["BaseAgent"]):
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import ClassVar, NamedTuple
+
+from sgr_agent_core.agent_definition import SearchConfig
+
+logger = logging.getLogger(__name__)
+
+
+class SearchCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class SearchCacheBackend(ABC):
+    """Base class for search result cache backends.
+
+    Values are opaque bytes with a shared TTL. Backends evict least
+    recently used entries when entry count or total byte size exceeds
+    the configured limits.
+    """
+
+    _shared: ClassVar[dict[tuple, "SearchCacheBackend"]] = {}
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @classmethod
+    def from_config(cls, search_config: SearchConfig) -> "SearchCacheBackend | None":
+        """Get the shared cache backend selected in the search configuration.
+
+        Args:
+            search_config: Search configuration
+
+        Returns:
+            Shared cache backend or None if caching is disabled
+        """
+        backend = search_config.cache_backend
+        if backend is None:
+            return None
+        key = (
+            backend,
+            search_config.cache_path if backend == "sqlite" else None,
+            search_config.cache_ttl,
+            search_config.cache_max_entries,
+            search_config.cache_max_bytes,
+        )
+        cache = cls._shared.get(key)
+        if cache is None:
+            limits = {
+                "ttl": search_config.cache_ttl,
+                "max_entries": search_config.cache_max_entries,
+                "max_bytes": search_config.cache_max_bytes,
+            }
+            if backend == "memory":
+                cache = InMemorySearchCache(**limits)
+            elif backend == "sqlite":
+                cache = SQLiteSearchCache(path=search_config.cache_path, **limits)
+            else:
+                raise ValueError(f"Unknown search cache backend: {backend}")
+            cls._shared[key] = cache
+            logger.info(f"Created {backend} search cache (ttl={search_config.cache_ttl}s)")
+        return cache
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Get a cached value or None if it is missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes) -> None:
+        """Store a value, evicting old entries if limits are exceeded."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop all cached values."""
+
+    @abstractmethod
+    def info(self) -> SearchCacheInfo:
+        """Get cache statistics."""
+
+
+class InMemorySearchCache(SearchCacheBackend):
+    """Process-local TTL + LRU search cache."""
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        super().__init__(ttl=ttl, max_entries=max_entries, max_bytes=max_bytes)
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._bytes = 0
+
+    def _pop(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._pop(key)
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[1]
+
+    async def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._pop(key)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._bytes += len(value)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._pop(next(iter(self._entries)))
+            self._evictions += 1
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def info(self) -> SearchCacheInfo:
+        return SearchCacheInfo(self._hits, self._misses, self._evictions, len(self._entries), self._bytes)
+
+
+class SQLiteSearchCache(SearchCacheBackend):
+    """On-disk TTL + LRU search cache backed by sqlite.
+
+    Survives restarts and can be shared by several workers on one host.
+    Database calls run in a worker thread to keep the event loop free.
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int, max_bytes: int):
+        super().__init__(ttl=ttl, max_entries=max_entries, max_bytes=max_bytes)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS search_cache_accessed ON search_cache (accessed_at)")
+
+    def _get(self, key: str) -> bytes | None:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._connection.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self._misses += 1
+                return None
+            self._connection.execute("UPDATE search_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._hits += 1
+            return row[0]
+
+    def _set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO search_cache (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now + self.ttl, now),
+            )
+            self._connection.execute("DELETE FROM search_cache WHERE expires_at < ?", (now,))
+            entries, total_bytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache"
+            ).fetchone()
+            if entries <= self.max_entries and total_bytes <= self.max_bytes:
+                return
+            evicted = []
+            for row_key, size in self._connection.execute(
+                "SELECT key, size FROM search_cache ORDER BY accessed_at ASC"
+            ).fetchall():
+                if entries <= self.max_entries and total_bytes <= self.max_bytes:
+                    break
+                evicted.append((row_key,))
+                entries -= 1
+                total_bytes -= size
+            self._connection.executemany("DELETE FROM search_cache WHERE key = ?", evicted)
+            self._evictions += len(evicted)
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM search_cache")
+
+    async def get(self, key: str) -> bytes | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        await asyncio.to_thread(self._set, key, value)
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._clear)
+
+    def info(self) -> SearchCacheInfo:
+        with self._lock:
+            entries, total_bytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache"
+            ).fetchone()
+        return SearchCacheInfo(self._hits, self._misses, self._evictions, entries, total_bytes)
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, AsyncIterator
+
+from pydantic import Field
+
+from sgr_agent_core.models import AgentStatesEnum
+from sgr_agent_core.services.agent_store import AgentSummary
+
+if TYPE_CHECKING:
+    from sgr_agent_core.base_agent import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+
+class AgentSnapshot(AgentSummary):
+    """Agent state persisted to shared storage so any worker can serve
+    it."""
+
+    worker_id: str = Field(description="ID of the worker running the agent")
+    conversation: list[dict] = Field(default_factory=list, description="Agent conversation messages")
+    evicted: bool = Field(default=False, description="Whether the agent was evicted from the owning worker")
+
+    @classmethod
+    def from_agent(cls, agent: BaseAgent, worker_id: str = "", evicted: bool = False) -> AgentSnapshot:
+        summary = AgentSummary.from_agent(agent)
+        return cls(
+            worker_id=worker_id,
+            conversation=agent.conversation,
+            evicted=evicted,
+            **summary.model_dump(exclude={"evicted"}),
+        )
+
+
+class SharedStateBackend(ABC):
+    """Shared storage used to run agents across several server workers.
+
+    Provides three channels: agent snapshots readable by every worker,
+    an append-only stream of SSE chunks per agent that any worker can
+    subscribe to, and per-worker command queues used to route
+    clarifications and cancellations to the worker owning the agent.
+
+    Stream chunks are ordered by a monotonically increasing event ID. A
+    None chunk marks the end of a stream segment (agent finished or
+    paused for clarification).
+    """
+
+    @abstractmethod
+    async def save_snapshot(self, snapshot: AgentSnapshot) -> None:
+        """Create or replace an agent snapshot."""
+
+    @abstractmethod
+    async def load_snapshot(self, agent_id: str) -> AgentSnapshot | None:
+        """Load an agent snapshot or None if it is unknown."""
+
+    @abstractmethod
+    async def delete_agent(self, agent_id: str) -> None:
+        """Drop snapshot and stream events of an agent."""
+
+    @abstractmethod
+    async def publish(self, agent_id: str, chunk: str | None) -> int:
+        """Append a stream chunk, None marks the end of a segment.
+
+        Returns:
+            Event ID of the published chunk
+        """
+
+    @abstractmethod
+    async def last_event(self, agent_id: str) -> tuple[int, bool]:
+        """Get the ID of the latest published event of an agent (0 if none)
+        and whether it ends a segment."""
+
+    @abstractmethod
+    async def segment_start(self, agent_id: str) -> int:
+        """Get the event ID after which the latest stream segment starts."""
+
+    @abstractmethod
+    def subscribe(self, agent_id: str, after: int = 0) -> AsyncIterator[str]:
+        """Iterate stream chunks published after the given event ID until
+        the end of the segment."""
+
+    @abstractmethod
+    async def send_command(self, worker_id: str, agent_id: str, command: str, payload: dict | None = None) -> None:
+        """Queue a command for the worker owning an agent."""
+
+    @abstractmethod
+    async def receive_commands(self, worker_id: str) -> list[tuple[str, str, dict]]:
+        """Pop queued commands of a worker as (agent_id, command, payload)."""
+
+    @abstractmethod
+    async def prune(self, max_age: float) -> None:
+        """Drop stream events, commands and snapshots of finished agents
+        older than max_age seconds."""
+
+    async def aclose(self) -> None:
+        """Release backend resources."""
+
+
+class SQLiteSharedStateBackend(SharedStateBackend):
+    """Shared state backend on a sqlite database file.
+
+    Suitable for several workers on one host. Subscribers and command
+    receivers poll the database every ``poll_interval`` seconds; database
+    calls run in a worker thread to keep the event loop free.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 0.05):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS agent_snapshots ("
+            "agent_id TEXT PRIMARY KEY, worker_id TEXT NOT NULL, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS stream_events ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, agent_id TEXT NOT NULL, data TEXT, created_at REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS stream_events_agent ON stream_events (agent_id, id)")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS worker_commands ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, worker_id TEXT NOT NULL, agent_id TEXT NOT NULL, "
+            "command TEXT NOT NULL, payload TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+
+    def _execute(self, query: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._connection.execute(query, params).fetchall()
+
+    async def _run(self, query: str, params: tuple = ()) -> list[tuple]:
+        return await asyncio.to_thread(self._execute, query, params)
+
+    async def save_snapshot(self, snapshot: AgentSnapshot) -> None:
+        await self._run(
+            "INSERT OR REPLACE INTO agent_snapshots (agent_id, worker_id, data, updated_at) VALUES (?, ?, ?, ?)",
+            (snapshot.agent_id, snapshot.worker_id, snapshot.model_dump_json(), time.time()),
+        )
+
+    async def load_snapshot(self, agent_id: str) -> AgentSnapshot | None:
+        rows = await self._run("SELECT data FROM agent_snapshots WHERE agent_id = ?", (agent_id,))
+        return AgentSnapshot.model_validate_json(rows[0][0]) if rows else None
+
+    def _delete_agent(self, agent_id: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM agent_snapshots WHERE agent_id = ?", (agent_id,))
+            self._connection.execute("DELETE FROM stream_events WHERE agent_id = ?", (agent_id,))
+
+    async def delete_agent(self, agent_id: str) -> None:
+        await asyncio.to_thread(self._delete_agent, agent_id)
+
+    def _publish(self, agent_id: str, chunk: str | None) -> int:
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT INTO stream_events (agent_id, data, created_at) VALUES (?, ?, ?)",
+                (agent_id, chunk, time.time()),
+            )
+            return cursor.lastrowid
+
+    async def publish(self, agent_id: str, chunk: str | None) -> int:
+        return await asyncio.to_thread(self._publish, agent_id, chunk)
+
+    async def last_event(self, agent_id: str) -> tuple[int, bool]:
+        rows = await self._run(
+            "SELECT id, data IS NULL FROM stream_events WHERE agent_id = ? ORDER BY id DESC LIMIT 1", (agent_id,)
+        )
+        return (rows[0][0], bool(rows[0][1])) if rows else (0, False)
+
+    async def segment_start(self, agent_id: str) -> int:
+        rows = await self._run(
+            "SELECT COALESCE(MAX(id), 0) FROM stream_events WHERE agent_id = ? AND data IS NULL "
+            "AND id < (SELECT MAX(id) FROM stream_events WHERE agent_id = ?)",
+            (agent_id, agent_id),
+        )
+        return rows[0][0]
+
+    async def subscribe(self, agent_id: str, after: int = 0) -> AsyncIterator[str]:
+        while True:
+            rows = await self._run(
+                "SELECT id, data FROM stream_events WHERE agent_id = ? AND id > ? ORDER BY id", (agent_id, after)
+            )
+            for event_id, data in rows:
+                if data is None:
+                    return
+                after = event_id
+                yield data
+            if not rows:
+                await asyncio.sleep(self.poll_interval)
+
+    async def send_command(self, worker_id: str, agent_id: str, command: str, payload: dict | None = None) -> None:
+        await self._run(
+            "INSERT INTO worker_commands (worker_id, agent_id, command, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+            (worker_id, agent_id, command, json.dumps(payload or {}), time.time()),
+        )
+
+    def _receive_commands(self, worker_id: str) -> list[tuple[str, str, dict]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "DELETE FROM worker_commands WHERE worker_id = ? RETURNING id, agent_id, command, payload",
+                (worker_id,),
+            ).fetchall()
+        return [(agent_id, command, json.loads(payload)) for _, agent_id, command, payload in sorted(rows)]
+
+    async def receive_commands(self, worker_id: str) -> list[tuple[str, str, dict]]:
+        return await asyncio.to_thread(self._receive_commands, worker_id)
+
+    def _prune(self, max_age: float) -> None:
+        threshold = time.time() - max_age
+        with self._lock:
+            self._connection.execute("DELETE FROM stream_events WHERE created_at < ?", (threshold,))
+            self._connection.execute("DELETE FROM worker_commands WHERE created_at < ?", (threshold,))
+            rows = self._connection.execute(
+                "SELECT agent_id, json_extract(data, '$.state') FROM agent_snapshots WHERE updated_at < ?",
+                (threshold,),
+            ).fetchall()
+            finished = [(agent_id,) for agent_id, state in rows if state in AgentStatesEnum.FINISH_STATES.value]
+            self._connection.executemany("DELETE FROM agent_snapshots WHERE agent_id = ?", finished)
+
+    async def prune(self, max_age: float) -> None:
+        await asyncio.to_thread(self._prune, max_age)
+
+    async def aclose(self) -> None:
+        with self._lock:
+            self._connection.close()
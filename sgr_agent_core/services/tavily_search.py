@@ -1,19 +1,147 @@
+import asyncio
+import hashlib
+import json
 import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, ClassVar
 
 from tavily import AsyncTavilyClient
 
 from sgr_agent_core.agent_definition import SearchConfig
-from sgr_agent_core.models import SourceData
+from sgr_agent_core.models import SearchCacheStats, SourceData
+from sgr_agent_core.services.metrics import MetricsRegistry
+from sgr_agent_core.services.page_extractor import LocalPageExtractor, PageExtractor
+from sgr_agent_core.services.rate_limiter import RateLimiter
+from sgr_agent_core.services.search_cache import SearchCacheBackend
 
 logger = logging.getLogger(__name__)
 
 
 class TavilySearchService:
-    def __init__(self, search_config: SearchConfig):
-        self._client = AsyncTavilyClient(
+    """Tavily search and extract service.
+
+    Use get_shared() to obtain a service shared across agents: it reuses
+    one AsyncTavilyClient connection pool per API key and base URL, and
+    identical in-flight search/extract calls are coalesced into a single
+    upstream request.
+
+    When SearchConfig.cache_backend is set, search responses and
+    per-URL extract results are cached with TTL and LRU eviction.
+
+    SearchConfig.extract_mode="per_url" extracts URLs concurrently with
+    per-URL timeouts, and extract_fallback selects a backend used for
+    URLs Tavily failed to extract.
+    """
+
+    _instances: ClassVar[dict[str, "TavilySearchService"]] = {}
+    _clients: ClassVar[dict[tuple[str, str], AsyncTavilyClient]] = {}
+    _in_flight: ClassVar[dict[tuple, asyncio.Future]] = {}
+
+    def __init__(
+        self,
+        search_config: SearchConfig,
+        client: AsyncTavilyClient | None = None,
+        fallback_extractor: PageExtractor | None = None,
+    ):
+        self._client = client or AsyncTavilyClient(
             api_key=search_config.tavily_api_key, api_base_url=search_config.tavily_api_base_url
         )
         self._config = search_config
+        self._client_key = self._make_client_key(search_config)
+        self._cache = SearchCacheBackend.from_config(search_config)
+        if fallback_extractor is None and search_config.extract_fallback == "local":
+            fallback_extractor = LocalPageExtractor()
+        self._fallback_extractor = fallback_extractor
+
+    @staticmethod
+    def _make_client_key(search_config: SearchConfig) -> tuple[str, str]:
+        api_key_hash = hashlib.sha256((search_config.tavily_api_key or "").encode("utf-8")).hexdigest()
+        return search_config.tavily_api_base_url, api_key_hash
+
+    @classmethod
+    def get_shared(cls, search_config: SearchConfig) -> "TavilySearchService":
+        """Get a service shared by all callers with the same search
+        configuration.
+
+        Args:
+            search_config: Search configuration
+
+        Returns:
+            Shared TavilySearchService instance
+        """
+        key = search_config.model_dump_json()
+        service = cls._instances.get(key)
+        if service is None:
+            client_key = cls._make_client_key(search_config)
+            client = cls._clients.get(client_key)
+            if client is None:
+                client = AsyncTavilyClient(
+                    api_key=search_config.tavily_api_key, api_base_url=search_config.tavily_api_base_url
+                )
+                cls._clients[client_key] = client
+            service = cls(search_config, client=client)
+            cls._instances[key] = service
+        return service
+
+    @classmethod
+    async def aclose_shared(cls) -> None:
+        """Close shared clients and drop shared services."""
+        clients = list(cls._clients.values())
+        clients += [service._fallback_extractor for service in cls._instances.values() if service._fallback_extractor]
+        cls._clients.clear()
+        cls._instances.clear()
+        for client in clients:
+            close = getattr(client, "close", None) or getattr(client, "aclose", None)
+            if close is None:
+                continue
+            try:
+                await close()
+            except Exception as e:
+                logger.warning(f"Error closing search client: {e}")
+
+    async def _coalesce(self, key: tuple, request: Callable[[], Awaitable[Any]]) -> Any:
+        """Run the request or join an identical one already in flight.
+
+        The shared request is shielded, so cancelling one caller does not
+        cancel it for the others.
+        """
+        key = (*self._client_key, *key)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._rate_limited(request))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            logger.debug(f"Joining in-flight Tavily request: {key[2:]}")
+        return await asyncio.shield(future)
+
+    async def _rate_limited(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        await RateLimiter.acquire(
+            f"search:{self._config.tavily_api_base_url}", self._config.rate_limit, self._config.rate_limit_burst
+        )
+        return await request()
+
+    async def _cache_get(self, key: str, cache_stats: SearchCacheStats | None) -> dict | None:
+        if self._cache is None:
+            return None
+        value = await self._cache.get(key)
+        MetricsRegistry.inc(
+            "sgr_search_cache_lookups_total", kind=key.partition(":")[0], result="miss" if value is None else "hit"
+        )
+        if cache_stats is not None:
+            if value is None:
+                cache_stats.misses += 1
+            else:
+                cache_stats.hits += 1
+        return json.loads(value) if value is not None else None
+
+    async def _cache_set(self, key: str, value: dict) -> None:
+        if self._cache is not None:
+            await self._cache.set(key, json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+    @staticmethod
+    def _search_cache_key(query: str, max_results: int, include_raw_content: bool) -> str:
+        normalized_query = " ".join(query.lower().split())
+        return f"search:{max_results}:{int(include_raw_content)}:{normalized_query}"
 
     @staticmethod
     def rearrange_sources(sources: list[SourceData], starting_number=1) -> list[SourceData]:
@@ -26,6 +154,7 @@ class TavilySearchService:
         query: str,
         max_results: int | None = None,
         include_raw_content: bool = True,
+        cache_stats: SearchCacheStats | None = None,
     ) -> list[SourceData]:
         """Perform search through Tavily API and return results with
         SourceData.
@@ -34,6 +163,7 @@ class TavilySearchService:
             query: Search query
             max_results: Maximum number of results (default from config)
             include_raw_content: Include raw page content
+            cache_stats: Optional per-agent cache statistics to update
 
         Returns:
             Tuple with tavily answer and list of SourceData
@@ -41,50 +171,179 @@ class TavilySearchService:
         max_results = max_results or self._config.max_results
         logger.info(f"🔍 Tavily search: '{query}' (max_results={max_results})")
 
-        # Execute search through Tavily
-        response = await self._client.search(
-            query=query,
-            max_results=max_results,
-            include_raw_content=include_raw_content,
-        )
+        cache_key = self._search_cache_key(query, max_results, include_raw_content)
+        response = await self._cache_get(cache_key, cache_stats)
+        if response is None:
+            # Execute search through Tavily
+            response = await self._coalesce(
+                ("search", query, max_results, include_raw_content),
+                lambda: self._client.search(
+                    query=query,
+                    max_results=max_results,
+                    include_raw_content=include_raw_content,
+                ),
+            )
+            await self._cache_set(cache_key, response)
 
         # Convert results to SourceData
         sources = self._convert_to_source_data(response)
         return sources
 
-    async def extract(self, urls: list[str]) -> list[SourceData]:
+    async def extract(self, urls: list[str], cache_stats: SearchCacheStats | None = None) -> list[SourceData]:
         """Extract full content from specific URLs using Tavily Extract API.
 
         Args:
             urls: List of URLs to extract content from
+            cache_stats: Optional per-agent cache statistics to update
 
         Returns:
-            List of SourceData with extracted content
+            List of SourceData with extracted content, failed URLs are omitted
         """
         logger.info(f"📄 Tavily extract: {len(urls)} URLs")
 
-        response = await self._client.extract(urls=urls)
+        if self._config.extract_mode == "per_url":
+            return [source async for _, source in self.iter_extract(urls, cache_stats) if source is not None]
 
-        sources = []
-        for i, result in enumerate(response.get("results", [])):
-            if not result.get("url"):
+        results = []
+        missing_urls = []
+        for url in urls:
+            cached = await self._cache_get(f"extract:{url}", cache_stats)
+            if cached is None:
+                missing_urls.append(url)
+            else:
+                results.append(cached)
+
+        if missing_urls:
+            response = await self._coalesce(
+                ("extract", tuple(missing_urls)), lambda: self._client.extract(urls=missing_urls)
+            )
+            fetched, unmatched = self._match_extract_results(missing_urls, response)
+            failed_urls = [url for url in missing_urls if url not in fetched]
+            if failed_urls and self._fallback_extractor is not None:
+                fallback_results = await asyncio.gather(*[self._extract_fallback(url) for url in failed_urls])
+                fetched.update((url, result) for url, result in zip(failed_urls, fallback_results) if result)
+            # Keyed by the requested URL, which is what later lookups use
+            for url, result in fetched.items():
+                await self._cache_set(f"extract:{url}", result)
+            results.extend(fetched.values())
+            results.extend(unmatched)
+
+            failed_results = response.get("failed_results", [])
+            if failed_results:
+                logger.warning(f"⚠️ Failed to extract {len(failed_results)} URLs: {failed_results}")
+
+        return [self._convert_extract_to_source_data(result, i) for i, result in enumerate(results)]
+
+    @staticmethod
+    def _match_extract_results(urls: list[str], response: dict) -> tuple[dict[str, dict], list[dict]]:
+        """Pair extract results with the requested URLs.
+
+        Tavily may return a normalized or redirected URL instead of the
+        requested one. Results without an exact match are paired in order
+        with the requested URLs that neither matched nor failed, when
+        their numbers agree.
+
+        Returns:
+            Results by requested URL and results that could not be paired
+        """
+        matched: dict[str, dict] = {}
+        unmatched = []
+        requested = set(urls)
+        for result in response.get("results", []):
+            url = result.get("url")
+            if not url:
                 continue
+            if url in requested and url not in matched:
+                matched[url] = result
+            else:
+                unmatched.append(result)
+        failed = {
+            failure.get("url") if isinstance(failure, dict) else failure
+            for failure in response.get("failed_results", [])
+        }
+        remaining = [url for url in urls if url not in matched and url not in failed]
+        if unmatched and len(remaining) == len(unmatched):
+            matched.update(zip(remaining, unmatched))
+            unmatched = []
+        return matched, unmatched
 
-            source = SourceData(
-                number=i,
-                title=result.get("url", "").split("/")[-1] or "Extracted Content",
-                url=result.get("url", ""),
-                snippet="",
-                full_content=result.get("raw_content", ""),
-                char_count=len(result.get("raw_content", "")),
+    async def iter_extract(
+        self, urls: list[str], cache_stats: SearchCacheStats | None = None
+    ) -> AsyncIterator[tuple[str, SourceData | None]]:
+        """Extract URLs concurrently and yield each result as soon as it
+        arrives.
+
+        Each URL is requested separately, bounded by
+        SearchConfig.extract_concurrency and extract_timeout. A slow or
+        failed page does not block the others.
+
+        Args:
+            urls: List of URLs to extract content from
+            cache_stats: Optional per-agent cache statistics to update
+
+        Yields:
+            Tuples of URL and SourceData, or None if the URL failed
+        """
+        semaphore = asyncio.Semaphore(self._config.extract_concurrency)
+
+        async def extract_url(url: str) -> tuple[str, dict | None]:
+            async with semaphore:
+                return url, await self._extract_url(url, cache_stats)
+
+        tasks = [asyncio.ensure_future(extract_url(url)) for url in dict.fromkeys(urls)]
+        try:
+            for number, next_done in enumerate(asyncio.as_completed(tasks)):
+                url, result = await next_done
+                if result is None:
+                    logger.warning(f"⚠️ Failed to extract {url}")
+                    yield url, None
+                else:
+                    yield url, self._convert_extract_to_source_data(result, number)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _extract_url(self, url: str, cache_stats: SearchCacheStats | None) -> dict | None:
+        """Extract a single URL with timeout, falling back to the fallback
+        extractor."""
+        cache_key = f"extract:{url}"
+        if (result := await self._cache_get(cache_key, cache_stats)) is not None:
+            return result
+        result = None
+        try:
+            response = await asyncio.wait_for(
+                self._coalesce(("extract", (url,)), lambda: self._client.extract(urls=[url])),
+                timeout=self._config.extract_timeout,
             )
-            sources.append(source)
+            result = next((r for r in response.get("results", []) if r.get("url")), None)
+        except Exception as e:
+            logger.warning(f"⚠️ Tavily extract failed for {url}: {e!r}")
+        if result is None:
+            result = await self._extract_fallback(url)
+        if result is not None:
+            await self._cache_set(cache_key, result)
+        return result
 
-        failed_urls = response.get("failed_results", [])
-        if failed_urls:
-            logger.warning(f"⚠️ Failed to extract {len(failed_urls)} URLs: {failed_urls}")
+    async def _extract_fallback(self, url: str) -> dict | None:
+        if self._fallback_extractor is None:
+            return None
+        try:
+            return await asyncio.wait_for(self._fallback_extractor.extract(url), timeout=self._config.extract_timeout)
+        except Exception as e:
+            logger.warning(f"⚠️ Fallback extract failed for {url}: {e!r}")
+            return None
 
-        return sources
+    @staticmethod
+    def _convert_extract_to_source_data(result: dict, number: int) -> SourceData:
+        """Convert a single extract result to SourceData."""
+        return SourceData(
+            number=number,
+            title=result.get("title") or result.get("url", "").split("/")[-1] or "Extracted Content",
+            url=result.get("url", ""),
+            snippet="",
+            full_content=result.get("raw_content", ""),
+            char_count=len(result.get("raw_content", "")),
+        )
 
     def _convert_to_source_data(self, response: dict) -> list[SourceData]:
         """Convert Tavily response to SourceData list."""
@@ -1,107 +1,350 @@
 import asyncio
+import importlib.util
 import json
+import logging
+import re
 import time
+from collections import deque
+from typing import Any, AsyncIterator, Literal, NamedTuple
 
 from openai.types.chat import ChatCompletionChunk
 
+logger = logging.getLogger(__name__)
+
+
+class StreamEvent(NamedTuple):
+    seq: int
+    data: str | None
+
 
 class StreamingGenerator:
-    def __init__(self):
-        self.queue = asyncio.Queue()
+    """Bounded ring buffer of stream chunks with replay for several
+    readers.
+
+    Every chunk gets a sequence number. At most ``max_chunks`` chunks and
+    ``max_bytes`` of data are kept; older chunks are dropped, and readers
+    that fell behind skip the gap. With ``overflow_policy="coalesce"``
+    readers get all chunks available at once joined into one string
+    instead of one by one, which lets slow clients catch up.
+
+    ``stream()`` is the default reader and continues where it stopped,
+    while ``subscribe()`` creates independent readers that can replay the
+    buffer from a sequence number (SSE ``Last-Event-ID``). None marks the
+    end of a stream segment; readers stop there.
+    """
+
+    def __init__(
+        self,
+        max_chunks: int = 10000,
+        max_bytes: int = 8 * 1024 * 1024,
+        overflow_policy: Literal["drop", "coalesce"] = "drop",
+    ):
+        self.max_chunks = max_chunks
+        self.max_bytes = max_bytes
+        self.overflow_policy = overflow_policy
+        self.buffer: deque[StreamEvent] = deque()
+        self.buffered_bytes = 0
+        self.dropped = 0
+        self._last_seq = 0
+        self._cursor = 0
+        self._segment_start = 0
+        self._previous_segment_start = 0
+        self._wakeup = asyncio.Event()
+        self._has_waiters = False
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    def qsize(self) -> int:
+        """Number of buffered chunks not yet read by the default reader."""
+        return sum(1 for event in self.buffer if event.seq > self._cursor)
+
+    def _append(self, data: str | None) -> None:
+        self._last_seq += 1
+        self.buffer.append(StreamEvent(self._last_seq, data))
+        self.buffered_bytes += len(data) if data else 0
+        while len(self.buffer) > 1 and (len(self.buffer) > self.max_chunks or self.buffered_bytes > self.max_bytes):
+            dropped = self.buffer.popleft()
+            self.buffered_bytes -= len(dropped.data) if dropped.data else 0
+            self.dropped += 1
+        if self._has_waiters:
+            self._wakeup.set()
+            self._wakeup = asyncio.Event()
+            self._has_waiters = False
 
     def add(self, data: str):
-        self.queue.put_nowait(data)
+        self._append(data)
 
     def finish(self):
-        self.queue.put_nowait(None)  # Termination signal
+        self._append(None)  # Termination signal
+        self._previous_segment_start = self._segment_start
+        self._segment_start = self._last_seq
 
-    async def stream(self):
+    async def _read(self, after: int) -> AsyncIterator[list[StreamEvent]]:
+        """Yield batches of events after the given sequence number until the
+        end of the segment."""
+        cursor = after
         while True:
-            data = await self.queue.get()
-            if data is None:  # Termination signal
-                break
-            yield data
+            wakeup = self._wakeup
+            if not self.buffer or self.buffer[-1].seq <= cursor:
+                self._has_waiters = True
+                await wakeup.wait()
+                continue
+            first = self.buffer[0].seq
+            if cursor + 1 < first:
+                logger.warning(f"⚠️ Stream reader fell behind, skipped {first - cursor - 1} chunks")
+                cursor = first - 1
+            batch = []
+            for index in range(cursor + 1 - first, len(self.buffer)):
+                event = self.buffer[index]
+                batch.append(event)
+                if event.data is None:
+                    break
+            cursor = batch[-1].seq
+            yield batch
+            if batch[-1].data is None:
+                return
+
+    async def _format(self, after: int, with_ids: bool) -> AsyncIterator[tuple[int, str | None]]:
+        """Yield (sequence number, chunk) pairs, joining batches for the
+        coalesce policy; the end of segment is yielded as None."""
+        async for batch in self._read(after):
+            chunks = [f"id: {event.seq}\n{event.data}" if with_ids else event.data for event in batch]
+            if self.overflow_policy == "coalesce":
+                data = "".join(chunk for chunk in chunks if chunk is not None)
+                if data:
+                    yield batch[-1].seq if batch[-1].data is not None else batch[-1].seq - 1, data
+                if batch[-1].data is None:
+                    yield batch[-1].seq, None
+            else:
+                for event, chunk in zip(batch, chunks):
+                    yield event.seq, chunk if event.data is not None else None
+
+    async def stream(self):
+        """Read the stream with the default reader until the end of the
+        segment."""
+        async for seq, data in self._format(self._cursor, with_ids=False):
+            self._cursor = seq
+            if data is not None:
+                yield data
+
+    async def _subscribe(self, after: int, with_ids: bool) -> AsyncIterator[str]:
+        async for _, data in self._format(after, with_ids=with_ids):
+            if data is not None:
+                yield data
+
+    def subscribe(self, after: int | None = None, with_ids: bool = False) -> AsyncIterator[str]:
+        """Create an independent reader of the stream.
+
+        Args:
+            after: Sequence number to replay after, e.g. from SSE Last-Event-ID.
+                By default replays the latest segment from its start.
+            with_ids: Prefix chunks with SSE ``id:`` lines carrying sequence numbers
+
+        Returns:
+            Async iterator over chunks until the end of the segment
+        """
+        if after is None:
+            last = self.buffer[-1] if self.buffer else None
+            after = self._previous_segment_start if last is not None and last.data is None else self._segment_start
+        return self._subscribe(after, with_ids=with_ids)
+
+
+def _dumps_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+
+    def dumps_json(value: Any) -> str:
+        """Serialize a value to compact JSON, using orjson when it is
+        installed."""
+        return orjson.dumps(value).decode()
+
+else:
+    dumps_json = _dumps_json
+
+
+class SSETemplate:
+    """SSE ``data:`` event with a constant JSON envelope rendered once.
+
+    The payload is serialized with placeholders for the variable fields
+    and split around them, so rendering an event only serializes the
+    variable values and joins strings.
+    """
+
+    _PLACEHOLDER = re.compile(r'"@@sse-field-(\d+)@@"')
+
+    def __init__(self, payload: dict, fields: list[str]):
+        """Build a template from a payload where variable values are field
+        names wrapped in ``SSETemplate.field()``."""
+        parts = self._PLACEHOLDER.split(f"data: {dumps_json(payload)}\n\n")
+        self._parts = parts[0::2]
+        self._order = [int(index) for index in parts[1::2]]
+        if sorted(self._order) != list(range(len(fields))):
+            raise ValueError("Every template field must appear in the payload exactly once")
+
+    @staticmethod
+    def field(index: int) -> str:
+        return f"@@sse-field-{index}@@"
+
+    def render(self, *values: Any) -> str:
+        if len(self._order) == 1:
+            return self._parts[0] + dumps_json(values[0]) + self._parts[1]
+        rendered = [self._parts[0]]
+        for index, part in zip(self._order, self._parts[1:]):
+            rendered.append(dumps_json(values[index]))
+            rendered.append(part)
+        return "".join(rendered)
+
+
+# Fields that must be empty for an upstream chunk to carry only a content delta.
+# Some of them only exist in recent openai SDKs, so they are read with getattr.
+_CHUNK_OPTIONAL_FIELDS = ("usage", "obfuscation", "moderation")
+_CHOICE_OPTIONAL_FIELDS = ("finish_reason", "logprobs")
+_DELTA_OPTIONAL_FIELDS = ("tool_calls", "function_call", "refusal", "audio")
+
+
+def _has_optional_fields(obj: Any, names: tuple[str, ...]) -> bool:
+    return any(getattr(obj, name, None) is not None for name in names)
 
 
 class OpenAIStreamingGenerator(StreamingGenerator):
-    def __init__(self, model="gpt-4o"):
-        super().__init__()
+    """Streaming generator producing OpenAI-compatible chat completion
+    chunks.
+
+    Envelopes of the generated chunks (id, created, model, fingerprint)
+    are pre-rendered once per generator. Content-only chunks from the
+    upstream stream are re-encoded through a per-response template
+    instead of a full ``model_dump_json()``.
+    """
+
+    def __init__(self, model="gpt-4o", **kwargs):
+        super().__init__(**kwargs)
         self.model = model
         self.fingerprint = f"fp_{hex(hash(model))[-8:]}"
         self.id = f"chatcmpl-{int(time.time())}{hash(str(time.time()))}"[:29]
         self.created = int(time.time())
         self.choice_index = 0
+        self._templates: dict[str, SSETemplate] = {}
+        self._templates_choice_index = 0
+        self._upstream_templates: dict[tuple, SSETemplate] = {}
 
-    def add_chunk(self, chunk: ChatCompletionChunk):
-        chunk.model = self.model
-        super().add(f"data: {chunk.model_dump_json()}\n\n")
-
-    def add_chunk_from_str(self, content: str):
-        response = {
+    def _envelope(self, choice: dict, usage: dict | None = None) -> dict:
+        return {
             "id": self.id,
             "object": "chat.completion.chunk",
             "created": self.created,
             "model": self.model,
             "system_fingerprint": self.fingerprint,
-            "choices": [
-                {
-                    "delta": {"content": content, "role": "assistant", "tool_calls": None},
-                    "index": self.choice_index,
-                    "finish_reason": None,
-                    "logprobs": None,
-                }
-            ],
-            "usage": None,
+            "choices": [choice],
+            "usage": usage,
         }
-        super().add(f"data: {json.dumps(response)}\n\n")
+
+    def _template(self, name: str) -> SSETemplate:
+        if self._templates_choice_index != self.choice_index:
+            self._templates.clear()
+            self._templates_choice_index = self.choice_index
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self._build_template(name)
+        return template
+
+    def _build_template(self, name: str) -> SSETemplate:
+        field = SSETemplate.field
+        if name == "content":
+            choice = {
+                "delta": {"content": field(0), "role": "assistant", "tool_calls": None},
+                "index": self.choice_index,
+                "finish_reason": None,
+                "logprobs": None,
+            }
+            return SSETemplate(self._envelope(choice), ["content"])
+        if name == "tool_call":
+            tool_call = {
+                "index": 0,
+                "id": field(0),
+                "type": "function",
+                "function": {"name": field(1), "arguments": field(2)},
+            }
+            choice = {
+                "delta": {"tool_calls": [tool_call]},
+                "index": self.choice_index,
+                "logprobs": None,
+                "finish_reason": None,
+            }
+            return SSETemplate(self._envelope(choice), ["id", "name", "arguments"])
+        if name == "finish":
+            choice = {
+                "index": self.choice_index,
+                "delta": {"content": field(0), "role": "assistant", "tool_calls": None},
+                "logprobs": None,
+                "finish_reason": field(1),
+            }
+            return SSETemplate(self._envelope(choice, field(2)), ["content", "finish_reason", "usage"])
+        raise ValueError(f"Unknown template: {name}")
+
+    @staticmethod
+    def _upstream_template_key(chunk: ChatCompletionChunk) -> tuple | None:
+        """Get the template key for content-only upstream chunks, or None if
+        the chunk needs full serialization."""
+        choices = chunk.choices
+        if len(choices) != 1:
+            return None
+        choice = choices[0]
+        delta = choice.delta
+        if (
+            not isinstance(delta.content, str)
+            or _has_optional_fields(chunk, _CHUNK_OPTIONAL_FIELDS)
+            or _has_optional_fields(choice, _CHOICE_OPTIONAL_FIELDS)
+            or _has_optional_fields(delta, _DELTA_OPTIONAL_FIELDS)
+            or chunk.__pydantic_extra__
+            or choice.__pydantic_extra__
+            or delta.__pydantic_extra__
+        ):
+            return None
+        return (
+            chunk.id,
+            chunk.created,
+            chunk.object,
+            chunk.service_tier,
+            chunk.system_fingerprint,
+            choice.index,
+            delta.role,
+        )
+
+    def add_chunk(self, chunk: ChatCompletionChunk):
+        key = self._upstream_template_key(chunk)
+        if key is None:
+            chunk.model = self.model
+            super().add(f"data: {chunk.model_dump_json()}\n\n")
+            return
+        template = self._upstream_templates.get(key)
+        if template is None:
+            chunk.model = self.model
+            payload = chunk.model_dump(mode="json")
+            payload["choices"][0]["delta"]["content"] = SSETemplate.field(0)
+            template = self._upstream_templates[key] = SSETemplate(payload, ["content"])
+        super().add(template.render(chunk.choices[0].delta.content))
+
+    def add_chunk_from_str(self, content: str):
+        super().add(self._template("content").render(content))
 
     def add_tool_call(self, tool_call_id: str, function_name: str, arguments: str):
         """Adds tool call chunk."""
-        response = {
-            "id": self.id,
-            "object": "chat.completion.chunk",
-            "created": self.created,
-            "model": self.model,
-            "system_fingerprint": f"fp_{hex(hash(self.model))[-8:]}",
-            "choices": [
-                {
-                    "delta": {
-                        "tool_calls": [
-                            {
-                                "index": 0,
-                                "id": tool_call_id,
-                                "type": "function",
-                                "function": {"name": function_name, "arguments": arguments},
-                            }
-                        ]
-                    },
-                    "index": self.choice_index,
-                    "logprobs": None,
-                    "finish_reason": None,
-                }
-            ],
-            "usage": None,
-        }
-        super().add(f"data: {json.dumps(response)}\n\n")
+        super().add(self._template("tool_call").render(tool_call_id, function_name, arguments))
 
-    def finish(self, content: str | None = None, finish_reason: str = "stop"):
-        """Finishes stream with the final chunk and usage."""
-        final_response = {
-            "id": self.id,
-            "object": "chat.completion.chunk",
-            "created": self.created,
-            "model": self.model,
-            "system_fingerprint": f"fp_{hex(hash(self.model))[-8:]}",
-            "choices": [
-                {
-                    "index": self.choice_index,
-                    "delta": {"content": content, "role": "assistant", "tool_calls": None},
-                    "logprobs": None,
-                    "finish_reason": finish_reason,
-                }
-            ],
-            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
-        }
-        super().add(f"data: {json.dumps(final_response)}\n\n")
+    def finish(self, content: str | None = None, finish_reason: str = "stop", usage: dict[str, int] | None = None):
+        """Finishes stream with the final chunk and usage.
+
+        Args:
+            content: Final content
+            finish_reason: Finish reason of the final chunk
+            usage: Token counts with prompt_tokens, completion_tokens and total_tokens, zeros if not given
+        """
+        usage = usage or {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        super().add(self._template("finish").render(content, finish_reason, usage))
         super().add("data: [DONE]\n\n")
         super().finish()
@@ -40,8 +40,8 @@ class ExtractPageContentTool(BaseTool):
 
         logger.info(f"📄 Extracting content from {len(self.urls)} URLs")
 
-        self._search_service = TavilySearchService(config.search)
-        sources = await self._search_service.extract(urls=self.urls)
+        self._search_service = TavilySearchService.get_shared(config.search)
+        sources = await self._search_service.extract(urls=self.urls, cache_stats=context.search_cache)
 
         # Update existing sources instead of overwriting
         for source in sources:
@@ -71,6 +71,8 @@ class ExtractPageContentTool(BaseTool):
                     )
                 else:
                     formatted_result += f"{str(source)}\n*Failed to extract content*\n\n"
+            else:
+                formatted_result += f"{url}\n*Failed to extract content*\n\n"
 
         logger.debug(formatted_result[:500])
         return formatted_result
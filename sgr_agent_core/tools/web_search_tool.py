@@ -56,12 +56,13 @@ class WebSearchTool(BaseTool):
         """Execute web search using TavilySearchService."""
 
         logger.info(f"🔍 Search query: '{self.query}'")
-        self._search_service = TavilySearchService(config.search)
+        self._search_service = TavilySearchService.get_shared(config.search)
 
         sources = await self._search_service.search(
             query=self.query,
             max_results=min(self.max_results, config.search.max_results),
             include_raw_content=False,
+            cache_stats=context.search_cache,
         )
 
         sources = TavilySearchService.rearrange_sources(sources, starting_number=len(context.sources) + 1)
@@ -8,6 +8,7 @@ from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionMessageParam
 
 from sgr_agent_core import ExecutionConfig, LLMConfig, PromptsConfig
+from sgr_agent_core.agent_config import GlobalConfig
 from sgr_agent_core.agent_definition import AgentConfig
 from sgr_agent_core.base_agent import BaseAgent
 
@@ -76,6 +77,15 @@ def create_test_agent(
     )
 
 
+@pytest.fixture(autouse=True)
+def isolated_logs_dir(tmp_path, monkeypatch):
+    """Write agent logs to a temporary directory instead of the working
+    tree."""
+    logs_dir = str(tmp_path / "logs")
+    monkeypatch.setenv("SGR__EXECUTION__LOGS_DIR", logs_dir)
+    monkeypatch.setattr(GlobalConfig().execution, "logs_dir", logs_dir)
+
+
 @pytest.fixture
 def mock_openai_client():
     """Create a mock OpenAI client."""
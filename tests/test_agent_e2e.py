@@ -64,7 +64,7 @@ class MockStream:
         output.
 
         Supports both formats:
-        - Structured output: message.parsed (for SGRAgent)
+        - Structured output: JSON message content (for SGRAgent)
         - Function calling: tool_calls[0].function.parsed_arguments (for SGRToolCallingAgent)
 
         Returns:
@@ -78,10 +78,6 @@ class MockStream:
             tool_calls=tool_calls if tool_calls else None,
         )
 
-        # Support structured output format (SGRAgent uses message.parsed)
-        if "parsed" in self._final_completion_data:
-            setattr(message, "parsed", self._final_completion_data["parsed"])
-
         return ChatCompletion(
             id="test-completion-id",
             choices=[Choice(index=0, message=message, finish_reason="stop")],
@@ -153,7 +149,7 @@ def create_mock_openai_client_for_sgr_agent(action_tool_1: Type, action_tool_2:
     def mock_stream(**kwargs):
         call_count["count"] += 1
         response = response_1 if call_count["count"] == 1 else response_2
-        return MockStream(final_completion_data={"parsed": response})
+        return MockStream(final_completion_data={"content": response.model_dump_json()})
 
     client.chat.completions.stream = Mock(side_effect=mock_stream)
     return client
@@ -347,6 +347,54 @@ class TestAgentFactoryClientCreation:
         assert client.api_key == "test-key"
         assert client._client is not None
 
+    def test_create_client_reuses_pooled_client(self):
+        """Test that clients are shared per upstream and api key."""
+        llm_config = LLMConfig(api_key="pool-key", base_url="https://pool.example.com/v1")
+
+        first = AgentFactory._create_client(llm_config)
+        second = AgentFactory._create_client(llm_config.model_copy(update={"model": "other-model"}))
+        other_key = AgentFactory._create_client(llm_config.model_copy(update={"api_key": "other-key"}))
+
+        assert first is second
+        assert first is not other_key
+
+    def test_create_client_applies_connection_limits(self):
+        """Test that connection pool limits from LLMConfig are applied."""
+        llm_config = LLMConfig(
+            api_key="limits-key",
+            base_url="https://limits.example.com/v1",
+            max_connections=7,
+            max_keepalive_connections=3,
+        )
+        client = AgentFactory._create_client(llm_config)
+
+        pool = client._client._transport._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+
+    def test_client_settings_not_passed_to_requests(self):
+        """Test that connection settings are excluded from request
+        kwargs."""
+        kwargs = LLMConfig(api_key="test-key", http2=True, max_connections=5).to_openai_client_kwargs()
+
+        assert "http2" not in kwargs
+        assert "max_connections" not in kwargs
+        assert "keepalive_expiry" not in kwargs
+
+    @pytest.mark.asyncio
+    async def test_client_pool_close(self):
+        """Test that closing the pool closes clients and empties stats."""
+        from sgr_agent_core.services import OpenAIClientPool
+
+        client = AgentFactory._create_client(LLMConfig(api_key="close-key", base_url="https://close.example.com/v1"))
+        assert "https://close.example.com/v1" in OpenAIClientPool.connection_stats()
+
+        await OpenAIClientPool.aclose()
+
+        assert client.is_closed()
+        assert OpenAIClientPool.connection_stats() == {}
+        assert AgentFactory._create_client(LLMConfig(api_key="close-key")) is not client
+
     @pytest.mark.asyncio
     async def test_stream_request_with_extra_parameters(self):
         """Test that additional parameters from LLMConfig (extra='allow') are
@@ -0,0 +1,214 @@
+"""Tests for AgentStore.
+
+This module contains tests for dict-like agent storage, eviction of
+finished agents by TTL, count and memory limits, and summary tombstones
+of evicted agents.
+"""
+
+import asyncio
+
+import pytest
+
+from sgr_agent_core.agents import SGRAgent
+from sgr_agent_core.models import AgentStatesEnum, SourceData, SpanStats
+from sgr_agent_core.server.endpoints import (
+    agents_storage,
+    cancel_agent,
+    delete_agent,
+    get_agent_state,
+    get_agents_list,
+    get_metrics,
+)
+from sgr_agent_core.services.agent_store import AgentStore, estimate_agent_size
+from tests.conftest import create_test_agent
+
+
+def create_agent(state: AgentStatesEnum = AgentStatesEnum.COMPLETED, content_size: int = 0) -> SGRAgent:
+    """Create a test agent in the given state with optional source
+    content."""
+    agent = create_test_agent(SGRAgent)
+    agent._context.state = state
+    if content_size:
+        url = f"https://example.com/{agent.id}"
+        agent._context.sources[url] = SourceData(number=1, url=url, full_content="x" * content_size)
+    return agent
+
+
+class TestAgentStore:
+    """Tests for AgentStore eviction."""
+
+    def test_dict_interface(self):
+        """Test that the store behaves like a dict of agents."""
+        store = AgentStore()
+        agent = create_agent()
+
+        store[agent.id] = agent
+
+        assert agent.id in store
+        assert store[agent.id] is agent
+        assert list(store.values()) == [agent]
+        del store[agent.id]
+        assert len(store) == 0
+
+    def test_expired_finished_agents_are_evicted(self):
+        """Test that finished agents past TTL are evicted and running ones
+        kept."""
+        store = AgentStore(ttl=0)
+        finished = create_agent()
+        running = create_agent(AgentStatesEnum.RESEARCHING)
+        store[finished.id] = finished
+        store[running.id] = running
+
+        assert store.sweep() == 1
+        assert finished.id not in store
+        assert running.id in store
+
+    def test_max_agents_evicts_least_recently_used(self):
+        """Test that count limit evicts least recently used finished
+        agents."""
+        store = AgentStore(max_agents=2)
+        first, second, third = create_agent(), create_agent(), create_agent()
+        store[first.id] = first
+        store[second.id] = second
+        store[first.id]  # touch
+        store[third.id] = third
+
+        assert second.id not in store
+        assert first.id in store
+        assert third.id in store
+
+    def test_memory_budget_eviction(self):
+        """Test that memory budget evicts finished agents until it
+        fits."""
+        store = AgentStore(max_memory_bytes=15000)
+        agents = [create_agent(content_size=10000) for _ in range(3)]
+        for agent in agents:
+            store[agent.id] = agent
+
+        assert store.sweep() == 2
+        assert list(store) == [agents[2].id]
+        assert store.memory_usage() == estimate_agent_size(agents[2])
+
+    def test_iteration_does_not_touch_agents(self):
+        """Test that iterating values and items keeps LRU order and access
+        times."""
+        store = AgentStore(max_agents=2)
+        first, second = create_agent(), create_agent()
+        store[first.id] = first
+        store[second.id] = second
+        last_access = dict(store._last_access)
+
+        list(store.values())
+        list(store.items())
+        list(store)
+
+        assert store._last_access == last_access
+        third = create_agent()
+        store[third.id] = third
+        assert first.id not in store
+
+    @pytest.mark.asyncio
+    async def test_scrapes_do_not_prevent_eviction(self):
+        """Test that polling the agents list and metrics does not keep
+        finished agents fresh."""
+        agents_storage.clear()
+        agents_storage.configure(ttl=0.05)
+        agent = create_agent()
+        agents_storage[agent.id] = agent
+        try:
+            for _ in range(4):
+                await get_agents_list()
+                await get_metrics()
+                await asyncio.sleep(0.02)
+
+            assert agents_storage.sweep() == 1
+            assert agent.id not in agents_storage
+        finally:
+            agents_storage.configure(ttl=3600.0)
+            agents_storage.clear()
+
+    def test_running_agents_are_never_evicted(self):
+        """Test that limits do not evict running agents."""
+        store = AgentStore(max_agents=1)
+        agents = [create_agent(AgentStatesEnum.RESEARCHING) for _ in range(3)]
+        for agent in agents:
+            store[agent.id] = agent
+
+        assert len(store) == 3
+
+    def test_evicted_agent_leaves_summary(self):
+        """Test that eviction keeps a bounded summary tombstone."""
+        store = AgentStore(ttl=0, max_tombstones=1)
+        first, second = create_agent(content_size=10), create_agent()
+        first._context.execution_result = "done"
+        store[first.id] = first
+        store.sweep()
+
+        summary = store.get_summary(first.id)
+        assert summary.state == AgentStatesEnum.COMPLETED.value
+        assert summary.execution_result == "done"
+        assert summary.sources_count == 1
+
+        store[second.id] = second
+        store.sweep()
+        assert store.get_summary(first.id) is None
+        assert store.get_summary(second.id) is not None
+
+    @pytest.mark.asyncio
+    async def test_background_sweeper(self):
+        """Test that the sweeper task evicts agents periodically."""
+        store = AgentStore(ttl=0, sweep_interval=0.01)
+        agent = create_agent()
+        store[agent.id] = agent
+
+        store.start_sweeper()
+        await asyncio.sleep(0.05)
+        await store.stop_sweeper()
+
+        assert agent.id not in store
+        assert store.evictions == 1
+
+
+class TestEvictedAgentEndpoints:
+    """Tests for endpoints answering from summary tombstones."""
+
+    def setup_method(self):
+        agents_storage.clear()
+        self.agent = create_agent()
+        self.agent._context.usage.calls = 2
+        self.agent._context.usage.total_tokens = 150
+        self.agent._context.timings["llm_stream"] = SpanStats(count=2, total_seconds=1.5, max_seconds=1.0)
+        agents_storage[self.agent.id] = self.agent
+        agents_storage._evict(self.agent.id)
+
+    def teardown_method(self):
+        agents_storage.clear()
+
+    @pytest.mark.asyncio
+    async def test_state_of_evicted_agent(self):
+        """Test that state endpoint answers from the summary."""
+        response = await get_agent_state(self.agent.id)
+
+        assert response.agent_id == self.agent.id
+        assert response.state == AgentStatesEnum.COMPLETED.value
+        assert response.evicted is True
+        assert response.usage.calls == 2
+        assert response.usage.total_tokens == 150
+        assert response.timings["llm_stream"].total_seconds == 1.5
+
+    @pytest.mark.asyncio
+    async def test_cancel_evicted_agent(self):
+        """Test that cancelling an evicted agent reports it was not
+        cancelled."""
+        response = await cancel_agent(self.agent.id)
+
+        assert response.cancelled is False
+        assert response.state == AgentStatesEnum.COMPLETED.value
+
+    @pytest.mark.asyncio
+    async def test_delete_evicted_agent_drops_summary(self):
+        """Test that deleting an evicted agent removes its summary."""
+        response = await delete_agent(self.agent.id)
+
+        assert response.deleted is True
+        assert agents_storage.get_summary(self.agent.id) is None
@@ -20,6 +20,7 @@ from sgr_agent_core.server.endpoints import (
     get_agent_state,
     get_agents_list,
     provide_clarification,
+    stream_agent,
 )
 from sgr_agent_core.server.models import ChatCompletionRequest, ClarificationRequest
 from tests.conftest import create_test_agent
@@ -627,3 +628,34 @@ class TestAgentStorageIntegration:
         """Test that different test methods have isolated storage."""
         # This test verifies that setup_method clears storage properly
         assert len(agents_storage) == 0
+
+
+class TestStreamAgentEndpoint:
+    """Tests for stream_agent endpoint."""
+
+    def setup_method(self):
+        """Setup for each test method."""
+        agents_storage.clear()
+
+    @pytest.mark.asyncio
+    async def test_stream_resumes_after_last_event_id(self):
+        """Test that subscribers resume after the Last-Event-ID."""
+        agent = create_test_agent(SGRAgent)
+        agents_storage[agent.id] = agent
+        agent.streaming_generator.add("data: first\n\n")
+        agent.streaming_generator.add("data: second\n\n")
+        agent.streaming_generator.finish()
+
+        response = await stream_agent(agent.id, last_event_id="1")
+        chunks = [chunk async for chunk in response.body_iterator]
+
+        assert chunks[0] == "id: 2\ndata: second\n\n"
+        assert chunks[-1].endswith("data: [DONE]\n\n")
+
+    @pytest.mark.asyncio
+    async def test_stream_unknown_agent(self):
+        """Test that streaming an unknown agent returns 404."""
+        with pytest.raises(HTTPException) as exc_info:
+            await stream_agent("nonexistent_agent_id")
+
+        assert exc_info.value.status_code == 404
@@ -52,3 +52,67 @@ class TestBaseTool:
             description = "Custom tool description"
 
         assert MyCustomTool.description == "Custom tool description"
+
+
+class TestBaseToolOpenAISchemaCache:
+    """Test BaseTool OpenAI function tool schema cache."""
+
+    def setup_method(self):
+        BaseTool.openai_tool_cache_clear()
+
+    def test_to_openai_tool_uses_tool_name(self):
+        """Test that function name defaults to tool_name."""
+
+        class SchemaCacheTool(BaseTool):
+            """Schema cache tool."""
+
+            query: str
+
+        tool_param = SchemaCacheTool.to_openai_tool()
+        assert tool_param["type"] == "function"
+        assert tool_param["function"]["name"] == "schemacachetool"
+        assert tool_param["function"]["description"] == "Schema cache tool."
+        assert "query" in tool_param["function"]["parameters"]["properties"]
+
+    def test_to_openai_tool_is_cached(self):
+        """Test that repeated calls return the cached param."""
+
+        class SchemaCacheTool(BaseTool):
+            query: str
+
+        first = SchemaCacheTool.to_openai_tool()
+        second = SchemaCacheTool.to_openai_tool()
+
+        assert first is second
+        info = BaseTool.openai_tool_cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+
+    def test_to_openai_tool_keyed_by_overrides(self):
+        """Test that name and description overrides are cached separately."""
+
+        class SchemaCacheTool(BaseTool):
+            query: str
+
+        default = SchemaCacheTool.to_openai_tool()
+        no_description = SchemaCacheTool.to_openai_tool(description="")
+
+        assert default is not no_description
+        assert no_description["function"]["description"] == ""
+        assert SchemaCacheTool.to_openai_tool(name="custom")["function"]["name"] == "custom"
+
+    def test_cache_is_per_class(self):
+        """Test that subclasses do not share cached schemas."""
+
+        class ParentSchemaTool(BaseTool):
+            query: str
+
+        class ChildSchemaTool(ParentSchemaTool):
+            limit: int
+
+        parent = ParentSchemaTool.to_openai_tool()
+        child = ChildSchemaTool.to_openai_tool()
+
+        assert parent is not child
+        assert "limit" not in parent["function"]["parameters"]["properties"]
+        assert "limit" in child["function"]["parameters"]["properties"]
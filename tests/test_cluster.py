@@ -0,0 +1,177 @@
+"""Tests for AgentCluster.
+
+This module contains tests for running agents across two workers that
+share a sqlite state backend: stream fan-out, state snapshots and
+clarification routing to the owning worker.
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+import pytest_asyncio
+
+from sgr_agent_core.agents import SGRAgent
+from sgr_agent_core.models import AgentStatesEnum
+from sgr_agent_core.server import endpoints
+from sgr_agent_core.server.cluster import AgentCluster
+from sgr_agent_core.server.models import ClarificationRequest
+from sgr_agent_core.services.agent_store import AgentStore
+from sgr_agent_core.services.shared_state import AgentSnapshot, SQLiteSharedStateBackend
+from tests.conftest import create_test_agent
+
+
+async def collect(stream, timeout: float = 1.0) -> list[str]:
+    async def read():
+        return [chunk async for chunk in stream]
+
+    return await asyncio.wait_for(read(), timeout)
+
+
+@pytest_asyncio.fixture
+async def workers(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    owner = AgentCluster(SQLiteSharedStateBackend(path, poll_interval=0.01), worker_id="owner")
+    other = AgentCluster(SQLiteSharedStateBackend(path, poll_interval=0.01), worker_id="other")
+    owner_storage = AgentStore()
+    owner.start(owner_storage, poll_interval=0.01)
+    other.start(AgentStore(), poll_interval=0.01)
+    yield owner, other, owner_storage
+    await owner.stop()
+    await other.stop()
+
+
+class TestAgentCluster:
+    """Tests for AgentCluster across workers."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_backend(self):
+        """Test that the cluster is disabled until configured."""
+        assert AgentCluster().enabled is False
+
+    @pytest.mark.asyncio
+    async def test_stop_closes_backend(self, tmp_path):
+        """Test that stopping the cluster closes the shared backend."""
+        backend = SQLiteSharedStateBackend(str(tmp_path / "shared.sqlite3"), poll_interval=0.01)
+        cluster = AgentCluster(backend, worker_id="worker")
+        cluster.start(AgentStore(), poll_interval=0.01)
+
+        await cluster.stop()
+
+        assert cluster._listener_task is None
+        with pytest.raises(sqlite3.ProgrammingError):
+            backend._connection.execute("SELECT 1")
+
+    @pytest.mark.asyncio
+    async def test_stream_and_state_visible_on_other_worker(self, workers):
+        """Test that another worker can subscribe to the stream and read
+        state."""
+        owner, other, storage = workers
+        agent = create_test_agent(SGRAgent)
+        storage[agent.id] = agent
+        after = await owner.register(agent)
+
+        agent.streaming_generator.add("chunk")
+        agent._context.state = AgentStatesEnum.COMPLETED
+        agent._context.execution_result = "done"
+        agent.streaming_generator.finish("done")
+
+        chunks = await collect(other.subscribe(agent.id, after=after))
+        snapshot = await other.load_snapshot(agent.id)
+
+        assert chunks[0] == "chunk"
+        assert chunks[-1] == "data: [DONE]\n\n"
+        assert snapshot.worker_id == "owner"
+        assert snapshot.state == AgentStatesEnum.COMPLETED.value
+        assert snapshot.execution_result == "done"
+
+    @pytest.mark.asyncio
+    async def test_clarification_routed_to_owner(self, workers):
+        """Test that a clarification sent from another worker resumes the
+        agent."""
+        owner, other, storage = workers
+        agent = create_test_agent(SGRAgent)
+        storage[agent.id] = agent
+        await owner.register(agent)
+        agent._context.state = AgentStatesEnum.WAITING_FOR_CLARIFICATION
+        agent.streaming_generator.finish()
+
+        after = await other.resume_offset(agent.id, timeout=1.0, poll_interval=0.01)
+        snapshot = await other.load_snapshot(agent.id)
+        assert snapshot.state == AgentStatesEnum.WAITING_FOR_CLARIFICATION.value
+
+        await other.send_command(snapshot, "clarification", {"messages": [{"role": "user", "content": "answer"}]})
+        await asyncio.wait_for(agent._context.clarification_received.wait(), 1.0)
+        assert agent.conversation[0] == {"role": "user", "content": "answer"}
+
+        agent.streaming_generator.add("resumed")
+        agent._context.state = AgentStatesEnum.COMPLETED
+        agent.streaming_generator.finish()
+
+        chunks = await collect(other.subscribe(agent.id, after=after))
+        assert chunks[0] == "resumed"
+
+    @pytest.mark.asyncio
+    async def test_eviction_marks_snapshot_evicted(self, workers):
+        """Test that evicting an agent on the owning worker marks its
+        snapshot as evicted for other workers."""
+        owner, other, storage = workers
+        agent = create_test_agent(SGRAgent)
+        storage[agent.id] = agent
+        await owner.register(agent)
+        agent._context.state = AgentStatesEnum.COMPLETED
+        agent.streaming_generator.finish("done")
+        await collect(other.subscribe(agent.id))
+
+        storage.configure(ttl=0.0)
+        assert storage.sweep() == 1
+        await asyncio.gather(*owner._eviction_saves)
+
+        snapshot = await other.load_snapshot(agent.id)
+        assert snapshot.evicted is True
+        assert snapshot.state == AgentStatesEnum.COMPLETED.value
+
+
+class TestClusterEndpoints:
+    """Tests for endpoints serving agents owned by another worker."""
+
+    @pytest.fixture(autouse=True)
+    def shared_backend(self, tmp_path, monkeypatch):
+        backend = SQLiteSharedStateBackend(str(tmp_path / "shared.sqlite3"), poll_interval=0.01)
+        monkeypatch.setattr(endpoints.agent_cluster, "backend", backend)
+        endpoints.agents_storage.clear()
+        self.backend = backend
+        yield
+        endpoints.agents_storage.clear()
+
+    async def save_remote_agent(self, state: AgentStatesEnum) -> SGRAgent:
+        agent = create_test_agent(SGRAgent)
+        agent._context.state = state
+        await self.backend.save_snapshot(AgentSnapshot.from_agent(agent, worker_id="owner"))
+        return agent
+
+    @pytest.mark.asyncio
+    async def test_state_of_remote_agent(self):
+        """Test that state endpoint answers from the shared snapshot."""
+        agent = await self.save_remote_agent(AgentStatesEnum.RESEARCHING)
+
+        response = await endpoints.get_agent_state(agent.id)
+
+        assert response.agent_id == agent.id
+        assert response.state == AgentStatesEnum.RESEARCHING.value
+        assert response.evicted is False
+
+    @pytest.mark.asyncio
+    async def test_clarification_for_remote_agent_is_routed(self):
+        """Test that clarification of a remote agent is sent to its
+        owner."""
+        agent = await self.save_remote_agent(AgentStatesEnum.WAITING_FOR_CLARIFICATION)
+        await self.backend.publish(agent.id, None)
+
+        response = await endpoints.provide_clarification(
+            agent.id, ClarificationRequest(messages=[{"role": "user", "content": "answer"}])
+        )
+
+        assert response.headers["X-Agent-ID"] == agent.id
+        commands = await self.backend.receive_commands("owner")
+        assert commands == [(agent.id, "clarification", {"messages": [{"role": "user", "content": "answer"}]})]
@@ -0,0 +1,132 @@
+"""Tests for ContextBuilder."""
+
+from unittest.mock import patch
+
+import pytest
+
+from sgr_agent_core.agent_definition import PromptsConfig
+from sgr_agent_core.base_agent import BaseAgent
+from sgr_agent_core.services.context_builder import ContextBuilder
+from sgr_agent_core.services.prompt_loader import PromptLoader
+from sgr_agent_core.tools import FinalAnswerTool, ReasoningTool
+from tests.conftest import create_test_agent
+
+
+@pytest.fixture
+def prompts_config():
+    return PromptsConfig(
+        system_prompt_str="Tools:\n{available_tools}",
+        initial_user_request_str="Date: {current_date}",
+        clarification_response_str="Clarified: {current_date}",
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_system_prompt_cache():
+    ContextBuilder.clear_cache()
+    yield
+    ContextBuilder.clear_cache()
+
+
+class TestContextBuilder:
+    """Tests for incremental context building."""
+
+    def test_build_layout(self, prompts_config):
+        """Test that the context is prefix followed by the conversation."""
+        builder = ContextBuilder()
+        task = [{"role": "user", "content": "Task"}]
+        conversation = [{"role": "assistant", "content": "Answer"}]
+
+        context = builder.build([ReasoningTool], prompts_config, task, conversation)
+
+        assert [message["role"] for message in context] == ["system", "user", "user", "assistant"]
+        assert "reasoningtool" in context[0]["content"]
+        assert context[1] is task[0]
+        assert builder.prefix_length == 3
+
+    def test_appends_only_new_turns(self, prompts_config):
+        """Test that repeated builds reuse the prefix and append new
+        turns."""
+        builder = ContextBuilder()
+        task = [{"role": "user", "content": "Task"}]
+        conversation = []
+
+        with patch.object(PromptLoader, "get_initial_user_request", wraps=PromptLoader.get_initial_user_request) as spy:
+            first = builder.build([ReasoningTool], prompts_config, task, conversation)
+            prefix = first[: builder.prefix_length]
+            conversation.append({"role": "assistant", "content": "1"})
+            builder.build([ReasoningTool], prompts_config, task, conversation)
+            conversation.append({"role": "tool", "content": "2"})
+            context = builder.build([ReasoningTool], prompts_config, task, conversation)
+
+        assert spy.call_count == 1
+        assert context is first
+        assert len(context) == 5
+        assert all(a is b for a, b in zip(context, prefix))
+
+    def test_conversation_replaced(self, prompts_config):
+        """Test that a replaced or truncated conversation is rebuilt."""
+        builder = ContextBuilder()
+        task = [{"role": "user", "content": "Task"}]
+        builder.build([], prompts_config, task, [{"role": "user", "content": "a"}, {"role": "user", "content": "b"}])
+
+        context = builder.build([], prompts_config, task, [{"role": "user", "content": "c"}])
+
+        assert [message["content"] for message in context[builder.prefix_length :]] == ["c"]
+
+    def test_caller_modification_detected(self, prompts_config):
+        """Test that a context modified by the caller is rebuilt."""
+        builder = ContextBuilder()
+        task = [{"role": "user", "content": "Task"}]
+        conversation = [{"role": "user", "content": "a"}]
+        context = builder.build([], prompts_config, task, conversation)
+        context.append({"role": "user", "content": "extra"})
+
+        context = builder.build([], prompts_config, task, conversation)
+
+        assert len(context) == builder.prefix_length + 1
+
+    def test_toolkit_change_rebuilds_prefix(self, prompts_config):
+        """Test that a different toolkit renders a new system prompt."""
+        builder = ContextBuilder()
+        task = [{"role": "user", "content": "Task"}]
+        builder.build([ReasoningTool], prompts_config, task, [])
+        key = builder.prompt_cache_key
+
+        context = builder.build([ReasoningTool, FinalAnswerTool], prompts_config, task, [])
+
+        assert "finalanswertool" in context[0]["content"]
+        assert builder.prompt_cache_key != key
+
+    def test_system_prompt_shared_between_builders(self, prompts_config):
+        """Test that the rendered system prompt is cached per toolkit."""
+        with patch.object(PromptLoader, "get_system_prompt", wraps=PromptLoader.get_system_prompt) as spy:
+            for _ in range(3):
+                ContextBuilder().build([ReasoningTool], prompts_config, [], [])
+
+        assert spy.call_count == 1
+
+    def test_prompt_cache_key_stable(self, prompts_config):
+        """Test that the cache key ignores conversation growth."""
+        builder = ContextBuilder()
+        conversation = []
+        builder.build([ReasoningTool], prompts_config, [], conversation)
+        key = builder.prompt_cache_key
+        conversation.append({"role": "assistant", "content": "1"})
+        builder.build([ReasoningTool], prompts_config, [], conversation)
+
+        assert key is not None
+        assert builder.prompt_cache_key == key
+
+    @pytest.mark.asyncio
+    async def test_agent_prepare_context(self):
+        """Test that agents build their context incrementally."""
+        agent = create_test_agent(BaseAgent, toolkit=[ReasoningTool])
+        first = await agent._prepare_context()
+        agent.conversation.append({"role": "assistant", "content": "step"})
+
+        context = await agent._prepare_context()
+
+        assert context is first
+        assert context[-1]["content"] == "step"
+        assert agent._context_builder.prefix_length == 3
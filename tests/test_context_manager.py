@@ -0,0 +1,198 @@
+"""Tests for the token-budgeted context manager."""
+
+import pytest
+
+from sgr_agent_core.agent_definition import ExecutionConfig
+from sgr_agent_core.base_agent import BaseAgent
+from sgr_agent_core.services.context_manager import (
+    ContextManager,
+    DropStaleToolOutputsPolicy,
+    HeuristicTokenCounter,
+    SummarizeOlderTurnsPolicy,
+    create_token_counter,
+    extract_citations,
+)
+from tests.conftest import create_test_agent
+
+CITATION = "[1] Example page - https://example.com/page"
+
+
+def tool_turn(index: int, content: str) -> list[dict]:
+    call_id = f"{index}-action"
+    return [
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {"type": "function", "id": call_id, "function": {"name": "websearchtool", "arguments": "{}"}}
+            ],
+        },
+        {"role": "tool", "content": content, "tool_call_id": call_id},
+    ]
+
+
+def make_conversation(turns: int, size: int = 2000) -> list[dict]:
+    conversation = []
+    for i in range(turns):
+        conversation.extend(
+            tool_turn(i, f"Search Query: q{i}\n\n[{i}] Page {i} - https://example.com/{i}\n" + "x" * size)
+        )
+    return conversation
+
+
+class TestTokenCounter:
+    """Tests for token counters."""
+
+    def test_heuristic_counter(self):
+        """Test that the heuristic counter approximates by text length."""
+        counter = HeuristicTokenCounter(chars_per_token=4)
+
+        assert counter.count_text("a" * 10) == 3
+        assert counter.count([{"role": "user", "content": "a" * 8}]) == 2 + counter.message_overhead
+
+    def test_counts_tool_calls(self):
+        """Test that tool call arguments are counted."""
+        counter = HeuristicTokenCounter()
+        message = tool_turn(0, "")[0]
+
+        assert counter.count_message(message) > counter.message_overhead
+
+    def test_create_token_counter(self):
+        """Test counter selection by name."""
+        assert isinstance(create_token_counter("heuristic"), HeuristicTokenCounter)
+        assert create_token_counter("tiktoken", "gpt-4o").count_text("hello world") > 0
+
+
+class TestContextPolicies:
+    """Tests for eviction policies."""
+
+    def test_extract_citations(self):
+        """Test that search citation lines are found."""
+        assert extract_citations(f"Search Query: q\n\n{CITATION}\nsnippet") == [CITATION]
+
+    @pytest.mark.asyncio
+    async def test_drop_stale_tool_outputs_keeps_recent_and_citations(self):
+        """Test that old tool outputs are replaced and citations kept."""
+        conversation = make_conversation(3)
+        manager = ContextManager(token_budget=1)
+
+        result = await DropStaleToolOutputsPolicy(keep_last=1).apply(conversation, 10**6, manager)
+
+        assert result is not conversation
+        assert result[1]["content"].startswith("[Tool output removed")
+        assert "[0] Page 0 - https://example.com/0" in result[1]["content"]
+        assert result[1]["tool_call_id"] == "0-action"
+        assert result[5] is conversation[5]
+
+    @pytest.mark.asyncio
+    async def test_drop_stops_when_excess_freed(self):
+        """Test that only as many outputs as needed are dropped."""
+        conversation = make_conversation(4)
+        manager = ContextManager(token_budget=1)
+
+        result = await DropStaleToolOutputsPolicy(keep_last=0).apply(conversation, 10, manager)
+
+        assert result[1] is not conversation[1]
+        assert result[3] is conversation[3]
+
+    @pytest.mark.asyncio
+    async def test_summarize_keeps_tool_pairs(self):
+        """Test that the summary cut never splits a tool call from its
+        result."""
+        conversation = make_conversation(4)
+        manager = ContextManager(token_budget=1)
+
+        result = await SummarizeOlderTurnsPolicy(keep_recent=3).apply(conversation, 10**6, manager)
+
+        assert result[0]["role"] == "user"
+        assert "Summary of earlier research steps" in result[0]["content"]
+        assert "[0] Page 0 - https://example.com/0" in result[0]["content"]
+        assert result[1]["role"] == "assistant"
+        assert result[1:] == conversation[4:]
+
+    @pytest.mark.asyncio
+    async def test_summarizer_failure_falls_back(self):
+        """Test that a failing summarizer falls back to the extractive
+        summary."""
+
+        async def failing(messages):
+            raise RuntimeError("LLM unavailable")
+
+        conversation = make_conversation(4)
+        policy = SummarizeOlderTurnsPolicy(keep_recent=2, summarizer=failing)
+
+        result = await policy.apply(conversation, 10**6, ContextManager(token_budget=1))
+
+        assert "Called websearchtool" in result[0]["content"]
+
+
+class TestContextManager:
+    """Tests for fitting the context into the budget."""
+
+    @pytest.mark.asyncio
+    async def test_within_budget_unchanged(self):
+        """Test that a context within the budget is left untouched."""
+        conversation = make_conversation(2)
+        original = list(conversation)
+
+        tokens, saved = await ContextManager(token_budget=10**6).fit([], conversation)
+
+        assert saved == {}
+        assert conversation == original
+        assert tokens > 0
+
+    @pytest.mark.asyncio
+    async def test_fit_records_savings_per_policy(self):
+        """Test that policies are applied in order and savings recorded."""
+        conversation = make_conversation(10)
+        manager = ContextManager(
+            token_budget=1000,
+            policies=[DropStaleToolOutputsPolicy(keep_last=2), SummarizeOlderTurnsPolicy(keep_recent=4)],
+        )
+        tokens_before = manager.count(conversation)
+
+        tokens, saved = await manager.fit([], conversation)
+
+        assert set(saved) == {"drop_stale_tool_outputs", "summarize_older_turns"}
+        assert tokens == tokens_before - sum(saved.values())
+        assert tokens == manager.count(conversation)
+        assert tokens <= 1000 or len(conversation) == 5
+
+    def test_from_config(self):
+        """Test that no manager is created without a budget."""
+        assert ContextManager.from_config(ExecutionConfig()) is None
+        manager = ContextManager.from_config(ExecutionConfig(context_token_budget=500, context_keep_tool_outputs=1))
+        assert manager.token_budget == 500
+        assert manager.policies[0].keep_last == 1
+
+
+class TestBaseAgentContextBudget:
+    """Tests for context budget enforcement in agents."""
+
+    @pytest.mark.asyncio
+    async def test_fit_context_updates_agent(self):
+        """Test that the agent conversation is reduced and savings are
+        logged."""
+        agent = create_test_agent(
+            BaseAgent, execution_config=ExecutionConfig(context_token_budget=2000, context_keep_tool_outputs=1)
+        )
+        agent.conversation.extend(make_conversation(6))
+        await agent._prepare_context()
+
+        await agent._fit_context()
+
+        assert agent._context.context_tokens_saved["drop_stale_tool_outputs"] > 0
+        assert agent.log[-1]["step_type"] == "context_eviction"
+        context = await agent._prepare_context()
+        assert agent.context_manager.count(context) == agent._context.context_tokens
+
+    @pytest.mark.asyncio
+    async def test_fit_context_disabled(self):
+        """Test that nothing happens without a budget."""
+        agent = create_test_agent(BaseAgent)
+        agent.conversation.extend(make_conversation(6))
+
+        await agent._fit_context()
+
+        assert agent.context_manager is None
+        assert agent._context.context_tokens_saved == {}
@@ -0,0 +1,51 @@
+"""Tests for FindFilesFastTool of the file agent example.
+
+This module contains tests for the native find fallback skipping the
+same directories and files as the workspace index.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from examples.sgr_file_agent.tools.find_files_fast_tool import FindFilesFastTool
+from examples.sgr_file_agent.tools.workspace_index import WorkspaceIndex
+
+
+def write(path: Path, content: str = "content\n") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+class TestFindFilesFastTool:
+    """Tests for FindFilesFastTool."""
+
+    @pytest.mark.asyncio
+    async def test_find_matches_index(self, tmp_path):
+        """Test that native find skips ignored and hidden directories and
+        ignored files like the workspace index."""
+        if not shutil.which("find"):
+            pytest.skip("find is not installed")
+        root = (tmp_path / ".workspace").resolve()
+        write(root / "main.py")
+        write(root / "pkg" / "module.py")
+        write(root / ".env.local")
+        write(root / "debug.log")
+        write(root / "pkg" / "module.pyc")
+        write(root / ".github" / "workflow.yml")
+        write(root / "tmp" / "scratch.txt")
+        write(root / "node_modules" / "dep" / "index.js")
+        write(root / "sgr.egg-info" / "PKG-INFO")
+        tool = FindFilesFastTool(reasoning="test", directory=str(root))
+        index = WorkspaceIndex(root)
+        index.refresh()
+
+        files = await tool._run_find(root)
+
+        assert files == index.find(root, max_depth=tool.max_depth)
+        assert [Path(path).relative_to(root).as_posix() for path in files] == [
+            ".env.local",
+            "main.py",
+            "pkg/module.py",
+        ]
@@ -0,0 +1,154 @@
+"""Tests for the background agent log writer."""
+
+import gzip
+import json
+import logging
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from sgr_agent_core.agent_definition import ExecutionConfig
+from sgr_agent_core.base_agent import BaseAgent
+from sgr_agent_core.services.log_writer import AgentLogWriter
+from sgr_agent_core.tools import ReasoningTool
+from tests.conftest import create_test_agent
+
+
+@pytest.fixture(autouse=True)
+def stop_writer():
+    yield
+    AgentLogWriter.shutdown()
+
+
+def make_agent(logs_dir: str, **execution):
+    agent = create_test_agent(BaseAgent, execution_config=ExecutionConfig(logs_dir=logs_dir, **execution))
+    mock_config = Mock()
+    mock_config.execution.logs_dir = logs_dir
+    return agent, patch("sgr_agent_core.agent_config.GlobalConfig", return_value=mock_config)
+
+
+def reasoning() -> ReasoningTool:
+    return ReasoningTool(
+        reasoning_steps=["a", "b"],
+        current_situation="s",
+        plan_status="p",
+        enough_data=False,
+        remaining_steps=["search"],
+        task_completed=False,
+    )
+
+
+class TestAgentLogWriter:
+    """Tests for AgentLogWriter."""
+
+    @pytest.mark.asyncio
+    async def test_appends_in_background(self, tmp_path):
+        """Test that records queued from the event loop are written in
+        order."""
+        path = str(tmp_path / "log.jsonl")
+
+        for i in range(100):
+            AgentLogWriter.append(path, {"i": i})
+        await AgentLogWriter.aflush()
+
+        assert [record["i"] for record in AgentLogWriter.read_records(path)] == list(range(100))
+        assert AgentLogWriter._thread.is_alive()
+
+    def test_writes_inline_without_event_loop(self, tmp_path):
+        """Test that writes outside an event loop are done immediately."""
+        path = str(tmp_path / "log.json")
+
+        AgentLogWriter.write(path, {"log": [1]})
+
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f) == {"log": [1]}
+        assert AgentLogWriter._thread is None
+
+    @pytest.mark.asyncio
+    async def test_gzip_appends_are_readable(self, tmp_path):
+        """Test that batches appended as gzip members read as one log."""
+        path = str(tmp_path / "log.jsonl.gz")
+
+        AgentLogWriter.append(path, {"i": 0}, compression="gzip")
+        await AgentLogWriter.aflush()
+        AgentLogWriter.append(path, {"i": 1}, compression="gzip")
+        await AgentLogWriter.aflush()
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            assert [json.loads(line)["i"] for line in f] == [0, 1]
+
+    def test_zstd_falls_back_to_gzip(self):
+        """Test that zstd compression falls back to gzip without
+        zstandard."""
+        with patch.dict("sys.modules", {"zstandard": None}):
+            assert AgentLogWriter.resolve_compression("zstd") == "gzip"
+        assert AgentLogWriter.resolve_compression(None) is None
+
+    def test_rotation(self, tmp_path):
+        """Test that a full file is rotated and old backups are
+        removed."""
+        path = str(tmp_path / "log.jsonl")
+
+        for i in range(4):
+            AgentLogWriter.append(path, {"i": i, "data": "x" * 100}, max_bytes=100, backup_count=2)
+
+        assert AgentLogWriter.read_records(path)[0]["i"] == 3
+        assert AgentLogWriter.read_records(f"{path}.1")[0]["i"] == 2
+        assert AgentLogWriter.read_records(f"{path}.2")[0]["i"] == 1
+        assert not os.path.exists(f"{path}.3")
+
+
+class TestBaseAgentLog:
+    """Tests for agent log output through the log writer."""
+
+    @pytest.mark.asyncio
+    async def test_jsonl_appended_per_step(self, tmp_path):
+        """Test that JSON Lines logs are written while the agent runs."""
+        logs_dir = str(tmp_path / "logs")
+        agent, global_config = make_agent(logs_dir, log_format="jsonl")
+
+        with global_config:
+            agent._log_reasoning(reasoning())
+            await AgentLogWriter.aflush()
+            (filename,) = os.listdir(logs_dir)
+            assert filename.endswith("-log.jsonl")
+            assert len(AgentLogWriter.read_records(os.path.join(logs_dir, filename))) == 2
+
+            agent._save_agent_log()
+            await AgentLogWriter.aflush()
+
+        header, step, finish = AgentLogWriter.read_records(os.path.join(logs_dir, filename))
+        assert header["id"] == agent.id
+        assert step["step_type"] == "reasoning"
+        assert finish["step_type"] == "finish"
+        assert finish["state"] == "inited"
+
+    @pytest.mark.asyncio
+    async def test_json_saved_off_loop(self, tmp_path):
+        """Test that the final JSON log is written by the writer thread."""
+        logs_dir = str(tmp_path / "logs")
+        agent, global_config = make_agent(logs_dir, log_compression="gzip")
+        agent._log_reasoning(reasoning())
+
+        with global_config:
+            agent._save_agent_log()
+        await AgentLogWriter.aflush()
+
+        (filename,) = os.listdir(logs_dir)
+        assert filename.endswith("-log.json.gz")
+        with gzip.open(os.path.join(logs_dir, filename), "rt", encoding="utf-8") as f:
+            assert json.load(f)["log"][0]["step_type"] == "reasoning"
+
+    def test_debug_output_skipped_when_info_disabled(self, tmp_path):
+        """Test that step debug messages are not formatted when INFO is
+        off."""
+        agent, _ = make_agent("")
+        agent.logger.setLevel(logging.WARNING)
+        tool = Mock(spec=ReasoningTool, tool_name="reasoningtool")
+        tool.model_dump.return_value = {}
+
+        agent._log_tool_execution(tool, "result")
+
+        tool.model_dump_json.assert_not_called()
+        assert agent.log[0]["tool_name"] == "reasoningtool"
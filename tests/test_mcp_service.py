@@ -0,0 +1,90 @@
+"""Tests for cached MCP tool discovery."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from fastmcp.mcp_config import MCPConfig
+
+from sgr_agent_core.services.mcp_service import MCP2ToolConverter
+from sgr_agent_core.services.mcp_session import MCPSession
+from tests.test_mcp_session import make_server
+
+CONFIG = MCPConfig.model_validate({"mcpServers": {"test": {"url": "http://localhost:9000/mcp"}}})
+
+
+@pytest_asyncio.fixture
+async def session():
+    MCP2ToolConverter.clear_cache()
+    session = MCPSession.get_shared(make_server())
+    with patch("sgr_agent_core.services.mcp_service.MCPSession.get_shared", return_value=session):
+        with patch.object(session, "list_tools", wraps=session.list_tools) as list_tools:
+            yield list_tools
+    MCP2ToolConverter.clear_cache()
+    await MCPSession.aclose_shared()
+
+
+class TestMCPToolCache:
+    """Tests for MCP2ToolConverter tool discovery caching."""
+
+    @pytest.mark.asyncio
+    async def test_tools_shared_between_agents(self, session):
+        """Test that tools are discovered once and the classes are
+        shared."""
+        first = await MCP2ToolConverter.build_tools_from_mcp(CONFIG)
+        second = await MCP2ToolConverter.build_tools_from_mcp(CONFIG)
+
+        assert session.call_count == 1
+        assert first == second
+        assert first is not second
+        assert {tool.tool_name for tool in first} == {"slow_echo", "fail"}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_loads_coalesced(self, session):
+        """Test that agents created at the same time share one
+        discovery."""
+        results = await asyncio.gather(*(MCP2ToolConverter.build_tools_from_mcp(CONFIG) for _ in range(5)))
+
+        assert session.call_count == 1
+        assert all(result == results[0] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_stale_tools_refreshed_in_background(self, session):
+        """Test that expired tools are served while being refreshed."""
+        first = await MCP2ToolConverter.build_tools_from_mcp(CONFIG)
+
+        with patch.object(MCP2ToolConverter, "cache_ttl", 0):
+            stale = await MCP2ToolConverter.build_tools_from_mcp(CONFIG)
+            await asyncio.sleep(0.1)
+        refreshed = await MCP2ToolConverter.build_tools_from_mcp(CONFIG)
+
+        assert stale == first
+        assert session.call_count == 2
+        assert refreshed != first
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_cached_tools(self, session):
+        """Test that a failing refresh keeps serving cached tools."""
+        first = await MCP2ToolConverter.build_tools_from_mcp(CONFIG)
+        session.side_effect = ConnectionError("server down")
+
+        with patch.object(MCP2ToolConverter, "cache_ttl", 0):
+            await MCP2ToolConverter.build_tools_from_mcp(CONFIG)
+            await asyncio.sleep(0.05)
+            tools = await MCP2ToolConverter.build_tools_from_mcp(CONFIG)
+
+        assert tools == first
+
+    @pytest.mark.asyncio
+    async def test_empty_config(self):
+        """Test that a config without servers needs no discovery."""
+        assert await MCP2ToolConverter.build_tools_from_mcp(MCPConfig()) == []
+
+    @pytest.mark.asyncio
+    async def test_prefetch_failure_logged(self):
+        """Test that prefetch does not raise when discovery fails."""
+        with patch.object(MCP2ToolConverter, "_build_tools", AsyncMock(side_effect=ConnectionError("down"))):
+            await MCP2ToolConverter.prefetch([CONFIG])
+
+        assert MCP2ToolConverter._cache == {}
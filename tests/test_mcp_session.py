@@ -0,0 +1,198 @@
+"""Tests for shared MCP sessions against an in-process MCP server."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+from fastmcp.mcp_config import MCPConfig
+from mcp.types import BlobResourceContents, EmbeddedResource, ImageContent, TextContent
+
+from sgr_agent_core.services.mcp_service import MCP2ToolConverter
+from sgr_agent_core.services.mcp_session import MCPSession, format_tool_result
+
+
+def make_server() -> FastMCP:
+    server = FastMCP("test")
+
+    @server.tool
+    async def slow_echo(text: str) -> str:
+        """Echo text after a delay."""
+        await asyncio.sleep(0.1)
+        return text
+
+    @server.tool
+    def fail() -> str:
+        """Always fails."""
+        raise ValueError("boom")
+
+    return server
+
+
+@pytest_asyncio.fixture
+async def session():
+    session = MCPSession.get_shared(make_server())
+    yield session
+    await MCPSession.aclose_shared()
+
+
+class TestMCPSession:
+    """Tests for MCPSession."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_connection(self, session):
+        """Test that concurrent calls run over one connection."""
+        with patch("sgr_agent_core.services.mcp_session.Client", wraps=Client) as client_cls:
+            started = asyncio.get_running_loop().time()
+            results = await asyncio.gather(*(session.call_tool("slow_echo", {"text": str(i)}) for i in range(5)))
+            elapsed = asyncio.get_running_loop().time() - started
+
+        assert [result.content[0].text for result in results] == ["0", "1", "2", "3", "4"]
+        assert client_cls.call_count == 1
+        assert elapsed < 0.4
+        assert session.connected
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_disconnect(self, session):
+        """Test that a closed connection is replaced on the next call."""
+        await session.call_tool("slow_echo", {"text": "a"})
+        await session._client.close()
+
+        result = await session.call_tool("slow_echo", {"text": "b"})
+
+        assert result.content[0].text == "b"
+        assert session.reconnects == 1
+
+    @pytest.mark.asyncio
+    async def test_tool_call_not_retried_after_connection_loss(self, session):
+        """Test that a tool call interrupted by a broken connection is not
+        run again and the next call reconnects."""
+        client = await session.get_client()
+
+        with patch.object(client, "call_tool", side_effect=ConnectionError("reset")) as call_tool:
+            with pytest.raises(ConnectionError):
+                await session.call_tool("slow_echo", {"text": "a"})
+
+        assert call_tool.call_count == 1
+        assert session.reconnects == 1
+        result = await session.call_tool("slow_echo", {"text": "b"})
+        assert result.content[0].text == "b"
+        assert session._client is not client
+
+    @pytest.mark.asyncio
+    async def test_list_tools_retried_after_connection_loss(self, session):
+        """Test that listing tools is retried once on a new connection."""
+        client = await session.get_client()
+
+        with patch.object(client, "list_tools", side_effect=ConnectionError("reset")):
+            tools = await session.list_tools()
+
+        assert {tool.name for tool in tools} == {"slow_echo", "fail"}
+        assert session.reconnects == 1
+
+    @pytest.mark.asyncio
+    async def test_tool_error_keeps_connection(self, session):
+        """Test that a failing tool does not reset the session."""
+        client = await session.get_client()
+
+        with pytest.raises(ToolError):
+            await session.call_tool("fail", {})
+
+        assert await session.get_client() is client
+        assert session.reconnects == 0
+
+    @pytest.mark.asyncio
+    async def test_connect_retries_with_backoff(self):
+        """Test that connecting is retried with growing delays."""
+        session = MCPSession("http://127.0.0.1:1/mcp")
+        sleep = asyncio.sleep
+        delays = []
+
+        async def record_sleep(delay):
+            delays.append(delay)
+            await sleep(0)
+
+        with patch("sgr_agent_core.services.mcp_session.asyncio.sleep", side_effect=record_sleep):
+            with pytest.raises(Exception):
+                await session.call_tool("slow_echo", {"text": "a"})
+
+        assert delays == [session.backoff, session.backoff * 2]
+
+    @pytest.mark.asyncio
+    async def test_shared_by_config(self):
+        """Test that equal configs share one session."""
+        config = {"mcpServers": {"a": {"url": "http://localhost:9000/mcp"}}}
+
+        assert MCPSession.get_shared(MCPConfig.model_validate(config)) is MCPSession.get_shared(
+            MCPConfig.model_validate(config)
+        )
+        await MCPSession.aclose_shared()
+
+    @pytest.mark.asyncio
+    async def test_aclose_shared(self, session):
+        """Test that closing shared sessions disconnects them."""
+        await session.call_tool("slow_echo", {"text": "a"})
+
+        await MCPSession.aclose_shared()
+
+        assert not session.connected
+        assert MCPSession._instances == {}
+
+    @pytest.mark.asyncio
+    async def test_built_tools_use_shared_session(self, session):
+        """Test that MCP tools built from a config call the shared
+        session."""
+        config = MCPConfig.model_validate({"mcpServers": {"test": {"url": "http://localhost:9000/mcp"}}})
+        with patch("sgr_agent_core.services.mcp_service.MCPSession.get_shared", return_value=session):
+            tools = await MCP2ToolConverter.build_tools_from_mcp(config)
+        echo = next(tool for tool in tools if tool.tool_name == "slow_echo")
+
+        with patch("sgr_agent_core.base_tool.GlobalConfig") as global_config:
+            global_config.return_value.execution.mcp_context_limit = 1000
+            results = await asyncio.gather(*(echo(text=str(i))(None, None) for i in range(3)))
+
+        assert all(f'\\"text\\":\\"{i}\\"' in result for i, result in enumerate(results))
+        assert session.reconnects == 0
+
+
+class TestFormatToolResult:
+    """Tests for size-aware rendering of MCP tool results."""
+
+    def test_small_result_unchanged(self):
+        """Test that results within the limit keep the original format."""
+        content = [TextContent(type="text", text="a"), TextContent(type="text", text="b")]
+
+        text, dropped = format_tool_result(content, 1000)
+
+        assert text == json.dumps([item.model_dump_json() for item in content], ensure_ascii=False)
+        assert dropped == 0
+
+    def test_long_text_cut_before_serializing(self):
+        """Test that only the needed part of a long text is serialized."""
+        content = [TextContent(type="text", text="x" * 100_000), TextContent(type="text", text="tail")]
+
+        text, dropped = format_tool_result(content, 100)
+
+        assert len(text) == 100
+        assert text.startswith('["{\\"type\\":\\"text\\",\\"text\\":\\"xxx')
+        assert dropped == 100_000 - 99 + len("tail")
+
+    def test_binary_data_replaced(self):
+        """Test that image and blob payloads are replaced with
+        placeholders."""
+        image = ImageContent(type="image", data="A" * 5000, mimeType="image/png")
+        blob = EmbeddedResource(
+            type="resource",
+            resource=BlobResourceContents(uri="file:///a.bin", blob="B" * 3000, mimeType="application/pdf"),
+        )
+
+        text, dropped = format_tool_result([image, blob], 1000)
+
+        assert "AAAA" not in text
+        assert "BBBB" not in text
+        assert "image/png data omitted, 5000 bytes" in text
+        assert "application/pdf data omitted, 3000 bytes" in text
+        assert dropped == 8000
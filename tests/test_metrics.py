@@ -0,0 +1,246 @@
+"""Tests for agent timing and token usage instrumentation."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from openai import AsyncOpenAI
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletion, ChatCompletionChunk, ChatCompletionMessage
+from openai.types.chat.chat_completion import Choice
+
+from sgr_agent_core.agent_definition import ExecutionConfig, LLMConfig
+from sgr_agent_core.agents import ToolCallingAgent
+from sgr_agent_core.models import AgentContext
+from sgr_agent_core.server.endpoints import agents_storage, get_agent_state, get_metrics
+from sgr_agent_core.services.metrics import AgentMetrics, MetricsRegistry, format_metric
+from sgr_agent_core.services.rate_limiter import RateLimiter
+from tests.conftest import create_test_agent
+from tests.test_parallel_tool_calls import SlowTool, make_agent, make_client
+
+
+def chunk(content: str | None) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 1,
+            "model": "m",
+            "choices": [{"index": 0, "delta": {"role": "assistant", "content": content}}],
+        }
+    )
+
+
+class UsageStream:
+    """Stream of content chunks with usage in the final completion."""
+
+    def __init__(self, contents: list[str | None], usage: CompletionUsage | None):
+        self.events = [SimpleNamespace(type="chunk", chunk=chunk(content)) for content in contents]
+        self.content = "".join(content for content in contents if content)
+        self.usage = usage
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for event in self.events:
+            yield event
+
+    async def get_final_completion(self) -> ChatCompletion:
+        return ChatCompletion(
+            id="c",
+            choices=[
+                Choice(
+                    index=0, message=ChatCompletionMessage(role="assistant", content=self.content), finish_reason="stop"
+                )
+            ],
+            created=1,
+            model="m",
+            object="chat.completion",
+            usage=self.usage,
+        )
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    MetricsRegistry.reset()
+    yield
+    MetricsRegistry.reset()
+
+
+class TestAgentMetrics:
+    """Tests for the per-agent recorder."""
+
+    def test_span_aggregated(self):
+        """Test that spans are aggregated in the context and the step."""
+        context = AgentContext()
+        metrics = AgentMetrics(context, agent_name="agent")
+
+        metrics.add_span("action_phase", 1.0)
+        metrics.add_span("action_phase", 3.0)
+
+        assert context.timings["action_phase"].count == 2
+        assert context.timings["action_phase"].total_seconds == 4.0
+        assert context.timings["action_phase"].max_seconds == 3.0
+        assert metrics.pop_step()["spans"] == {"action_phase": 4.0}
+        assert metrics.pop_step()["spans"] == {}
+
+    def test_span_recorded_on_error(self):
+        """Test that a failing block is measured too."""
+        context = AgentContext()
+        metrics = AgentMetrics(context, agent_name="agent")
+
+        with pytest.raises(RuntimeError):
+            with metrics.span("tool:failing"):
+                raise RuntimeError("failed")
+
+        assert context.timings["tool:failing"].count == 1
+
+    def test_llm_call_usage_and_speed(self):
+        """Test that reported usage and generation speed are aggregated."""
+        context = AgentContext()
+        metrics = AgentMetrics(context, agent_name="agent")
+
+        metrics.record_llm_call(2.5, 0.5, CompletionUsage(prompt_tokens=100, completion_tokens=40, total_tokens=140))
+        metrics.record_llm_call(1.0, None, None)
+
+        assert context.usage.calls == 2
+        assert context.usage.prompt_tokens == 100
+        assert context.usage.completion_tokens == 40
+        assert context.usage.tokens_per_second == 20.0
+        assert context.usage.time_to_first_token.count == 1
+        step = metrics.pop_step()
+        assert step["llm_calls"] == 2
+        assert step["time_to_first_token"] == [0.5]
+        assert step["spans"]["llm_stream"] == 3.5
+
+
+class TestMetricsRegistry:
+    """Tests for Prometheus text rendering."""
+
+    def test_format_metric(self):
+        """Test the text exposition format with labels."""
+        text = format_metric("requests", "gauge", "Requests", {(("path", 'a"b'),): 2})
+
+        assert text == '# HELP requests Requests\n# TYPE requests gauge\nrequests{path="a\\"b"} 2\n'
+
+    def test_summary_rendered(self):
+        """Test that observations render as summary count and sum."""
+        MetricsRegistry.observe("sgr_agent_span_seconds", 1.5, agent="a", span="action_phase")
+        MetricsRegistry.observe("sgr_agent_span_seconds", 0.5, agent="a", span="action_phase")
+
+        text = MetricsRegistry.render()
+
+        assert 'sgr_agent_span_seconds_count{agent="a",span="action_phase"} 2' in text
+        assert 'sgr_agent_span_seconds_sum{agent="a",span="action_phase"} 2' in text
+
+
+class TestBaseAgentInstrumentation:
+    """Tests for instrumentation of agent steps and LLM streams."""
+
+    @pytest.mark.asyncio
+    async def test_stream_completion_records_usage(self):
+        """Test that time to first token and usage are taken from the
+        stream."""
+        client = Mock(spec=AsyncOpenAI)
+        usage = CompletionUsage(prompt_tokens=10, completion_tokens=2, total_tokens=12)
+        client.chat.completions.stream = Mock(return_value=UsageStream([None, "a", "b"], usage))
+        agent = create_test_agent(ToolCallingAgent, openai_client=client)
+
+        completion = await agent._stream_completion(messages=[])
+
+        assert completion.choices[0].message.content == "ab"
+        assert client.chat.completions.stream.call_args.kwargs["stream_options"] == {"include_usage": True}
+        assert agent._context.usage.total_tokens == 12
+        assert agent._context.usage.time_to_first_token.count == 1
+        assert agent.streaming_generator.last_seq == 3
+
+    @pytest.mark.asyncio
+    async def test_summary_call_is_instrumented(self):
+        """Test that context summaries go through the rate limiter, LLM
+        settings and metrics without reaching the client stream."""
+        client = Mock(spec=AsyncOpenAI)
+        usage = CompletionUsage(prompt_tokens=50, completion_tokens=5, total_tokens=55)
+        client.chat.completions.stream = Mock(return_value=UsageStream(["summary"], usage))
+        agent = create_test_agent(
+            ToolCallingAgent,
+            openai_client=client,
+            llm_config=LLMConfig(api_key="key", model="m", temperature=0.1, max_tokens=64, rate_limit=10),
+        )
+
+        with patch.object(RateLimiter, "acquire", AsyncMock()) as acquire:
+            summary = await agent._summarize_messages([{"role": "tool", "content": "found"}])
+
+        assert summary == "summary"
+        acquire.assert_awaited_once_with(f"llm:{agent.config.llm.base_url}", 10, 1)
+        kwargs = client.chat.completions.stream.call_args.kwargs
+        assert (kwargs["model"], kwargs["temperature"], kwargs["max_tokens"]) == ("m", 0.1, 64)
+        assert agent._context.usage.total_tokens == 55
+        assert agent.streaming_generator.last_seq == 0
+
+    def test_stream_usage_can_be_disabled(self):
+        """Test that stream_options are not sent when disabled."""
+        assert "stream_options" not in LLMConfig(stream_usage=False).to_openai_client_kwargs()
+
+    @pytest.mark.asyncio
+    async def test_execution_step_spans(self):
+        """Test that phase and tool spans are recorded and logged per
+        step."""
+        agent = make_agent(ToolCallingAgent, make_client([SlowTool(label="0")]))
+
+        await agent._execution_step()
+        agent._log_step_metrics()
+
+        assert set(agent._context.timings) == {
+            "reasoning_phase",
+            "select_action_phase",
+            "action_phase",
+            "llm_stream",
+            "tool:slowtool",
+        }
+        assert agent._context.usage.calls == 1
+        entry = agent.log[-1]
+        assert entry["step_type"] == "step_metrics"
+        assert entry["spans"]["tool:slowtool"] > 0
+
+    @pytest.mark.asyncio
+    async def test_exposed_by_endpoints(self):
+        """Test that metrics are returned by the state and metrics
+        endpoints."""
+        agents_storage.clear()
+        agent = create_test_agent(ToolCallingAgent, execution_config=ExecutionConfig())
+        agent.metrics.record_llm_call(1.0, 0.2, CompletionUsage(prompt_tokens=7, completion_tokens=3, total_tokens=10))
+        agents_storage[agent.id] = agent
+
+        state = await get_agent_state(agent.id)
+        response = await get_metrics()
+        agents_storage.clear()
+
+        assert state.usage.total_tokens == 10
+        assert state.timings["llm_stream"].count == 1
+        text = response.body.decode()
+        assert 'sgr_agents{state="inited"} 1' in text
+        assert 'sgr_agent_llm_tokens_total{agent="tool_calling_agent",type="prompt"} 7' in text
+        assert "# TYPE sgr_llm_connections gauge" in text
+
+    @pytest.mark.asyncio
+    async def test_search_cache_stats_exposed(self):
+        """Test that the state endpoint reports search cache usage with its
+        hit rate."""
+        agents_storage.clear()
+        agent = create_test_agent(ToolCallingAgent, execution_config=ExecutionConfig())
+        agent._context.search_cache.hits = 3
+        agent._context.search_cache.misses = 1
+        agents_storage[agent.id] = agent
+
+        state = await get_agent_state(agent.id)
+        agents_storage.clear()
+
+        assert state.search_cache.hits == 3
+        assert state.model_dump()["search_cache"] == {"hits": 3, "misses": 1, "hit_rate": 0.75}
@@ -0,0 +1,102 @@
+"""Tests for NextStepToolsBuilder.
+
+This module contains tests for building NextStepTools models and the
+process-wide cache of built models keyed by toolkit subset.
+"""
+
+import pytest
+
+from sgr_agent_core.base_tool import BaseTool
+from sgr_agent_core.next_step_tool import NextStepToolsBuilder, NextStepToolStub
+from sgr_agent_core.services.registry import ToolRegistry
+from sgr_agent_core.tools import AdaptPlanTool, FinalAnswerTool, WebSearchTool
+
+
+@pytest.fixture(autouse=True)
+def clear_next_step_tools_cache():
+    NextStepToolsBuilder.cache_clear()
+    yield
+    NextStepToolsBuilder.cache_clear()
+
+
+class TestNextStepToolsCache:
+    """Tests for NextStepToolsBuilder cache."""
+
+    def test_build_returns_next_step_tool_stub_subclass(self):
+        """Test that built model is a NextStepToolStub subclass."""
+        model = NextStepToolsBuilder.build_NextStepTools([WebSearchTool, FinalAnswerTool])
+        assert issubclass(model, NextStepToolStub)
+
+    def test_same_subset_is_cached(self):
+        """Test that the same toolkit subset returns the same model."""
+        first = NextStepToolsBuilder.build_NextStepTools([WebSearchTool, FinalAnswerTool])
+        second = NextStepToolsBuilder.build_NextStepTools([FinalAnswerTool, WebSearchTool])
+
+        assert first is second
+        info = NextStepToolsBuilder.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+        assert info.currsize == 1
+
+    def test_different_subsets_are_cached_separately(self):
+        """Test that different toolkit subsets produce different models."""
+        first = NextStepToolsBuilder.build_NextStepTools([WebSearchTool, FinalAnswerTool])
+        second = NextStepToolsBuilder.build_NextStepTools([FinalAnswerTool])
+
+        assert first is not second
+        assert NextStepToolsBuilder.cache_info().currsize == 2
+
+    def test_cache_is_bounded(self, monkeypatch):
+        """Test that least recently used entries are evicted."""
+        monkeypatch.setattr(NextStepToolsBuilder, "cache_maxsize", 2)
+        NextStepToolsBuilder.build_NextStepTools([WebSearchTool])
+        NextStepToolsBuilder.build_NextStepTools([FinalAnswerTool])
+        NextStepToolsBuilder.build_NextStepTools([WebSearchTool])
+        NextStepToolsBuilder.build_NextStepTools([AdaptPlanTool])
+
+        assert NextStepToolsBuilder.cache_info().currsize == 2
+        NextStepToolsBuilder.build_NextStepTools([WebSearchTool])
+        assert NextStepToolsBuilder.cache_info().hits == 2
+
+    def test_registry_change_invalidates_cache(self, monkeypatch):
+        """Test that registering a new tool drops cached models."""
+        monkeypatch.setattr(ToolRegistry, "_items", dict(ToolRegistry._items))
+        first = NextStepToolsBuilder.build_NextStepTools([WebSearchTool])
+
+        class CacheInvalidationTestTool(BaseTool):
+            pass
+
+        assert ToolRegistry.get("CacheInvalidationTestTool") is CacheInvalidationTestTool
+        second = NextStepToolsBuilder.build_NextStepTools([WebSearchTool])
+        assert first is not second
+        assert NextStepToolsBuilder.cache_info().misses == 2
+
+    def test_reregistering_same_tool_keeps_cache(self):
+        """Test that registering an already registered tool does not bump
+        the registry version."""
+        first = NextStepToolsBuilder.build_NextStepTools([WebSearchTool])
+        version = ToolRegistry.version()
+
+        ToolRegistry.register(WebSearchTool)
+        ToolRegistry.register(WebSearchTool, name=WebSearchTool.tool_name)
+
+        assert ToolRegistry.version() == version
+        assert NextStepToolsBuilder.build_NextStepTools([WebSearchTool]) is first
+
+    def test_response_format_is_cached(self):
+        """Test that the strict response format is generated once per
+        model."""
+        model = NextStepToolsBuilder.build_NextStepTools([WebSearchTool, FinalAnswerTool])
+
+        response_format = NextStepToolsBuilder.get_response_format(model)
+
+        assert NextStepToolsBuilder.get_response_format(model) is response_format
+        assert response_format["json_schema"]["strict"] is True
+        assert response_format["json_schema"]["schema"]["additionalProperties"] is False
+
+    def test_built_models_are_not_registered(self):
+        """Test that dynamic models do not override registered tools."""
+        NextStepToolsBuilder.build_NextStepTools([WebSearchTool, FinalAnswerTool])
+
+        assert ToolRegistry.get(WebSearchTool.tool_name) is WebSearchTool
+        assert ToolRegistry.get("nextsteptools") is None
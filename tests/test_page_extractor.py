@@ -0,0 +1,147 @@
+"""Tests for page extractors.
+
+This module contains tests for LocalPageExtractor against a local HTTP
+stub server and for HTML-to-text conversion.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from sgr_agent_core.services.page_extractor import LocalPageExtractor, html_to_text
+
+PAGES = {
+    "/article": (
+        "text/html; charset=utf-8",
+        b"<html><head><title>Article</title><style>p{}</style></head>"
+        b"<body><script>var x = 1;</script><h1>Header</h1><p>First &amp; second</p></body></html>",
+    ),
+    "/plain": ("text/plain", b"Plain text"),
+    "/image": ("image/png", b"\x89PNG"),
+}
+REDIRECTS = {"/moved": "/article"}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path in REDIRECTS:
+            self.send_response(302)
+            self.send_header("Location", REDIRECTS[self.path])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path not in PAGES:
+            self.send_error(404)
+            return
+        content_type, body = PAGES[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestHTMLToText:
+    """Tests for html_to_text."""
+
+    def test_skips_scripts_and_styles(self):
+        """Test that scripts and styles are not part of the text."""
+        title, text = html_to_text("<title>T</title><style>a{}</style><script>x()</script><p>Hello</p><p>World</p>")
+
+        assert title == "T"
+        assert text == "Hello\nWorld"
+
+
+class TestLocalPageExtractor:
+    """Tests for LocalPageExtractor."""
+
+    @pytest.mark.asyncio
+    async def test_extracts_html(self, stub_server):
+        """Test that HTML pages are converted to text."""
+        extractor = LocalPageExtractor(allow_private_addresses=True)
+        try:
+            result = await extractor.extract(f"{stub_server}/article")
+        finally:
+            await extractor.aclose()
+
+        assert result == {"url": f"{stub_server}/article", "title": "Article", "raw_content": "Header\nFirst & second"}
+
+    @pytest.mark.asyncio
+    async def test_extracts_plain_text(self, stub_server):
+        """Test that plain text is returned as is."""
+        extractor = LocalPageExtractor(allow_private_addresses=True)
+        try:
+            result = await extractor.extract(f"{stub_server}/plain")
+        finally:
+            await extractor.aclose()
+
+        assert result["raw_content"] == "Plain text"
+
+    @pytest.mark.asyncio
+    async def test_failures_return_none(self, stub_server):
+        """Test that HTTP errors and unsupported content return None."""
+        extractor = LocalPageExtractor(allow_private_addresses=True)
+        try:
+            assert await extractor.extract(f"{stub_server}/missing") is None
+            assert await extractor.extract(f"{stub_server}/image") is None
+        finally:
+            await extractor.aclose()
+
+    @pytest.mark.asyncio
+    async def test_follows_redirects(self, stub_server):
+        """Test that redirects are followed and the requested URL is
+        reported."""
+        extractor = LocalPageExtractor(allow_private_addresses=True)
+        try:
+            result = await extractor.extract(f"{stub_server}/moved")
+        finally:
+            await extractor.aclose()
+
+        assert result["url"] == f"{stub_server}/moved"
+        assert result["title"] == "Article"
+
+    @pytest.mark.asyncio
+    async def test_private_addresses_are_refused(self, stub_server):
+        """Test that loopback and private hosts are not requested."""
+        extractor = LocalPageExtractor()
+        try:
+            assert await extractor.extract(f"{stub_server}/article") is None
+            assert await extractor.extract("http://10.0.0.1/") is None
+            assert await extractor.extract("http://169.254.169.254/latest/meta-data/") is None
+            assert await extractor.extract("http://[::ffff:127.0.0.1]/") is None
+            assert await extractor.extract("file:///etc/passwd") is None
+        finally:
+            await extractor.aclose()
+
+    @pytest.mark.asyncio
+    async def test_redirect_to_private_address_is_refused(self):
+        """Test that a public page redirecting to a private address is not
+        followed."""
+        requested = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(str(request.url))
+            return httpx.Response(302, headers={"Location": "http://127.0.0.1/admin"})
+
+        extractor = LocalPageExtractor(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        try:
+            assert await extractor.extract("http://93.184.215.14/page") is None
+        finally:
+            await extractor.aclose()
+
+        assert requested == ["http://93.184.215.14/page"]
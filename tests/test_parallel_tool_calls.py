@@ -0,0 +1,262 @@
+"""Tests for parallel tool calls and fused reasoning in tool calling
+agents."""
+
+import asyncio
+from typing import ClassVar
+from unittest.mock import Mock
+
+import pytest
+from openai import AsyncOpenAI
+
+from sgr_agent_core.agent_definition import ExecutionConfig
+from sgr_agent_core.agents import SGRToolCallingAgent, ToolCallingAgent
+from sgr_agent_core.models import AgentStatesEnum
+from sgr_agent_core.tools import BaseTool, FinalAnswerTool, ReasoningTool
+from tests.conftest import create_test_agent
+from tests.test_agent_e2e import MockStream, _create_tool_call
+
+
+class SlowTool(BaseTool, register=False):
+    """Test tool tracking how many instances run at the same time."""
+
+    tool_name = "slowtool"
+    description = "Slow test tool"
+
+    running: ClassVar[int] = 0
+    peak: ClassVar[int] = 0
+
+    label: str
+
+    async def __call__(self, context, config, **_) -> str:
+        SlowTool.running += 1
+        SlowTool.peak = max(SlowTool.peak, SlowTool.running)
+        # Later tools finish first to check that results keep the call order
+        await asyncio.sleep(0.05 / (int(self.label) + 1))
+        SlowTool.running -= 1
+        return f"result {self.label}"
+
+
+class FailingTool(BaseTool, register=False):
+    tool_name = "failingtool"
+    description = "Failing test tool"
+
+    async def __call__(self, context, config, **_) -> str:
+        raise RuntimeError("tool failed")
+
+
+@pytest.fixture(autouse=True)
+def reset_slow_tool():
+    SlowTool.running = 0
+    SlowTool.peak = 0
+
+
+def make_client(*responses: list) -> AsyncOpenAI:
+    client = Mock(spec=AsyncOpenAI)
+    streams = iter(
+        MockStream(
+            {"content": None, "tool_calls": [_create_tool_call(tool, f"call_{i}") for i, tool in enumerate(tools)]}
+        )
+        for tools in responses
+    )
+    client.chat.completions.stream = Mock(side_effect=lambda **kwargs: next(streams))
+    return client
+
+
+def make_agent(agent_class, client: AsyncOpenAI, parallel: bool = True, limit: int = 4):
+    agent = create_test_agent(
+        agent_class,
+        openai_client=client,
+        execution_config=ExecutionConfig(parallel_tool_calls=parallel, max_parallel_tool_calls=limit),
+        toolkit=[SlowTool, FinalAnswerTool],
+    )
+    agent._context.iteration = 1
+    return agent
+
+
+def final_answer() -> FinalAnswerTool:
+    return FinalAnswerTool(
+        reasoning="done", completed_steps=["search"], answer="answer", status=AgentStatesEnum.COMPLETED
+    )
+
+
+def reasoning() -> ReasoningTool:
+    return ReasoningTool(
+        reasoning_steps=["a", "b"],
+        current_situation="s",
+        plan_status="p",
+        enough_data=False,
+        remaining_steps=["search"],
+        task_completed=False,
+    )
+
+
+class TestParallelToolCalls:
+    """Tests for the parallel tool calls mode."""
+
+    @pytest.mark.asyncio
+    async def test_tool_calling_agent_executes_all_calls(self):
+        """Test that all calls run concurrently and results keep call
+        order."""
+        tools = [SlowTool(label=str(i)) for i in range(3)]
+        agent = make_agent(ToolCallingAgent, make_client(tools))
+
+        tool = await agent._select_action_phase()
+        result = await agent._action_phase(tool)
+
+        assert result == "result 0"
+        assert SlowTool.peak == 3
+        assistant, *tool_messages = agent.conversation
+        assert [call["id"] for call in assistant["tool_calls"]] == ["1-action", "1-action-1", "1-action-2"]
+        assert [message["tool_call_id"] for message in tool_messages] == ["1-action", "1-action-1", "1-action-2"]
+        assert [message["content"] for message in tool_messages] == ["result 0", "result 1", "result 2"]
+        assert len([entry for entry in agent.log if entry["step_type"] == "tool_execution"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """Test that the per-agent limit bounds concurrent tool calls."""
+        tools = [SlowTool(label=str(i)) for i in range(4)]
+        agent = make_agent(ToolCallingAgent, make_client(tools), limit=2)
+
+        await agent._action_phase(await agent._select_action_phase())
+
+        assert SlowTool.peak == 2
+        assert len(agent.conversation) == 5
+
+    @pytest.mark.asyncio
+    async def test_disabled_executes_first_call_only(self):
+        """Test that only the first call is executed without parallel
+        mode."""
+        tools = [SlowTool(label=str(i)) for i in range(3)]
+        agent = make_agent(ToolCallingAgent, make_client(tools), parallel=False)
+
+        await agent._action_phase(await agent._select_action_phase())
+
+        assert len(agent.conversation[0]["tool_calls"]) == 1
+        assert agent.conversation[1] == {"role": "tool", "content": "result 0", "tool_call_id": "1-action"}
+
+    @pytest.mark.asyncio
+    async def test_workflow_tools_not_batched(self):
+        """Test that a final answer is not executed together with other
+        tools."""
+        agent = make_agent(ToolCallingAgent, make_client([SlowTool(label="0"), final_answer()]))
+
+        tool = await agent._select_action_phase()
+        await agent._action_phase(tool)
+
+        assert isinstance(tool, SlowTool)
+        assert len(agent.conversation) == 2
+        assert agent._context.state != AgentStatesEnum.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_leading_workflow_tool_runs_alone(self):
+        """Test that a leading final answer is executed alone."""
+        agent = make_agent(ToolCallingAgent, make_client([final_answer(), SlowTool(label="0")]))
+
+        tool = await agent._select_action_phase()
+        await agent._action_phase(tool)
+
+        assert isinstance(tool, FinalAnswerTool)
+        assert SlowTool.peak == 0
+
+    @pytest.mark.asyncio
+    async def test_failure_is_raised(self):
+        """Test that a failing tool fails the step after all tools
+        finish."""
+        agent = make_agent(ToolCallingAgent, make_client([SlowTool(label="0"), FailingTool()]))
+
+        with pytest.raises(RuntimeError, match="tool failed"):
+            await agent._action_phase(await agent._select_action_phase())
+        assert SlowTool.running == 0
+
+    @pytest.mark.asyncio
+    async def test_sgr_tool_calling_agent(self):
+        """Test parallel mode in the SGR tool calling agent."""
+        tools = [SlowTool(label=str(i)) for i in range(2)]
+        agent = make_agent(SGRToolCallingAgent, make_client(tools))
+
+        tool = await agent._select_action_phase(reasoning())
+        await agent._action_phase(tool)
+
+        assert agent.conversation[0]["content"] == "search"
+        assert [message["tool_call_id"] for message in agent.conversation[1:]] == ["1-action", "1-action-1"]
+        assert SlowTool.peak == 2
+
+
+def make_fused_agent(client: AsyncOpenAI, parallel: bool = False):
+    agent = create_test_agent(
+        SGRToolCallingAgent,
+        openai_client=client,
+        execution_config=ExecutionConfig(fused_reasoning=True, parallel_tool_calls=parallel),
+        toolkit=[SlowTool, FinalAnswerTool],
+    )
+    agent._context.iteration = 1
+    return agent
+
+
+class TestFusedReasoning:
+    """Tests for the fused reasoning and action mode of
+    SGRToolCallingAgent."""
+
+    @pytest.mark.asyncio
+    async def test_single_call_per_step(self):
+        """Test that reasoning and action come from one completion."""
+        client = make_client([reasoning(), SlowTool(label="0")])
+        agent = make_fused_agent(client)
+
+        await agent._action_phase(await agent._select_action_phase(await agent._reasoning_phase()))
+
+        assert client.chat.completions.stream.call_count == 1
+        kwargs = client.chat.completions.stream.call_args.kwargs
+        assert kwargs["parallel_tool_calls"] is True
+        assert {tool["function"]["name"] for tool in kwargs["tools"]} == {
+            "reasoningtool",
+            "slowtool",
+            "finalanswertool",
+        }
+        assert [message["role"] for message in agent.conversation] == ["assistant", "tool", "assistant", "tool"]
+        assert agent.conversation[1]["tool_call_id"] == "1-reasoning"
+        assert agent.conversation[3] == {"role": "tool", "content": "result 0", "tool_call_id": "1-action"}
+
+    @pytest.mark.asyncio
+    async def test_instruction_not_kept_in_context(self):
+        """Test that the fused call instruction does not leak into the
+        conversation."""
+        agent = make_fused_agent(make_client([reasoning(), SlowTool(label="0")]))
+
+        await agent._reasoning_phase()
+
+        assert len(await agent._prepare_context()) == agent._context_builder.prefix_length + 2
+
+    @pytest.mark.asyncio
+    async def test_only_reasoning_falls_back(self):
+        """Test that a separate action call is made when only reasoning is
+        returned."""
+        client = make_client([reasoning()], [SlowTool(label="0")])
+        agent = make_fused_agent(client)
+
+        tool = await agent._select_action_phase(await agent._reasoning_phase())
+
+        assert client.chat.completions.stream.call_count == 2
+        assert isinstance(tool, SlowTool)
+
+    @pytest.mark.asyncio
+    async def test_missing_reasoning_falls_back(self):
+        """Test that a separate reasoning call is made when the fused
+        response has no reasoning."""
+        client = make_client([SlowTool(label="0")], [reasoning()], [SlowTool(label="1")])
+        agent = make_fused_agent(client)
+
+        tool = await agent._select_action_phase(await agent._reasoning_phase())
+
+        assert client.chat.completions.stream.call_count == 3
+        assert tool.label == "1"
+
+    @pytest.mark.asyncio
+    async def test_fused_with_parallel_tool_calls(self):
+        """Test that several fused actions run as a parallel batch."""
+        agent = make_fused_agent(make_client([reasoning(), SlowTool(label="0"), SlowTool(label="1")]), parallel=True)
+
+        await agent._action_phase(await agent._select_action_phase(await agent._reasoning_phase()))
+
+        assert [message.get("tool_call_id") for message in agent.conversation[3:]] == ["1-action", "1-action-1"]
+        assert SlowTool.peak == 2
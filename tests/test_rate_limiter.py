@@ -0,0 +1,78 @@
+"""Tests for per-upstream rate limiting."""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from sgr_agent_core.agent_definition import LLMConfig, SearchConfig
+from sgr_agent_core.services.metrics import MetricsRegistry
+from sgr_agent_core.services.rate_limiter import RateLimiter, TokenBucket
+from sgr_agent_core.services.tavily_search import TavilySearchService
+
+
+@pytest.fixture(autouse=True)
+def reset_limiter():
+    RateLimiter.reset()
+    MetricsRegistry.reset()
+    yield
+    RateLimiter.reset()
+    MetricsRegistry.reset()
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_rate(self):
+        """Test that the burst passes at once and later requests wait."""
+        bucket = TokenBucket(rate=50, burst=2)
+
+        started = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        elapsed = time.monotonic() - started
+
+        assert 0.03 <= elapsed < 0.5
+
+
+class TestRateLimiter:
+    """Tests for the shared RateLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_no_limit(self):
+        """Test that upstreams without a rate limit are not tracked."""
+        await RateLimiter.acquire("llm:http://x", None)
+
+        assert RateLimiter._buckets == {}
+
+    @pytest.mark.asyncio
+    async def test_bucket_shared_per_upstream(self):
+        """Test that callers of one upstream share a bucket and wait times
+        are recorded."""
+        await RateLimiter.acquire("llm:http://x", 100, 1)
+        await RateLimiter.acquire("llm:http://x", 100, 1)
+
+        assert list(RateLimiter._buckets) == ["llm:http://x"]
+        assert 'sgr_rate_limit_wait_seconds_count{upstream="llm:http://x"} 2' in MetricsRegistry.render()
+
+    def test_limits_not_sent_to_llm(self):
+        """Test that rate limit settings are not passed to completion
+        requests."""
+        kwargs = LLMConfig(rate_limit=2, rate_limit_burst=3).to_openai_client_kwargs()
+
+        assert "rate_limit" not in kwargs
+        assert "rate_limit_burst" not in kwargs
+
+    @pytest.mark.asyncio
+    async def test_search_requests_limited(self):
+        """Test that Tavily requests take a token of the search
+        upstream."""
+        client = AsyncMock()
+        client.search.return_value = {"results": []}
+        service = TavilySearchService(SearchConfig(tavily_api_key="key", rate_limit=10), client=client)
+
+        with patch.object(RateLimiter, "acquire", AsyncMock()) as acquire:
+            await service.search("query")
+
+        acquire.assert_awaited_once_with("search:https://api.tavily.com", 10, 1)
@@ -0,0 +1,266 @@
+"""Tests for agent admission control of the API server."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from sgr_agent_core.server.endpoints import agent_scheduler, agents_storage, create_chat_completion
+from sgr_agent_core.server.models import ChatCompletionRequest
+from sgr_agent_core.server.scheduler import AgentScheduler, SchedulerBusyError
+from sgr_agent_core.services.metrics import MetricsRegistry
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    MetricsRegistry.reset()
+    yield
+    MetricsRegistry.reset()
+
+
+class TestAgentScheduler:
+    """Tests for AgentScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_admits_up_to_global_cap(self):
+        """Test that agents above the global cap wait for a free slot."""
+        scheduler = AgentScheduler(max_running=2)
+        await scheduler.acquire("a")
+        await scheduler.acquire("b")
+
+        waiting = asyncio.create_task(scheduler.acquire("a"))
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        assert scheduler.queue_depth == 1
+
+        scheduler.release("b")
+        await waiting
+        assert scheduler.running == {"a": 2}
+        assert scheduler.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_per_definition_cap(self):
+        """Test that a busy definition does not block other definitions."""
+        scheduler = AgentScheduler(max_running=10, max_running_per_definition=1)
+        await scheduler.acquire("a")
+
+        waiting = asyncio.create_task(scheduler.acquire("a"))
+        await asyncio.sleep(0)
+        await scheduler.acquire("b")
+
+        assert not waiting.done()
+        scheduler.release("a")
+        await waiting
+        assert scheduler.running == {"a": 1, "b": 1}
+
+    @pytest.mark.asyncio
+    async def test_priority_order(self):
+        """Test that higher priorities are admitted first, then by
+        arrival."""
+        scheduler = AgentScheduler(max_running=1)
+        await scheduler.acquire("a")
+        admitted = []
+
+        async def wait(name: str, priority: int):
+            await scheduler.acquire(name, priority)
+            admitted.append(name)
+
+        tasks = [
+            asyncio.create_task(wait("low", 0)),
+            asyncio.create_task(wait("high", 5)),
+            asyncio.create_task(wait("low2", 0)),
+        ]
+        await asyncio.sleep(0)
+        for name in ("a", "high", "low"):
+            scheduler.release(name)
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+        assert admitted == ["high", "low", "low2"]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejected(self):
+        """Test that requests above the queue size get 429 with Retry-
+        After."""
+        scheduler = AgentScheduler(max_running=1, max_queue=1)
+        await scheduler.acquire("a")
+        waiting = asyncio.create_task(scheduler.acquire("a"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(SchedulerBusyError) as exc_info:
+            await scheduler.acquire("a")
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after >= 1
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert scheduler.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self):
+        """Test that a request waiting too long gets 503 and leaves the
+        queue."""
+        scheduler = AgentScheduler(max_running=1, queue_timeout=0.01)
+        await scheduler.acquire("a")
+
+        with pytest.raises(SchedulerBusyError) as exc_info:
+            await scheduler.acquire("a")
+
+        assert exc_info.value.status_code == 503
+        assert scheduler.queue_depth == 0
+        assert 'sgr_scheduler_rejected_total{reason="timeout"} 1' in MetricsRegistry.render()
+
+    @pytest.mark.asyncio
+    async def test_run_releases_slot(self):
+        """Test that the slot is released when the agent fails."""
+        scheduler = AgentScheduler(max_running=1)
+        await scheduler.acquire("a")
+
+        async def failing():
+            raise RuntimeError("failed")
+
+        with pytest.raises(RuntimeError):
+            await scheduler.run("a", failing())
+
+        assert scheduler.running == {}
+
+    @pytest.mark.asyncio
+    async def test_metrics(self):
+        """Test that running and queued agents are rendered as gauges."""
+        scheduler = AgentScheduler(max_running=1)
+        await scheduler.acquire("a")
+        waiting = asyncio.create_task(scheduler.acquire("b"))
+        await asyncio.sleep(0)
+
+        text = scheduler.render_metrics()
+
+        assert 'sgr_scheduler_running_agents{agent="a"} 1' in text
+        assert 'sgr_scheduler_queue_depth{agent="b"} 1' in text
+        scheduler.release("a")
+        await waiting
+        assert 'sgr_scheduler_wait_seconds_count{agent="b"} 1' in MetricsRegistry.render()
+
+    @pytest.mark.asyncio
+    async def test_clarification_wait_frees_slot(self):
+        """Test that an agent waiting for clarification frees its slot and
+        queues ahead of new requests to resume."""
+        scheduler = AgentScheduler(max_running=1)
+        await scheduler.acquire("a")
+        agent = Mock()
+        resumed = asyncio.Event()
+        clarified = asyncio.Event()
+
+        async def agent_run():
+            await agent.on_clarification_wait()
+            await clarified.wait()
+            await agent.on_clarification_resume()
+            resumed.set()
+
+        run = asyncio.create_task(scheduler.run("a", agent_run(), agent=agent))
+        await asyncio.sleep(0)
+        assert scheduler.running == {}
+
+        await scheduler.acquire("b")
+        newcomer = asyncio.create_task(scheduler.acquire("c"))
+        clarified.set()
+        await asyncio.sleep(0)
+        assert not resumed.is_set()
+        assert scheduler.queue_depth == 2
+
+        scheduler.release("b")
+        assert scheduler.running == {"a": 1}
+        assert not newcomer.done()
+        await run
+        await newcomer
+        assert scheduler.running == {"c": 1}
+
+    @pytest.mark.asyncio
+    async def test_cancel_during_clarification_wait(self):
+        """Test that cancelling a paused agent does not release a slot it no
+        longer holds."""
+        scheduler = AgentScheduler(max_running=1)
+        await scheduler.acquire("a")
+        agent = Mock()
+
+        async def agent_run():
+            await agent.on_clarification_wait()
+            await asyncio.Event().wait()
+
+        run = asyncio.create_task(scheduler.run("a", agent_run(), agent=agent))
+        await asyncio.sleep(0)
+        await scheduler.acquire("b")
+        run.cancel()
+        await asyncio.gather(run, return_exceptions=True)
+
+        assert scheduler.running == {"b": 1}
+
+    def test_priority_is_capped(self):
+        """Test that client priorities are capped at the configured
+        maximum."""
+        assert AgentScheduler().clamp_priority(100) == 0
+        assert AgentScheduler(max_priority=5).clamp_priority(100) == 5
+        assert AgentScheduler(max_priority=5).clamp_priority(-1) == -1
+
+
+class TestChatCompletionAdmission:
+    """Tests for admission control of the chat completions endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_busy_server_returns_retry_after(self):
+        """Test that a full queue is reported as 429 with Retry-After."""
+        agent_def = Mock()
+        agent_def.name = "sgr_agent"
+        request = ChatCompletionRequest(model="sgr_agent", messages=[{"role": "user", "content": "Task"}])
+
+        with (
+            patch("sgr_agent_core.server.endpoints.AgentFactory") as factory,
+            patch.object(
+                agent_scheduler, "acquire", AsyncMock(side_effect=SchedulerBusyError("full", 429, retry_after=7))
+            ),
+        ):
+            factory.get_definitions_list.return_value = [agent_def]
+            with pytest.raises(HTTPException) as exc_info:
+                await create_chat_completion(request)
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.headers == {"Retry-After": "7"}
+        factory.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_slot_released_when_creation_fails(self):
+        """Test that a failed agent creation frees its slot."""
+        agent_def = Mock()
+        agent_def.name = "sgr_agent"
+        request = ChatCompletionRequest(model="sgr_agent", messages=[{"role": "user", "content": "Task"}])
+
+        with patch("sgr_agent_core.server.endpoints.AgentFactory") as factory:
+            factory.get_definitions_list.return_value = [agent_def]
+            factory.create = AsyncMock(side_effect=ValueError("bad config"))
+            with pytest.raises(HTTPException):
+                await create_chat_completion(request)
+
+        assert "sgr_agent" not in agent_scheduler.running
+        agents_storage.clear()
+
+    @pytest.mark.asyncio
+    async def test_request_priority_is_capped(self):
+        """Test that the endpoint caps the priority from the request
+        body."""
+        agent_def = Mock()
+        agent_def.name = "sgr_agent"
+        request = ChatCompletionRequest(
+            model="sgr_agent", messages=[{"role": "user", "content": "Task"}], priority=1000
+        )
+        acquire = AsyncMock(side_effect=SchedulerBusyError("full", 429, retry_after=1))
+
+        with (
+            patch("sgr_agent_core.server.endpoints.AgentFactory") as factory,
+            patch.object(agent_scheduler, "acquire", acquire),
+            patch.object(agent_scheduler, "max_priority", 3),
+        ):
+            factory.get_definitions_list.return_value = [agent_def]
+            with pytest.raises(HTTPException):
+                await create_chat_completion(request)
+
+        acquire.assert_awaited_once_with("sgr_agent", 3)
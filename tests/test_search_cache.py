@@ -0,0 +1,139 @@
+"""Tests for search result cache backends.
+
+This module contains tests for TTL and LRU eviction, byte size
+accounting and backend selection from SearchConfig.
+"""
+
+import time
+
+import pytest
+
+from sgr_agent_core.agent_definition import SearchConfig
+from sgr_agent_core.services.search_cache import InMemorySearchCache, SearchCacheBackend, SQLiteSearchCache
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    """Factory fixture creating a cache of each backend type."""
+
+    def _make(ttl: float = 60, max_entries: int = 10, max_bytes: int = 1024) -> SearchCacheBackend:
+        if request.param == "memory":
+            return InMemorySearchCache(ttl=ttl, max_entries=max_entries, max_bytes=max_bytes)
+        return SQLiteSearchCache(
+            path=str(tmp_path / "cache.sqlite3"), ttl=ttl, max_entries=max_entries, max_bytes=max_bytes
+        )
+
+    return _make
+
+
+class TestSearchCacheBackends:
+    """Tests shared by all search cache backends."""
+
+    @pytest.mark.asyncio
+    async def test_get_missing_returns_none(self, make_cache):
+        """Test that missing keys are reported as misses."""
+        cache = make_cache()
+
+        assert await cache.get("missing") is None
+        assert cache.info().misses == 1
+
+    @pytest.mark.asyncio
+    async def test_set_and_get(self, make_cache):
+        """Test storing and reading a value."""
+        cache = make_cache()
+        await cache.set("key", b"value")
+
+        assert await cache.get("key") == b"value"
+        info = cache.info()
+        assert info.hits == 1
+        assert info.entries == 1
+        assert info.bytes == 5
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_dropped(self, make_cache):
+        """Test that entries expire after TTL."""
+        cache = make_cache(ttl=0.01)
+        await cache.set("key", b"value")
+        time.sleep(0.02)
+
+        assert await cache.get("key") is None
+        assert cache.info().entries == 0
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_by_entries(self, make_cache):
+        """Test that least recently used entries are evicted first."""
+        cache = make_cache(max_entries=2)
+        await cache.set("first", b"1")
+        time.sleep(0.001)
+        await cache.set("second", b"2")
+        time.sleep(0.001)
+        await cache.get("first")
+        time.sleep(0.001)
+        await cache.set("third", b"3")
+
+        assert await cache.get("second") is None
+        assert await cache.get("first") == b"1"
+        assert await cache.get("third") == b"3"
+        assert cache.info().evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_eviction_by_bytes(self, make_cache):
+        """Test that total byte size stays within the limit."""
+        cache = make_cache(max_bytes=10)
+        await cache.set("first", b"12345")
+        time.sleep(0.001)
+        await cache.set("second", b"12345")
+        time.sleep(0.001)
+        await cache.set("third", b"12345")
+
+        info = cache.info()
+        assert info.bytes <= 10
+        assert await cache.get("first") is None
+
+    @pytest.mark.asyncio
+    async def test_oversized_values_are_not_cached(self, make_cache):
+        """Test that values larger than the byte limit are skipped."""
+        cache = make_cache(max_bytes=4)
+        await cache.set("key", b"12345")
+
+        assert cache.info().entries == 0
+
+    @pytest.mark.asyncio
+    async def test_clear(self, make_cache):
+        """Test that clear drops all entries."""
+        cache = make_cache()
+        await cache.set("key", b"value")
+        await cache.clear()
+
+        assert await cache.get("key") is None
+
+
+class TestSearchCacheFromConfig:
+    """Tests for backend selection from SearchConfig."""
+
+    def setup_method(self):
+        SearchCacheBackend._shared.clear()
+
+    def test_disabled_by_default(self):
+        """Test that caching is disabled unless a backend is configured."""
+        assert SearchCacheBackend.from_config(SearchConfig()) is None
+
+    def test_memory_backend(self):
+        """Test that memory backend is shared between equal configs."""
+        config = SearchConfig(cache_backend="memory", cache_ttl=30)
+        cache = SearchCacheBackend.from_config(config)
+
+        assert isinstance(cache, InMemorySearchCache)
+        assert cache.ttl == 30
+        assert SearchCacheBackend.from_config(config.model_copy(update={"max_results": 3})) is cache
+
+    @pytest.mark.asyncio
+    async def test_sqlite_backend_persists(self, tmp_path):
+        """Test that sqlite backend keeps values across instances."""
+        path = str(tmp_path / "nested" / "cache.sqlite3")
+        cache = SearchCacheBackend.from_config(SearchConfig(cache_backend="sqlite", cache_path=path))
+        await cache.set("key", b"value")
+
+        reopened = SQLiteSearchCache(path=path, ttl=60, max_entries=10, max_bytes=1024)
+        assert isinstance(cache, SQLiteSearchCache)
+        assert await reopened.get("key") == b"value"
@@ -0,0 +1,156 @@
+"""Tests for SearchInFilesTool of the file agent example.
+
+This module contains tests for chunked search of single files, reading
+long rg/grep output lines, the early-stop estimate and parity of the
+search backends.
+"""
+
+import asyncio
+import re
+import shutil
+from pathlib import Path
+
+import pytest
+
+from examples.sgr_file_agent.tools import search_in_files_tool
+from examples.sgr_file_agent.tools.search_in_files_tool import (
+    MAX_LINE_LENGTH,
+    SearchInFilesTool,
+    read_lines,
+    search_file,
+)
+
+
+def create_tool(search_text: str, directory: Path, **kwargs) -> SearchInFilesTool:
+    return SearchInFilesTool(reasoning="test", search_text=search_text, directory=str(directory), **kwargs)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Search files in 16 byte chunks so short files span many chunks."""
+    monkeypatch.setattr(search_in_files_tool, "SEARCH_CHUNK_SIZE", 16)
+
+
+class TestSearchFile:
+    """Tests for search_file."""
+
+    def test_line_numbers_across_chunks(self, tmp_path, small_chunks):
+        """Test that line numbers stay right when matches are in later
+        chunks."""
+        path = tmp_path / "lines.txt"
+        path.write_text("".join(f"line {i}{' match' if i % 7 == 0 else ''}\n" for i in range(1, 40)))
+
+        matches, count, skipped = search_file(str(path), re.compile(b"match"), limit=100)
+
+        assert skipped is None
+        assert count == 5
+        assert matches == [(i, f"line {i} match") for i in (7, 14, 21, 28, 35)]
+
+    def test_line_longer_than_chunk(self, tmp_path, small_chunks):
+        """Test that a line spanning several chunks is matched whole."""
+        path = tmp_path / "long.txt"
+        path.write_text("short\n" + "x" * 50 + "needle" + "y" * 50 + "\nafter needle\n")
+
+        matches, count, _ = search_file(str(path), re.compile(b"needle"), limit=100)
+
+        assert count == 2
+        assert matches == [(2, "x" * 50 + "needle" + "y" * 50), (3, "after needle")]
+
+    def test_long_lines_are_cut(self, tmp_path):
+        """Test that matching lines are cut to MAX_LINE_LENGTH
+        characters."""
+        path = tmp_path / "minified.js"
+        path.write_text("needle" + "x" * (MAX_LINE_LENGTH * 3) + "\n")
+
+        matches, _, _ = search_file(str(path), re.compile(b"needle"), limit=100)
+
+        assert len(matches[0][1]) == MAX_LINE_LENGTH
+
+    def test_anchors_match_line_ends(self, tmp_path, small_chunks):
+        """Test that ^ and $ anchor at line starts and ends like grep."""
+        path = tmp_path / "anchors.txt"
+        path.write_text("def one():\n    def inner():\nclass Two:\n  end\nend\n")
+        tool = create_tool("^(def|end)|:$", tmp_path, regex=True)
+
+        matches, _, _ = search_file(str(path), tool._compile_pattern(), limit=100)
+
+        assert [number for number, _ in matches] == [1, 2, 3, 5]
+
+    def test_binary_files_are_skipped(self, tmp_path):
+        """Test that files with a NUL byte are reported as binary."""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"needle\0needle")
+
+        assert search_file(str(path), re.compile(b"needle"), limit=100) == ([], 0, "binary")
+
+    def test_limit_stops_search(self, tmp_path):
+        """Test that at most limit matching lines are returned."""
+        path = tmp_path / "many.txt"
+        path.write_text("needle\n" * 100)
+
+        matches, count, _ = search_file(str(path), re.compile(b"needle"), limit=3)
+
+        assert count == 3
+        assert [number for number, _ in matches] == [1, 2, 3]
+
+
+class TestReadLines:
+    """Tests for reading rg/grep output."""
+
+    @pytest.mark.asyncio
+    async def test_lines_longer_than_buffer(self, small_chunks):
+        """Test that lines longer than a read are cut instead of
+        raising."""
+        stream = asyncio.StreamReader()
+        stream.feed_data(b"first\n" + b"x" * 100 + b"\nlast")
+        stream.feed_eof()
+
+        lines = [line async for line in read_lines(stream, max_bytes=10)]
+
+        assert lines == [b"first", b"x" * 10, b"last"]
+
+
+class TestSearchInFilesTool:
+    """Tests for SearchInFilesTool backends."""
+
+    def test_early_stop_estimate(self, tmp_path):
+        """Test that an early stop extrapolates the total from searched
+        files."""
+        for i in range(40):
+            (tmp_path / f"file{i:02}.txt").write_text("needle\nneedle\n")
+        tool = create_tool("needle", tmp_path, max_results=10)
+
+        outcome = tool._search_python(tmp_path, tool._compile_pattern())
+
+        assert outcome.exact is False
+        assert len(outcome.matches) == 10
+        assert outcome.files_searched < 40
+        assert outcome.total == 80
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend", ["grep", "rg"])
+    async def test_backend_parity(self, tmp_path, backend):
+        """Test that rg and grep find the same lines as the Python
+        backend."""
+        if not shutil.which(backend):
+            pytest.skip(f"{backend} is not installed")
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "main.py").write_text("import os\nNeedle = 1\nprint(needle)\n")
+        (tmp_path / "notes.txt").write_text("a needle here\n" + "x" * 100 + "needle" + "y" * 5000 + "\n")
+        (tmp_path / "image.bin").write_bytes(b"needle\0")
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "dep.js").write_text("needle\n")
+        # Hidden files are searched, hidden directories are not, and .gitignore is not respected
+        (tmp_path / ".env").write_text("NEEDLE=1\n")
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "config").write_text("needle\n")
+        (tmp_path / ".gitignore").write_text("ignored.txt\n")
+        (tmp_path / "ignored.txt").write_text("needle\n")
+        tool = create_tool("needle", tmp_path, case_sensitive=False)
+
+        expected = tool._search_python(tmp_path, tool._compile_pattern())
+        outcome = await tool._search_command(backend, tmp_path)
+
+        assert sorted(outcome.matches) == sorted(expected.matches)
+        assert outcome.total == expected.total == 6
+        assert all(len(content) <= MAX_LINE_LENGTH for _, _, content in outcome.matches)
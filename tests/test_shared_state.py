@@ -0,0 +1,114 @@
+"""Tests for shared state backends.
+
+This module contains tests for SQLiteSharedStateBackend: agent
+snapshots, stream fan-out with segment markers and per-worker command
+queues.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from sgr_agent_core.agents import SGRAgent
+from sgr_agent_core.models import AgentStatesEnum
+from sgr_agent_core.services.shared_state import AgentSnapshot, SQLiteSharedStateBackend
+from tests.conftest import create_test_agent
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return SQLiteSharedStateBackend(str(tmp_path / "shared.sqlite3"), poll_interval=0.01)
+
+
+async def collect(stream, timeout: float = 1.0) -> list[str]:
+    async def read():
+        return [chunk async for chunk in stream]
+
+    return await asyncio.wait_for(read(), timeout)
+
+
+class TestSQLiteSharedStateBackend:
+    """Tests for SQLiteSharedStateBackend."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_roundtrip(self, backend):
+        """Test that agent snapshots are saved and loaded."""
+        agent = create_test_agent(SGRAgent)
+        agent.conversation.append({"role": "user", "content": "hello"})
+
+        await backend.save_snapshot(AgentSnapshot.from_agent(agent, worker_id="worker-1"))
+        snapshot = await backend.load_snapshot(agent.id)
+
+        assert snapshot.worker_id == "worker-1"
+        assert snapshot.state == agent._context.state.value
+        assert snapshot.conversation == agent.conversation
+        assert await backend.load_snapshot("unknown") is None
+
+    @pytest.mark.asyncio
+    async def test_subscribe_until_segment_end(self, backend):
+        """Test that subscribers read chunks until the end marker."""
+        await backend.publish("agent", "first")
+        await backend.publish("agent", "second")
+        await backend.publish("agent", None)
+        await backend.publish("agent", "third")
+
+        assert await collect(backend.subscribe("agent")) == ["first", "second"]
+        assert await backend.last_event("agent") == (4, False)
+
+    @pytest.mark.asyncio
+    async def test_subscribe_waits_for_new_chunks(self, backend):
+        """Test that subscribers receive chunks published later."""
+        task = asyncio.create_task(collect(backend.subscribe("agent")))
+        await asyncio.sleep(0.02)
+        await backend.publish("agent", "late")
+        await backend.publish("agent", None)
+
+        assert await task == ["late"]
+
+    @pytest.mark.asyncio
+    async def test_segment_start(self, backend):
+        """Test that the latest segment starts after the previous end
+        marker."""
+        for chunk in ["a", None, "b", None]:
+            await backend.publish("agent", chunk)
+
+        assert await collect(backend.subscribe("agent", after=await backend.segment_start("agent"))) == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_commands_are_routed_per_worker(self, backend):
+        """Test that commands are delivered once to the target worker."""
+        await backend.send_command("worker-1", "agent", "clarification", {"messages": []})
+        await backend.send_command("worker-2", "agent", "cancel")
+
+        assert await backend.receive_commands("worker-1") == [("agent", "clarification", {"messages": []})]
+        assert await backend.receive_commands("worker-1") == []
+        assert await backend.receive_commands("worker-2") == [("agent", "cancel", {})]
+
+    @pytest.mark.asyncio
+    async def test_delete_agent(self, backend):
+        """Test that deleting an agent drops its snapshot and events."""
+        agent = create_test_agent(SGRAgent)
+        await backend.save_snapshot(AgentSnapshot.from_agent(agent))
+        await backend.publish(agent.id, "chunk")
+
+        await backend.delete_agent(agent.id)
+
+        assert await backend.load_snapshot(agent.id) is None
+        assert await backend.last_event(agent.id) == (0, False)
+
+    @pytest.mark.asyncio
+    async def test_prune_drops_old_finished_snapshots(self, backend, monkeypatch):
+        """Test that pruning drops snapshots of finished agents older than
+        max_age and keeps running ones."""
+        running = create_test_agent(SGRAgent)
+        finished = create_test_agent(SGRAgent)
+        finished._context.state = AgentStatesEnum.COMPLETED
+        await backend.save_snapshot(AgentSnapshot.from_agent(running))
+        await backend.save_snapshot(AgentSnapshot.from_agent(finished, evicted=True))
+
+        monkeypatch.setattr(time, "time", lambda: 10**12)
+        await backend.prune(60)
+
+        assert await backend.load_snapshot(running.id) is not None
+        assert await backend.load_snapshot(finished.id) is None
@@ -4,11 +4,17 @@ This module contains comprehensive tests for the StreamingGenerator and
 OpenAIStreamingGenerator classes used for SSE-like streaming.
 """
 
+import asyncio
 import json
 
 import pytest
+from openai.types.chat import ChatCompletionChunk
 
-from sgr_agent_core.stream import OpenAIStreamingGenerator, StreamingGenerator
+from sgr_agent_core.stream import OpenAIStreamingGenerator, SSETemplate, StreamingGenerator
+
+
+async def _collect(stream) -> list[str]:
+    return [item async for item in stream]
 
 
 class TestStreamingGenerator:
@@ -17,22 +23,22 @@ class TestStreamingGenerator:
     def test_initialization(self):
         """Test that StreamingGenerator initializes correctly."""
         generator = StreamingGenerator()
-        assert generator.queue is not None
-        assert generator.queue.qsize() == 0
+        assert generator.buffer is not None
+        assert generator.qsize() == 0
 
     def test_add_single_item(self):
-        """Test adding a single item to the queue."""
+        """Test adding a single item to the buffer."""
         generator = StreamingGenerator()
         generator.add("test data")
-        assert generator.queue.qsize() == 1
+        assert generator.qsize() == 1
 
     def test_add_multiple_items(self):
-        """Test adding multiple items to the queue."""
+        """Test adding multiple items to the buffer."""
         generator = StreamingGenerator()
         generator.add("item 1")
         generator.add("item 2")
         generator.add("item 3")
-        assert generator.queue.qsize() == 3
+        assert generator.qsize() == 3
 
     def test_finish_adds_none(self):
         """Test that finish() adds None as termination signal."""
@@ -40,8 +46,8 @@ class TestStreamingGenerator:
         generator.add("data")
         generator.finish()
 
-        # Queue should have 2 items: "data" and None
-        assert generator.queue.qsize() == 2
+        # Buffer should have 2 items: "data" and None
+        assert generator.qsize() == 2
 
     @pytest.mark.asyncio
     async def test_stream_empty(self):
@@ -161,6 +167,111 @@ class TestStreamingGenerator:
         assert items == special_chars
 
 
+class TestStreamingGeneratorBuffer:
+    """Tests for bounded buffer, replay and multiple subscribers."""
+
+    @staticmethod
+    async def collect(stream) -> list[str]:
+        return await asyncio.wait_for(_collect(stream), timeout=1.0)
+
+    def test_buffer_is_bounded_by_chunks(self):
+        """Test that the oldest chunks are dropped over the chunk cap."""
+        generator = StreamingGenerator(max_chunks=3)
+        for i in range(5):
+            generator.add(f"item {i}")
+
+        assert [event.data for event in generator.buffer] == ["item 2", "item 3", "item 4"]
+        assert generator.dropped == 2
+
+    def test_buffer_is_bounded_by_bytes(self):
+        """Test that the oldest chunks are dropped over the byte cap."""
+        generator = StreamingGenerator(max_bytes=10)
+        generator.add("aaaaaa")
+        generator.add("bbbbbb")
+
+        assert [event.data for event in generator.buffer] == ["bbbbbb"]
+        assert generator.buffered_bytes == 6
+
+    @pytest.mark.asyncio
+    async def test_lagging_reader_skips_dropped_chunks(self):
+        """Test that a reader behind the buffer continues from the oldest
+        chunk."""
+        generator = StreamingGenerator(max_chunks=2)
+        for item in ["a", "b", "c"]:
+            generator.add(item)
+        generator.finish()
+
+        assert await self.collect(generator.stream()) == ["c"]
+
+    @pytest.mark.asyncio
+    async def test_multiple_subscribers(self):
+        """Test that every subscriber receives all chunks."""
+        generator = StreamingGenerator()
+        first = asyncio.create_task(self.collect(generator.subscribe()))
+        second = asyncio.create_task(self.collect(generator.subscribe()))
+        await asyncio.sleep(0)
+
+        generator.add("a")
+        generator.add("b")
+        generator.finish()
+
+        assert await first == ["a", "b"]
+        assert await second == ["a", "b"]
+        assert await self.collect(generator.stream()) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_replay_after_last_event_id(self):
+        """Test that subscribers resume after a sequence number with SSE
+        ids."""
+        generator = StreamingGenerator()
+        for item in ["data: a\n\n", "data: b\n\n", "data: c\n\n"]:
+            generator.add(item)
+        generator.finish()
+
+        assert await self.collect(generator.subscribe(after=1, with_ids=True)) == [
+            "id: 2\ndata: b\n\n",
+            "id: 3\ndata: c\n\n",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_subscribe_replays_latest_segment(self):
+        """Test that default subscription starts at the latest segment."""
+        generator = StreamingGenerator()
+        generator.add("before clarification")
+        generator.finish()
+        generator.add("after clarification")
+
+        stream = generator.subscribe()
+        generator.finish()
+
+        assert await self.collect(stream) == ["after clarification"]
+        assert await self.collect(generator.subscribe()) == ["after clarification"]
+
+    @pytest.mark.asyncio
+    async def test_default_reader_continues_after_segment(self):
+        """Test that stream() continues where the previous read stopped."""
+        generator = StreamingGenerator()
+        generator.add("first")
+        generator.finish()
+        generator.add("second")
+        generator.finish()
+
+        assert await self.collect(generator.stream()) == ["first"]
+        assert await self.collect(generator.stream()) == ["second"]
+
+    @pytest.mark.asyncio
+    async def test_coalesce_policy_joins_available_chunks(self):
+        """Test that coalesce policy delivers pending chunks in one
+        write."""
+        generator = StreamingGenerator(overflow_policy="coalesce")
+        for item in ["a", "b", "c"]:
+            generator.add(item)
+        generator.finish()
+
+        assert await self.collect(generator.stream()) == ["abc"]
+        assert generator.qsize() == 0
+
+
 class TestOpenAIStreamingGenerator:
     """Tests for OpenAIStreamingGenerator class."""
 
@@ -561,8 +672,8 @@ class TestOpenAIStreamingGenerator:
 
         # Models should definitely be different
         assert gen1.model != gen2.model
-        # Queues should be independent
-        assert gen1.queue != gen2.queue
+        # Buffers should be independent
+        assert gen1.buffer is not gen2.buffer
 
     @pytest.mark.asyncio
     async def test_long_content_stream(self):
@@ -581,3 +692,62 @@ class TestOpenAIStreamingGenerator:
         data = json.loads(json_str)
 
         assert len(data["choices"][0]["delta"]["content"]) == 10000
+
+
+class TestOpenAIStreamingGeneratorEncoding:
+    """Tests for template-based chunk encoding."""
+
+    @staticmethod
+    def make_chunk(delta: dict, finish_reason: str | None = None) -> ChatCompletionChunk:
+        return ChatCompletionChunk.model_validate(
+            {
+                "id": "chatcmpl-upstream",
+                "object": "chat.completion.chunk",
+                "created": 1700000000,
+                "model": "upstream-model",
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+        )
+
+    def test_sse_template_renders_fields(self):
+        """Test that template fields are serialized in place."""
+        template = SSETemplate({"a": SSETemplate.field(1), "b": {"c": SSETemplate.field(0)}}, ["c", "a"])
+
+        rendered = template.render('quote " and\nnewline', None)
+
+        assert rendered.startswith("data: ") and rendered.endswith("\n\n")
+        assert json.loads(rendered[6:]) == {"a": None, "b": {"c": 'quote " and\nnewline'}}
+
+    def test_sse_template_requires_all_fields(self):
+        """Test that missing template fields are rejected."""
+        with pytest.raises(ValueError):
+            SSETemplate({"a": SSETemplate.field(0)}, ["a", "b"])
+
+    @pytest.mark.parametrize(
+        "delta,finish_reason",
+        [
+            ({"content": 'Hello, мир "!"', "role": "assistant"}, None),
+            ({"content": "second"}, None),
+            ({"content": None}, "stop"),
+            ({"tool_calls": [{"index": 0, "id": "call", "function": {"name": "tool", "arguments": "{}"}}]}, None),
+        ],
+    )
+    def test_add_chunk_matches_full_serialization(self, delta, finish_reason):
+        """Test that encoded upstream chunks equal full model
+        serialization."""
+        generator = OpenAIStreamingGenerator(model="agent-model")
+        generator.add_chunk(self.make_chunk({"content": "warm up template"}))
+
+        chunk = self.make_chunk(delta, finish_reason)
+        generator.add_chunk(chunk)
+
+        expected = chunk.model_copy(update={"model": "agent-model"}).model_dump(mode="json")
+        assert json.loads(generator.buffer[-1].data[6:]) == expected
+
+    def test_upstream_template_reused_per_response(self):
+        """Test that content chunks of one response share a template."""
+        generator = OpenAIStreamingGenerator()
+        for content in ["a", "b", "c"]:
+            generator.add_chunk(self.make_chunk({"content": content}))
+
+        assert len(generator._upstream_templates) == 1
@@ -0,0 +1,331 @@
+"""Tests for TavilySearchService.
+
+This module contains tests for the shared service registry and
+coalescing of identical in-flight Tavily requests.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from sgr_agent_core.agent_definition import SearchConfig
+from sgr_agent_core.models import SearchCacheStats
+from sgr_agent_core.services.metrics import MetricsRegistry
+from sgr_agent_core.services.search_cache import SearchCacheBackend
+from sgr_agent_core.services.tavily_search import TavilySearchService
+
+
+def create_mock_client(delay: float = 0.01) -> Mock:
+    """Create a mock AsyncTavilyClient with slow search and extract."""
+
+    async def search(query, max_results, include_raw_content):
+        await asyncio.sleep(delay)
+        return {"results": [{"url": f"https://example.com/{query}", "title": query, "content": "snippet"}]}
+
+    async def extract(urls):
+        await asyncio.sleep(delay)
+        return {"results": [{"url": url, "raw_content": f"content of {url}"} for url in urls]}
+
+    client = Mock()
+    client.search = AsyncMock(side_effect=search)
+    client.extract = AsyncMock(side_effect=extract)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_services():
+    TavilySearchService._instances.clear()
+    TavilySearchService._clients.clear()
+    SearchCacheBackend._shared.clear()
+    yield
+    TavilySearchService._instances.clear()
+    TavilySearchService._clients.clear()
+    SearchCacheBackend._shared.clear()
+
+
+class TestTavilySearchServiceShared:
+    """Tests for shared TavilySearchService instances."""
+
+    def test_get_shared_returns_same_instance(self):
+        """Test that the same config returns the same service."""
+        config = SearchConfig(tavily_api_key="key")
+
+        assert TavilySearchService.get_shared(config) is TavilySearchService.get_shared(config.model_copy())
+
+    def test_get_shared_reuses_client_across_configs(self):
+        """Test that services with the same credentials share a client."""
+        first = TavilySearchService.get_shared(SearchConfig(tavily_api_key="key", max_results=5))
+        second = TavilySearchService.get_shared(SearchConfig(tavily_api_key="key", max_results=7))
+        other = TavilySearchService.get_shared(SearchConfig(tavily_api_key="other-key"))
+
+        assert first is not second
+        assert first._client is second._client
+        assert first._client is not other._client
+
+    @pytest.mark.asyncio
+    async def test_aclose_shared_drops_services(self):
+        """Test that closing shared services creates new ones afterwards."""
+        config = SearchConfig(tavily_api_key="key")
+        service = TavilySearchService.get_shared(config)
+
+        await TavilySearchService.aclose_shared()
+
+        assert TavilySearchService.get_shared(config) is not service
+
+
+class TestTavilySearchServiceCoalescing:
+    """Tests for coalescing identical in-flight requests."""
+
+    @pytest.mark.asyncio
+    async def test_identical_searches_are_coalesced(self):
+        """Test that concurrent identical searches hit upstream once."""
+        client = create_mock_client()
+        service = TavilySearchService(SearchConfig(tavily_api_key="key"), client=client)
+
+        results = await asyncio.gather(*[service.search("query", max_results=3) for _ in range(5)])
+
+        assert client.search.await_count == 1
+        assert all(len(sources) == 1 for sources in results)
+        # Each caller gets its own SourceData objects
+        assert results[0][0] is not results[1][0]
+
+    @pytest.mark.asyncio
+    async def test_different_searches_are_not_coalesced(self):
+        """Test that different queries are sent separately."""
+        client = create_mock_client()
+        service = TavilySearchService(SearchConfig(tavily_api_key="key"), client=client)
+
+        await asyncio.gather(service.search("first"), service.search("second"))
+
+        assert client.search.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_identical_extracts_are_coalesced(self):
+        """Test that concurrent identical extracts hit upstream once."""
+        client = create_mock_client()
+        service = TavilySearchService(SearchConfig(tavily_api_key="key"), client=client)
+        urls = ["https://example.com/a", "https://example.com/b"]
+
+        results = await asyncio.gather(service.extract(urls), service.extract(list(urls)))
+
+        assert client.extract.await_count == 1
+        assert [source.url for source in results[1]] == urls
+
+    @pytest.mark.asyncio
+    async def test_sequential_searches_are_not_coalesced(self):
+        """Test that finished requests are not reused."""
+        client = create_mock_client()
+        service = TavilySearchService(SearchConfig(tavily_api_key="key"), client=client)
+
+        await service.search("query")
+        await service.search("query")
+
+        assert client.search.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_request(self):
+        """Test that cancelling one caller keeps the request for others."""
+        client = create_mock_client(delay=0.05)
+        service = TavilySearchService(SearchConfig(tavily_api_key="key"), client=client)
+
+        first = asyncio.create_task(service.search("query"))
+        second = asyncio.create_task(service.search("query"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        sources = await second
+        assert len(sources) == 1
+        assert client.search.await_count == 1
+
+
+class TestTavilySearchServiceCache:
+    """Tests for the search result cache layer."""
+
+    @pytest.mark.asyncio
+    async def test_search_served_from_cache(self):
+        """Test that normalized repeated queries hit the cache."""
+        client = create_mock_client()
+        service = TavilySearchService(SearchConfig(tavily_api_key="key", cache_backend="memory"), client=client)
+        stats = SearchCacheStats()
+
+        first = await service.search("Python  News", max_results=3, cache_stats=stats)
+        second = await service.search("python news ", max_results=3, cache_stats=stats)
+
+        assert client.search.await_count == 1
+        assert [s.url for s in first] == [s.url for s in second]
+        assert stats.hits == 1
+        assert stats.misses == 1
+        assert stats.hit_rate == 0.5
+
+    @pytest.mark.asyncio
+    async def test_search_cache_keyed_by_parameters(self):
+        """Test that different max_results are cached separately."""
+        client = create_mock_client()
+        service = TavilySearchService(SearchConfig(tavily_api_key="key", cache_backend="memory"), client=client)
+
+        await service.search("query", max_results=3)
+        await service.search("query", max_results=5)
+        await service.search("query", max_results=3, include_raw_content=False)
+
+        assert client.search.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_extract_fetches_only_missing_urls(self):
+        """Test that extract uses per-URL cache entries."""
+        client = create_mock_client()
+        service = TavilySearchService(SearchConfig(tavily_api_key="key", cache_backend="memory"), client=client)
+        stats = SearchCacheStats()
+
+        await service.extract(["https://example.com/a"], cache_stats=stats)
+        sources = await service.extract(["https://example.com/a", "https://example.com/b"], cache_stats=stats)
+
+        assert client.extract.await_args.kwargs["urls"] == ["https://example.com/b"]
+        assert {source.url for source in sources} == {"https://example.com/a", "https://example.com/b"}
+        assert stats.hits == 1
+        assert stats.misses == 2
+
+    @pytest.mark.asyncio
+    async def test_extract_cached_by_requested_url(self):
+        """Test that a redirected extract result is cached under the
+        requested URL."""
+        client = create_mock_client()
+        client.extract = AsyncMock(
+            return_value={"results": [{"url": "https://www.example.com/a/", "raw_content": "content"}]}
+        )
+        service = TavilySearchService(SearchConfig(tavily_api_key="key", cache_backend="memory"), client=client)
+
+        await service.extract(["https://example.com/a"])
+        sources = await service.extract(["https://example.com/a"])
+
+        assert client.extract.await_count == 1
+        assert sources[0].full_content == "content"
+
+    @pytest.mark.asyncio
+    async def test_cache_lookups_counted_in_metrics(self):
+        """Test that cache hits and misses are exported as counters."""
+        MetricsRegistry.reset()
+        service = TavilySearchService(
+            SearchConfig(tavily_api_key="key", cache_backend="memory"), client=create_mock_client()
+        )
+
+        await service.search("query")
+        await service.search("query")
+
+        text = MetricsRegistry.render()
+        MetricsRegistry.reset()
+        assert 'sgr_search_cache_lookups_total{kind="search",result="hit"} 1' in text
+        assert 'sgr_search_cache_lookups_total{kind="search",result="miss"} 1' in text
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled_by_default(self):
+        """Test that without cache backend every call goes upstream."""
+        client = create_mock_client()
+        service = TavilySearchService(SearchConfig(tavily_api_key="key"), client=client)
+        stats = SearchCacheStats()
+
+        await service.search("query", cache_stats=stats)
+        await service.search("query", cache_stats=stats)
+
+        assert client.search.await_count == 2
+        assert stats.hits == 0
+
+
+class TestTavilySearchServicePerUrlExtract:
+    """Tests for the concurrent per-URL extract mode."""
+
+    @staticmethod
+    def create_service(client: Mock, fallback_extractor: Mock | None = None, **config) -> TavilySearchService:
+        return TavilySearchService(
+            SearchConfig(tavily_api_key="key", extract_mode="per_url", **config),
+            client=client,
+            fallback_extractor=fallback_extractor,
+        )
+
+    @pytest.mark.asyncio
+    async def test_urls_are_extracted_separately(self):
+        """Test that each URL gets its own extract request."""
+        client = create_mock_client()
+        service = self.create_service(client)
+        urls = ["https://example.com/a", "https://example.com/b"]
+
+        sources = await service.extract(urls)
+
+        assert client.extract.await_count == 2
+        assert {source.url for source in sources} == set(urls)
+
+    @pytest.mark.asyncio
+    async def test_slow_url_times_out_and_others_succeed(self):
+        """Test that a slow page is marked failed without blocking the
+        rest."""
+
+        async def extract(urls):
+            await asyncio.sleep(1 if urls[0].endswith("slow") else 0.01)
+            return {"results": [{"url": urls[0], "raw_content": "content"}]}
+
+        client = Mock()
+        client.extract = AsyncMock(side_effect=extract)
+        service = self.create_service(client, extract_timeout=0.1)
+
+        results = [item async for item in service.iter_extract(["https://example.com/slow", "https://example.com/a"])]
+
+        assert results[0][0] == "https://example.com/a"
+        assert results[0][1].full_content == "content"
+        assert results[1] == ("https://example.com/slow", None)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """Test that no more than extract_concurrency requests run at
+        once."""
+        active = 0
+        peak = 0
+
+        async def extract(urls):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"results": [{"url": urls[0], "raw_content": "content"}]}
+
+        client = Mock()
+        client.extract = AsyncMock(side_effect=extract)
+        service = self.create_service(client, extract_concurrency=2)
+
+        sources = await service.extract([f"https://example.com/{i}" for i in range(6)])
+
+        assert len(sources) == 6
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_fallback_extractor_used_for_failed_urls(self):
+        """Test that URLs failed by Tavily are retried with the
+        fallback."""
+        client = Mock()
+        client.extract = AsyncMock(return_value={"results": [], "failed_results": ["https://example.com/a"]})
+        fallback = Mock()
+        fallback.extract = AsyncMock(return_value={"url": "https://example.com/a", "raw_content": "local content"})
+        service = self.create_service(client, fallback_extractor=fallback)
+
+        sources = await service.extract(["https://example.com/a"])
+
+        fallback.extract.assert_awaited_once_with("https://example.com/a")
+        assert sources[0].full_content == "local content"
+
+    @pytest.mark.asyncio
+    async def test_batch_mode_uses_fallback_for_failed_urls(self):
+        """Test that batch mode retries only failed URLs with the
+        fallback."""
+        client = Mock()
+        client.extract = AsyncMock(
+            return_value={"results": [{"url": "https://example.com/a", "raw_content": "a"}], "failed_results": []}
+        )
+        fallback = Mock()
+        fallback.extract = AsyncMock(return_value=None)
+        service = TavilySearchService(SearchConfig(tavily_api_key="key"), client=client, fallback_extractor=fallback)
+
+        sources = await service.extract(["https://example.com/a", "https://example.com/b"])
+
+        assert client.extract.await_count == 1
+        fallback.extract.assert_awaited_once_with("https://example.com/b")
+        assert [source.url for source in sources] == ["https://example.com/a"]
@@ -0,0 +1,184 @@
+"""Tests for the workspace index of the file agent example.
+
+This module contains tests for incremental refresh, dropping and
+compaction of removed files, the save and load round trip, candidate
+filtering and the freshness of indexes handed out by the service.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from examples.sgr_file_agent.tools.workspace_index import WorkspaceIndex, WorkspaceIndexService
+
+
+def write(path: Path, content: bytes | str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    path.write_bytes(content)
+
+
+def touch_later(path: Path) -> None:
+    """Move the mtime of path forward so a refresh notices the change."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "root"
+    write(root / "a.py", "def alpha():\n    return 1\n")
+    write(root / "pkg" / "b.txt", "beta gamma\n")
+    write(root / "pkg" / "data.bin", b"\0\1\2binary")
+    write(root / ".git" / "HEAD", "ref: refs/heads/main\n")
+    return root.resolve()
+
+
+def candidate_names(index: WorkspaceIndex, directory: Path, pattern: str, needle: bytes | None) -> list[str]:
+    candidates, _ = index.search_candidates(directory, pattern, needle)
+    return [Path(path).name for path, _ in candidates]
+
+
+class TestWorkspaceIndex:
+    """Tests for WorkspaceIndex."""
+
+    def test_refresh_indexes_tree(self, tree):
+        """Test that the first refresh indexes files and skips hidden
+        directories."""
+        index = WorkspaceIndex(tree)
+
+        assert index.refresh() is True
+
+        assert sorted(index.files) == ["a.py", "pkg/b.txt", "pkg/data.bin"]
+        assert index.directories[""] == {"a.py", "pkg"}
+        assert index.files["pkg/data.bin"].binary is True
+        assert index.files["a.py"].indexed is True
+
+    def test_refresh_reindexes_changed_files_only(self, tree):
+        """Test that unchanged files keep their entry and changed ones are
+        reindexed."""
+        index = WorkspaceIndex(tree)
+        index.refresh()
+        unchanged = index.files["a.py"]
+        before = index.files["pkg/b.txt"].id
+
+        assert index.refresh() is False
+        write(tree / "pkg" / "b.txt", "delta\n")
+        touch_later(tree / "pkg" / "b.txt")
+        assert index.refresh() is True
+
+        assert index.files["a.py"] is unchanged
+        assert index.files["pkg/b.txt"].id != before
+        assert candidate_names(index, tree, "*", b"delta") == ["b.txt"]
+        assert candidate_names(index, tree, "*", b"gamma") == []
+
+    def test_removed_files_are_dropped_and_compacted(self, tree):
+        """Test that removed files leave the table and their ids the
+        postings."""
+        index = WorkspaceIndex(tree)
+        index.refresh()
+        removed = index.files["pkg/b.txt"].id
+
+        (tree / "pkg" / "b.txt").unlink()
+        (tree / "a.py").unlink()
+        assert index.refresh() is True
+
+        assert sorted(index.files) == ["pkg/data.bin"]
+        assert "b.txt" not in index.directories["pkg"]
+        # Two dead files outnumber the one live file, so postings were compacted
+        assert index._dead == 0
+        assert all(removed not in ids for ids in index.postings.values())
+
+    def test_save_and_load_round_trip(self, tree, tmp_path):
+        """Test that a saved index loads back with the same contents."""
+        index = WorkspaceIndex(tree, tmp_path / "cache" / "tree.idx")
+        index.refresh()
+        index.save()
+
+        loaded = WorkspaceIndex(tree, tmp_path / "cache" / "tree.idx")
+        assert loaded.load() is True
+
+        assert loaded.files == index.files
+        assert loaded.directories == index.directories
+        assert loaded.postings == index.postings
+        assert loaded.refresh() is False
+        assert WorkspaceIndex(tree / "pkg", tmp_path / "cache" / "tree.idx").load() is False
+
+    def test_search_candidates_filtering(self, tree):
+        """Test that candidates are filtered by directory, pattern and
+        trigrams, case insensitively, with binary files counted."""
+        index = WorkspaceIndex(tree)
+        index.refresh()
+
+        assert candidate_names(index, tree, "*", b"ALPHA") == ["a.py"]
+        assert candidate_names(index, tree, "*", b"zzz") == []
+        assert candidate_names(index, tree, "*.txt", None) == ["b.txt"]
+        # Needles shorter than a trigram cannot be filtered
+        assert candidate_names(index, tree, "*", b"be") == ["a.py", "b.txt"]
+        assert candidate_names(index, tree / "pkg", "*", b"beta") == ["b.txt"]
+        assert index.search_candidates(tree, "*", None)[1] == 1
+        assert index.search_candidates(tree / ".git", "*", None) is None
+
+
+class TestWorkspaceIndexService:
+    """Tests for WorkspaceIndexService."""
+
+    @pytest.fixture(autouse=True)
+    def isolated_service(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(WorkspaceIndexService, "cache_dir", tmp_path / "cache")
+        WorkspaceIndexService.reset()
+        yield
+        WorkspaceIndexService.reset()
+
+    @pytest.mark.asyncio
+    async def test_index_is_fresh_on_every_request(self, tree):
+        """Test that files created right after a request are visible to the
+        next one."""
+        assert await WorkspaceIndexService.get(tree) is None
+        await WorkspaceIndexService._building[tree]
+        index = await WorkspaceIndexService.get(tree)
+        assert candidate_names(index, tree, "*", b"epsilon") == []
+
+        write(tree / "new.md", "epsilon\n")
+        index = await WorkspaceIndexService.get(tree)
+
+        assert candidate_names(index, tree, "*", b"epsilon") == ["new.md"]
+        assert (WorkspaceIndexService.cache_dir).is_dir()
+
+    @pytest.mark.asyncio
+    async def test_changed_index_is_saved_later(self, tree, monkeypatch):
+        """Test that a refresh does not save the index in the request but
+        marks it for a background save."""
+        monkeypatch.setattr(WorkspaceIndexService, "save_delay", 3600.0)
+        await WorkspaceIndexService.get(tree)
+        await WorkspaceIndexService._building[tree]
+        path = WorkspaceIndexService._index_path(tree)
+        saved = path.stat().st_mtime_ns
+
+        write(tree / "new.md", "epsilon\n")
+        await WorkspaceIndexService.get(tree)
+
+        assert path.stat().st_mtime_ns == saved
+        assert tree in WorkspaceIndexService._dirty
+        WorkspaceIndexService.save_dirty()
+        loaded = WorkspaceIndex(tree, path)
+        assert loaded.load() is True
+        assert "new.md" in loaded.files
+
+    @pytest.mark.asyncio
+    async def test_background_save(self, tree, monkeypatch):
+        """Test that a changed index is saved after save_delay."""
+        monkeypatch.setattr(WorkspaceIndexService, "save_delay", 0.0)
+        await WorkspaceIndexService.get(tree)
+        await WorkspaceIndexService._building[tree]
+
+        write(tree / "new.md", "epsilon\n")
+        await WorkspaceIndexService.get(tree)
+        await WorkspaceIndexService._saving[tree]
+
+        assert not WorkspaceIndexService._dirty
+        loaded = WorkspaceIndex(tree, WorkspaceIndexService._index_path(tree))
+        assert loaded.load() is True
+        assert "new.md" in loaded.files